@@ -6,6 +6,8 @@ CONFIG_SCHEMA = {
         "database_oauth_uri": "sqlite:///database/eve_oauth.db",
         "database_app_uri": "sqlite:///database/eve_app.db",
         "database_sde_uri": "sqlite:///database/eve_sde.db",
+        "database_sde_read_only": True,
+        "database_sde_ram_tables": [],
         "language": "en",
     },
     "esi": {
@@ -27,7 +27,6 @@ if _SRC.exists() and str(_SRC) not in sys.path:
     sys.path.insert(0, str(_SRC))
 
 from flask_app.settings import (
-    flask_debug,
     flask_host,
     flask_port,
     health_poll_timeout_seconds,
@@ -49,19 +48,18 @@ def run_flask():
 
     from flask_app.app import create_app
     from flask_app.bootstrap import start_background_initialization
+    from flask_app.serving import serve_app
 
     app = create_app()
 
-    # Initialization can be slow (DB/ESI refresh). Start it in the background so
+    # Werkzeug (default) or a production WSGI server, selected by FLASK_SERVER.
+    # Initialization can be slow (DB/ESI refresh). It runs in the background so
     # the server becomes reachable quickly and /health can report progress.
-    start_background_initialization(app_state=app.extensions.get("app_state"), refresh_metadata=refresh_metadata_on_startup())
-
-    # Avoid Werkzeug reloader when running under multiprocessing.
-    app.run(
-        host=flask_host(),
-        port=flask_port(),
-        debug=flask_debug(),
-        use_reloader=False,
+    serve_app(
+        app,
+        initialize=lambda: start_background_initialization(
+            app_state=app.extensions.get("app_state"), refresh_metadata=refresh_metadata_on_startup()
+        ),
     )
 
 
@@ -3,6 +3,10 @@ import os
 import sys
 import zipfile
 import shutil
+import hashlib
+import sqlite3
+import time
+from multiprocessing import Pool
 
 try:
     import truststore
@@ -11,12 +15,12 @@ except ImportError:
     pass
 
 import requests  # pyright: ignore[reportMissingModuleSource]
-import pandas as pd  # pyright: ignore[reportMissingModuleSource]
 import yaml  # pyright: ignore[reportMissingModuleSource]
 import argparse
 import json
 from datetime import datetime
 from tqdm import tqdm
+from sqlalchemy.engine import make_url  # pyright: ignore[reportMissingImports]
 
 # Add project root and src/ to sys.path
 ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
@@ -27,6 +31,7 @@ sys.path.append(SRC_DIR)
 from eve_online_industry_tracker.config.config_manager import ConfigManager
 from config.schemas import IMPORT_SDE_SCHEMA, SDE_VERSION_SCHEMA
 from eve_online_industry_tracker.infrastructure.database_manager import DatabaseManager
+from eve_online_industry_tracker.infrastructure.sde.reload import PENDING_SUFFIX, SDE_TABLE_STATE_TABLE
 
 
 # ----------------------------
@@ -207,71 +212,459 @@ def download_sde(url: str, dest_dir: str) -> str:
 
 
 # ----------------------------
-# Import YAML SDE tables to SQLite
+# Import YAML/JSONL SDE tables to SQLite
 # ----------------------------
+# libyaml's C loader parses the SDE several times faster than the pure-Python SafeLoader.
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+INSERT_CHUNK_SIZE = 5000
+# Bump when staged rows change shape so --update re-imports every table once.
+IMPORT_FORMAT_VERSION = 1
+
+# Secondary indexes built once all rows are loaded: {table: (columns, ...)}.
+# Tables keyed by ID in the SDE get "id" as INTEGER PRIMARY KEY instead.
+SDE_POST_LOAD_INDEXES = {
+    "types": (("groupID", "published"), ("metaGroupID",)),
+    "groups": (("categoryID",),),
+    "blueprints": (("blueprintTypeID",),),
+    "npcStations": (("solarSystemID",),),
+    "mapSolarSystems": (("constellationID",), ("regionID",)),
+}
+
+
+def find_table_files(sde_dir: str, tables_to_import: list) -> dict:
+    """Map table name -> source file, preferring the JSONL distribution over YAML."""
+    found = {}
+    for root, _, files in os.walk(sde_dir):
+        for file in sorted(files):
+            table_name, ext = os.path.splitext(file)
+            if table_name not in tables_to_import or ext not in (".jsonl", ".yaml", ".yml"):
+                continue
+            if ext == ".jsonl" or table_name not in found:
+                found[table_name] = os.path.join(root, file)
+    return found
+
+
+def _keyed_row(key, value, *, strict_int: bool) -> dict:
+    try:
+        key = int(key)
+    except (TypeError, ValueError):
+        if strict_int:
+            raise
+    if isinstance(value, dict):
+        return {"id": key, **value}
+    return {"id": key, "value": value}
+
+
+def _iter_yaml_rows(path: str):
+    with open(path, "r", encoding="utf-8") as f:
+        data = yaml.load(f, Loader=YAML_LOADER)
+    if isinstance(data, dict):
+        for k, v in data.items():
+            yield _keyed_row(k, v, strict_int=True)
+    elif isinstance(data, list):
+        yield from data
+
+
+def _iter_jsonl_rows(path: str):
+    """Stream a JSONL table one line at a time; "_key" becomes "id" like the YAML mapping keys."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            row = json.loads(line)
+            if isinstance(row, dict) and "_key" in row:
+                key = row.pop("_key")
+                row = _keyed_row(key, row.pop("_value") if set(row) == {"_value"} else row, strict_int=False)
+            yield row
+
+
+def _column_type(kinds: set) -> str:
+    kinds = kinds - {"null"}
+    if not kinds or kinds <= {"integer"}:
+        return "INTEGER"
+    if kinds <= {"integer", "real"}:
+        return "REAL"
+    return "TEXT"
+
+
+def _value_kind(value) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, (bool, int)):
+        return "integer"
+    if isinstance(value, float):
+        return "real"
+    return "text"
+
+
+def stage_table(table_name: str, source_path: str, staging_path: str, repackaged_volumes: dict | None = None) -> dict:
+    """Parse one SDE table into its own staging SQLite file. Runs in a worker process.
+
+    Columns and their types are inferred from all rows first (JSONL is simply read twice),
+    then rows are written with executemany in chunks. Returns per-table timing and the
+    worker's peak RSS (each table gets a fresh worker, so the peak is per table).
+    """
+    started = time.perf_counter()
+    if source_path.endswith(".jsonl"):
+        def rows():
+            return (flatten_row(row) for row in _iter_jsonl_rows(source_path))
+    else:
+        cached = [flatten_row(row) for row in _iter_yaml_rows(source_path)]
+
+        def rows():
+            return iter(cached)
+
+    if repackaged_volumes is not None:
+        source_rows = rows
+
+        def rows():
+            for row in source_rows():
+                row["repackaged_volume"] = repackaged_volumes.get(row.get("id"))
+                yield row
+
+    # Column order follows first appearance; names that collide after sanitizing keep the first key.
+    columns = {}
+    kinds = {}
+    row_count = 0
+    for row in rows():
+        row_count += 1
+        for key, value in row.items():
+            column = columns.setdefault(key, sanitize_column_name(str(key)))
+            kinds.setdefault(column, set()).add(_value_kind(value))
+    keys = []
+    names = []
+    for key, column in columns.items():
+        if column not in names:
+            keys.append(key)
+            names.append(column)
+
+    types = {name: _column_type(kinds[name]) for name in names}
+    id_is_key = "id" in types and types["id"] == "INTEGER" and "null" not in kinds["id"]
+    column_defs = ", ".join(
+        f'"{name}" {types[name]}' + (" PRIMARY KEY" if name == "id" and id_is_key else "") for name in names
+    )
+
+    if os.path.exists(staging_path):
+        os.remove(staging_path)
+    conn = sqlite3.connect(staging_path)
+    try:
+        conn.execute("PRAGMA journal_mode=OFF")
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.execute(f'CREATE TABLE "{table_name}" ({column_defs})')
+        insert_sql = f'INSERT INTO "{table_name}" VALUES ({", ".join("?" for _ in names)})'
+        chunk = []
+        for row in rows():
+            chunk.append(tuple(_sqlite_value(row.get(key)) for key in keys))
+            if len(chunk) >= INSERT_CHUNK_SIZE:
+                conn.executemany(insert_sql, chunk)
+                chunk = []
+        if chunk:
+            conn.executemany(insert_sql, chunk)
+        conn.commit()
+    finally:
+        conn.close()
+
+    return {
+        "table": table_name,
+        "rows": row_count,
+        "parse_seconds": time.perf_counter() - started,
+        "peak_mib": _peak_rss_mib(),
+    }
+
+
+def _stage_table_task(task: tuple) -> dict:
+    table_name = task[0]
+    try:
+        return stage_table(*task)
+    except Exception as e:
+        return {"table": table_name, "error": str(e)}
+
+
+def _peak_rss_mib() -> float | None:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and KiB on Linux.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _format_mib(value) -> str:
+    return "n/a" if value is None else f"{value:.1f}"
+
+
+def _sqlite_value(value):
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return str(value)
+
+
+def source_hash(source_path: str, repackaged_volumes: dict | None = None) -> str:
+    """Hash of everything a table is built from: the source file, the repackaged volumes
+    merged into it and the importer's row format."""
+    digest = hashlib.sha256(f"import-format:{IMPORT_FORMAT_VERSION}\n".encode())
+    with open(source_path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    if repackaged_volumes is not None:
+        digest.update(json.dumps(sorted(repackaged_volumes.items())).encode())
+    return digest.hexdigest()
+
+
+def init_table_state(db_path: str) -> dict:
+    """Create the per-table import state table if needed; returns {table: source_hash}."""
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        conn.execute(
+            f"""CREATE TABLE IF NOT EXISTS {SDE_TABLE_STATE_TABLE} (
+                table_name TEXT PRIMARY KEY,
+                source_hash TEXT NOT NULL,
+                row_count INTEGER,
+                imported_at TEXT NOT NULL
+            )"""
+        )
+        rows = conn.execute(f"SELECT table_name, source_hash FROM {SDE_TABLE_STATE_TABLE}").fetchall()
+    finally:
+        conn.close()
+    return {table: hash_ for table, hash_ in rows}
+
+
+def _same_keyed_schema(conn, table_name: str) -> bool:
+    main_cols = [row[1:3] + (row[5],) for row in conn.execute(f'PRAGMA main.table_info("{table_name}")')]
+    staged_cols = [row[1:3] + (row[5],) for row in conn.execute(f'PRAGMA staged.table_info("{table_name}")')]
+    return bool(main_cols) and main_cols == staged_cols and ("id", "INTEGER", 1) in main_cols
+
+
+def merge_staged_table(
+    db_path: str, table_name: str, staging_path: str, *, source_hash: str, row_count: int, incremental: bool = False
+) -> dict:
+    """Move the staged copy of ``table_name`` into the SDE database in one transaction.
+
+    With ``incremental`` and an unchanged, id-keyed schema only the row differences are
+    applied; otherwise the table is replaced. The table's source hash is recorded in the
+    same transaction. Returns what was done.
+    """
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        conn.execute("ATTACH DATABASE ? AS staged", (staging_path,))
+        ddl = conn.execute(
+            "SELECT sql FROM staged.sqlite_master WHERE type = 'table' AND name = ?", (table_name,)
+        ).fetchone()[0]
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if incremental and _same_keyed_schema(conn, table_name):
+                deleted = conn.execute(
+                    f'DELETE FROM main."{table_name}" WHERE id NOT IN (SELECT id FROM staged."{table_name}")'
+                ).rowcount
+                upserted = conn.execute(
+                    f'INSERT OR REPLACE INTO main."{table_name}" '
+                    f'SELECT * FROM staged."{table_name}" EXCEPT SELECT * FROM main."{table_name}"'
+                ).rowcount
+                outcome = {"action": "diff", "deleted": deleted, "upserted": upserted}
+            else:
+                conn.execute(f'DROP TABLE IF EXISTS main."{table_name}"')
+                conn.execute(ddl)
+                # Same schema and no indexes yet, so SQLite copies pages instead of re-inserting rows.
+                conn.execute(f'INSERT INTO main."{table_name}" SELECT * FROM staged."{table_name}"')
+                outcome = {"action": "replaced"}
+            conn.execute(
+                f"INSERT OR REPLACE INTO main.{SDE_TABLE_STATE_TABLE} (table_name, source_hash, row_count, imported_at) "
+                "VALUES (?, ?, ?, ?)",
+                (table_name, source_hash, row_count, datetime.now().isoformat()),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("DETACH DATABASE staged")
+    finally:
+        conn.close()
+    os.remove(staging_path)
+    return outcome
+
+
+def create_post_load_indexes(db_path: str, tables: list) -> None:
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        for table_name in tables:
+            existing = {row[1] for row in conn.execute(f'PRAGMA table_info("{table_name}")')}
+            for columns in SDE_POST_LOAD_INDEXES.get(table_name, ()):
+                if not set(columns) <= existing:
+                    continue
+                index_name = f"idx_{table_name}_{'_'.join(columns)}"
+                column_list = ", ".join(f'"{c}"' for c in columns)
+                conn.execute(f'CREATE INDEX IF NOT EXISTS "{index_name}" ON "{table_name}" ({column_list})')
+        conn.execute("ANALYZE")
+        # Leave no WAL behind; the app opens the SDE immutable.
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        conn.execute("PRAGMA journal_mode=DELETE")
+    finally:
+        conn.close()
+
+
+def prepare_work_copy(db_path: str) -> str:
+    """Copy the current SDE (or a not yet applied pending one) to ``<db>.next`` to build into.
+
+    The app opens the SDE immutable, so it must never change in place; the finished copy
+    is swapped in with ``swap_into_place``.
+    """
+    work_path = f"{db_path}.next"
+    for path in (work_path, f"{work_path}-wal", f"{work_path}-shm"):
+        if os.path.exists(path):
+            os.remove(path)
+    pending_path = f"{db_path}{PENDING_SUFFIX}"
+    base_path = pending_path if os.path.exists(pending_path) else db_path
+    if os.path.exists(base_path):
+        src = sqlite3.connect(f"file:{base_path}?mode=ro", uri=True)
+        dst = sqlite3.connect(work_path)
+        try:
+            src.backup(dst)
+        finally:
+            dst.close()
+            src.close()
+    return work_path
+
+
+def swap_into_place(work_path: str, db_path: str) -> str:
+    """Atomically replace the SDE with the finished work copy; returns where it ended up.
+
+    Windows refuses to replace a file another process has open; the copy is then left as
+    ``<db>.pending`` and the running app moves it into place on its next reload check.
+    """
+    for path in (f"{db_path}-wal", f"{db_path}-shm"):
+        if os.path.exists(path):
+            os.remove(path)
+    try:
+        os.replace(work_path, db_path)
+    except OSError as e:
+        pending_path = f"{db_path}{PENDING_SUFFIX}"
+        os.replace(work_path, pending_path)
+        tqdm.write(f"SDE database is in use ({e}); the update was left at {pending_path}.")
+        return pending_path
+    pending_path = f"{db_path}{PENDING_SUFFIX}"
+    if os.path.exists(pending_path):
+        os.remove(pending_path)
+    return db_path
+
+
 def import_sde_to_sqlite(
-    sde_dir: str, db_uri: str, tables_to_import: list, repackaged_json_path: str
+    sde_dir: str,
+    db_uri: str,
+    tables_to_import: list,
+    repackaged_json_path: str,
+    workers: int | None = None,
+    *,
+    update: bool = False,
+    sde_version: dict | None = None,
 ):
-    db = DatabaseManager(db_uri)
-    repackaged_groups, repackaged_items = load_repackaged_volumes(repackaged_json_path)
+    """Import the selected tables into a copy of the SDE database and swap it in.
 
-    table_files = []
-    for root, _, files in os.walk(sde_dir):
-        for file in sorted(files):
-            table_name = os.path.splitext(file)[0]
-            if table_name in tables_to_import and file.endswith((".yaml", ".yml")):
-                table_files.append((table_name, os.path.join(root, file)))
+    With ``update`` tables whose source hash matches the last import are skipped and the
+    changed ones get a row-level diff instead of a full rewrite. ``sde_version`` (CCP's
+    version payload) is recorded in the copy so the swap also publishes the version.
+    """
+    db_path = make_url(db_uri).database
+    os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+    staging_dir = os.path.join(sde_dir, "_staging")
+    os.makedirs(staging_dir, exist_ok=True)
+    repackaged_groups, repackaged_items = load_repackaged_volumes(repackaged_json_path)
+    repackaged_by_table = {"types": repackaged_items, "groups": repackaged_groups}
+
+    work_path = prepare_work_copy(db_path)
+    previous_hashes = init_table_state(work_path)
+
+    table_files = find_table_files(sde_dir, tables_to_import)
+    hashes = {
+        table_name: source_hash(path, repackaged_by_table.get(table_name)) for table_name, path in table_files.items()
+    }
+    skipped = []
+    if update:
+        skipped = sorted(t for t in table_files if previous_hashes.get(t) == hashes[t])
+        table_files = {t: path for t, path in table_files.items() if t not in skipped}
+    # Largest files first so the slowest parse starts immediately.
+    ordered = sorted(table_files.items(), key=lambda item: os.path.getsize(item[1]), reverse=True)
+    workers = max(1, int(workers or min(4, os.cpu_count() or 1)))
 
     tqdm.write("\n=== SDE Import ===")
-    tqdm.write(f"Importing {len(table_files)} tables...\n")
+    if skipped:
+        tqdm.write(f"Unchanged since the last import, skipped: {', '.join(skipped)}")
+    tqdm.write(f"Importing {len(ordered)} tables with {workers} worker process(es)...\n")
 
     import_summary = []
-
-    with tqdm(total=len(table_files), desc="Overall Progress", unit="table") as overall_pbar:
-        for table_name, yaml_path in table_files:
-            data = None
+    imported_tables = []
+    started = time.perf_counter()
+
+    tasks = [
+        (table_name, path, os.path.join(staging_dir, f"{table_name}.db"), repackaged_by_table.get(table_name))
+        for table_name, path in ordered
+    ]
+    # A fresh worker per table releases each parse's memory and makes the RSS peak per table.
+    with Pool(processes=workers, maxtasksperchild=1) as pool, tqdm(
+        total=len(tasks), desc="Overall Progress", unit="table"
+    ) as overall_pbar:
+        # Merge each table as soon as its worker finishes, while the others keep parsing.
+        for report in pool.imap_unordered(_stage_table_task, tasks):
+            table_name = report["table"]
             try:
-                with open(yaml_path, "r", encoding="utf-8") as f:
-                    data = yaml.safe_load(f)
-
-                if isinstance(data, dict):
-                    items = list(data.items())
-                    new_data = []
-                    for k, v in items:
-                        if isinstance(v, dict):
-                            v = {"id": int(k), **v}
-                        else:
-                            v = {"id": int(k), "value": v}
-                        new_data.append(v)
-                    data = new_data
-                elif not isinstance(data, list):
-                    data = []
-
-                data_flat = [flatten_row(row) for row in data]
-                df = pd.DataFrame(data_flat)
-                df = df.loc[:, ~df.columns.duplicated()]
-                df.columns = [sanitize_column_name(c) for c in df.columns]
-
-                if table_name == "types" and "id" in df.columns:
-                    df["repackaged_volume"] = df["id"].map(repackaged_items)
-                elif table_name == "groups" and "id" in df.columns:
-                    df["repackaged_volume"] = df["id"].map(repackaged_groups)
-
-                db.save_df(df, table_name)
-                tqdm.write(f"{table_name:<25} | {len(df):>8} rows imported")
-                import_summary.append((table_name, len(df)))
+                if "error" in report:
+                    raise RuntimeError(report["error"])
+                merge_started = time.perf_counter()
+                outcome = merge_staged_table(
+                    work_path,
+                    table_name,
+                    os.path.join(staging_dir, f"{table_name}.db"),
+                    source_hash=hashes[table_name],
+                    row_count=report["rows"],
+                    incremental=update,
+                )
+                report["write_seconds"] = time.perf_counter() - merge_started
+                report["action"] = (
+                    f"-{outcome['deleted']} +{outcome['upserted']}" if outcome["action"] == "diff" else "replaced"
+                )
+                tqdm.write(
+                    f"{table_name:<25} | {report['rows']:>8} rows | {report['parse_seconds']:>7.1f}s parse"
+                    f" | {report['write_seconds']:>6.1f}s write | {_format_mib(report['peak_mib']):>7} MiB peak"
+                    f" | {report['action']}"
+                )
+                import_summary.append(report)
+                imported_tables.append(table_name)
             except Exception as e:
                 tqdm.write(f"{table_name:<25} | ERROR: {e}")
-                import_summary.append((table_name, "ERROR"))
+                import_summary.append({"table": table_name, "error": str(e)})
             overall_pbar.update(1)
 
-    tqdm.write("\n=== Import Summary ===")
-    tqdm.write(f"{'Table':<25} | {'Rows Imported':>12}")
-    tqdm.write("-" * 40)
-    for name, count in import_summary:
-        tqdm.write(f"{name:<25} | {str(count):>12}")
+    if sde_version:
+        version_db = DatabaseManager(f"sqlite:///{work_path}")
+        try:
+            init_sde_version_table(version_db)
+            record_sde_version(version_db, sde_version["buildNumber"], sde_version["releaseDate"])
+        finally:
+            version_db.dispose()
 
-    tqdm.write(f"\nAll selected SDE tables imported to {db_uri}\n")
+    index_started = time.perf_counter()
+    create_post_load_indexes(work_path, imported_tables)
+    index_seconds = time.perf_counter() - index_started
+    shutil.rmtree(staging_dir, ignore_errors=True)
+    final_path = swap_into_place(work_path, db_path)
+
+    tqdm.write("\n=== Import Summary ===")
+    tqdm.write(f"{'Table':<25} | {'Rows':>8} | {'Parse s':>7} | {'Write s':>7} | {'Peak MiB':>8} | Action")
+    tqdm.write("-" * 80)
+    for report in sorted(import_summary, key=lambda r: r["table"]):
+        if "error" in report:
+            tqdm.write(f"{report['table']:<25} | {'ERROR':>8}")
+            continue
+        tqdm.write(
+            f"{report['table']:<25} | {report['rows']:>8} | {report['parse_seconds']:>7.1f}"
+            f" | {report['write_seconds']:>7.1f} | {_format_mib(report['peak_mib']):>8} | {report['action']}"
+        )
+    for table_name in skipped:
+        tqdm.write(f"{table_name:<25} | {'':>8} | {'':>7} | {'':>7} | {'':>8} | unchanged")
+    tqdm.write(f"\nIndexes built in {index_seconds:.1f}s; total {time.perf_counter() - started:.1f}s")
+    tqdm.write(f"All selected SDE tables imported to {final_path}\n")
+    return import_summary
 
 
 # ----------------------------
@@ -372,6 +765,17 @@ def main():
         nargs="*",
         help="Tables to import (default: TABLES_TO_IMPORT from config)",
     )
+    parser.add_argument(
+        "--update",
+        action="store_true",
+        help="Only re-import tables whose source changed, applying row-level differences",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes used to parse tables in parallel (default: up to 4)",
+    )
 
     args = parser.parse_args()
 
@@ -486,16 +890,16 @@ def main():
         if not tables_to_import:
             raise ValueError("No tables specified for import (check config or CLI args).")
 
+        # The import builds a copy and swaps it in; don't hold the old file open meanwhile.
+        db.dispose()
         import_sde_to_sqlite(
             sde_path,
             db_uri=args.db,
             tables_to_import=tables_to_import,
             repackaged_json_path=repackaged_json_path,
-        )
-
-        # Record the new version
-        record_sde_version(
-            db, latest_version["buildNumber"], latest_version["releaseDate"]
+            workers=args.workers,
+            update=args.update,
+            sde_version=latest_version,
         )
 
     if args.cleanup:
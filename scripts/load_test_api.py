@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+"""Tiny concurrent GET load test for the Flask API.
+
+Example:
+    python scripts/load_test_api.py --path /health --concurrency 16 --requests 2000
+"""
+
+import argparse
+from collections import Counter
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+
+# Add parent directory to path
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from flask_app.settings import flask_host, flask_port
+
+
+_thread_local = threading.local()
+
+
+def _session() -> requests.Session:
+    session = getattr(_thread_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        _thread_local.session = session
+    return session
+
+
+def _timed_get(url: str, timeout: float) -> tuple[float, int]:
+    started = time.perf_counter()
+    try:
+        status_code = _session().get(url, timeout=timeout).status_code
+    except requests.RequestException:
+        status_code = 0
+    return time.perf_counter() - started, status_code
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100.0 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Concurrent GET load test for the Flask API")
+    parser.add_argument("--base-url", default=f"http://{flask_host()}:{flask_port()}")
+    parser.add_argument("--path", default="/health")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    args = parser.parse_args()
+
+    url = f"{args.base_url.rstrip('/')}/{args.path.lstrip('/')}"
+    # Warm up connections and any lazily built caches.
+    _timed_get(url, args.timeout)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as executor:
+        results = list(executor.map(lambda _: _timed_get(url, args.timeout), range(max(1, args.requests))))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for latency, _ in results)
+    status_counts = Counter(status_code for _, status_code in results)
+    errors = status_counts.get(0, 0)
+    print(f"url={url} requests={len(results)} concurrency={args.concurrency} connection_errors={errors}")
+    print("status_codes " + " ".join(f"{code}={count}" for code, count in sorted(status_counts.items())))
+    print(f"throughput={len(results) / elapsed:.1f} req/s elapsed={elapsed:.2f}s")
+    print(
+        "latency_ms "
+        f"mean={statistics.fmean(latencies) * 1000:.1f} "
+        f"p50={_percentile(latencies, 50) * 1000:.1f} "
+        f"p95={_percentile(latencies, 95) * 1000:.1f} "
+        f"p99={_percentile(latencies, 99) * 1000:.1f}"
+    )
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
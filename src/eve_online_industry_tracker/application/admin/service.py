@@ -5,6 +5,7 @@ from typing import Any
 
 from sqlalchemy import func, select
 
+from eve_online_industry_tracker.application.errors import ServiceError
 from eve_online_industry_tracker.db_models import PublicStructuresModel
 
 from eve_online_industry_tracker.infrastructure.public_structures_admin_adapter import (
@@ -88,6 +89,8 @@ class AdminService:
                     "cursor": self._state.public_structures_global_scan_cursor,
                     "attempted": self._state.public_structures_global_scan_attempted,
                     "rows_written": self._state.public_structures_global_scan_rows_written,
+                    "skipped": self._state.public_structures_global_scan_skipped,
+                    "workers": self._state.public_structures_global_scan_workers,
                 },
             }
         finally:
@@ -167,3 +170,13 @@ class AdminService:
             "message": ("Stop signal sent" if signaled else "No scan stop event available"),
             "meta": {"signaled": bool(signaled), "running": bool(getattr(self._state, "public_structures_global_scan_running", False))},
         }
+
+    def reload_sde(self, *, force: bool) -> dict:
+        reloader = getattr(self._state, "sde_reloader", None)
+        if reloader is None:
+            raise ServiceError("SDE reloader is not initialized", status_code=503)
+        out = reloader.check(force=force)
+        return {
+            "message": ("SDE reloaded" if out.get("reloaded") else f"SDE not reloaded: {out.get('reason')}"),
+            "meta": out,
+        }
@@ -9,7 +9,8 @@ from typing import Any, Iterable, Optional
 
 from sqlalchemy import desc
 
-from eve_online_industry_tracker.infrastructure.models import Blueprints, MarketHistoryModel
+from eve_online_industry_tracker.infrastructure.models import MarketHistoryModel
+from eve_online_industry_tracker.infrastructure.sde.blueprint_activities import get_blueprint_activity_cache
 
 
 ASSET_SOURCE_INDUSTRY_BUILD = "industry_build"
@@ -19,8 +20,6 @@ ASSET_SOURCE_UNKNOWN = "unknown"
 REFERENCE_TYPE_INDUSTRY_JOB = "industry_job"
 REFERENCE_TYPE_WALLET_TRANSACTION = "wallet_transaction"
 
-_INVENTION_SOURCE_BLUEPRINT_CACHE: dict[int, dict[str, Any]] | None = None
-
 
 @dataclass(frozen=True)
 class CostInfo:
@@ -114,26 +113,7 @@ def build_market_price_map(rows: Iterable[dict[str, Any]] | None) -> dict[int, f
 def _output_quantity_per_run_for_job(*, sde_session: Any, blueprint_type_id: int, product_type_id: int) -> Optional[int]:
     if not blueprint_type_id or not product_type_id:
         return None
-    bp = sde_session.query(Blueprints).filter_by(blueprintTypeID=int(blueprint_type_id)).first()
-    if bp is None:
-        return None
-    mfg = _get_mfg_activity(getattr(bp, "activities", None))
-    if not mfg:
-        return None
-    products = mfg.get("products")
-    if not isinstance(products, list) or not products:
-        return None
-    for p in products:
-        if not isinstance(p, dict):
-            continue
-        if _safe_int(p.get("typeID")) == int(product_type_id):
-            quantity = _safe_int(p.get("quantity"))
-            return quantity if quantity and quantity > 0 else None
-    first = products[0]
-    if not isinstance(first, dict):
-        return None
-    quantity = _safe_int(first.get("quantity"))
-    return quantity if quantity and quantity > 0 else None
+    return get_blueprint_activity_cache(sde_session).output_quantity_per_run(int(blueprint_type_id), int(product_type_id))
 
 
 def _estimate_industry_job_materials_cost_total(
@@ -191,11 +171,7 @@ def _estimate_industry_job_materials_cost_total(
     if runs <= 0:
         runs = 1
 
-    bp = sde_session.query(Blueprints).filter_by(blueprintTypeID=int(blueprint_type_id)).first()
-    if bp is None:
-        return None
-
-    mfg = _get_mfg_activity(getattr(bp, "activities", None))
+    mfg = get_blueprint_activity_cache(sde_session).activity(int(blueprint_type_id))
     if not mfg:
         return None
 
@@ -296,77 +272,11 @@ def industry_job_material_type_ids(
 ) -> list[int]:
     if not blueprint_type_id:
         return []
-    bp = sde_session.query(Blueprints).filter_by(blueprintTypeID=int(blueprint_type_id)).first()
-    if bp is None:
-        return []
-    mfg = _get_mfg_activity(getattr(bp, "activities", None))
-    if not mfg:
-        return []
-    out: list[int] = []
-    for material in mfg.get("materials") or []:
-        if not isinstance(material, dict):
-            continue
-        type_id = _safe_int(material.get("typeID"))
-        if type_id is not None:
-            out.append(int(type_id))
-    return out
-
-
-def _invention_probability(invention: dict[str, Any]) -> Optional[float]:
-    probability = _safe_float(invention.get("probability"))
-    if probability is not None and probability > 0:
-        return probability
-    products = invention.get("products") or []
-    raw_probs: list[float] = []
-    for product in products:
-        if not isinstance(product, dict):
-            continue
-        prob = _safe_float(product.get("probability"))
-        if prob is not None and prob > 0:
-            raw_probs.append(float(prob))
-    if not raw_probs:
-        return None
-    if len(raw_probs) == 1:
-        return raw_probs[0]
-    if max(raw_probs) - min(raw_probs) < 1e-9:
-        return raw_probs[0]
-    return None
-
-
-def _invention_source_blueprint_by_target_type(sde_session: Any) -> dict[int, dict[str, Any]]:
-    global _INVENTION_SOURCE_BLUEPRINT_CACHE
-    if _INVENTION_SOURCE_BLUEPRINT_CACHE is not None:
-        return _INVENTION_SOURCE_BLUEPRINT_CACHE
-
-    mapping: dict[int, dict[str, Any]] = {}
-    for blueprint in sde_session.query(Blueprints).all():
-        activities = getattr(blueprint, "activities", None)
-        if not isinstance(activities, dict):
-            continue
-        invention = activities.get("invention")
-        if not isinstance(invention, dict):
-            continue
-        for product in invention.get("products") or []:
-            if not isinstance(product, dict):
-                continue
-            target_blueprint_type_id = _safe_int(product.get("typeID"))
-            if not target_blueprint_type_id or target_blueprint_type_id <= 0:
-                continue
-            if int(target_blueprint_type_id) in mapping:
-                continue
-            mapping[int(target_blueprint_type_id)] = {
-                "source_blueprint_type_id": int(getattr(blueprint, "blueprintTypeID", 0) or 0),
-                "invention": invention,
-            }
-    _INVENTION_SOURCE_BLUEPRINT_CACHE = mapping
-    return mapping
+    return get_blueprint_activity_cache(sde_session).material_type_ids(int(blueprint_type_id))
 
 
 def _target_blueprint_runs_per_success(sde_session: Any, *, target_blueprint_type_id: int) -> int:
-    blueprint = sde_session.query(Blueprints).filter_by(blueprintTypeID=int(target_blueprint_type_id)).first()
-    if blueprint is None:
-        return 1
-    runs = _safe_int(getattr(blueprint, "maxProductionLimit", None)) or 1
+    runs = get_blueprint_activity_cache(sde_session).max_production_limit(int(target_blueprint_type_id)) or 1
     return max(1, int(runs))
 
 
@@ -377,8 +287,7 @@ def _estimate_invention_material_cost(
     market_price_map: dict[int, float],
     owned_cost_map: dict[int, float] | None = None,
 ) -> Optional[dict[str, Any]]:
-    mapping = _invention_source_blueprint_by_target_type(sde_session)
-    payload = mapping.get(int(target_blueprint_type_id))
+    payload = get_blueprint_activity_cache(sde_session).invention_source(int(target_blueprint_type_id))
     if not isinstance(payload, dict):
         return None
     invention = payload.get("invention")
@@ -402,7 +311,7 @@ def _estimate_invention_material_cost(
         return None
     return {
         "material_cost": float(material_cost),
-        "probability": _invention_probability(invention),
+        "probability": payload.get("probability"),
         "target_runs_per_success": _target_blueprint_runs_per_success(
             sde_session,
             target_blueprint_type_id=int(target_blueprint_type_id),
@@ -723,42 +632,10 @@ def build_fifo_remaining_lots_by_type(
     # This allows FIFO valuation for items you manufactured, not only bought.
     if industry_jobs is not None and sde_session is not None and market_price_map:
         completed_statuses = {"delivered", "ready", "completed"}
-        qty_per_run_cache: dict[tuple[int, int], Optional[int]] = {}
+        blueprint_activities = get_blueprint_activity_cache(sde_session)
 
         def _output_qty_per_run(blueprint_type_id: int, product_type_id: int) -> Optional[int]:
-            key = (int(blueprint_type_id), int(product_type_id))
-            if key in qty_per_run_cache:
-                return qty_per_run_cache[key]
-            bp = (
-                sde_session.query(Blueprints)
-                .filter_by(blueprintTypeID=int(blueprint_type_id))
-                .first()
-            )
-            if bp is None:
-                qty_per_run_cache[key] = None
-                return None
-            mfg = _get_mfg_activity(getattr(bp, "activities", None))
-            if not mfg:
-                qty_per_run_cache[key] = None
-                return None
-            products = mfg.get("products")
-            if not isinstance(products, list) or not products:
-                qty_per_run_cache[key] = None
-                return None
-            out_q: Optional[int] = None
-            for p in products:
-                if not isinstance(p, dict):
-                    continue
-                if _safe_int(p.get("typeID")) == int(product_type_id):
-                    out_q = _safe_int(p.get("quantity"))
-                    break
-            if out_q is None and products:
-                out_q = _safe_int(products[0].get("quantity")) if isinstance(products[0], dict) else None
-            if not out_q or out_q <= 0:
-                qty_per_run_cache[key] = None
-                return None
-            qty_per_run_cache[key] = int(out_q)
-            return int(out_q)
+            return blueprint_activities.output_quantity_per_run(int(blueprint_type_id), int(product_type_id))
 
         for job in industry_jobs or []:
             status = str(getattr(job, "status", "") or "").lower()
@@ -1049,15 +926,6 @@ def _safe_int(x: Any) -> Optional[int]:
         return None
 
 
-def _get_mfg_activity(activities: Any) -> Optional[dict[str, Any]]:
-    if not isinstance(activities, dict):
-        return None
-    mfg = activities.get("manufacturing")
-    if isinstance(mfg, dict):
-        return mfg
-    return None
-
-
 def estimate_industry_job_unit_cost(
     *,
     sde_session,
@@ -1385,13 +1253,9 @@ def backfill_historical_market_costs(
             if not material_type_ids:
                 continue
 
-            bp = sde_session.query(Blueprints).filter_by(blueprintTypeID=blueprint_type_id).first()
-            if bp is None:
-                continue
-            mfg = _get_mfg_activity(getattr(bp, "activities", None))
-            if not mfg:
+            materials = get_blueprint_activity_cache(sde_session).materials(blueprint_type_id)
+            if not materials:
                 continue
-            materials = mfg.get("materials") or []
 
             material_reduction = max(0.0, min(float(me) / 100.0, 0.99))
             total_materials_cost = 0.0
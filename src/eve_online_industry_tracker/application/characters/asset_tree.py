@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from typing import Any, Iterable
+
+
+TOP_LOCATION_FLAGS = frozenset(
+    {
+        "CorpDeliveries",
+        "OfficeFolder",
+        "AssetSafety",
+        "CorpSAG1",
+        "CorpSAG2",
+        "CorpSAG3",
+        "CorpSAG4",
+        "CorpSAG5",
+        "CorpSAG6",
+        "CorpSAG7",
+    }
+)
+
+
+def _resolve_top_location_ids(
+    location_ids: Iterable[Any],
+    *,
+    parent_location_map: dict[Any, Any],
+    valid_top_location_ids: set[Any],
+) -> dict[Any, Any]:
+    """Resolve the top location for every starting location id, memoising each ancestor.
+
+    A location resolves to itself when it is not an asset, is a valid top-level location,
+    or is its own parent; otherwise it resolves to its parent's top location. Every node on
+    a walked path is memoised, so the whole tree is resolved in O(n).
+    """
+    resolved: dict[Any, Any] = {}
+    for start in location_ids:
+        if start in resolved:
+            continue
+        path: list[Any] = []
+        on_path: set[Any] = set()
+        loc_id = start
+        while True:
+            if loc_id in resolved:
+                top_location_id = resolved[loc_id]
+                break
+            if loc_id not in parent_location_map or loc_id in valid_top_location_ids:
+                top_location_id = loc_id
+                break
+            parent_id = parent_location_map[loc_id]
+            if parent_id == loc_id or loc_id in on_path:
+                # Self-parented or cyclic data: stop where the walk would repeat.
+                top_location_id = loc_id
+                break
+            path.append(loc_id)
+            on_path.add(loc_id)
+            loc_id = parent_id
+        resolved[loc_id] = top_location_id
+        for node in path:
+            resolved[node] = top_location_id
+    return resolved
+
+
+def resolve_asset_tree(
+    asset_list: list[dict[str, Any]],
+    *,
+    container_names: dict[Any, str] | None = None,
+    ship_names: dict[Any, str] | None = None,
+    office_folders_inherit_container_name: bool = True,
+) -> None:
+    """Assign container_name, ship_name and top_location_id to every asset in place.
+
+    Custom names apply to the named item itself; non-container items (and non-ship items)
+    additionally inherit the name of the container (or ship) they sit in directly.
+    """
+    container_names = container_names or {}
+    ship_names = ship_names or {}
+
+    parent_location_map: dict[Any, Any] = {}
+    container_name_by_item_id: dict[Any, Any] = {}
+    ship_name_by_item_id: dict[Any, Any] = {}
+    excluded_parent_ids: set[Any] = set()
+    flagged_location_ids: set[Any] = set()
+    for asset in asset_list:
+        item_id = asset.get("item_id")
+        parent_location_map[item_id] = asset.get("location_id")
+        if item_id in container_names:
+            asset["container_name"] = container_names[item_id]
+        if item_id in ship_names:
+            asset["ship_name"] = ship_names[item_id]
+        if asset.get("is_container"):
+            container_name_by_item_id[item_id] = asset.get("container_name")
+        if asset.get("is_ship"):
+            ship_name_by_item_id[item_id] = asset.get("ship_name")
+        if asset.get("is_asset_safety_wrap") or asset.get("is_office_folder"):
+            excluded_parent_ids.add(item_id)
+        if asset.get("location_flag") in TOP_LOCATION_FLAGS:
+            flagged_location_ids.add(asset.get("location_id"))
+
+    valid_top_location_ids = flagged_location_ids - excluded_parent_ids
+    top_location_by_location_id = _resolve_top_location_ids(
+        (asset.get("location_id") for asset in asset_list),
+        parent_location_map=parent_location_map,
+        valid_top_location_ids=valid_top_location_ids,
+    )
+
+    for asset in asset_list:
+        location_id = asset.get("location_id")
+        if not asset.get("is_container") and (office_folders_inherit_container_name or not asset.get("is_office_folder")):
+            if location_id in container_name_by_item_id:
+                asset["container_name"] = container_name_by_item_id[location_id]
+        if not asset.get("is_ship"):
+            if location_id in ship_name_by_item_id:
+                asset["ship_name"] = ship_name_by_item_id[location_id]
+        asset["top_location_id"] = top_location_by_location_id.get(location_id, location_id)
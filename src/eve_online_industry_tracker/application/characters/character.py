@@ -1,6 +1,5 @@
 import logging
 import json
-import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 from typing import Optional, List, Dict, Any
@@ -13,7 +12,7 @@ from eve_online_industry_tracker.infrastructure.models import CharacterModel, Ch
     , CharacterWalletTransactionsModel, CharacterMarketOrdersModel, CharacterAssetsModel \
     , CharacterIndustryJobsModel \
     , NpcCorporations, Bloodlines, Races, Types \
-    , Groups, Categories, Factions
+    , Groups
 
 from eve_online_industry_tracker.application.characters.asset_provenance import (
     build_market_price_map,
@@ -23,6 +22,8 @@ from eve_online_industry_tracker.application.characters.asset_provenance import
     resolve_industry_job_cost_snapshot,
     backfill_historical_market_costs,
 )
+from eve_online_industry_tracker.application.characters.asset_tree import resolve_asset_tree
+from eve_online_industry_tracker.infrastructure.sde.dimensions import get_sde_dimensions
 from eve_online_industry_tracker.application.characters.asset_history import (
     backfill_wallet_buy_acquisitions,
     build_historical_input_cost_lookup,
@@ -258,19 +259,21 @@ class Character:
 
             if self.wallet_journal:
                 try:
-                    self._db_app.session.bulk_save_objects(self.wallet_journal)
-                    self._db_app.session.commit()
+                    self._db_app.run_write(lambda session: session.bulk_save_objects(self.wallet_journal))
                 except Exception as bulk_err:
-                    self._db_app.session.rollback()
                     # Fall back to one-by-one insert, skipping duplicates.
-                    saved = 0
-                    for obj in self.wallet_journal:
-                        try:
-                            self._db_app.session.add(obj)
-                            self._db_app.session.commit()
-                            saved += 1
-                        except Exception:
-                            self._db_app.session.rollback()
+                    def insert_one_by_one(session) -> int:
+                        saved = 0
+                        for obj in self.wallet_journal:
+                            try:
+                                session.add(obj)
+                                session.commit()
+                                saved += 1
+                            except Exception:
+                                session.rollback()
+                        return saved
+
+                    saved = self._db_app.run_write(insert_one_by_one)
                     logging.debug(
                         f"Wallet journal fallback insert: {saved}/{len(self.wallet_journal)} for {self.character_name} "
                         f"(bulk failed: {bulk_err.__class__.__name__})."
@@ -301,8 +304,7 @@ class Character:
                 self.wallet_transactions.append(new_trans)
             
             if self.wallet_transactions:
-                self._db_app.session.bulk_save_objects(self.wallet_transactions)
-                self._db_app.session.commit()
+                self._db_app.run_write(lambda session: session.bulk_save_objects(self.wallet_transactions))
             else:
                 logging.debug(f"No new wallet transactions to save for {self.character_name}.")
             
@@ -330,9 +332,11 @@ class Character:
 
             if model_objects:
                 # Delete existing orders for this character and add new ones
-                self._db_app.session.query(CharacterMarketOrdersModel).filter_by(character_id=self.character_id).delete()
-                self._db_app.session.bulk_save_objects(model_objects)
-                self._db_app.session.commit()
+                def replace_orders(session) -> None:
+                    session.query(CharacterMarketOrdersModel).filter_by(character_id=self.character_id).delete()
+                    session.bulk_save_objects(model_objects)
+
+                self._db_app.run_write(replace_orders)
             else:
                 logging.debug(f"No new market orders to save for {self.character_name}.")
 
@@ -353,48 +357,37 @@ class Character:
             logging.debug(f"No assets to save for {self.character_name}.")
             return
 
-        max_retries = 3
-        for attempt in range(1, max_retries + 1):
-            try:
-                enriched_assets = enrich_assets_with_acquisition_costs(
-                    app_session=self._db_app.session,
+        # Runs on the app DB writer thread, so concurrent refreshes queue instead of
+        # contending for the SQLite write lock.
+        def replace_assets(session) -> list[CharacterAssetsModel]:
+            enriched_assets = enrich_assets_with_acquisition_costs(
+                app_session=session,
+                owner_kind="character",
+                owner_id=int(self.character_id),
+                asset_list=asset_list,
+            )
+            assets = [CharacterAssetsModel(**asset) for asset in enriched_assets]
+            if assets:
+                sync_asset_history(
+                    app_session=session,
                     owner_kind="character",
                     owner_id=int(self.character_id),
-                    asset_list=asset_list,
+                    asset_rows=enriched_assets,
                 )
+                # Delete existing assets for this character and add new ones
+                session.query(CharacterAssetsModel).filter_by(character_id=self.character_id).delete()
+                session.bulk_save_objects(assets)
+            return assets
 
-                self.assets = []
-                for asset in enriched_assets:
-                    new_asset = CharacterAssetsModel(**asset)
-                    self.assets.append(new_asset)
-
-                if self.assets:
-                    sync_asset_history(
-                        app_session=self._db_app.session,
-                        owner_kind="character",
-                        owner_id=int(self.character_id),
-                        asset_rows=enriched_assets,
-                    )
-                    # Delete existing assets for this character and add new ones
-                    self._db_app.session.query(CharacterAssetsModel).filter_by(character_id=self.character_id).delete()
-                    self._db_app.session.bulk_save_objects(self.assets)
-                    self._db_app.session.commit()
-                else:
-                    logging.debug(f"No new assets to save for {self.character_name}.")
-
-                logging.debug(f"Assets saved ({len(self.assets)}) for {self.character_name}.")
-                return
-
-            except Exception as e:
-                self._db_app.session.rollback()
-                if "database is locked" in str(e) and attempt < max_retries:
-                    wait = attempt * 2
-                    logging.warning(f"Database locked saving assets for {self.character_name}, retry {attempt}/{max_retries} in {wait}s")
-                    time.sleep(wait)
-                    continue
-                error_message = f"Failed to save assets for {self.character_name}. Error: {str(e)}"
-                logging.error(error_message)
-                raise Exception(error_message)
+        try:
+            self.assets = self._db_app.run_write(replace_assets)
+            if not self.assets:
+                logging.debug(f"No new assets to save for {self.character_name}.")
+            logging.debug(f"Assets saved ({len(self.assets)}) for {self.character_name}.")
+        except Exception as e:
+            error_message = f"Failed to save assets for {self.character_name}. Error: {str(e)}"
+            logging.error(error_message)
+            raise Exception(error_message)
     
     # -------------------
     # Refresh All
@@ -825,20 +818,21 @@ class Character:
                 client_names[cid] = name
 
             # Step 3: Assign names to transaction entries
+            dimensions = get_sde_dimensions(self._db_sde.session, self._db_sde.language)
             new_entries = []
             for entry in new_transaction_entries:
                 cid = entry.get("client_id")
                 entry["client_name"] = client_names.get(cid)
 
                 type_id = entry.get("type_id")
-                type = self._db_sde.session.query(Types).filter_by(id=type_id).first()
-                entry["type_name"] = type.name[self._db_sde.language] if type else None
-                group = self._db_sde.session.query(Groups).filter_by(id=type.groupID).first() if type else None
-                entry["type_group_id"] = group.id if group else None
-                entry["type_group_name"] = group.name[self._db_sde.language] if group else None
-                category = self._db_sde.session.query(Categories).filter_by(id=group.categoryID).first() if group else None
-                entry["type_category_id"] = category.id if category else None
-                entry["type_category_name"] = category.name[self._db_sde.language] if category else None
+                type_data = dimensions.get_type(type_id)
+                entry["type_name"] = type_data.name if type_data else None
+                group = dimensions.group_for_type(type_id)
+                entry["type_group_id"] = group.group_id if group else None
+                entry["type_group_name"] = group.name if group else None
+                category = dimensions.category_for_type(type_id)
+                entry["type_category_id"] = category.category_id if category else None
+                entry["type_category_name"] = category.name if category else None
 
                 new_entry = {
                     "character_id": self.character_id,
@@ -1376,17 +1370,12 @@ class Character:
                 return resolved
 
             orders = []
-            type_ids = set(order.get("type_id") for order in order_list)
-            type_data_map = {t.id: t for t in self._db_sde.session.query(Types).filter(Types.id.in_(list(type_ids))).all()}
-            group_ids = set(t.groupID for t in type_data_map.values())
-            group_data_map = {g.id: g for g in self._db_sde.session.query(Groups).filter(Groups.id.in_(list(group_ids))).all()}
-            category_ids = set(g.categoryID for g in group_data_map.values())
-            category_data_map = {c.id: c for c in self._db_sde.session.query(Categories).filter(Categories.id.in_(list(category_ids))).all()}
+            dimensions = get_sde_dimensions(self._db_sde.session, self._db_sde.language)
             for order in order_list:
                 type_id = order.get("type_id")
-                type_data = type_data_map.get(type_id)
-                group_data = group_data_map.get(type_data.groupID) if type_data else None
-                category_data = category_data_map.get(group_data.categoryID) if group_data else None
+                type_data = dimensions.get_type(type_id)
+                group_data = dimensions.group_for_type(type_id)
+                category_data = dimensions.category_for_type(type_id)
 
                 location_id = order.get("location_id", None)
                 resolved_location_name, resolved_region_id, resolved_region_name = resolve_location_region(location_id)
@@ -1400,11 +1389,11 @@ class Character:
                     "character_id": self.character_id,
                     "order_id": order.get("order_id", None),
                     "type_id": order.get("type_id", None),
-                    "type_name": type_data.name[self._db_sde.language] if type_data else None,
-                    "type_group_id": type_data.groupID if type_data else None,
-                    "type_group_name": group_data.name[self._db_sde.language] if group_data else None,
-                    "type_category_id": group_data.categoryID if group_data else None,
-                    "type_category_name": category_data.name[self._db_sde.language] if category_data else None,
+                    "type_name": type_data.name if type_data else None,
+                    "type_group_id": type_data.group_id if type_data else None,
+                    "type_group_name": group_data.name if group_data else None,
+                    "type_category_id": group_data.category_id if group_data else None,
+                    "type_category_name": category_data.name if category_data else None,
                     "location_id": location_id,
                     "location_name": resolved_location_name,
                     "region_id": final_region_id,
@@ -1481,26 +1470,22 @@ class Character:
             )
 
             asset_list = []
-            type_ids = set(asset.get("type_id") for asset in assets)
-            type_data_map = {t.id: t for t in self._db_sde.session.query(Types).filter(Types.id.in_(type_ids)).all()}
-            group_ids = set(t.groupID for t in type_data_map.values())
-            group_data_map = {g.id: g for g in self._db_sde.session.query(Groups).filter(Groups.id.in_(group_ids)).all()}
-            category_ids = set(g.categoryID for g in group_data_map.values())
-            category_data_map = {c.id: c for c in self._db_sde.session.query(Categories).filter(Categories.id.in_(category_ids)).all()}
-            race_ids = set(t.raceID for t in type_data_map.values() if hasattr(t, "raceID") and t.raceID is not None)
-            race_data_map = {r.id: r for r in self._db_sde.session.query(Races).filter(Races.id.in_(race_ids)).all()}
-            faction_ids = set(t.factionID for t in type_data_map.values() if hasattr(t, "factionID") and t.factionID is not None)
-            faction_data_map = {f.id: f for f in self._db_sde.session.query(Factions).filter(Factions.id.in_(faction_ids)).all()}
+            dimensions = get_sde_dimensions(self._db_sde.session, self._db_sde.language)
+            adjusted_price_by_type: dict[Any, Any] = {}
+            average_price_by_type: dict[Any, Any] = {}
+            for item in market_prices if isinstance(market_prices, list) else []:
+                adjusted_price_by_type.setdefault(item.get("type_id"), item.get("adjusted_price", 0.0))
+                average_price_by_type.setdefault(item.get("type_id"), item.get("average_price", 0.0))
             blueprint_data_map = {bp["item_id"]: bp for bp in blueprints}
             for asset in assets:
                 type_id = asset.get("type_id")
-                type_data = type_data_map.get(type_id)
-                type_adjusted_price = next((item.get("adjusted_price", 0.0) for item in market_prices if item.get("type_id") == type_id), 0.0)
-                type_average_price = next((item.get("average_price", 0.0) for item in market_prices if item.get("type_id") == type_id), 0.0)
-                group_data = group_data_map.get(type_data.groupID) if type_data else None
-                category_data = category_data_map.get(group_data.categoryID) if group_data else None
-                race_data = race_data_map.get(type_data.raceID) if type_data and hasattr(type_data, "raceID") else None
-                faction_data = faction_data_map.get(type_data.factionID) if type_data and hasattr(type_data, "factionID") else None
+                type_data = dimensions.get_type(type_id)
+                type_adjusted_price = adjusted_price_by_type.get(type_id, 0.0)
+                type_average_price = average_price_by_type.get(type_id, 0.0)
+                group_data = dimensions.group_for_type(type_id)
+                category_data = dimensions.category_for_type(type_id)
+                race_data = dimensions.race_for_type(type_id)
+                faction_data = dimensions.faction_for_type(type_id)
                 blueprint_data = blueprint_data_map.get(asset.get("item_id"))
                 
                 # --- Calculate actual volume ---
@@ -1508,10 +1493,10 @@ class Character:
                 repackaged_volume = None
 
                 # Check type repackaged_volume
-                if type_data and hasattr(type_data, "repackaged_volume") and type_data.repackaged_volume:
+                if type_data and type_data.repackaged_volume:
                     repackaged_volume = type_data.repackaged_volume
                 # If not, check group repackaged_volume
-                elif group_data and hasattr(group_data, "repackaged_volume") and group_data.repackaged_volume:
+                elif group_data and group_data.repackaged_volume:
                     repackaged_volume = group_data.repackaged_volume
 
                 # Use repackaged_volume if repackaged, else normal volume
@@ -1524,26 +1509,26 @@ class Character:
                     "character_id": self.character_id,
                     "item_id": asset.get("item_id"),
                     "type_id": type_id,
-                    "type_name": getattr(type_data, "name", {}).get(self._db_sde.language, "") if type_data else "",
+                    "type_name": type_data.name if type_data else "",
                     "type_default_volume": sde_volume,
                     "type_repackaged_volume": repackaged_volume,
                     "type_volume": actual_volume,
                     "type_capacity": getattr(type_data, "capacity", None) if type_data else None,
-                    "type_description": getattr(type_data, "description", {}).get(self._db_sde.language, "") if type_data and getattr(type_data, "description", None) else "",
+                    "type_description": type_data.description if type_data else "",
                     "container_name": None,
                     "ship_name": None,
-                    "type_group_id": getattr(type_data, "groupID", None) if type_data else None,
-                    "type_group_name": getattr(group_data, "name", {}).get(self._db_sde.language, "") if group_data else "",
-                    "type_category_id": getattr(group_data, "categoryID", None) if group_data else None,
-                    "type_category_name": getattr(category_data, "name", {}).get(self._db_sde.language, "") if category_data else "",
-                    "type_meta_group_id": getattr(type_data, "metaGroupID", None) if type_data else None,
-                    "type_race_id": getattr(type_data, "raceID", None) if type_data else None,
-                    "type_race_name": getattr(race_data, "name", {}).get(self._db_sde.language, "") if race_data and getattr(race_data, "name", None) else "",
-                    "type_race_description": getattr(race_data, "description", {}).get(self._db_sde.language, "") if race_data and getattr(race_data, "description", None) else "",
-                    "type_faction_id": getattr(type_data, "factionID", None) if type_data else None,
-                    "type_faction_name": getattr(faction_data, "name", {}).get(self._db_sde.language, "") if faction_data and getattr(faction_data, "name", None) else "",
-                    "type_faction_description": getattr(faction_data, "description", {}).get(self._db_sde.language, "") if faction_data and getattr(faction_data, "description", None) else "",
-                    "type_faction_short_description": getattr(faction_data, "shortDescription", {}).get(self._db_sde.language, "") if faction_data and getattr(faction_data, "shortDescription", None) else "",
+                    "type_group_id": type_data.group_id if type_data else None,
+                    "type_group_name": group_data.name if group_data else "",
+                    "type_category_id": group_data.category_id if group_data else None,
+                    "type_category_name": category_data.name if category_data else "",
+                    "type_meta_group_id": type_data.meta_group_id if type_data else None,
+                    "type_race_id": type_data.race_id if type_data else None,
+                    "type_race_name": race_data.name if race_data else "",
+                    "type_race_description": race_data.description if race_data else "",
+                    "type_faction_id": type_data.faction_id if type_data else None,
+                    "type_faction_name": faction_data.name if faction_data else "",
+                    "type_faction_description": faction_data.description if faction_data else "",
+                    "type_faction_short_description": faction_data.short_description if faction_data else "",
                     "location_id": asset.get("location_id"),
                     "location_type": asset.get("location_type"),
                     "location_flag": asset.get("location_flag"),
@@ -1558,7 +1543,7 @@ class Character:
                     "type_average_price": type_average_price,
                     "is_container": type_id == 17366 and asset.get("is_singleton", False) == True,
                     "is_asset_safety_wrap": type_id == 60 and asset.get("is_singleton", False) == True,
-                    "is_ship": group_data.categoryID == 6 if group_data else False,
+                    "is_ship": group_data.category_id == 6 if group_data else False,
                     "is_office_folder": type_id == 27,
                 }
 
@@ -1589,10 +1574,6 @@ class Character:
                 if names_response and isinstance(names_response, list):
                     container_names = {c["item_id"]: c["name"] for c in names_response}
 
-            for asset in asset_list:
-                if asset.get("item_id") in container_names:
-                    asset["container_name"] = container_names[asset["item_id"]]
-            
             # Fetch custom names for ships
             ship_ids = [a["item_id"] for a in asset_list if a.get("is_ship")]
             ship_names = {}
@@ -1604,52 +1585,13 @@ class Character:
                 if names_response and isinstance(names_response, list):
                     ship_names = {s["item_id"]: s["name"] for s in names_response}
 
-            for asset in asset_list:
-                if asset.get("item_id") in ship_names:
-                    asset["ship_name"] = ship_names[asset["item_id"]]
-            
-            # Lookup for all containers and ships by item_id
-            container_lookup = {a["item_id"]: a for a in asset_list if a.get("is_container")}
-            ship_lookup = {a["item_id"]: a for a in asset_list if a.get("is_ship")}
-
-            for asset in asset_list:
-                # Assign container_name for non-containers
-                if not (asset.get("is_container")):
-                    container = container_lookup.get(asset.get("location_id"))
-                    if container:
-                        asset["container_name"] = container.get("container_name")
-                # Assign ship_name for non-ships (modules, etc.)
-                if not (asset.get("is_ship")):
-                    ship = ship_lookup.get(asset.get("location_id"))
-                    if ship:
-                        asset["ship_name"] = ship.get("ship_name")
-
-            # Calculate top_location_id for each asset
-            location_flags = ["CorpDeliveries", "OfficeFolder", "AssetSafety","CorpSAG1", "CorpSAG2", "CorpSAG3", "CorpSAG4","CorpSAG5", "CorpSAG6", "CorpSAG7"]
-            assetsafety_wrap_ids = {a["item_id"] for a in asset_list if a.get("is_asset_safety_wrap")}
-            office_folder_ids = {a["item_id"] for a in asset_list if a.get("is_office_folder")}
-            parent_location_map = {a["item_id"]: a["location_id"] for a in asset_list}
-            valid_top_location_ids = {a["location_id"] for a in asset_list
-                if a.get("location_flag") in location_flags
-                    and a.get("location_id") not in assetsafety_wrap_ids
-                    and a.get("location_id") not in office_folder_ids
-            }
-
-            def resolve_top_location_id(item):
-                loc_id = item["location_id"]
-                while loc_id in parent_location_map:
-                    # Stop if we've reached a valid top-level location
-                    if loc_id in valid_top_location_ids:
-                        break
-                    parent_id = parent_location_map[loc_id]
-                    if parent_id == loc_id:
-                        break
-                    loc_id = parent_id
-                return loc_id
-
-            # Assign top_location_id for each asset
-            for asset in asset_list:
-                asset["top_location_id"] = resolve_top_location_id(asset)
+            # Apply custom names, inherit container/ship names from the direct parent and
+            # resolve top_location_id for the whole tree in one pass.
+            resolve_asset_tree(
+                asset_list,
+                container_names=container_names,
+                ship_names=ship_names,
+            )
 
             # Check for Draugur before saving
             draugur_before_save = [a for a in asset_list if a.get("type_id") == 52254]
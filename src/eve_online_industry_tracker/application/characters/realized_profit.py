@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from functools import cached_property
 import json
-from typing import Any
+import time
+from typing import Any, Callable
+
+from sqlalchemy import func, or_
 
 from eve_online_industry_tracker.application.characters.asset_provenance import (
     ASSET_SOURCE_INDUSTRY_BUILD,
@@ -11,22 +16,26 @@ from eve_online_industry_tracker.application.characters.asset_provenance import
     resolve_industry_job_cost_snapshot,
 )
 from eve_online_industry_tracker.db_models import (
-    Blueprints,
     CharacterIndustryJobsModel,
     CharacterModel,
+    CharacterRealizedProfitStateModel,
     CharacterRealizedSalesLedgerModel,
     CharacterWalletJournalModel,
     CharacterWalletTransactionsModel,
     CorporationIndustryJobsModel,
     CorporationModel,
+    CorporationRealizedProfitStateModel,
     CorporationRealizedSalesLedgerModel,
     CorporationWalletTransactionsModel,
 )
+from eve_online_industry_tracker.infrastructure.sde.blueprint_activities import get_blueprint_activity_cache
 
 
 ASSET_SOURCE_UNTRACKED = "untracked_inventory"
 ASSET_SOURCE_OPENING_INVENTORY = "opening_inventory"
 
+_COMPLETED_JOB_STATUSES = {"delivered", "ready", "completed"}
+
 
 def _safe_float(value: Any) -> float | None:
     try:
@@ -60,34 +69,8 @@ def _parse_date(value: Any) -> datetime | None:
         return None
 
 
-def _get_mfg_activity(activities: Any) -> dict[str, Any] | None:
-    if not isinstance(activities, dict):
-        return None
-    manufacturing = activities.get("manufacturing")
-    return manufacturing if isinstance(manufacturing, dict) else None
-
-
 def _output_quantity_per_run(*, sde_session: Any, blueprint_type_id: int, product_type_id: int) -> int | None:
-    blueprint = sde_session.query(Blueprints).filter_by(blueprintTypeID=int(blueprint_type_id)).first()
-    if blueprint is None:
-        return None
-    manufacturing = _get_mfg_activity(getattr(blueprint, "activities", None))
-    if not manufacturing:
-        return None
-    products = manufacturing.get("products") or []
-    if not isinstance(products, list) or not products:
-        return None
-    for product in products:
-        if not isinstance(product, dict):
-            continue
-        if _safe_int(product.get("typeID")) == int(product_type_id):
-            quantity = _safe_int(product.get("quantity"))
-            return quantity if quantity and quantity > 0 else None
-    first = products[0]
-    if not isinstance(first, dict):
-        return None
-    quantity = _safe_int(first.get("quantity"))
-    return quantity if quantity and quantity > 0 else None
+    return get_blueprint_activity_cache(sde_session).output_quantity_per_run(int(blueprint_type_id), int(product_type_id))
 
 
 def _append_lot(lots_by_type: dict[int, list[FifoLot]], *, type_id: int, lot: FifoLot) -> None:
@@ -150,11 +133,12 @@ def _consume_lots(lots: list[FifoLot], *, quantity: int) -> dict[str, Any]:
     }
 
 
-def _opening_inventory_lot(events: list[dict[str, Any]]) -> FifoLot | None:
-    running_balance = 0
-    min_balance = 0
-    first_known_unit_cost: float | None = None
-    first_known_date: Any = None
+def _opening_inventory_tracker(events: list[dict[str, Any]], *, tracker: dict[str, Any] | None = None) -> dict[str, Any]:
+    state = tracker or {}
+    running_balance = int(state.get("running_balance") or 0)
+    min_balance = int(state.get("min_balance") or 0)
+    first_known_unit_cost: float | None = _safe_float(state.get("first_known_unit_cost"))
+    first_known_date: Any = state.get("first_known_date")
 
     for event in events:
         kind = str(event.get("kind") or "")
@@ -182,20 +166,79 @@ def _opening_inventory_lot(events: list[dict[str, Any]]) -> FifoLot | None:
 
         min_balance = min(min_balance, int(running_balance))
 
-    opening_quantity = max(0, -int(min_balance))
+    return {
+        "running_balance": int(running_balance),
+        "min_balance": int(min_balance),
+        "first_known_unit_cost": first_known_unit_cost,
+        "first_known_date": first_known_date,
+    }
+
+
+def _opening_inventory_lot_from_tracker(tracker: dict[str, Any]) -> FifoLot | None:
+    opening_quantity = max(0, -int(tracker.get("min_balance") or 0))
+    first_known_unit_cost = _safe_float(tracker.get("first_known_unit_cost"))
     if opening_quantity <= 0 or first_known_unit_cost is None or first_known_unit_cost <= 0:
         return None
 
     return FifoLot(
         quantity=int(opening_quantity),
         unit_price=float(first_known_unit_cost),
-        acquisition_date=first_known_date,
+        acquisition_date=tracker.get("first_known_date"),
         reference_id=None,
         reference_type=ASSET_SOURCE_OPENING_INVENTORY,
         source=ASSET_SOURCE_OPENING_INVENTORY,
     )
 
 
+def _opening_inventory_lot(events: list[dict[str, Any]]) -> FifoLot | None:
+    return _opening_inventory_lot_from_tracker(_opening_inventory_tracker(events))
+
+
+def _opening_inventory_signature(tracker: dict[str, Any]) -> tuple[int, float | None]:
+    lot = _opening_inventory_lot_from_tracker(tracker)
+    if lot is None:
+        return 0, None
+    return int(lot.quantity), float(lot.unit_price)
+
+
+def _event_sort_key(event: dict[str, Any]) -> tuple[datetime, int]:
+    return event.get("dt") or datetime.min, int(event.get("sort_id") or 0)
+
+
+def _stored_event_sort_key(value: Any) -> tuple[datetime, int] | None:
+    if not isinstance(value, (list, tuple)) or len(value) != 2:
+        return None
+    return _parse_date(value[0]) or datetime.min, int(_safe_int(value[1]) or 0)
+
+
+def _lot_to_payload(lot: FifoLot) -> dict[str, Any]:
+    return {
+        "quantity": int(lot.quantity),
+        "unit_price": float(lot.unit_price),
+        "acquisition_date": lot.acquisition_date,
+        "reference_id": lot.reference_id,
+        "reference_type": lot.reference_type,
+        "source": lot.source,
+    }
+
+
+def _lot_from_payload(payload: Any) -> FifoLot | None:
+    if not isinstance(payload, dict):
+        return None
+    quantity = _safe_int(payload.get("quantity"))
+    unit_price = _safe_float(payload.get("unit_price"))
+    if not quantity or quantity <= 0 or unit_price is None:
+        return None
+    return FifoLot(
+        quantity=int(quantity),
+        unit_price=float(unit_price),
+        acquisition_date=payload.get("acquisition_date"),
+        reference_id=_safe_int(payload.get("reference_id")),
+        reference_type=payload.get("reference_type"),
+        source=payload.get("source"),
+    )
+
+
 def _journal_fee_breakdown(*, gross_revenue: float, journal: CharacterWalletJournalModel | None) -> tuple[float, float, float, str, list[str]]:
     notes: list[str] = []
     if journal is None:
@@ -332,16 +375,32 @@ def _normalize_untracked_payload(payload: dict[str, Any]) -> dict[str, Any]:
 class _BaseRealizedProfitLedgerService:
     owner_id_field: str
     ledger_model: Any
+    state_model: Any
     transaction_model: Any
     industry_job_model: Any
     owner_model: Any
 
-    def __init__(self, *, app_session: Any, sde_session: Any, market_prices: list[dict[str, Any]] | None = None):
+    def __init__(
+        self,
+        *,
+        app_session: Any,
+        sde_session: Any,
+        market_prices: list[dict[str, Any]] | None = None,
+        market_price_map: dict[int, float] | None = None,
+    ):
+        """``market_price_map`` lets parallel workers share one already-built price map."""
         self._app_session = app_session
         self._sde_session = sde_session
         self._market_prices = market_prices or []
+        self._shared_market_price_map = market_price_map
+
+    def rebuild(self, *, owner_id: int | None = None, incremental: bool = False) -> list[dict[str, Any]]:
+        """Rebuild the ledger for one owner, or all owners when owner_id is None.
 
-    def rebuild(self, *, owner_id: int | None = None) -> list[dict[str, Any]]:
+        With ``incremental=True`` only wallet transactions and industry jobs newer than
+        the persisted watermark are processed on top of the stored FIFO state. Owners
+        without stored state, or with back-dated inputs, fall back to a full rebuild.
+        """
         if owner_id is not None:
             owner_ids = [int(owner_id)]
         else:
@@ -349,11 +408,90 @@ class _BaseRealizedProfitLedgerService:
 
         persisted_rows: list[Any] = []
         for current_owner_id in owner_ids:
-            persisted_rows.extend(self._rebuild_owner(owner_id=int(current_owner_id)))
+            if incremental:
+                persisted_rows.extend(self._rebuild_owner_incremental(owner_id=int(current_owner_id)))
+            else:
+                persisted_rows.extend(self._rebuild_owner(owner_id=int(current_owner_id)))
 
         self._app_session.commit()
         return [self._serialize_row(row) for row in persisted_rows]
 
+    def rebuild_parallel(
+        self,
+        *,
+        app_session_factory: Callable[[], Any],
+        sde_session_factory: Callable[[], Any],
+        owner_ids: list[int] | None = None,
+        incremental: bool = True,
+        max_workers: int = 4,
+        progress_callback: Callable[[int, int, dict[str, Any]], None] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Rebuild several owners concurrently, one worker thread and session pair per owner.
+
+        Each owner is committed in its own short transaction, so a failing owner does not
+        roll back the others and the SQLite write lock is never held across owners.
+        ``progress_callback(done, total, owner_result)`` is called as each owner finishes.
+        """
+        if owner_ids is None:
+            owner_ids = [int(getattr(row, self.owner_id_field)) for row in self._app_session.query(self.owner_model).all()]
+        owner_ids = list(dict.fromkeys(int(owner_id) for owner_id in owner_ids))
+        if not owner_ids:
+            return []
+
+        market_price_map = self._market_price_map
+        results: list[dict[str, Any]] = []
+        with ThreadPoolExecutor(max_workers=max(1, min(int(max_workers), len(owner_ids)))) as pool:
+            futures = {
+                pool.submit(
+                    self._rebuild_owner_in_own_session,
+                    owner_id=int(owner_id),
+                    incremental=bool(incremental),
+                    app_session_factory=app_session_factory,
+                    sde_session_factory=sde_session_factory,
+                    market_price_map=market_price_map,
+                ): int(owner_id)
+                for owner_id in owner_ids
+            }
+            for future in as_completed(futures):
+                owner_result = future.result()
+                results.append(owner_result)
+                if progress_callback is not None:
+                    progress_callback(len(results), len(owner_ids), owner_result)
+
+        order = {int(owner_id): index for index, owner_id in enumerate(owner_ids)}
+        results.sort(key=lambda result: order.get(int(result.get(self.owner_id_field) or 0), 0))
+        return results
+
+    def _rebuild_owner_in_own_session(
+        self,
+        *,
+        owner_id: int,
+        incremental: bool,
+        app_session_factory: Callable[[], Any],
+        sde_session_factory: Callable[[], Any],
+        market_price_map: dict[int, float],
+    ) -> dict[str, Any]:
+        app_session = app_session_factory()
+        sde_session = sde_session_factory()
+        started = time.perf_counter()
+        result: dict[str, Any] = {self.owner_id_field: int(owner_id), "row_count": 0, "error_message": None}
+        try:
+            worker = type(self)(app_session=app_session, sde_session=sde_session, market_price_map=market_price_map)
+            if incremental:
+                rows = worker._rebuild_owner_incremental(owner_id=int(owner_id))
+            else:
+                rows = worker._rebuild_owner(owner_id=int(owner_id))
+            app_session.commit()
+            result["row_count"] = len(rows)
+        except Exception as e:
+            app_session.rollback()
+            result["error_message"] = str(e)
+        finally:
+            app_session.close()
+            sde_session.close()
+        result["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+        return result
+
     def list_rows(self, *, owner_id: int | None = None) -> list[dict[str, Any]]:
         query = self._app_session.query(self.ledger_model)
         if owner_id is not None:
@@ -369,7 +507,147 @@ class _BaseRealizedProfitLedgerService:
         journal_by_id = self._load_journal_map(owner_id=int(owner_id))
         owner_context = self._load_owner_context(owner_id=int(owner_id))
 
+        events_by_type = self._collect_events(wallet_transactions=wallet_transactions, industry_jobs=industry_jobs)
+
         lots_by_type: dict[int, list[FifoLot]] = {}
+        type_states: dict[str, dict[str, Any]] = {}
+        persisted_rows: list[Any] = []
+        for type_id, events in events_by_type.items():
+            events.sort(key=_event_sort_key)
+            lots = lots_by_type.setdefault(int(type_id), [])
+            tracker = _opening_inventory_tracker(events)
+            opening_lot = _opening_inventory_lot_from_tracker(tracker)
+            if opening_lot is not None:
+                lots.append(opening_lot)
+            persisted_rows.extend(
+                self._apply_events(
+                    owner_id=int(owner_id),
+                    type_id=int(type_id),
+                    events=events,
+                    lots_by_type=lots_by_type,
+                    journal_by_id=journal_by_id,
+                    owner_context=owner_context,
+                )
+            )
+            type_states[str(int(type_id))] = self._type_state(lots=lots, tracker=tracker, events=events)
+
+        job_watermark_date = max(
+            (self._job_completion_date(job) for job in industry_jobs if self._is_eligible_job(job)),
+            default=None,
+        )
+        self._save_state(
+            owner_id=int(owner_id),
+            last_transaction_id=max(
+                (int(_safe_int(getattr(tx, "transaction_id", None)) or 0) for tx in wallet_transactions),
+                default=None,
+            ),
+            job_watermark_date=job_watermark_date,
+            fifo_state=type_states,
+        )
+
+        self._app_session.flush()
+        return persisted_rows
+
+    def _rebuild_owner_incremental(self, *, owner_id: int) -> list[Any]:
+        state = self._load_state(owner_id=int(owner_id))
+        if state is None or self._has_backdated_inputs(owner_id=int(owner_id), state=state):
+            return self._rebuild_owner(owner_id=int(owner_id))
+
+        new_transactions = self._load_wallet_transactions(
+            owner_id=int(owner_id),
+            after_transaction_id=_safe_int(getattr(state, "last_transaction_id", None)),
+        )
+        new_jobs = self._load_industry_jobs(
+            owner_id=int(owner_id),
+            completed_after=getattr(state, "job_watermark_date", None),
+        )
+        if not new_transactions and not new_jobs:
+            return self._load_ledger_rows(owner_id=int(owner_id))
+
+        events_by_type = self._collect_events(wallet_transactions=new_transactions, industry_jobs=new_jobs)
+        type_states: dict[str, dict[str, Any]] = dict(getattr(state, "fifo_state", None) or {})
+
+        trackers: dict[int, dict[str, Any]] = {}
+        for type_id, events in events_by_type.items():
+            events.sort(key=_event_sort_key)
+            prior = type_states.get(str(int(type_id)))
+            if prior is None:
+                trackers[int(type_id)] = _opening_inventory_tracker(events)
+                continue
+            last_key = _stored_event_sort_key(prior.get("last_event_key"))
+            try:
+                if last_key is not None and _event_sort_key(events[0]) <= last_key:
+                    return self._rebuild_owner(owner_id=int(owner_id))
+            except TypeError:
+                return self._rebuild_owner(owner_id=int(owner_id))
+            prior_tracker = prior.get("opening_tracker") or {}
+            tracker = _opening_inventory_tracker(events, tracker=prior_tracker)
+            # A changed opening-inventory estimate re-prices sales that were already booked.
+            if _opening_inventory_signature(tracker) != _opening_inventory_signature(prior_tracker):
+                return self._rebuild_owner(owner_id=int(owner_id))
+            trackers[int(type_id)] = tracker
+
+        journal_ref_ids = {
+            int(journal_ref_id)
+            for journal_ref_id in (_safe_int(getattr(tx, "journal_ref_id", None)) for tx in new_transactions)
+            if journal_ref_id is not None
+        }
+        journal_by_id = self._load_journal_map(owner_id=int(owner_id), journal_ref_ids=journal_ref_ids)
+        owner_context = self._load_owner_context(owner_id=int(owner_id))
+
+        lots_by_type: dict[int, list[FifoLot]] = {}
+        for type_id, events in events_by_type.items():
+            prior = type_states.get(str(int(type_id)))
+            lots = lots_by_type.setdefault(int(type_id), [])
+            if prior is None:
+                opening_lot = _opening_inventory_lot_from_tracker(trackers[int(type_id)])
+                if opening_lot is not None:
+                    lots.append(opening_lot)
+            else:
+                lots.extend(lot for lot in (_lot_from_payload(item) for item in prior.get("lots") or []) if lot is not None)
+            self._apply_events(
+                owner_id=int(owner_id),
+                type_id=int(type_id),
+                events=events,
+                lots_by_type=lots_by_type,
+                journal_by_id=journal_by_id,
+                owner_context=owner_context,
+            )
+            type_states[str(int(type_id))] = self._type_state(lots=lots, tracker=trackers[int(type_id)], events=events)
+
+        job_watermark_date = max(
+            [str(value) for value in (getattr(state, "job_watermark_date", None),) if value]
+            + [self._job_completion_date(job) for job in new_jobs],
+            default=None,
+        )
+        last_transaction_id = max(
+            [int(value) for value in (_safe_int(getattr(state, "last_transaction_id", None)),) if value is not None]
+            + [int(_safe_int(getattr(tx, "transaction_id", None)) or 0) for tx in new_transactions],
+            default=None,
+        )
+        self._save_state(
+            owner_id=int(owner_id),
+            last_transaction_id=last_transaction_id,
+            job_watermark_date=job_watermark_date,
+            fifo_state=type_states,
+        )
+
+        self._app_session.flush()
+        return self._load_ledger_rows(owner_id=int(owner_id))
+
+    @cached_property
+    def _market_price_map(self) -> dict[int, float]:
+        if self._shared_market_price_map is not None:
+            return self._shared_market_price_map
+        return {
+            int(row.get("type_id")): float(row.get("average_price") or row.get("adjusted_price"))
+            for row in self._market_prices
+            if isinstance(row, dict)
+            and _safe_int(row.get("type_id")) is not None
+            and _safe_float(row.get("average_price") or row.get("adjusted_price")) is not None
+        }
+
+    def _collect_events(self, *, wallet_transactions: list[Any], industry_jobs: list[Any]) -> dict[int, list[dict[str, Any]]]:
         events_by_type: dict[int, list[dict[str, Any]]] = {}
         for tx in wallet_transactions:
             type_id = _safe_int(getattr(tx, "type_id", None))
@@ -388,25 +666,13 @@ class _BaseRealizedProfitLedgerService:
                 }
             )
 
-        completed_statuses = {"delivered", "ready", "completed"}
-        market_price_map = {
-            int(row.get("type_id")): float(row.get("average_price") or row.get("adjusted_price"))
-            for row in self._market_prices
-            if isinstance(row, dict)
-            and _safe_int(row.get("type_id")) is not None
-            and _safe_float(row.get("average_price") or row.get("adjusted_price")) is not None
-        }
+        market_price_map = self._market_price_map
         for job in industry_jobs:
-            status = str(getattr(job, "status", "") or "").strip().lower()
-            if status and status not in completed_statuses:
-                continue
-            product_type_id = _safe_int(getattr(job, "product_type_id", None))
-            blueprint_type_id = _safe_int(getattr(job, "blueprint_type_id", None))
-            if not product_type_id or not blueprint_type_id:
-                continue
-            completed_date = getattr(job, "completed_date", None) or getattr(job, "end_date", None)
-            if not completed_date:
+            if not self._is_eligible_job(job):
                 continue
+            product_type_id = int(_safe_int(getattr(job, "product_type_id", None)) or 0)
+            blueprint_type_id = int(_safe_int(getattr(job, "blueprint_type_id", None)) or 0)
+            completed_date = self._job_completion_date(job)
             snapshot = resolve_industry_job_cost_snapshot(
                 job=job,
                 sde_session=self._sde_session,
@@ -436,150 +702,286 @@ class _BaseRealizedProfitLedgerService:
                     "unit_cost": float(unit_cost),
                 }
             )
-
+        return events_by_type
+
+    def _apply_events(
+        self,
+        *,
+        owner_id: int,
+        type_id: int,
+        events: list[dict[str, Any]],
+        lots_by_type: dict[int, list[FifoLot]],
+        journal_by_id: dict[int, Any],
+        owner_context: dict[str, Any],
+    ) -> list[Any]:
+        lots = lots_by_type.setdefault(int(type_id), [])
         persisted_rows: list[Any] = []
-        for type_id, events in events_by_type.items():
-            events.sort(key=lambda item: (item.get("dt") or datetime.min, int(item.get("sort_id") or 0)))
-            lots = lots_by_type.setdefault(int(type_id), [])
-            opening_lot = _opening_inventory_lot(events)
-            if opening_lot is not None:
-                lots.append(opening_lot)
-            for event in events:
-                kind = str(event.get("kind") or "")
-                if kind == "buy":
-                    tx = event.get("tx")
-                    unit_price = _safe_float(getattr(tx, "unit_price", None))
-                    quantity = _safe_int(getattr(tx, "quantity", None)) or 0
-                    if unit_price is None or unit_price <= 0 or quantity <= 0:
-                        continue
-                    _append_lot(
-                        lots_by_type,
-                        type_id=int(type_id),
-                        lot=FifoLot(
-                            quantity=int(quantity),
-                            unit_price=float(unit_price),
-                            acquisition_date=getattr(tx, "date", None),
-                            reference_id=_safe_int(getattr(tx, "transaction_id", None)),
-                            reference_type="wallet_transaction",
-                            source=ASSET_SOURCE_MARKET_BUY,
-                        ),
-                    )
+        for event in events:
+            kind = str(event.get("kind") or "")
+            if kind == "buy":
+                tx = event.get("tx")
+                unit_price = _safe_float(getattr(tx, "unit_price", None))
+                quantity = _safe_int(getattr(tx, "quantity", None)) or 0
+                if unit_price is None or unit_price <= 0 or quantity <= 0:
                     continue
+                _append_lot(
+                    lots_by_type,
+                    type_id=int(type_id),
+                    lot=FifoLot(
+                        quantity=int(quantity),
+                        unit_price=float(unit_price),
+                        acquisition_date=getattr(tx, "date", None),
+                        reference_id=_safe_int(getattr(tx, "transaction_id", None)),
+                        reference_type="wallet_transaction",
+                        source=ASSET_SOURCE_MARKET_BUY,
+                    ),
+                )
+                continue
 
-                if kind == "job":
-                    job = event.get("job")
-                    quantity = _safe_int(event.get("quantity")) or 0
-                    unit_cost = _safe_float(event.get("unit_cost"))
-                    if unit_cost is None or unit_cost <= 0 or quantity <= 0:
-                        continue
-                    _append_lot(
-                        lots_by_type,
-                        type_id=int(type_id),
-                        lot=FifoLot(
-                            quantity=int(quantity),
-                            unit_price=float(unit_cost),
-                            acquisition_date=getattr(job, "completed_date", None) or getattr(job, "end_date", None),
-                            reference_id=_safe_int(getattr(job, "job_id", None)),
-                            reference_type="industry_job",
-                            source=ASSET_SOURCE_INDUSTRY_BUILD,
-                        ),
-                    )
+            if kind == "job":
+                job = event.get("job")
+                quantity = _safe_int(event.get("quantity")) or 0
+                unit_cost = _safe_float(event.get("unit_cost"))
+                if unit_cost is None or unit_cost <= 0 or quantity <= 0:
                     continue
+                _append_lot(
+                    lots_by_type,
+                    type_id=int(type_id),
+                    lot=FifoLot(
+                        quantity=int(quantity),
+                        unit_price=float(unit_cost),
+                        acquisition_date=getattr(job, "completed_date", None) or getattr(job, "end_date", None),
+                        reference_id=_safe_int(getattr(job, "job_id", None)),
+                        reference_type="industry_job",
+                        source=ASSET_SOURCE_INDUSTRY_BUILD,
+                    ),
+                )
+                continue
 
-                if kind != "sell":
-                    continue
+            if kind != "sell":
+                continue
 
-                tx = event.get("tx")
-                quantity = _safe_int(getattr(tx, "quantity", None)) or 0
-                if quantity <= 0:
-                    continue
-                gross_revenue = _safe_float(getattr(tx, "total_price", None))
-                if gross_revenue is None:
-                    unit_price = _safe_float(getattr(tx, "unit_price", None)) or 0.0
-                    gross_revenue = float(unit_price) * float(quantity)
-                allocation = _consume_lots(lots, quantity=int(quantity))
-                if int(allocation["unpriced_quantity"]) > 0:
-                    slot = allocation["by_source"].setdefault(ASSET_SOURCE_UNTRACKED, {"quantity": 0, "cost": 0.0})
-                    slot["quantity"] = int(slot.get("quantity") or 0) + int(allocation["unpriced_quantity"])
-                    slot["cost"] = float(slot.get("cost") or 0.0)
-                    allocation["allocations"].append(
-                        {
-                            "source": ASSET_SOURCE_UNTRACKED,
-                            "quantity": int(allocation["unpriced_quantity"]),
-                            "unit_cost": None,
-                            "total_cost": 0.0,
-                            "acquisition_date": None,
-                            "reference_id": None,
-                            "reference_type": "untracked_inventory",
-                        }
-                    )
-                journal_ref_id = _safe_int(getattr(tx, "journal_ref_id", None))
-                journal = journal_by_id.get(int(journal_ref_id)) if journal_ref_id is not None else None
-                other_fees_amount, sales_tax_amount, net_revenue, fee_capture_mode, notes = self._fee_breakdown(
-                    gross_revenue=float(gross_revenue),
-                    journal=journal,
-                    owner_context=owner_context,
+            tx = event.get("tx")
+            quantity = _safe_int(getattr(tx, "quantity", None)) or 0
+            if quantity <= 0:
+                continue
+            gross_revenue = _safe_float(getattr(tx, "total_price", None))
+            if gross_revenue is None:
+                unit_price = _safe_float(getattr(tx, "unit_price", None)) or 0.0
+                gross_revenue = float(unit_price) * float(quantity)
+            allocation = _consume_lots(lots, quantity=int(quantity))
+            if int(allocation["unpriced_quantity"]) > 0:
+                slot = allocation["by_source"].setdefault(ASSET_SOURCE_UNTRACKED, {"quantity": 0, "cost": 0.0})
+                slot["quantity"] = int(slot.get("quantity") or 0) + int(allocation["unpriced_quantity"])
+                slot["cost"] = float(slot.get("cost") or 0.0)
+                allocation["allocations"].append(
+                    {
+                        "source": ASSET_SOURCE_UNTRACKED,
+                        "quantity": int(allocation["unpriced_quantity"]),
+                        "unit_cost": None,
+                        "total_cost": 0.0,
+                        "acquisition_date": None,
+                        "reference_id": None,
+                        "reference_type": "untracked_inventory",
+                    }
                 )
-                if ASSET_SOURCE_OPENING_INVENTORY in allocation["by_source"]:
-                    opening_slot = allocation["by_source"][ASSET_SOURCE_OPENING_INVENTORY]
-                    notes.append(
-                        "{quantity} unit(s) were matched to estimated opening inventory using the earliest known tracked unit cost for this item.".format(
-                            quantity=int(opening_slot.get("quantity") or 0)
-                        )
+            journal_ref_id = _safe_int(getattr(tx, "journal_ref_id", None))
+            journal = journal_by_id.get(int(journal_ref_id)) if journal_ref_id is not None else None
+            other_fees_amount, sales_tax_amount, net_revenue, fee_capture_mode, notes = self._fee_breakdown(
+                gross_revenue=float(gross_revenue),
+                journal=journal,
+                owner_context=owner_context,
+            )
+            if ASSET_SOURCE_OPENING_INVENTORY in allocation["by_source"]:
+                opening_slot = allocation["by_source"][ASSET_SOURCE_OPENING_INVENTORY]
+                notes.append(
+                    "{quantity} unit(s) were matched to estimated opening inventory using the earliest known tracked unit cost for this item.".format(
+                        quantity=int(opening_slot.get("quantity") or 0)
                     )
-                if allocation["unpriced_quantity"] > 0:
-                    notes.append(f"{allocation['unpriced_quantity']} unit(s) could not be matched to a historical cost basis.")
-                realized_profit = None
-                realized_margin_fraction = None
-                if allocation["unpriced_quantity"] == 0 or int(allocation["priced_quantity"]) == 0:
-                    realized_profit = float(net_revenue) - float(allocation["total_cost"])
-                    if net_revenue > 0:
-                        realized_margin_fraction = float(realized_profit) / float(net_revenue)
-
-                row = self.ledger_model(
-                    **self._owner_fields(owner_id=int(owner_id)),
-                    transaction_id=int(_safe_int(getattr(tx, "transaction_id", None)) or 0),
-                    journal_ref_id=journal_ref_id,
-                    date=getattr(tx, "date", None),
-                    type_id=_safe_int(getattr(tx, "type_id", None)),
-                    type_name=getattr(tx, "type_name", None),
-                    type_group_name=getattr(tx, "type_group_name", None),
-                    type_category_name=getattr(tx, "type_category_name", None),
-                    quantity=int(quantity),
-                    unit_price=_safe_float(getattr(tx, "unit_price", None)),
-                    gross_revenue=float(gross_revenue),
-                    sales_tax_amount=float(sales_tax_amount),
-                    other_fees_amount=float(other_fees_amount),
-                    total_fees_amount=float(sales_tax_amount) + float(other_fees_amount),
-                    net_revenue=float(net_revenue),
-                    allocated_cost=float(allocation["total_cost"]),
-                    realized_profit=realized_profit,
-                    realized_margin_fraction=realized_margin_fraction,
+                )
+            if allocation["unpriced_quantity"] > 0:
+                notes.append(f"{allocation['unpriced_quantity']} unit(s) could not be matched to a historical cost basis.")
+            realized_profit = None
+            realized_margin_fraction = None
+            if allocation["unpriced_quantity"] == 0 or int(allocation["priced_quantity"]) == 0:
+                realized_profit = float(net_revenue) - float(allocation["total_cost"])
+                if net_revenue > 0:
+                    realized_margin_fraction = float(realized_profit) / float(net_revenue)
+
+            row = self.ledger_model(
+                **self._owner_fields(owner_id=int(owner_id)),
+                transaction_id=int(_safe_int(getattr(tx, "transaction_id", None)) or 0),
+                journal_ref_id=journal_ref_id,
+                date=getattr(tx, "date", None),
+                type_id=_safe_int(getattr(tx, "type_id", None)),
+                type_name=getattr(tx, "type_name", None),
+                type_group_name=getattr(tx, "type_group_name", None),
+                type_category_name=getattr(tx, "type_category_name", None),
+                quantity=int(quantity),
+                unit_price=_safe_float(getattr(tx, "unit_price", None)),
+                gross_revenue=float(gross_revenue),
+                sales_tax_amount=float(sales_tax_amount),
+                other_fees_amount=float(other_fees_amount),
+                total_fees_amount=float(sales_tax_amount) + float(other_fees_amount),
+                net_revenue=float(net_revenue),
+                allocated_cost=float(allocation["total_cost"]),
+                realized_profit=realized_profit,
+                realized_margin_fraction=realized_margin_fraction,
+                priced_quantity=int(allocation["priced_quantity"]),
+                unpriced_quantity=int(allocation["unpriced_quantity"]),
+                source_mix=allocation["by_source"],
+                allocation_details=allocation["allocations"],
+                fee_capture_mode=fee_capture_mode,
+                confidence=_confidence(
                     priced_quantity=int(allocation["priced_quantity"]),
                     unpriced_quantity=int(allocation["unpriced_quantity"]),
-                    source_mix=allocation["by_source"],
-                    allocation_details=allocation["allocations"],
                     fee_capture_mode=fee_capture_mode,
-                    confidence=_confidence(
-                        priced_quantity=int(allocation["priced_quantity"]),
-                        unpriced_quantity=int(allocation["unpriced_quantity"]),
-                        fee_capture_mode=fee_capture_mode,
-                    ),
-                    notes=notes,
-                )
-                self._app_session.add(row)
-                persisted_rows.append(row)
+                ),
+                notes=notes,
+            )
+            self._app_session.add(row)
+            persisted_rows.append(row)
 
-        self._app_session.flush()
         return persisted_rows
 
-    def _load_wallet_transactions(self, *, owner_id: int) -> list[Any]:
-        return self._app_session.query(self.transaction_model).filter(getattr(self.transaction_model, self.owner_id_field) == int(owner_id)).all()
+    @staticmethod
+    def _type_state(*, lots: list[FifoLot], tracker: dict[str, Any], events: list[dict[str, Any]]) -> dict[str, Any]:
+        last_dt, last_sort_id = _event_sort_key(events[-1])
+        return {
+            "lots": [_lot_to_payload(lot) for lot in lots],
+            "opening_tracker": tracker,
+            "last_event_key": [last_dt.isoformat() if last_dt != datetime.min else None, int(last_sort_id)],
+        }
+
+    @staticmethod
+    def _job_completion_date(job: Any) -> str | None:
+        completed_date = getattr(job, "completed_date", None) or getattr(job, "end_date", None)
+        return str(completed_date) if completed_date else None
+
+    def _is_eligible_job(self, job: Any) -> bool:
+        status = str(getattr(job, "status", "") or "").strip().lower()
+        if status and status not in _COMPLETED_JOB_STATUSES:
+            return False
+        if not _safe_int(getattr(job, "product_type_id", None)) or not _safe_int(getattr(job, "blueprint_type_id", None)):
+            return False
+        return self._job_completion_date(job) is not None
+
+    def _job_completion_column(self) -> Any:
+        model = self.industry_job_model
+        return func.coalesce(func.nullif(model.completed_date, ""), model.end_date)
+
+    def _eligible_job_filters(self) -> list[Any]:
+        model = self.industry_job_model
+        status = func.lower(func.trim(func.coalesce(model.status, "")))
+        completion = self._job_completion_column()
+        return [
+            or_(status == "", status.in_(sorted(_COMPLETED_JOB_STATUSES))),
+            model.product_type_id.isnot(None),
+            model.product_type_id != 0,
+            model.blueprint_type_id.isnot(None),
+            model.blueprint_type_id != 0,
+            completion.isnot(None),
+            completion != "",
+        ]
+
+    def _count_inputs_within_watermarks(
+        self,
+        *,
+        owner_id: int,
+        last_transaction_id: int | None,
+        job_watermark_date: str | None,
+    ) -> tuple[int, int]:
+        transaction_count = 0
+        if last_transaction_id is not None:
+            transaction_count = int(
+                self._app_session.query(func.count(self.transaction_model.id))
+                .filter(
+                    getattr(self.transaction_model, self.owner_id_field) == int(owner_id),
+                    self.transaction_model.transaction_id <= int(last_transaction_id),
+                )
+                .scalar()
+                or 0
+            )
+        job_count = 0
+        if job_watermark_date:
+            job_count = int(
+                self._app_session.query(func.count(self.industry_job_model.id))
+                .filter(
+                    getattr(self.industry_job_model, self.owner_id_field) == int(owner_id),
+                    *self._eligible_job_filters(),
+                    self._job_completion_column() <= str(job_watermark_date),
+                )
+                .scalar()
+                or 0
+            )
+        return transaction_count, job_count
+
+    def _has_backdated_inputs(self, *, owner_id: int, state: Any) -> bool:
+        """True when transactions or jobs appeared below the stored watermarks."""
+        transaction_count, job_count = self._count_inputs_within_watermarks(
+            owner_id=int(owner_id),
+            last_transaction_id=_safe_int(getattr(state, "last_transaction_id", None)),
+            job_watermark_date=getattr(state, "job_watermark_date", None),
+        )
+        return (
+            transaction_count != int(getattr(state, "transaction_count", 0) or 0)
+            or job_count != int(getattr(state, "job_count", 0) or 0)
+        )
+
+    def _load_state(self, *, owner_id: int) -> Any:
+        return (
+            self._app_session.query(self.state_model)
+            .filter(getattr(self.state_model, self.owner_id_field) == int(owner_id))
+            .first()
+        )
 
-    def _load_industry_jobs(self, *, owner_id: int) -> list[Any]:
-        return self._app_session.query(self.industry_job_model).filter(getattr(self.industry_job_model, self.owner_id_field) == int(owner_id)).all()
+    def _save_state(
+        self,
+        *,
+        owner_id: int,
+        last_transaction_id: int | None,
+        job_watermark_date: str | None,
+        fifo_state: dict[str, dict[str, Any]],
+    ) -> None:
+        self._app_session.flush()
+        transaction_count, job_count = self._count_inputs_within_watermarks(
+            owner_id=int(owner_id),
+            last_transaction_id=last_transaction_id,
+            job_watermark_date=job_watermark_date,
+        )
+        state = self._load_state(owner_id=int(owner_id))
+        if state is None:
+            state = self.state_model(**self._owner_fields(owner_id=int(owner_id)))
+            self._app_session.add(state)
+        state.last_transaction_id = last_transaction_id
+        state.transaction_count = int(transaction_count)
+        state.job_watermark_date = job_watermark_date
+        state.job_count = int(job_count)
+        state.fifo_state = fifo_state
+
+    def _load_ledger_rows(self, *, owner_id: int) -> list[Any]:
+        return (
+            self._app_session.query(self.ledger_model)
+            .filter(getattr(self.ledger_model, self.owner_id_field) == int(owner_id))
+            .all()
+        )
+
+    def _load_wallet_transactions(self, *, owner_id: int, after_transaction_id: int | None = None) -> list[Any]:
+        query = self._app_session.query(self.transaction_model).filter(getattr(self.transaction_model, self.owner_id_field) == int(owner_id))
+        if after_transaction_id is not None:
+            query = query.filter(self.transaction_model.transaction_id > int(after_transaction_id))
+        return query.all()
+
+    def _load_industry_jobs(self, *, owner_id: int, completed_after: str | None = None) -> list[Any]:
+        query = self._app_session.query(self.industry_job_model).filter(getattr(self.industry_job_model, self.owner_id_field) == int(owner_id))
+        if completed_after:
+            query = query.filter(
+                *self._eligible_job_filters(),
+                self._job_completion_column() > str(completed_after),
+            )
+        return query.all()
 
-    def _load_journal_map(self, *, owner_id: int) -> dict[int, Any]:
+    def _load_journal_map(self, *, owner_id: int, journal_ref_ids: set[int] | None = None) -> dict[int, Any]:
         return {}
 
     def _load_owner_context(self, *, owner_id: int) -> dict[str, Any]:
@@ -633,22 +1035,21 @@ class CharacterRealizedProfitLedgerService(_BaseRealizedProfitLedgerService):
     transaction_model = CharacterWalletTransactionsModel
     industry_job_model = CharacterIndustryJobsModel
     owner_model = CharacterModel
+    state_model = CharacterRealizedProfitStateModel
 
-    def rebuild(self, *, character_id: int | None = None) -> list[dict[str, Any]]:
-        return super().rebuild(owner_id=character_id)
+    def rebuild(self, *, character_id: int | None = None, incremental: bool = False) -> list[dict[str, Any]]:
+        return super().rebuild(owner_id=character_id, incremental=incremental)
 
     def list_rows(self, *, character_id: int | None = None) -> list[dict[str, Any]]:
         return super().list_rows(owner_id=character_id)
 
-    def _load_wallet_transactions(self, *, owner_id: int) -> list[Any]:
-        return (
-            self._app_session.query(self.transaction_model)
-            .filter(self.transaction_model.character_id == int(owner_id))
-            .all()
-        )
-
-    def _load_journal_map(self, *, owner_id: int) -> dict[int, Any]:
-        wallet_journals = self._app_session.query(CharacterWalletJournalModel).filter_by(character_id=int(owner_id)).all()
+    def _load_journal_map(self, *, owner_id: int, journal_ref_ids: set[int] | None = None) -> dict[int, Any]:
+        query = self._app_session.query(CharacterWalletJournalModel).filter_by(character_id=int(owner_id))
+        if journal_ref_ids is not None:
+            if not journal_ref_ids:
+                return {}
+            query = query.filter(CharacterWalletJournalModel.wallet_journal_id.in_(sorted(journal_ref_ids)))
+        wallet_journals = query.all()
         return {
             int(row.wallet_journal_id): row
             for row in wallet_journals
@@ -686,9 +1087,10 @@ class CorporationRealizedProfitLedgerService(_BaseRealizedProfitLedgerService):
     transaction_model = CorporationWalletTransactionsModel
     industry_job_model = CorporationIndustryJobsModel
     owner_model = CorporationModel
+    state_model = CorporationRealizedProfitStateModel
 
-    def rebuild(self, *, corporation_id: int | None = None) -> list[dict[str, Any]]:
-        return super().rebuild(owner_id=corporation_id)
+    def rebuild(self, *, corporation_id: int | None = None, incremental: bool = False) -> list[dict[str, Any]]:
+        return super().rebuild(owner_id=corporation_id, incremental=incremental)
 
     def list_rows(self, *, corporation_id: int | None = None) -> list[dict[str, Any]]:
         return super().list_rows(owner_id=corporation_id)
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+from typing import Any
+
+from eve_online_industry_tracker.application.characters.realized_profit import (
+    CharacterRealizedProfitLedgerService,
+    CorporationRealizedProfitLedgerService,
+)
+from eve_online_industry_tracker.application.errors import ServiceError
+from eve_online_industry_tracker.infrastructure.job_queue import (
+    claim_job,
+    dispatch_job,
+    job_start_response,
+    restore_job,
+    update_job,
+)
+from eve_online_industry_tracker.infrastructure.session_provider import StateSessionProvider
+
+
+REALIZED_PROFIT_REBUILD_JOB_KIND = "realized_profit_rebuild"
+
+_LEDGER_SERVICES: dict[str, Any] = {
+    "character": CharacterRealizedProfitLedgerService,
+    "corporation": CorporationRealizedProfitLedgerService,
+}
+
+
+def _job_phases(params: dict[str, Any]) -> list[str]:
+    """The stages a rebuild with these params runs, in order; drives the step numbering."""
+    phases = ["refresh_inputs"] if params.get("refresh") else []
+    return phases + ["market_prices", "rebuild"]
+
+
+class RealizedProfitRebuildJobs:
+    """Background multi-owner realized-profit rebuilds.
+
+    Jobs live in ``state.jobs.realized_profit_rebuild`` and run on the shared
+    ``DurableJobQueue`` like the industry overview refresh jobs.
+    """
+
+    def __init__(self, *, state: Any):
+        self._state = state
+        self._sessions = StateSessionProvider(state=state)
+
+    def _get_store(self) -> Any:
+        jobs_state = getattr(self._state, "jobs", None)
+        if jobs_state is None or not hasattr(jobs_state, "realized_profit_rebuild"):
+            raise RuntimeError("Realized profit rebuild state is not initialized")
+        return jobs_state.realized_profit_rebuild
+
+    def register_background_jobs(self, queue: Any) -> None:
+        """Register the rebuild job handler with a ``DurableJobQueue``."""
+        queue.register(REALIZED_PROFIT_REBUILD_JOB_KIND, self._run_job)
+
+    @staticmethod
+    def _normalize_params(
+        *,
+        owner_kind: str,
+        owner_ids: list[int] | None = None,
+        refresh: bool = False,
+        full_rebuild: bool = False,
+        max_workers: int = 4,
+    ) -> dict[str, Any]:
+        normalized_owner_kind = str(owner_kind or "").strip().lower()
+        if normalized_owner_kind not in _LEDGER_SERVICES:
+            raise ServiceError(f"Unknown realized profit owner kind: {owner_kind}", status_code=400)
+        return {
+            "owner_kind": normalized_owner_kind,
+            "owner_ids": sorted({int(owner_id) for owner_id in owner_ids}) if owner_ids else None,
+            "refresh": bool(refresh),
+            "full_rebuild": bool(full_rebuild),
+            "max_workers": max(1, int(max_workers or 1)),
+        }
+
+    def _update_job(self, job_id: str, **kwargs: Any) -> dict[str, Any]:
+        return update_job(self._get_store(), job_id, job_kind="realized profit rebuild job", **kwargs)
+
+    def start(
+        self,
+        *,
+        owner_kind: str,
+        owner_ids: list[int] | None = None,
+        refresh: bool = False,
+        full_rebuild: bool = False,
+        max_workers: int = 4,
+    ) -> dict[str, Any]:
+        params = self._normalize_params(
+            owner_kind=owner_kind,
+            owner_ids=owner_ids,
+            refresh=refresh,
+            full_rebuild=full_rebuild,
+            max_workers=max_workers,
+        )
+        job, created = claim_job(self._get_store(), params, step_count=len(_job_phases(params)))
+        if created:
+            dispatch_job(self._state, REALIZED_PROFIT_REBUILD_JOB_KIND, job, self._run_job)
+        return job_start_response(job)
+
+    def status(self, *, job_id: str) -> dict[str, Any]:
+        # Finished jobs are trimmed from memory by the job queue; reload them on demand.
+        restore_job(self._state, REALIZED_PROFIT_REBUILD_JOB_KIND, job_id)
+        store = self._get_store()
+        with store.lock:
+            job = store.jobs.get(str(job_id))
+            if job is None:
+                raise ServiceError(f"Unknown realized profit rebuild job: {job_id}", status_code=404)
+            return dict(job)
+
+    def _refresh_inputs(self, *, owner_kind: str, owner_ids: list[int] | None) -> None:
+        manager = self._state.char_manager if owner_kind == "character" else self._state.corp_manager
+        id_kwarg = "character_id" if owner_kind == "character" else "corporation_id"
+        if not owner_ids:
+            manager.refresh_realized_profit_inputs()
+            return
+        for owner_id in owner_ids:
+            manager.refresh_realized_profit_inputs(**{id_kwarg: int(owner_id)})
+
+    def _run_job(self, job_id: str, params: dict[str, Any]) -> None:
+        owner_kind = str(params.get("owner_kind") or "character")
+        owner_ids = params.get("owner_ids")
+        phases = _job_phases(params)
+        step_count = len(phases)
+
+        def enter_phase(stage: str, label: str, progress_fraction: float, **meta: Any) -> None:
+            step = phases.index(stage) + 1
+            self._update_job(
+                job_id,
+                status="running",
+                progress_fraction=progress_fraction,
+                progress_label=f"Step {step}/{step_count}: {label}",
+                progress_meta={"step": step, "step_count": step_count, "stage": stage, **meta},
+            )
+
+        self._update_job(
+            job_id,
+            status="running",
+            progress_fraction=0.01,
+            progress_label="Starting realized profit rebuild",
+            progress_meta={"step": 0, "step_count": step_count, "stage": "startup"},
+        )
+        try:
+            if "refresh_inputs" in phases:
+                enter_phase("refresh_inputs", "Refreshing wallet and industry inputs", 0.02)
+                self._refresh_inputs(owner_kind=owner_kind, owner_ids=owner_ids)
+
+            enter_phase("market_prices", "Loading market prices", 0.08)
+            market_prices = self._state.esi_service.get_market_prices()
+
+            enter_phase("rebuild", "Rebuilding owner ledgers", 0.1)
+            app_session = self._sessions.app_session()
+            sde_session = self._sessions.sde_session()
+            try:
+                ledger_service = _LEDGER_SERVICES[owner_kind](
+                    app_session=app_session,
+                    sde_session=sde_session,
+                    market_prices=market_prices if isinstance(market_prices, list) else [],
+                )
+
+                def report_progress(done: int, total: int, owner_result: dict[str, Any]) -> None:
+                    enter_phase(
+                        "rebuild",
+                        f"Rebuilt {done}/{total} owners",
+                        0.1 + 0.9 * (float(done) / float(max(1, total))),
+                        owners_done=int(done),
+                        owners_total=int(total),
+                    )
+
+                results = ledger_service.rebuild_parallel(
+                    app_session_factory=self._sessions.app_session,
+                    sde_session_factory=self._sessions.sde_session,
+                    owner_ids=owner_ids,
+                    incremental=not bool(params.get("full_rebuild")),
+                    max_workers=int(params.get("max_workers") or 1),
+                    progress_callback=report_progress,
+                )
+            finally:
+                app_session.close()
+                sde_session.close()
+
+            failed = [result for result in results if result.get("error_message")]
+            self._update_job(
+                job_id,
+                status="completed",
+                progress_fraction=1.0,
+                progress_label=(
+                    f"Realized profit rebuild completed ({len(failed)} owner(s) failed)"
+                    if failed
+                    else "Realized profit rebuild completed"
+                ),
+                result=results,
+                result_meta={
+                    "owner_count": len(results),
+                    "failed_count": len(failed),
+                    "row_count": sum(int(result.get("row_count") or 0) for result in results),
+                },
+            )
+        except Exception as e:
+            self._update_job(
+                job_id,
+                status="failed",
+                progress_label="Realized profit rebuild failed",
+                error_message=str(e),
+            )
@@ -8,6 +8,7 @@ from eve_online_industry_tracker.application.characters.realized_profit import (
     CharacterRealizedProfitLedgerService,
     summarize_realized_profit_rows,
 )
+from eve_online_industry_tracker.application.characters.realized_profit_jobs import RealizedProfitRebuildJobs
 from eve_online_industry_tracker.application.market_analysis.pricing_suggestion_service import (
     PricingSuggestionService,
 )
@@ -45,6 +46,7 @@ class CharactersService:
         *,
         refresh: bool = False,
         character_id: int | None = None,
+        full_rebuild: bool = False,
     ) -> dict[str, Any]:
         if refresh:
             self._state.char_manager.refresh_realized_profit_inputs(character_id=character_id)
@@ -58,13 +60,32 @@ class CharactersService:
 
         rows = ledger_service.list_rows(character_id=character_id)
         if refresh or not rows:
-            rows = ledger_service.rebuild(character_id=character_id)
+            rows = ledger_service.rebuild(character_id=character_id, incremental=not full_rebuild)
 
         return {
             "rows": rows,
             "summary": summarize_realized_profit_rows(rows),
         }
 
+    def start_realized_profit_rebuild(
+        self,
+        *,
+        refresh: bool = False,
+        character_id: int | None = None,
+        full_rebuild: bool = False,
+        max_workers: int = 4,
+    ) -> dict[str, Any]:
+        return RealizedProfitRebuildJobs(state=self._state).start(
+            owner_kind="character",
+            owner_ids=[int(character_id)] if character_id is not None else None,
+            refresh=refresh,
+            full_rebuild=full_rebuild,
+            max_workers=max_workers,
+        )
+
+    def realized_profit_rebuild_status(self, *, job_id: str) -> dict[str, Any]:
+        return RealizedProfitRebuildJobs(state=self._state).status(job_id=job_id)
+
     def get_market_orders_enriched(
         self,
         *,
@@ -81,6 +102,8 @@ class CharactersService:
 
         # Initialize pricing suggestion service for sell price analysis
         pricing_svc = PricingSuggestionService(state=self._state)
+        pricing_requests: list[dict[str, Any]] = []
+        enriched_by_order_id: dict[int, dict[str, Any]] = {}
         market_history_svc = MarketHistoryService(state=self._state)
 
         if include_orderbook_comparison:
@@ -179,24 +202,24 @@ class CharactersService:
                     except Exception:
                         region_name = None
 
-                # Get pricing suggestion for sell orders
-                advised_price_data = None
+                # Sell orders get a pricing suggestion, computed for all of them at once below
+                pricing_request = None
                 character_id = order.get("character_id") or (character or {}).get("character_id")
-                if not order.get("is_buy_order") and isinstance(type_id, int) and isinstance(character_id, int):
-                    days_remaining_int: int | None = None
-                    if expires_in_td.total_seconds() > 0:
-                        days_remaining_int = max(0, expires_in_td.days)
-                    try:
-                        advised_price_data = pricing_svc.suggest_price(
-                            character_id=character_id,
-                            type_id=type_id,
-                            current_price=order_price,
-                            quantity=int(order.get("volume_remain") or 0),
-                            order_duration_days=duration_days_int or 90,
-                            days_remaining=days_remaining_int,
-                        )
-                    except Exception:
-                        advised_price_data = None
+                if (
+                    not order.get("is_buy_order")
+                    and isinstance(type_id, int)
+                    and isinstance(character_id, int)
+                    and isinstance(order.get("order_id"), int)
+                ):
+                    pricing_request = {
+                        "order_id": order["order_id"],
+                        "character_id": character_id,
+                        "type_id": type_id,
+                        "price": order_price,
+                        "quantity": int(order.get("volume_remain") or 0),
+                        "order_duration_days": duration_days_int or 90,
+                        "days_remaining": max(0, expires_in_td.days) if expires_in_td.total_seconds() > 0 else None,
+                    }
 
                 enriched_order = {
                     "owner": order.get("owner"),
@@ -224,34 +247,43 @@ class CharactersService:
                     "is_blueprint_copy": False,
                 }
 
-                # Add pricing suggestion if available
-                if advised_price_data:
-                    enriched_order["advised_price"] = advised_price_data.get("advised_price")
-                    enriched_order["advised_price_confidence"] = advised_price_data.get("confidence")
-                    enriched_order["pricing_breakdown"] = advised_price_data.get("breakdown")
-                    enriched_order["pricing_reasoning"] = advised_price_data.get("reasoning")
-                    enriched_order["cost_basis"] = advised_price_data.get("cost_basis")
-                    enriched_order["acquisition_source"] = advised_price_data.get("acquisition_source")
-                    enriched_order["cost_basis_source"] = advised_price_data.get("cost_basis_source")
-                    enriched_order["price_difference_pct"] = advised_price_data.get("price_difference_pct")
-                    # Profitability metrics
-                    enriched_order["break_even_price"] = advised_price_data.get("break_even_price")
-                    enriched_order["net_margin_pct_advised"] = advised_price_data.get("net_margin_pct_advised")
-                    enriched_order["net_margin_pct_current"] = advised_price_data.get("net_margin_pct_current")
-                    enriched_order["estimated_sell_days_advised"] = advised_price_data.get("estimated_sell_days_advised")
-                    enriched_order["estimated_sell_days_current"] = advised_price_data.get("estimated_sell_days_current")
-                    enriched_order["isk_per_day_advised"] = advised_price_data.get("isk_per_day_advised")
-                    enriched_order["isk_per_day_current"] = advised_price_data.get("isk_per_day_current")
-                    enriched_order["hold_signal"] = advised_price_data.get("hold_signal")
-                    enriched_order["relist_risk"] = advised_price_data.get("relist_risk")
-                    enriched_order["price_band"] = advised_price_data.get("price_band")
-                    enriched_order["min_target_margin_pct"] = advised_price_data.get("min_target_margin_pct")
-                    enriched_order["fill_rate_velocity"] = advised_price_data.get("fill_rate_velocity")
-                    enriched_order["seller_concentration"] = advised_price_data.get("seller_concentration")
-                    enriched_order["expiry_urgency"] = advised_price_data.get("expiry_urgency")
-                    enriched_order["expiry_urgency_detail"] = advised_price_data.get("expiry_urgency_detail")
-
                 enriched_orders.append(enriched_order)
+                if pricing_request is not None:
+                    pricing_requests.append(pricing_request)
+                    enriched_by_order_id[int(pricing_request["order_id"])] = enriched_order
+
+        try:
+            suggestions = pricing_svc.suggest_prices_bulk(orders=pricing_requests)
+        except Exception:
+            suggestions = {}
+        for order_id, advised_price_data in suggestions.items():
+            enriched_order = enriched_by_order_id.get(order_id)
+            if enriched_order is None or not advised_price_data:
+                continue
+            enriched_order["advised_price"] = advised_price_data.get("advised_price")
+            enriched_order["advised_price_confidence"] = advised_price_data.get("confidence")
+            enriched_order["pricing_breakdown"] = advised_price_data.get("breakdown")
+            enriched_order["pricing_reasoning"] = advised_price_data.get("reasoning")
+            enriched_order["cost_basis"] = advised_price_data.get("cost_basis")
+            enriched_order["acquisition_source"] = advised_price_data.get("acquisition_source")
+            enriched_order["cost_basis_source"] = advised_price_data.get("cost_basis_source")
+            enriched_order["price_difference_pct"] = advised_price_data.get("price_difference_pct")
+            # Profitability metrics
+            enriched_order["break_even_price"] = advised_price_data.get("break_even_price")
+            enriched_order["net_margin_pct_advised"] = advised_price_data.get("net_margin_pct_advised")
+            enriched_order["net_margin_pct_current"] = advised_price_data.get("net_margin_pct_current")
+            enriched_order["estimated_sell_days_advised"] = advised_price_data.get("estimated_sell_days_advised")
+            enriched_order["estimated_sell_days_current"] = advised_price_data.get("estimated_sell_days_current")
+            enriched_order["isk_per_day_advised"] = advised_price_data.get("isk_per_day_advised")
+            enriched_order["isk_per_day_current"] = advised_price_data.get("isk_per_day_current")
+            enriched_order["hold_signal"] = advised_price_data.get("hold_signal")
+            enriched_order["relist_risk"] = advised_price_data.get("relist_risk")
+            enriched_order["price_band"] = advised_price_data.get("price_band")
+            enriched_order["min_target_margin_pct"] = advised_price_data.get("min_target_margin_pct")
+            enriched_order["fill_rate_velocity"] = advised_price_data.get("fill_rate_velocity")
+            enriched_order["seller_concentration"] = advised_price_data.get("seller_concentration")
+            enriched_order["expiry_urgency"] = advised_price_data.get("expiry_urgency")
+            enriched_order["expiry_urgency_detail"] = advised_price_data.get("expiry_urgency_detail")
 
         # Compute repricing priority score for sell orders
         for order in enriched_orders:
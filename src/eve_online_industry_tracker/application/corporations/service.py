@@ -6,6 +6,7 @@ from eve_online_industry_tracker.application.characters.realized_profit import (
     CorporationRealizedProfitLedgerService,
     summarize_realized_profit_rows,
 )
+from eve_online_industry_tracker.application.characters.realized_profit_jobs import RealizedProfitRebuildJobs
 
 
 class CorporationsService:
@@ -101,6 +102,7 @@ class CorporationsService:
         *,
         refresh: bool = False,
         corporation_id: int | None = None,
+        full_rebuild: bool = False,
     ) -> dict[str, Any]:
         if refresh:
             self._state.corp_manager.refresh_realized_profit_inputs(corporation_id=corporation_id)
@@ -114,9 +116,28 @@ class CorporationsService:
 
         rows = ledger_service.list_rows(corporation_id=corporation_id)
         if refresh or not rows:
-            rows = ledger_service.rebuild(corporation_id=corporation_id)
+            rows = ledger_service.rebuild(corporation_id=corporation_id, incremental=not full_rebuild)
 
         return {
             "rows": rows,
             "summary": summarize_realized_profit_rows(rows),
         }
+
+    def start_realized_profit_rebuild(
+        self,
+        *,
+        refresh: bool = False,
+        corporation_id: int | None = None,
+        full_rebuild: bool = False,
+        max_workers: int = 4,
+    ) -> dict[str, Any]:
+        return RealizedProfitRebuildJobs(state=self._state).start(
+            owner_kind="corporation",
+            owner_ids=[int(corporation_id)] if corporation_id is not None else None,
+            refresh=refresh,
+            full_rebuild=full_rebuild,
+            max_workers=max_workers,
+        )
+
+    def realized_profit_rebuild_status(self, *, job_id: str) -> dict[str, Any]:
+        return RealizedProfitRebuildJobs(state=self._state).status(job_id=job_id)
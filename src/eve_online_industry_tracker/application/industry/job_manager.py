@@ -14,6 +14,7 @@ from eve_online_industry_tracker.infrastructure.session_provider import (
     StateSessionProvider,
 )
 from eve_online_industry_tracker.infrastructure.sde.blueprints import get_blueprint_manufacturing_data
+from eve_online_industry_tracker.infrastructure.sde.dimensions import SDE_DIMENSION_TABLES
 
 
 class IndustryJobManager:
@@ -25,6 +26,8 @@ class IndustryJobManager:
 
     _THREAD_NAME = "industry-job-manager"
     _SNAPSHOT_REFRESH_INTERVAL_SECONDS = 6 * 3600
+    # SDE tables the blueprint overview is built from.
+    SDE_TABLES = frozenset({"blueprints"}) | SDE_DIMENSION_TABLES
 
     def _excluded_blueprint_type_ids(self) -> set[int]:
         cfg_manager = getattr(self._state, "cfg_manager", None)
@@ -86,6 +89,12 @@ class IndustryJobManager:
     def request_refresh(self) -> None:
         self._refresh_requested.set()
 
+    def invalidate_blueprint_overview(self) -> None:
+        """Mark the snapshot stale (e.g. after an SDE update) and rebuild it in the background."""
+        with self._snapshot_lock:
+            self._last_snapshot_at = None
+        self.request_refresh()
+
     def get_blueprint_overview(self, *, force_refresh: bool = False, type_ids: set[int] | None = None) -> list[dict[str, Any]]:
         with self._snapshot_lock:
             has_snapshot = bool(self._blueprint_overview)
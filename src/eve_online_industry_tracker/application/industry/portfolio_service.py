@@ -1,8 +1,26 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, Callable
+import logging
 import math
+import time
+
+from pulp import (  # pyright: ignore[reportMissingImports]
+    LpInteger,
+    LpMaximize,
+    LpProblem,
+    LpStatus,
+    LpVariable,
+    PULP_CBC_CMD,
+    lpSum,
+)
+
+
+# Objectives the MILP solver can express: it maximises confidence-adjusted profit, which is
+# what the greedy "balanced" ranking orders by first. "max_isk_per_hour" ranks by a ratio
+# that has no linear objective, so it is always planned greedily.
+MILP_OBJECTIVES = frozenset({"balanced"})
 
 
 @dataclass(slots=True)
@@ -41,6 +59,165 @@ class PortfolioPlanRequest:
     minimum_pricing_confidence: str = "low"
     candidate_scope: PortfolioCandidateScope = field(default_factory=PortfolioCandidateScope)
     candidate_directives: list[PortfolioCandidateDirective] = field(default_factory=list)
+    # "greedy" ranks candidates and fills budgets in order; "milp" solves the allocation exactly
+    # (profit-maximising, so only for the objectives in MILP_OBJECTIVES).
+    solver: str = "greedy"
+    solver_time_limit_seconds: float = 10.0
+
+
+@dataclass(slots=True)
+class PortfolioMaterialLedger:
+    """Owned input stock and unit prices shared by every line of one portfolio plan.
+
+    Candidates are costed as if each had all owned stock to itself; with a ledger the plan
+    draws owned inputs down as batches are allocated and prices the shortfall at market.
+    """
+
+    owned_quantity_by_type_id: dict[int, int] = field(default_factory=dict)
+    owned_unit_cost_by_type_id: dict[int, float] = field(default_factory=dict)
+    market_unit_price_by_type_id: dict[int, float] = field(default_factory=dict)
+
+    @classmethod
+    def from_payload(cls, payload: Any) -> "PortfolioMaterialLedger | None":
+        if not isinstance(payload, dict):
+            return None
+
+        def int_map(raw: Any) -> dict[int, int]:
+            out: dict[int, int] = {}
+            for key, value in (raw or {}).items() if isinstance(raw, dict) else []:
+                try:
+                    out[int(key)] = max(0, int(value or 0))
+                except Exception:
+                    continue
+            return out
+
+        def float_map(raw: Any) -> dict[int, float]:
+            out: dict[int, float] = {}
+            for key, value in (raw or {}).items() if isinstance(raw, dict) else []:
+                parsed = IndustryPortfolioService._safe_float(value)
+                try:
+                    type_id = int(key)
+                except Exception:
+                    continue
+                if parsed is not None and parsed >= 0:
+                    out[type_id] = parsed
+            return out
+
+        return cls(
+            owned_quantity_by_type_id=int_map(payload.get("owned_quantity_by_type_id")),
+            owned_unit_cost_by_type_id=float_map(payload.get("owned_unit_cost_by_type_id")),
+            market_unit_price_by_type_id=float_map(payload.get("market_unit_price_by_type_id")),
+        )
+
+    def to_payload(self) -> dict[str, Any]:
+        # String keys so the ledger survives the JSON round trip through persisted job results.
+        return {
+            "owned_quantity_by_type_id": {str(k): int(v) for k, v in self.owned_quantity_by_type_id.items()},
+            "owned_unit_cost_by_type_id": {str(k): float(v) for k, v in self.owned_unit_cost_by_type_id.items()},
+            "market_unit_price_by_type_id": {str(k): float(v) for k, v in self.market_unit_price_by_type_id.items()},
+        }
+
+
+class _MaterialLedgerState:
+    """Remaining owned quantity per type while one plan is being allocated.
+
+    Each candidate's inputs are indexed once as (type_id, quantity per batch, owned unit
+    cost, market unit price); costing or taking batches is then O(materials) per call.
+    """
+
+    __slots__ = ("_ledger", "remaining", "_inputs_by_candidate")
+
+    def __init__(self, ledger: PortfolioMaterialLedger, remaining: dict[int, int] | None = None):
+        self._ledger = ledger
+        self.remaining = dict(ledger.owned_quantity_by_type_id if remaining is None else remaining)
+        self._inputs_by_candidate: dict[int, tuple[float, list[tuple[int, int, float, float]]]] = {}
+
+    def copy(self) -> "_MaterialLedgerState":
+        clone = _MaterialLedgerState(self._ledger, self.remaining)
+        clone._inputs_by_candidate = self._inputs_by_candidate
+        return clone
+
+    def inputs(self, candidate: dict[str, Any]) -> tuple[float, list[tuple[int, int, float, float]]]:
+        """(non-material cost per batch, [(type_id, qty_per_batch, owned_unit_cost, market_unit_price)])."""
+        key = id(candidate)
+        cached = self._inputs_by_candidate.get(key)
+        if cached is not None:
+            return cached
+
+        cash_outlay_per_batch = IndustryPortfolioService._safe_float(candidate.get("cash_outlay_per_batch")) or 0.0
+        inputs: list[tuple[int, int, float, float]] = []
+        row_material_cost = 0.0
+        for material in candidate.get("input_materials") or []:
+            if not isinstance(material, dict):
+                continue
+            type_id = IndustryPortfolioService._safe_int(material.get("type_id"))
+            quantity = IndustryPortfolioService._safe_int(material.get("quantity"))
+            if type_id <= 0 or quantity <= 0:
+                continue
+            row_unit_price = IndustryPortfolioService._safe_float(material.get("unit_price")) or 0.0
+            row_material_cost += row_unit_price * quantity
+            market_unit_price = self._ledger.market_unit_price_by_type_id.get(type_id, row_unit_price)
+            owned_unit_cost = self._ledger.owned_unit_cost_by_type_id.get(type_id, market_unit_price)
+            inputs.append((type_id, quantity, float(owned_unit_cost), float(market_unit_price)))
+
+        material_cost = IndustryPortfolioService._safe_float(candidate.get("material_cost"))
+        if material_cost is None:
+            material_cost = row_material_cost
+        fixed_cost_per_batch = max(0.0, cash_outlay_per_batch - material_cost) if inputs else cash_outlay_per_batch
+        cached = (fixed_cost_per_batch, inputs)
+        self._inputs_by_candidate[key] = cached
+        return cached
+
+    def cost(self, candidate: dict[str, Any], batches: int) -> float:
+        fixed_cost_per_batch, inputs = self.inputs(candidate)
+        total = fixed_cost_per_batch * batches
+        for type_id, quantity, owned_unit_cost, market_unit_price in inputs:
+            needed = quantity * batches
+            taken = min(needed, self.remaining.get(type_id, 0))
+            total += taken * owned_unit_cost + (needed - taken) * market_unit_price
+        return total
+
+    def max_batches_within(self, candidate: dict[str, Any], capital: float, upper: int) -> int:
+        # Cost only grows with batches, so binary search the largest affordable count.
+        low, high = 0, max(0, int(upper))
+        while low < high:
+            mid = (low + high + 1) // 2
+            if self.cost(candidate, mid) <= capital + 1e-6:
+                low = mid
+            else:
+                high = mid - 1
+        return low
+
+    def take(self, candidate: dict[str, Any], batches: int) -> dict[str, float]:
+        fixed_cost_per_batch, inputs = self.inputs(candidate)
+        usage = {"cost": fixed_cost_per_batch * batches, "owned_units": 0, "bought_units": 0, "owned_value": 0.0, "bought_value": 0.0}
+        for type_id, quantity, owned_unit_cost, market_unit_price in inputs:
+            needed = quantity * batches
+            available = self.remaining.get(type_id, 0)
+            taken = min(needed, available)
+            if taken:
+                self.remaining[type_id] = available - taken
+            bought = needed - taken
+            usage["owned_units"] += taken
+            usage["bought_units"] += bought
+            usage["owned_value"] += taken * owned_unit_cost
+            usage["bought_value"] += bought * market_unit_price
+        usage["cost"] += usage["owned_value"] + usage["bought_value"]
+        return usage
+
+
+# Called after the operator pass with the remaining candidates, the batches already allocated
+# per row, the remaining budgets and the material ledger (None without one); returns extra
+# batches for each candidate, in order.
+ExtraBatchesSolver = Callable[
+    [
+        list[tuple[dict[str, Any], "PortfolioCandidateDirective | None"]],
+        dict[str, int],
+        dict[str, float],
+        "_MaterialLedgerState | None",
+    ],
+    list[int],
+]
 
 
 class IndustryPortfolioService:
@@ -184,6 +361,37 @@ class IndustryPortfolioService:
         *,
         candidates: list[dict[str, Any]],
         plan_request: PortfolioPlanRequest,
+        material_ledger: PortfolioMaterialLedger | None = None,
+    ) -> dict[str, Any]:
+        greedy_plan = cls._allocate_portfolio(candidates=candidates, plan_request=plan_request, material_ledger=material_ledger)
+        if str(plan_request.solver or "greedy").strip().lower() != "milp":
+            greedy_plan["solver"] = {"mode": "greedy"}
+            return greedy_plan
+        if greedy_plan["objective"] not in MILP_OBJECTIVES:
+            greedy_plan["solver"] = {
+                "mode": "greedy",
+                "objective": greedy_plan["objective"],
+                "fallback_reason": (
+                    f"The MILP solver maximises confidence-adjusted profit and does not support "
+                    f"objective '{greedy_plan['objective']}'"
+                ),
+            }
+            return greedy_plan
+        return cls._optimize_portfolio_milp(
+            candidates=candidates,
+            plan_request=plan_request,
+            greedy_plan=greedy_plan,
+            material_ledger=material_ledger,
+        )
+
+    @classmethod
+    def _allocate_portfolio(
+        cls,
+        *,
+        candidates: list[dict[str, Any]],
+        plan_request: PortfolioPlanRequest,
+        material_ledger: PortfolioMaterialLedger | None = None,
+        extra_batches_solver: ExtraBatchesSolver | None = None,
     ) -> dict[str, Any]:
         normalized_objective = str(plan_request.objective or "balanced").strip().lower() or "balanced"
         minimum_confidence_rank = cls._confidence_rank_value(plan_request.minimum_pricing_confidence)
@@ -311,6 +519,8 @@ class IndustryPortfolioService:
         slot_hours_committed = 0.0
 
         allocated_batches_by_row_id: dict[str, int] = {}
+        ledger_state = _MaterialLedgerState(material_ledger) if material_ledger is not None else None
+        ledger_totals = {"owned_units": 0, "bought_units": 0, "owned_value": 0.0, "bought_value": 0.0}
 
         def record_selected_item(
             *,
@@ -318,6 +528,7 @@ class IndustryPortfolioService:
             directive: PortfolioCandidateDirective | None,
             allocated_batches: int,
             pass_name: str,
+            ledger_usage: dict[str, float] | None = None,
         ) -> None:
             nonlocal total_expected_profit, total_required_capital, total_allocated_units, total_allocated_batches, slot_hours_committed
 
@@ -329,6 +540,10 @@ class IndustryPortfolioService:
             committed_slot_hours = float(slot_hours_per_batch) * float(allocated_batches)
             expected_profit = float(candidate.get("profit_amount") or 0.0) * float(allocated_batches)
             allocated_units = int(units_per_batch * allocated_batches)
+            if ledger_usage is not None:
+                # Inputs another line already drew from stock are bought at market instead.
+                expected_profit += committed_capital - float(ledger_usage["cost"])
+                committed_capital = float(ledger_usage["cost"])
 
             existing = selected_item_by_row_id.get(overview_row_id)
             if existing is None:
@@ -351,9 +566,18 @@ class IndustryPortfolioService:
                     "target_units_override": cls._override_or_none(directive.target_units_override) if directive else None,
                     "allocation_passes": [],
                 }
+                if ledger_usage is not None:
+                    existing["owned_input_units"] = 0
+                    existing["bought_input_units"] = 0
                 selected_item_by_row_id[overview_row_id] = existing
                 selected_items.append(existing)
 
+            if ledger_usage is not None:
+                existing["owned_input_units"] = int(existing.get("owned_input_units") or 0) + int(ledger_usage["owned_units"])
+                existing["bought_input_units"] = int(existing.get("bought_input_units") or 0) + int(ledger_usage["bought_units"])
+                for key in ledger_totals:
+                    ledger_totals[key] += ledger_usage[key]
+
             existing["batches"] = int(existing.get("batches") or 0) + int(allocated_batches)
             existing["units"] = int(existing.get("units") or 0) + int(allocated_units)
             existing["capital_committed"] = float(existing.get("capital_committed") or 0.0) + committed_capital
@@ -379,8 +603,6 @@ class IndustryPortfolioService:
             minimum_batches: int = 0,
             pass_name: str,
         ) -> bool:
-            nonlocal remaining_capital, remaining_slot_hours, remaining_research_slot_hours
-
             overview_row_id = str(candidate.get("overview_row_id") or "")
             cash_outlay_per_batch = cls._safe_float(candidate.get("cash_outlay_per_batch"))
             slot_hours_per_batch = cls._safe_float(candidate.get("manufacturing_slot_hours_per_batch")) or cls._safe_float(candidate.get("slot_hours_per_batch"))
@@ -421,7 +643,10 @@ class IndustryPortfolioService:
                 )
                 return False
 
-            max_by_capital = int(math.floor(remaining_capital / cash_outlay_per_batch)) if cash_outlay_per_batch > 0 else 0
+            if ledger_state is not None:
+                max_by_capital = ledger_state.max_batches_within(candidate, remaining_capital, remaining_candidate_batches)
+            else:
+                max_by_capital = int(math.floor(remaining_capital / cash_outlay_per_batch)) if cash_outlay_per_batch > 0 else 0
             max_by_slots = int(math.floor(remaining_slot_hours / slot_hours_per_batch)) if slot_hours_per_batch > 0 else 0
             max_by_research_slots = (
                 int(math.floor(remaining_research_slot_hours / preparation_slot_hours_per_batch))
@@ -445,12 +670,7 @@ class IndustryPortfolioService:
             if allocatable_batches <= 0:
                 return False
 
-            remaining_capital = max(0.0, remaining_capital - (float(cash_outlay_per_batch) * float(allocatable_batches)))
-            remaining_slot_hours = max(0.0, remaining_slot_hours - (float(slot_hours_per_batch) * float(allocatable_batches)))
-            if preparation_slot_hours_per_batch > 0:
-                remaining_research_slot_hours = max(0.0, remaining_research_slot_hours - (float(preparation_slot_hours_per_batch) * float(allocatable_batches)))
-            allocated_batches_by_row_id[overview_row_id] = already_allocated + int(allocatable_batches)
-            record_selected_item(
+            commit_batches(
                 candidate=candidate,
                 directive=directive,
                 allocated_batches=int(allocatable_batches),
@@ -458,6 +678,34 @@ class IndustryPortfolioService:
             )
             return True
 
+        def commit_batches(
+            *,
+            candidate: dict[str, Any],
+            directive: PortfolioCandidateDirective | None,
+            allocated_batches: int,
+            pass_name: str,
+        ) -> None:
+            nonlocal remaining_capital, remaining_slot_hours, remaining_research_slot_hours
+
+            overview_row_id = str(candidate.get("overview_row_id") or "")
+            cash_outlay_per_batch = cls._safe_float(candidate.get("cash_outlay_per_batch")) or 0.0
+            slot_hours_per_batch = cls._safe_float(candidate.get("manufacturing_slot_hours_per_batch")) or cls._safe_float(candidate.get("slot_hours_per_batch")) or 0.0
+            preparation_slot_hours_per_batch = cls._safe_float(candidate.get("preparation_slot_hours_per_batch")) or 0.0
+            ledger_usage = ledger_state.take(candidate, int(allocated_batches)) if ledger_state is not None else None
+            batch_capital = float(ledger_usage["cost"]) if ledger_usage is not None else float(cash_outlay_per_batch) * float(allocated_batches)
+            remaining_capital = max(0.0, remaining_capital - batch_capital)
+            remaining_slot_hours = max(0.0, remaining_slot_hours - (float(slot_hours_per_batch) * float(allocated_batches)))
+            if preparation_slot_hours_per_batch > 0:
+                remaining_research_slot_hours = max(0.0, remaining_research_slot_hours - (float(preparation_slot_hours_per_batch) * float(allocated_batches)))
+            allocated_batches_by_row_id[overview_row_id] = allocated_batches_by_row_id.get(overview_row_id, 0) + int(allocated_batches)
+            record_selected_item(
+                candidate=candidate,
+                directive=directive,
+                allocated_batches=int(allocated_batches),
+                pass_name=pass_name,
+                ledger_usage=ledger_usage,
+            )
+
         operator_priority_candidates: list[tuple[dict[str, Any], PortfolioCandidateDirective, int | None, int]] = []
         normal_candidates: list[tuple[dict[str, Any], PortfolioCandidateDirective | None]] = []
         for candidate in sorted_candidates:
@@ -517,11 +765,40 @@ class IndustryPortfolioService:
                     reason=operator_reason,
                 )
 
-        for candidate, directive in normal_candidates:
+        extra_batches: list[int] | None = None
+        if extra_batches_solver is not None:
+            extra_batches = extra_batches_solver(
+                normal_candidates,
+                dict(allocated_batches_by_row_id),
+                {
+                    "capital": remaining_capital,
+                    "slot_hours": remaining_slot_hours,
+                    "research_slot_hours": remaining_research_slot_hours,
+                    "research_slot_hours_budget": total_research_slot_hours_budget,
+                },
+                ledger_state,
+            )
+
+        for candidate_index, (candidate, directive) in enumerate(normal_candidates):
             overview_row_id = str(candidate.get("overview_row_id") or "")
             if allocated_batches_by_row_id.get(overview_row_id, 0) >= cls._effective_max_batches(candidate=candidate, directive=directive):
                 continue
 
+            if extra_batches is not None:
+                candidate_extra_batches = int(extra_batches[candidate_index])
+                if candidate_extra_batches > 0:
+                    commit_batches(candidate=candidate, directive=directive, allocated_batches=candidate_extra_batches, pass_name="milp")
+                elif overview_row_id not in allocated_batches_by_row_id:
+                    skipped_items.append(
+                        {
+                            "overview_row_id": overview_row_id,
+                            "type_id": candidate.get("type_id"),
+                            "type_name": candidate.get("type_name"),
+                            "reason": cls._milp_skip_reason(candidate=candidate, directive=directive),
+                        }
+                    )
+                continue
+
             requested_batches = None
             minimum_batches = 0
             if not allocate_candidate(
@@ -576,6 +853,18 @@ class IndustryPortfolioService:
             "skipped_count": len(skipped_items),
             "candidate_scope_count": len(filtered_candidates),
             "minimum_pricing_confidence": str(plan_request.minimum_pricing_confidence or "low"),
+            "material_ledger": (
+                {
+                    **ledger_totals,
+                    "depleted_type_ids": sorted(
+                        type_id
+                        for type_id, quantity in material_ledger.owned_quantity_by_type_id.items()
+                        if quantity > 0 and ledger_state.remaining.get(type_id, 0) <= 0
+                    ),
+                }
+                if material_ledger is not None and ledger_state is not None
+                else None
+            ),
             "operator_decisions": {
                 "forced_includes": forced_items,
                 "exclusions": excluded_items,
@@ -584,3 +873,237 @@ class IndustryPortfolioService:
                 "unfulfilled_locked_items": unfulfilled_locked_items,
             },
         }
+
+    @staticmethod
+    def _portfolio_batch_value(candidate: dict[str, Any]) -> float:
+        effective_profit = IndustryPortfolioService._safe_float(candidate.get("effective_profit_per_batch"))
+        if effective_profit is None:
+            effective_profit = IndustryPortfolioService._safe_float(candidate.get("profit_amount"))
+        return float(effective_profit or 0.0)
+
+    @classmethod
+    def _milp_skip_reason(cls, *, candidate: dict[str, Any], directive: PortfolioCandidateDirective | None) -> str:
+        if (cls._safe_float(candidate.get("cash_outlay_per_batch")) or 0.0) <= 0:
+            return "Missing cash outlay per batch"
+        if (cls._safe_float(candidate.get("manufacturing_slot_hours_per_batch")) or cls._safe_float(candidate.get("slot_hours_per_batch")) or 0.0) <= 0:
+            return "Missing slot-hours per batch"
+        if cls._effective_max_batches(candidate=candidate, directive=directive) <= 0:
+            return "No batches allowed after operator override or market limit"
+        if cls._portfolio_batch_value(candidate) <= 0:
+            return "Non-positive confidence-adjusted profit"
+        return "Not selected by the integer optimizer"
+
+    @classmethod
+    def _optimize_portfolio_milp(
+        cls,
+        *,
+        candidates: list[dict[str, Any]],
+        plan_request: PortfolioPlanRequest,
+        greedy_plan: dict[str, Any],
+        material_ledger: PortfolioMaterialLedger | None = None,
+    ) -> dict[str, Any]:
+        """Re-plan the ranked pass as an integer program over the same budgets.
+
+        Operator directives are applied exactly as in the greedy plan (same operator pass),
+        so forced, locked and target batches are fixed before the solve. The remaining
+        capital, manufacturing and research slot-hours are then allocated to maximise
+        confidence-adjusted profit, warm-started from the greedy allocation. The greedy plan
+        is returned instead when the solver fails or does not beat it within the time limit.
+        """
+        time_limit = min(120.0, max(1.0, float(plan_request.solver_time_limit_seconds or 10.0)))
+        greedy_batches_by_row_id = {
+            str(item.get("overview_row_id") or ""): int(item.get("batches") or 0)
+            for item in greedy_plan.get("selected_items") or []
+        }
+        outcome: dict[str, Any] = {}
+
+        def solve(
+            normal_candidates: list[tuple[dict[str, Any], PortfolioCandidateDirective | None]],
+            allocated_batches_by_row_id: dict[str, int],
+            budgets: dict[str, float],
+            ledger_state: _MaterialLedgerState | None,
+        ) -> list[int]:
+            upper_bounds: list[int] = []
+            warm_start: list[int] = []
+            for candidate, directive in normal_candidates:
+                overview_row_id = str(candidate.get("overview_row_id") or "")
+                already_allocated = allocated_batches_by_row_id.get(overview_row_id, 0)
+                upper = max(0, cls._effective_max_batches(candidate=candidate, directive=directive) - already_allocated)
+                if cls._milp_skip_reason(candidate=candidate, directive=directive) != "Not selected by the integer optimizer":
+                    upper = 0
+                upper_bounds.append(upper)
+                warm_start.append(min(upper, max(0, greedy_batches_by_row_id.get(overview_row_id, 0) - already_allocated)))
+
+            outcome.update(
+                cls._solve_portfolio_milp(
+                    candidates=[candidate for candidate, _ in normal_candidates],
+                    upper_bounds=upper_bounds,
+                    warm_start=warm_start,
+                    budgets=budgets,
+                    time_limit_seconds=time_limit,
+                    ledger_state=ledger_state,
+                )
+            )
+            batches = outcome.get("batches")
+            return list(batches) if batches is not None else [0] * len(normal_candidates)
+
+        milp_plan = cls._allocate_portfolio(
+            candidates=candidates,
+            plan_request=plan_request,
+            material_ledger=material_ledger,
+            extra_batches_solver=solve,
+        )
+
+        solver_info: dict[str, Any] = {
+            "mode": "milp",
+            "status": outcome.get("status", "Not Run"),
+            "solve_seconds": outcome.get("solve_seconds", 0.0),
+            "time_limit_seconds": time_limit,
+            "variable_count": outcome.get("variable_count", 0),
+            "warm_started": bool(outcome.get("warm_started", False)),
+            "objective": "confidence_adjusted_profit",
+            "objective_value": outcome.get("objective_value"),
+            "greedy_objective_value": outcome.get("greedy_objective_value"),
+            "greedy_total_expected_profit": float(greedy_plan.get("total_expected_profit") or 0.0),
+        }
+        objective_value = outcome.get("objective_value")
+        greedy_objective_value = float(outcome.get("greedy_objective_value") or 0.0)
+        if outcome.get("batches") is None or objective_value is None or float(objective_value) < greedy_objective_value:
+            solver_info["fallback_reason"] = (
+                f"Solver returned {solver_info['status']}"
+                if objective_value is None
+                else "Solver did not improve on the greedy plan within the time limit"
+            )
+            greedy_plan["solver"] = {**solver_info, "mode": "greedy"}
+            return greedy_plan
+
+        improvement = float(objective_value) - greedy_objective_value
+        solver_info["gap_vs_greedy"] = improvement
+        solver_info["gap_vs_greedy_pct"] = (
+            (improvement / abs(greedy_objective_value)) * 100.0 if greedy_objective_value else None
+        )
+        milp_plan["solver"] = solver_info
+        return milp_plan
+
+    @classmethod
+    def _solve_portfolio_milp(
+        cls,
+        *,
+        candidates: list[dict[str, Any]],
+        upper_bounds: list[int],
+        warm_start: list[int],
+        budgets: dict[str, float],
+        time_limit_seconds: float,
+        ledger_state: _MaterialLedgerState | None = None,
+    ) -> dict[str, Any]:
+        values = [cls._portfolio_batch_value(candidate) for candidate in candidates]
+
+        def objective_value(batches: list[int]) -> float:
+            total = sum(value * count for value, count in zip(values, batches))
+            if ledger_state is None:
+                return total
+            # Same ledger adjustment as the allocation: inputs beyond owned stock cost market price.
+            trial = ledger_state.copy()
+            for candidate, count in zip(candidates, batches):
+                if count > 0:
+                    total += float(candidate.get("cash_outlay_per_batch") or 0.0) * count - trial.take(candidate, count)["cost"]
+            return total
+
+        greedy_objective_value = objective_value(warm_start)
+        active = [index for index, upper in enumerate(upper_bounds) if upper > 0 and values[index] > 0]
+        if not active:
+            return {
+                "status": "Optimal",
+                "batches": [0] * len(candidates),
+                "objective_value": 0.0,
+                "greedy_objective_value": greedy_objective_value,
+                "variable_count": 0,
+                "solve_seconds": 0.0,
+            }
+
+        prob = LpProblem("ManufacturingPortfolio", LpMaximize)
+        x = {}
+        for index in active:
+            var = LpVariable(f"x_{index}", lowBound=0, upBound=upper_bounds[index], cat=LpInteger)
+            var.setInitialValue(warm_start[index])
+            x[index] = var
+        if ledger_state is None:
+            prob += lpSum(values[index] * x[index] for index in active)
+            prob += lpSum(float(candidates[index].get("cash_outlay_per_batch") or 0.0) * x[index] for index in active) <= float(budgets["capital"])
+        else:
+            # Owned stock is shared: per input type, demand is met from what is left in stock
+            # (take) and the market (buy); capital pays for fixed job costs plus both.
+            demand_terms: dict[int, list[Any]] = {}
+            unit_costs: dict[int, tuple[float, float]] = {}
+            fixed_cost_terms = []
+            row_cost_terms = []
+            for index in active:
+                fixed_cost_per_batch, inputs = ledger_state.inputs(candidates[index])
+                fixed_cost_terms.append(fixed_cost_per_batch * x[index])
+                row_cost_terms.append(float(candidates[index].get("cash_outlay_per_batch") or 0.0) * x[index])
+                for type_id, quantity, owned_unit_cost, market_unit_price in inputs:
+                    demand_terms.setdefault(type_id, []).append(quantity * x[index])
+                    unit_costs[type_id] = (owned_unit_cost, market_unit_price)
+            material_cost_terms = []
+            for type_id, terms in demand_terms.items():
+                take = LpVariable(f"take_{type_id}", lowBound=0, upBound=max(0, ledger_state.remaining.get(type_id, 0)))
+                buy = LpVariable(f"buy_{type_id}", lowBound=0)
+                prob += lpSum(terms) == take + buy
+                owned_unit_cost, market_unit_price = unit_costs[type_id]
+                material_cost_terms.append(owned_unit_cost * take + market_unit_price * buy)
+            actual_cost = lpSum(fixed_cost_terms) + lpSum(material_cost_terms)
+            prob += lpSum(values[index] * x[index] for index in active) + lpSum(row_cost_terms) - actual_cost
+            prob += actual_cost <= float(budgets["capital"])
+        prob += (
+            lpSum(
+                float(
+                    cls._safe_float(candidates[index].get("manufacturing_slot_hours_per_batch"))
+                    or cls._safe_float(candidates[index].get("slot_hours_per_batch"))
+                    or 0.0
+                )
+                * x[index]
+                for index in active
+            )
+            <= float(budgets["slot_hours"])
+        )
+        # Like the greedy pass, research slot-hours only constrain when a research budget is configured.
+        if float(budgets.get("research_slot_hours_budget") or 0.0) > 0:
+            research_terms = [
+                float(cls._safe_float(candidates[index].get("preparation_slot_hours_per_batch")) or 0.0) * x[index]
+                for index in active
+                if (cls._safe_float(candidates[index].get("preparation_slot_hours_per_batch")) or 0.0) > 0
+            ]
+            if research_terms:
+                prob += lpSum(research_terms) <= float(budgets["research_slot_hours"])
+
+        started = time.perf_counter()
+        try:
+            solver = PULP_CBC_CMD(msg=False, timeLimit=time_limit_seconds, warmStart=True, gapRel=0.0001)
+            prob.solve(solver)
+        except Exception as e:
+            logging.warning("Portfolio MILP solve failed: %s", e)
+            return {
+                "status": f"Error: {e}",
+                "greedy_objective_value": greedy_objective_value,
+                "variable_count": len(active),
+                "solve_seconds": time.perf_counter() - started,
+            }
+        solve_seconds = time.perf_counter() - started
+
+        status = LpStatus[prob.status]
+        result: dict[str, Any] = {
+            "status": status,
+            "greedy_objective_value": greedy_objective_value,
+            "variable_count": len(active),
+            "solve_seconds": solve_seconds,
+            "warm_started": True,
+        }
+        if status != "Optimal" and status != "Integer Feasible":
+            return result
+
+        batches = [0] * len(candidates)
+        for index in active:
+            batches[index] = max(0, int(round(x[index].value() or 0.0)))
+        result["batches"] = batches
+        result["objective_value"] = objective_value(batches)
+        return result
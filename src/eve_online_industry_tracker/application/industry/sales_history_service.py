@@ -9,6 +9,15 @@ from eve_online_industry_tracker.infrastructure.models import CharacterWalletTra
 from eve_online_industry_tracker.infrastructure.session_provider import SessionProvider, StateSessionProvider
 
 
+def _sold_row(tx: CharacterWalletTransactionsModel) -> dict[str, Any]:
+    return {
+        "date": str(tx.date) if tx.date else None,
+        "quantity": int(tx.quantity or 0),
+        "unit_price": float(tx.unit_price or 0.0),
+        "total_price": float(tx.total_price or 0.0),
+    }
+
+
 class SalesHistoryService:
     def __init__(self, *, state: Any, sessions: SessionProvider | None = None):
         self._state = state
@@ -49,15 +58,43 @@ class SalesHistoryService:
                 )
             ).order_by(desc(CharacterWalletTransactionsModel.date)).all()
 
-            result = [
-                {
-                    "date": str(tx.date) if tx.date else None,
-                    "quantity": int(tx.quantity or 0),
-                    "unit_price": float(tx.unit_price or 0.0),
-                    "total_price": float(tx.total_price or 0.0),
-                }
-                for tx in transactions
-            ]
+            result = [_sold_row(tx) for tx in transactions]
+            return result
+        finally:
+            try:
+                app_session.close()
+            except Exception:
+                pass
+
+    def get_sold_history_bulk(
+        self,
+        *,
+        character_id: int,
+        type_ids: list[int],
+        days: int = 30,
+    ) -> dict[int, list[dict[str, Any]]]:
+        """``get_sold_history`` for many item types in one query, keyed by type_id.
+
+        Types without sales in the window are absent from the result.
+        """
+        ids = sorted({int(type_id) for type_id in type_ids or []})
+        if not ids:
+            return {}
+        app_session = self._sessions.app_session()
+        try:
+            cutoff_str = (datetime.utcnow() - timedelta(days=days)).isoformat()
+            transactions = app_session.query(CharacterWalletTransactionsModel).filter(
+                and_(
+                    CharacterWalletTransactionsModel.character_id == character_id,
+                    CharacterWalletTransactionsModel.type_id.in_(ids),
+                    CharacterWalletTransactionsModel.is_buy == False,
+                    CharacterWalletTransactionsModel.date >= cutoff_str,
+                )
+            ).order_by(desc(CharacterWalletTransactionsModel.date)).all()
+
+            result: dict[int, list[dict[str, Any]]] = {}
+            for tx in transactions:
+                result.setdefault(int(tx.type_id), []).append(_sold_row(tx))
             return result
         finally:
             try:
@@ -87,7 +124,11 @@ class SalesHistoryService:
             - price_range: {"min": lowest, "max": highest} if data exists
         """
         history = self.get_sold_history(character_id=character_id, type_id=type_id, days=days)
+        return self.suggest_sell_price_from_history(history)
 
+    @staticmethod
+    def suggest_sell_price_from_history(history: list[dict[str, Any]]) -> dict[str, Any]:
+        """``suggest_sell_price`` for already-loaded sold history (newest first)."""
         if not history:
             return {
                 "suggested_price": None,
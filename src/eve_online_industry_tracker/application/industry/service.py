@@ -4,13 +4,13 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 import hashlib
 import json
+import logging
 import math
 import threading
 import time
 import dataclasses
 from dataclasses import dataclass
 from typing import Any, Callable, cast
-import uuid
 
 from sqlalchemy import bindparam, text
 from eve_online_industry_tracker.db_models import (
@@ -34,7 +34,6 @@ from eve_online_industry_tracker.application.characters.asset_provenance import
 from eve_online_industry_tracker.application.errors import ServiceError
 from eve_online_industry_tracker.application.market_analysis.market_history_service import MarketHistoryService
 from eve_online_industry_tracker.application.market_pricing.service import MarketPricingService
-from flask_app.background_jobs import register_thread
 from eve_online_industry_tracker.infrastructure.session_provider import (
     SessionProvider,
     StateSessionProvider,
@@ -57,11 +56,25 @@ from eve_online_industry_tracker.infrastructure.industry_adapter import (
     trigger_refresh_public_structures_for_system,
 )
 from eve_online_industry_tracker.application.industry.job_manager import IndustryJobManager
+from eve_online_industry_tracker.application.industry.portfolio_service import PortfolioMaterialLedger
+from eve_online_industry_tracker.infrastructure.job_queue import (
+    claim_job,
+    dispatch_job,
+    job_start_response,
+    restore_job,
+    update_job,
+)
 from eve_online_industry_tracker.infrastructure.persistence import blueprints_repo
 
 
 ProgressCallback = Callable[[float, str, dict[str, Any] | None], None]
 
+# Background job kinds; each names its store on ``state.jobs``.
+OVERVIEW_REFRESH_JOB_KIND = "industry_overview_refresh"
+PORTFOLIO_CANDIDATES_JOB_KIND = "industry_portfolio_candidates"
+# Both refreshes build the full product overview, so they share one concurrency slot.
+INDUSTRY_REFRESH_CONCURRENCY_GROUP = "industry_refresh"
+
 
 def _camel_to_words(s: str) -> str:
     """Convert camelCase to space-separated words (e.g. 'rigLargeShip' → 'rig Large Ship')."""
@@ -206,6 +219,11 @@ class IndustryService:
         self._state = state
         self._sessions = sessions or StateSessionProvider(state=state)
 
+    def _app_read_session(self) -> Any:
+        # Read-only app DB session for large reads; providers without a read pool use app_session().
+        read_session = getattr(self._sessions, "app_read_session", None)
+        return read_session() if read_session is not None else self._sessions.app_session()
+
     @property
     def _admin(self):
         return getattr(self._state, "admin_settings", None)
@@ -452,65 +470,71 @@ class IndustryService:
             "min_region_daily_volume": int(min_region_daily_volume or 0),
         }
 
-    def _find_matching_job(self, *, store: Any, params: dict[str, Any]) -> dict[str, Any] | None:
-        with store.lock:
-            for job in store.jobs.values():
-                if not isinstance(job, dict):
-                    continue
-                if not self._job_is_active(job):
-                    continue
-                if dict(job.get("request_params") or {}) != params:
-                    continue
-                return dict(job)
-        return None
+    def _claim_job(self, *, store: Any, params: dict[str, Any], step_count: int) -> tuple[dict[str, Any], bool]:
+        return claim_job(store, params, step_count=step_count)
 
-    def _find_matching_overview_refresh_job(self, *, params: dict[str, Any]) -> dict[str, Any] | None:
-        return self._find_matching_job(store=self._get_industry_overview_refresh_store(), params=params)
+    def _restore_job(self, kind: str, job_id: str) -> None:
+        # Finished jobs are trimmed from memory by the job queue; reload them on demand.
+        restore_job(self._state, kind, job_id)
 
-    def _find_matching_portfolio_candidates_job(self, *, params: dict[str, Any]) -> dict[str, Any] | None:
-        return self._find_matching_job(store=self._get_industry_portfolio_candidates_store(), params=params)
+    def _dispatch_job(self, kind: str, job: dict[str, Any], run: Callable[[str, dict[str, Any]], None]) -> None:
+        dispatch_job(self._state, kind, job, run)
 
-    def _update_job(
+    def register_background_jobs(self, queue: Any) -> None:
+        """Register the industry refresh job handlers with a ``DurableJobQueue``."""
+        queue.register(
+            OVERVIEW_REFRESH_JOB_KIND,
+            self._run_overview_refresh_job,
+            concurrency_group=INDUSTRY_REFRESH_CONCURRENCY_GROUP,
+        )
+        queue.register(
+            PORTFOLIO_CANDIDATES_JOB_KIND,
+            self._run_portfolio_candidates_refresh_job,
+            concurrency_group=INDUSTRY_REFRESH_CONCURRENCY_GROUP,
+        )
+
+    @staticmethod
+    def _job_start_response(job: dict[str, Any]) -> dict[str, Any]:
+        return job_start_response(job)
+
+    @staticmethod
+    def _job_progress_view(job: dict[str, Any]) -> dict[str, Any]:
+        return {key: value for key, value in job.items() if key != "result"}
+
+    def _wait_for_job_progress(
         self,
         store: Any,
         job_id: str,
         *,
-        job_kind: str = "job",
-        status: str | None = None,
-        progress_fraction: float | None = None,
-        progress_label: str | None = None,
-        result: list[dict[str, Any]] | None = None,
-        result_meta: dict[str, Any] | None = None,
-        error_message: str | None = None,
-        progress_meta: dict[str, Any] | None = None,
+        job_kind: str,
+        after_revision: int = -1,
+        wait_seconds: float = 0.0,
     ) -> dict[str, Any]:
+        """Return the job without ``result`` once its revision passes ``after_revision``.
+
+        Blocks for at most ``wait_seconds`` (on the store's ``changed`` condition) while the
+        job is active and unchanged; returns the current state on timeout.
+        """
         with store.lock:
+            def _is_settled() -> bool:
+                job = store.jobs.get(str(job_id))
+                if job is None or not self._job_is_active(job):
+                    return True
+                return int(job.get("revision") or 0) > int(after_revision)
+
+            changed = getattr(store, "changed", None)
+            if changed is not None and wait_seconds > 0:
+                changed.wait_for(_is_settled, timeout=float(wait_seconds))
             job = store.jobs.get(str(job_id))
             if job is None:
-                raise RuntimeError(f"Unknown {job_kind}: {job_id}")
-            if status is not None:
-                job["status"] = str(status)
-            if progress_fraction is not None:
-                job["progress_fraction"] = max(0.0, min(1.0, float(progress_fraction)))
-            if progress_label is not None:
-                job["progress_label"] = str(progress_label)
-            if progress_meta is not None:
-                job["progress_meta"] = dict(progress_meta)
-            if result is not None:
-                job["result"] = result
-                job["result_count"] = len(result)
-            if result_meta is not None:
-                job["result_meta"] = dict(result_meta)
-            if error_message is not None:
-                job["error_message"] = str(error_message)
-            job["updated_at"] = datetime.now(timezone.utc).isoformat()
-            return dict(job)
+                raise ServiceError(f"Unknown {job_kind}: {job_id}", status_code=404)
+            return self._job_progress_view(job)
 
     def _update_overview_refresh_job(self, job_id: str, **kwargs: Any) -> dict[str, Any]:
-        return self._update_job(self._get_industry_overview_refresh_store(), job_id, job_kind="overview refresh job", **kwargs)
+        return update_job(self._get_industry_overview_refresh_store(), job_id, job_kind="overview refresh job", **kwargs)
 
     def _update_portfolio_candidates_job(self, job_id: str, **kwargs: Any) -> dict[str, Any]:
-        return self._update_job(self._get_industry_portfolio_candidates_store(), job_id, job_kind="portfolio candidates job", **kwargs)
+        return update_job(self._get_industry_portfolio_candidates_store(), job_id, job_kind="portfolio candidates job", **kwargs)
 
     def start_industry_manufacturing_product_overview_refresh(
         self,
@@ -542,54 +566,10 @@ class IndustryService:
             owned_blueprints_scope=owned_blueprints_scope,
             character_id=character_id,
         )
-        existing_job = self._find_matching_overview_refresh_job(params=params)
-        if existing_job is not None:
-            return {
-                "job_id": str(existing_job.get("job_id") or ""),
-                "created_at": existing_job.get("created_at"),
-                "updated_at": existing_job.get("updated_at"),
-                "progress_label": str(existing_job.get("progress_label") or "Queued"),
-                "progress_meta": dict(existing_job.get("progress_meta") or {}),
-            }
-
-        job_id = str(uuid.uuid4())
-        store = self._get_industry_overview_refresh_store()
-        created_at = datetime.now(timezone.utc).isoformat()
-        with store.lock:
-            store.jobs[job_id] = {
-                "job_id": job_id,
-                "request_params": dict(params),
-                "status": "queued",
-                "progress_fraction": 0.0,
-                "progress_label": "Queued",
-                "progress_meta": {
-                    "stage": "queued",
-                    "step": 0,
-                    "step_count": 9,
-                },
-                "created_at": created_at,
-                "updated_at": created_at,
-                "result": None,
-                "result_meta": {},
-                "result_count": 0,
-                "error_message": None,
-            }
-
-        thread = threading.Thread(
-            target=self._run_overview_refresh_job,
-            args=(job_id, params),
-            daemon=True,
-            name=f"industry-overview-refresh-{job_id[:8]}",
-        )
-        register_thread(self._state, thread.name, thread)
-        thread.start()
-        return {
-            "job_id": job_id,
-            "created_at": created_at,
-            "updated_at": created_at,
-            "progress_label": "Queued",
-            "progress_meta": {"step": 0, "step_count": 9, "stage": "queued"},
-        }
+        job, created = self._claim_job(store=self._get_industry_overview_refresh_store(), params=params, step_count=9)
+        if created:
+            self._dispatch_job(OVERVIEW_REFRESH_JOB_KIND, job, self._run_overview_refresh_job)
+        return self._job_start_response(job)
 
     def _run_overview_refresh_job(self, job_id: str, params: dict[str, Any]) -> None:
         self._update_overview_refresh_job(
@@ -646,12 +626,29 @@ class IndustryService:
 
     def industry_manufacturing_product_overview_refresh_status(self, *, job_id: str) -> dict[str, Any]:
         store = self._get_industry_overview_refresh_store()
+        self._restore_job(OVERVIEW_REFRESH_JOB_KIND, job_id)
         with store.lock:
             job = store.jobs.get(str(job_id))
             if job is None:
                 raise ServiceError(f"Unknown overview refresh job: {job_id}", status_code=404)
             return dict(job)
 
+    def industry_manufacturing_product_overview_refresh_progress(
+        self,
+        *,
+        job_id: str,
+        after_revision: int = -1,
+        wait_seconds: float = 0.0,
+    ) -> dict[str, Any]:
+        self._restore_job(OVERVIEW_REFRESH_JOB_KIND, job_id)
+        return self._wait_for_job_progress(
+            self._get_industry_overview_refresh_store(),
+            job_id,
+            job_kind="overview refresh job",
+            after_revision=after_revision,
+            wait_seconds=wait_seconds,
+        )
+
     def start_industry_manufacturing_portfolio_candidates_refresh(
         self,
         *,
@@ -696,54 +693,10 @@ class IndustryService:
             min_isk_per_hour=min_isk_per_hour,
             min_region_daily_volume=min_region_daily_volume,
         )
-        existing_job = self._find_matching_portfolio_candidates_job(params=params)
-        if existing_job is not None:
-            return {
-                "job_id": str(existing_job.get("job_id") or ""),
-                "created_at": existing_job.get("created_at"),
-                "updated_at": existing_job.get("updated_at"),
-                "progress_label": str(existing_job.get("progress_label") or "Queued"),
-                "progress_meta": dict(existing_job.get("progress_meta") or {}),
-            }
-
-        job_id = str(uuid.uuid4())
-        store = self._get_industry_portfolio_candidates_store()
-        created_at = datetime.now(timezone.utc).isoformat()
-        with store.lock:
-            store.jobs[job_id] = {
-                "job_id": job_id,
-                "request_params": dict(params),
-                "status": "queued",
-                "progress_fraction": 0.0,
-                "progress_label": "Queued",
-                "progress_meta": {
-                    "stage": "queued",
-                    "step": 0,
-                    "step_count": 11,
-                },
-                "created_at": created_at,
-                "updated_at": created_at,
-                "result": None,
-                "result_meta": {},
-                "result_count": 0,
-                "error_message": None,
-            }
-
-        thread = threading.Thread(
-            target=self._run_portfolio_candidates_refresh_job,
-            args=(job_id, params),
-            daemon=True,
-            name=f"industry-portfolio-candidates-{job_id[:8]}",
-        )
-        register_thread(self._state, thread.name, thread)
-        thread.start()
-        return {
-            "job_id": job_id,
-            "created_at": created_at,
-            "updated_at": created_at,
-            "progress_label": "Queued",
-            "progress_meta": {"step": 0, "step_count": 11, "stage": "queued"},
-        }
+        job, created = self._claim_job(store=self._get_industry_portfolio_candidates_store(), params=params, step_count=11)
+        if created:
+            self._dispatch_job(PORTFOLIO_CANDIDATES_JOB_KIND, job, self._run_portfolio_candidates_refresh_job)
+        return self._job_start_response(job)
 
     def _run_portfolio_candidates_refresh_job(self, job_id: str, params: dict[str, Any]) -> None:
         self._update_portfolio_candidates_job(
@@ -798,6 +751,7 @@ class IndustryService:
                 result_meta={
                     "summary": (payload.get("summary") or {}) if isinstance(payload, dict) else {},
                     "pricing_batch": (payload.get("pricing_batch") or {}) if isinstance(payload, dict) else {},
+                    "material_ledger": payload.get("material_ledger") if isinstance(payload, dict) else None,
                 },
             )
         except Exception as e:
@@ -810,12 +764,29 @@ class IndustryService:
 
     def industry_manufacturing_portfolio_candidates_refresh_status(self, *, job_id: str) -> dict[str, Any]:
         store = self._get_industry_portfolio_candidates_store()
+        self._restore_job(PORTFOLIO_CANDIDATES_JOB_KIND, job_id)
         with store.lock:
             job = store.jobs.get(str(job_id))
             if job is None:
                 raise ServiceError(f"Unknown portfolio candidates job: {job_id}", status_code=404)
             return dict(job)
 
+    def industry_manufacturing_portfolio_candidates_refresh_progress(
+        self,
+        *,
+        job_id: str,
+        after_revision: int = -1,
+        wait_seconds: float = 0.0,
+    ) -> dict[str, Any]:
+        self._restore_job(PORTFOLIO_CANDIDATES_JOB_KIND, job_id)
+        return self._wait_for_job_progress(
+            self._get_industry_portfolio_candidates_store(),
+            job_id,
+            job_kind="portfolio candidates job",
+            after_revision=after_revision,
+            wait_seconds=wait_seconds,
+        )
+
     def industry_manufacturing_portfolio_candidate_snapshot(
         self,
         *,
@@ -827,6 +798,7 @@ class IndustryService:
             raise ServiceError("Candidate snapshot id is required.", status_code=400)
 
         store = self._get_industry_portfolio_candidates_store()
+        self._restore_job(PORTFOLIO_CANDIDATES_JOB_KIND, normalized_snapshot_id)
         with store.lock:
             job = store.jobs.get(normalized_snapshot_id)
             if job is None:
@@ -857,6 +829,7 @@ class IndustryService:
             "candidates": list(snapshot_job.get("result") or []),
             "summary": dict(result_meta.get("summary") or {}),
             "pricing_batch": dict(result_meta.get("pricing_batch") or {}),
+            "material_ledger": result_meta.get("material_ledger"),
             "result_count": int(snapshot_job.get("result_count") or 0),
         }
 
@@ -2346,6 +2319,7 @@ class IndustryService:
         industry_profile_id: int | None = None,
         owned_blueprints_scope: str = "all_characters",
         character_id: int | None = None,
+        compare_hubs: list[str] | None = None,
         progress_callback: ProgressCallback | None = None,
     ) -> dict[str, Any]:
         rows = self.industry_manufacturing_product_overview(
@@ -2363,6 +2337,13 @@ class IndustryService:
             character_id=character_id,
             progress_callback=progress_callback,
         )
+        if compare_hubs:
+            rows = self._enrich_product_rows_with_hub_comparison(
+                rows,
+                hubs=compare_hubs,
+                material_price_side=MarketPricingService.normalize_order_side(material_price_side),
+                product_price_side=MarketPricingService.normalize_order_side(product_price_side),
+            )
         return {
             "rows": rows,
             "pricing_batch": self._build_overview_batch_meta(
@@ -2404,6 +2385,71 @@ class IndustryService:
             return 0.0
         return float(owned_quantity) / float(total_quantity)
 
+    @classmethod
+    def _portfolio_input_materials(cls, procurement_materials: Any) -> list[dict[str, Any]]:
+        if not isinstance(procurement_materials, dict):
+            return []
+        inputs: list[dict[str, Any]] = []
+        for material in procurement_materials.values():
+            if not isinstance(material, dict):
+                continue
+            type_id = int(material.get("type_id") or 0)
+            quantity = max(0, int(material.get("quantity") or 0))
+            if type_id <= 0 or quantity <= 0:
+                continue
+            inputs.append({"type_id": type_id, "quantity": quantity, "unit_price": cls._as_float(material.get("unit_price"))})
+        return inputs
+
+    def _portfolio_material_ledger(
+        self,
+        candidates: list[dict[str, Any]],
+        *,
+        owned_blueprints_scope: str,
+        market_hub: str,
+        material_price_side: str,
+    ) -> PortfolioMaterialLedger | None:
+        """Owned stock and market prices of every candidate input, for netting across a plan."""
+        type_ids = sorted(
+            {
+                int(material["type_id"])
+                for candidate in candidates
+                for material in candidate.get("input_materials") or []
+                if isinstance(material, dict)
+            }
+        )
+        if not type_ids:
+            return None
+        try:
+            pricing_service = MarketPricingService(state=self._state, sessions=self._sessions)
+            material_price_map = pricing_service.get_type_price_map(
+                type_ids=type_ids,
+                hub=MarketPricingService.normalize_market_hub(market_hub),
+                side=MarketPricingService.normalize_order_side(material_price_side),
+            )
+            owned_quantity_by_type_id, owned_unit_cost_by_type_id = self._get_owned_item_inventory(
+                owned_blueprints_scope=owned_blueprints_scope,
+                material_price_map=material_price_map,
+            )
+        except Exception as e:
+            logging.warning("Portfolio material ledger unavailable; lines are costed independently: %s", e)
+            return None
+
+        wanted = set(type_ids)
+        market_unit_price_by_type_id: dict[int, float] = {}
+        for type_id in type_ids:
+            unit_price = self._as_float(((material_price_map or {}).get(type_id) or {}).get("unit_price"))
+            if unit_price is not None and unit_price > 0:
+                market_unit_price_by_type_id[type_id] = unit_price
+        return PortfolioMaterialLedger(
+            owned_quantity_by_type_id={
+                int(t): int(q) for t, q in (owned_quantity_by_type_id or {}).items() if int(t) in wanted and int(q) > 0
+            },
+            owned_unit_cost_by_type_id={
+                int(t): float(c) for t, c in (owned_unit_cost_by_type_id or {}).items() if int(t) in wanted and c is not None
+            },
+            market_unit_price_by_type_id=market_unit_price_by_type_id,
+        )
+
     @classmethod
     def _build_portfolio_candidate(
         cls,
@@ -2530,6 +2576,7 @@ class IndustryService:
             "manufacturing_group": row.get("manufacturing_group"),
             "skill_requirements_met": cls._overview_row_skill_requirements_met(row),
             "owned_input_coverage_fraction": owned_input_coverage_fraction,
+            "input_materials": cls._portfolio_input_materials(procurement_materials),
             "confidence_penalty_factor": confidence_penalty_factor,
             "effective_profit_per_batch": effective_profit_per_batch,
             "effective_isk_per_hour": effective_isk_per_hour,
@@ -2633,6 +2680,12 @@ class IndustryService:
                 {"step": 10, "step_count": 11, "stage": "candidates", "rows": len(rows)},
             )
         candidates = self._build_portfolio_candidates(rows, planning_horizon_hours=planning_horizon_hours)
+        material_ledger = self._portfolio_material_ledger(
+            candidates,
+            owned_blueprints_scope=owned_blueprints_scope,
+            market_hub=market_hub,
+            material_price_side=material_price_side,
+        )
         if progress_callback is not None:
             progress_callback(
                 1.0,
@@ -2649,6 +2702,7 @@ class IndustryService:
             "rows": rows,
             "candidates": candidates,
             "pricing_batch": overview_payload.get("pricing_batch") or {},
+            "material_ledger": material_ledger.to_payload() if material_ledger is not None else None,
             "summary": {
                 "row_count": len(rows),
                 "candidate_count": len(candidates),
@@ -5460,7 +5514,7 @@ class IndustryService:
         dict[int, str],
         dict[int, str],
     ]:
-        session: Any = self._sessions.app_session()
+        session: Any = self._app_read_session()
         sde_session: Any = self._sessions.sde_session()
         try:
             characters = self._state.char_manager.get_characters() or []
@@ -5733,7 +5787,7 @@ class IndustryService:
         owned_blueprints_scope: str,
         material_price_map: dict[int, dict[str, Any]] | None = None,
     ) -> tuple[dict[int, int], dict[int, float]]:
-        session: Any = self._sessions.app_session()
+        session: Any = self._app_read_session()
         sde_session: Any = self._sessions.sde_session()
         try:
             characters = self._state.char_manager.get_characters() or []
@@ -7172,6 +7226,93 @@ class IndustryService:
 
         return product_rows
 
+    def _enrich_product_rows_with_hub_comparison(
+        self,
+        product_rows: list[dict[str, Any]],
+        *,
+        hubs: list[str] | None = None,
+        material_price_side: str = "sell",
+        product_price_side: str = "sell",
+    ) -> list[dict[str, Any]]:
+        """Attach per-hub material cost and product price, plus the best hubs, to planned rows.
+
+        Rows are not re-planned: the planned procurement quantities are priced at every
+        hub from one multi-hub price pass per side. Returns new row dicts so cached
+        overview rows stay untouched.
+        """
+        if not product_rows:
+            return product_rows
+
+        def _materials(row: dict[str, Any]) -> list[dict[str, Any]]:
+            manufacturing_job = row.get("manufacturing_job") or {}
+            if not isinstance(manufacturing_job, dict):
+                return []
+            materials = manufacturing_job.get("procurement_materials") or manufacturing_job.get("materials") or {}
+            if not isinstance(materials, dict):
+                return []
+            return [
+                material for material in materials.values()
+                if isinstance(material, dict) and int(material.get("type_id") or 0) > 0 and int(material.get("quantity") or 0) > 0
+            ]
+
+        product_type_ids = sorted({int(row.get("type_id") or 0) for row in product_rows if int(row.get("type_id") or 0) > 0})
+        material_type_ids = sorted({int(material["type_id"]) for row in product_rows for material in _materials(row)})
+        pricing_service = MarketPricingService(state=self._state, sessions=self._sessions)
+        product_prices = pricing_service.get_multi_hub_price_map(type_ids=product_type_ids, hubs=hubs, side=product_price_side)
+        material_prices = pricing_service.get_multi_hub_price_map(type_ids=material_type_ids, hubs=hubs, side=material_price_side)
+        compared_hubs = MarketPricingService.normalize_market_hubs(hubs)
+
+        enriched_rows: list[dict[str, Any]] = []
+        for row in product_rows:
+            materials = _materials(row)
+            product_price_by_hub = product_prices.get(int(row.get("type_id") or 0)) or {}
+            by_hub: dict[str, dict[str, Any]] = {}
+            for hub in compared_hubs:
+                material_cost = 0.0
+                priced_material_count = 0
+                for material in materials:
+                    unit_price = self._as_float(((material_prices.get(int(material["type_id"])) or {}).get(hub) or {}).get("unit_price"))
+                    if unit_price is None:
+                        continue
+                    material_cost += float(unit_price) * int(material["quantity"])
+                    priced_material_count += 1
+                product_price = product_price_by_hub.get(hub) or {}
+                by_hub[hub] = {
+                    "hub_label": product_price.get("hub_label") or hub.title(),
+                    "product_unit_price": self._as_float(product_price.get("unit_price")),
+                    "material_cost": material_cost if materials and priced_material_count == len(materials) else None,
+                    "priced_material_count": priced_material_count,
+                }
+
+            material_best_hub_by_type_id: dict[str, str] = {}
+            for material in materials:
+                prices_by_hub = {
+                    hub: self._as_float((entry or {}).get("unit_price"))
+                    for hub, entry in (material_prices.get(int(material["type_id"])) or {}).items()
+                }
+                priced_hubs = [hub for hub in compared_hubs if prices_by_hub.get(hub) is not None]
+                if priced_hubs:
+                    material_best_hub_by_type_id[str(material["type_id"])] = min(priced_hubs, key=lambda hub: prices_by_hub[hub])
+
+            costed_hubs = [hub for hub in compared_hubs if by_hub[hub]["material_cost"] is not None]
+            selling_hubs = [hub for hub in compared_hubs if by_hub[hub]["product_unit_price"] is not None]
+            best_material_hub = min(costed_hubs, key=lambda hub: by_hub[hub]["material_cost"]) if costed_hubs else None
+            best_sell_hub = max(selling_hubs, key=lambda hub: by_hub[hub]["product_unit_price"]) if selling_hubs else None
+            enriched_rows.append({
+                **row,
+                "hub_comparison": {
+                    "material_price_side": material_price_side,
+                    "product_price_side": product_price_side,
+                    "hubs": by_hub,
+                    "best_material_hub": best_material_hub,
+                    "best_material_cost": by_hub[best_material_hub]["material_cost"] if best_material_hub else None,
+                    "best_sell_hub": best_sell_hub,
+                    "best_sell_unit_price": by_hub[best_sell_hub]["product_unit_price"] if best_sell_hub else None,
+                    "material_best_hub_by_type_id": material_best_hub_by_type_id,
+                },
+            })
+        return enriched_rows
+
     def industry_job_manager_status(self) -> dict:
         mgr = self._ensure_industry_job_manager()
         return mgr.get_status()
@@ -7516,14 +7657,17 @@ class IndustryService:
         """Return active industry jobs and slot capacities, optionally filtered by character."""
         from eve_online_industry_tracker.infrastructure.sde.types import get_type_data
 
-        session: Any = self._sessions.app_session()
-        query = session.query(CharacterIndustryJobsModel).filter(
-            CharacterIndustryJobsModel.status == "active"
-        )
-        if character_id is not None:
-            query = query.filter(CharacterIndustryJobsModel.character_id == int(character_id))
+        session: Any = self._app_read_session()
+        try:
+            query = session.query(CharacterIndustryJobsModel).filter(
+                CharacterIndustryJobsModel.status == "active"
+            )
+            if character_id is not None:
+                query = query.filter(CharacterIndustryJobsModel.character_id == int(character_id))
 
-        jobs = query.all()
+            jobs = query.all()
+        finally:
+            session.close()
 
         # Slot capacities (always include even with no active jobs)
         all_capacities = self._character_slot_capacities()
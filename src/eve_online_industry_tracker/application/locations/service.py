@@ -1,10 +1,31 @@
 from __future__ import annotations
 
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from typing import Any
 
-from eve_online_industry_tracker.infrastructure.models import StructureNameCacheModel
+from eve_online_industry_tracker.infrastructure.models import PublicStructuresModel, StructureNameCacheModel
+from eve_online_industry_tracker.infrastructure.sde.locations import get_npc_station_index
+
+
+# Concurrent /universe/structures/ lookups when resolving a batch of unknown structures.
+_STRUCTURE_LOOKUP_WORKERS = 8
+# A character that got 403/404 for a structure is not asked again for this long.
+_DENIED_TTL_SECONDS = 6 * 3600
+
+# /universe/names/ category -> the ID field of the matching ESI detail payload.
+_CATEGORY_ID_FIELDS = {
+    "station": "station_id",
+    "solar_system": "system_id",
+    "constellation": "constellation_id",
+    "region": "region_id",
+}
+
+_DENIED_LOCK = threading.Lock()
+_DENIED_UNTIL: dict[tuple[int, int], float] = {}
 
 
 def _is_structure_id(location_id: int) -> bool:
@@ -12,6 +33,22 @@ def _is_structure_id(location_id: int) -> bool:
     return isinstance(location_id, int) and location_id >= 1020000000000
 
 
+def _is_denied(structure_id: int, client_key: int, now: float) -> bool:
+    with _DENIED_LOCK:
+        until = _DENIED_UNTIL.get((structure_id, client_key))
+        if until is None:
+            return False
+        if until <= now:
+            _DENIED_UNTIL.pop((structure_id, client_key), None)
+            return False
+        return True
+
+
+def _mark_denied(structure_id: int, client_key: int, now: float) -> None:
+    with _DENIED_LOCK:
+        _DENIED_UNTIL[(structure_id, client_key)] = now + _DENIED_TTL_SECONDS
+
+
 class LocationsService:
     def __init__(self, *, state: Any):
         self._state = state
@@ -25,9 +62,40 @@ class LocationsService:
         return info if info else {}
 
     def get_locations(self, location_ids: list[int]) -> dict[str, dict]:
+        """Resolve many IDs at once.
+
+        NPC stations and other universe IDs come from the SDE station index plus one
+        batched /universe/names/ call; structures from the name caches (one IN query
+        each), and only structures missing there hit ESI, concurrently, across every
+        authorised character.
+        """
         result: dict[str, dict] = {}
-        for location_id in location_ids:
-            info = self._resolve_location(location_id)
+        ids: list[int] = []
+        for raw_id in location_ids:
+            try:
+                location_id = int(raw_id)
+            except (TypeError, ValueError):
+                result[str(raw_id)] = {}
+                continue
+            if str(location_id) not in result:
+                result[str(location_id)] = {}
+                ids.append(location_id)
+
+        structure_ids = [location_id for location_id in ids if _is_structure_id(location_id)]
+        other_ids = [location_id for location_id in ids if not _is_structure_id(location_id) and location_id > 0]
+
+        resolved = self._resolve_universe_ids(other_ids)
+        resolved.update(self._resolve_structures(structure_ids))
+
+        for location_id in ids:
+            info = resolved.get(location_id)
+            if info is None and location_id in other_ids:
+                # Not covered by the batched lookup; fall back to the per-ID ESI path.
+                try:
+                    info = self._resolve_location(location_id)
+                except Exception as e:
+                    logging.debug("Location %s could not be resolved: %s", location_id, e)
+                    info = None
             result[str(location_id)] = info if info else {}
         return result
 
@@ -72,72 +140,160 @@ class LocationsService:
         return None
 
     # ------------------------------------------------------------------
-    # Multi-character ESI fallback
+    # Batched resolution
     # ------------------------------------------------------------------
 
-    def _resolve_structure_via_characters(self, structure_id: int) -> dict | None:
-        """Try each character's authenticated ESI client to resolve a structure name."""
-        char_manager = getattr(self._state, "char_manager", None)
-        if char_manager is None:
-            return None
+    def _resolve_universe_ids(self, location_ids: list[int]) -> dict[int, dict]:
+        """Stations, systems, etc.: SDE station index for metadata, /universe/names/ for names.
+
+        Stations carry the ESI station fields the SDE has; other IDs only their name and ID field.
+        """
+        if not location_ids:
+            return {}
+
+        stations: dict[int, dict] = {}
+        db_sde = getattr(self._state, "db_sde", None)
+        if db_sde is not None:
+            try:
+                index = get_npc_station_index(db_sde.session)
+                stations = {location_id: index[location_id] for location_id in location_ids if location_id in index}
+            except Exception as e:
+                logging.debug("NPC station index unavailable: %s", e)
+
+        get_universe_names = getattr(self._state.esi_service, "get_universe_names", None)
+        if get_universe_names is None:
+            return {}
+        names = get_universe_names(location_ids) or {}
+
+        out: dict[int, dict] = {}
+        for location_id in location_ids:
+            entry = names.get(location_id) or {}
+            if not entry.get("name"):
+                continue
+            info = {"name": entry["name"]}
+            id_field = "station_id" if location_id in stations else _CATEGORY_ID_FIELDS.get(entry.get("category"))
+            if id_field:
+                info[id_field] = location_id
+            info.update(stations.get(location_id) or {})
+            out[location_id] = info
+        return out
 
+    def _resolve_structures(self, structure_ids: list[int]) -> dict[int, dict]:
+        """Name caches first; the rest from ESI across all characters, cached on success."""
+        if not structure_ids:
+            return {}
+
+        out = self._lookup_structure_cache_bulk(structure_ids)
+        missing = [structure_id for structure_id in structure_ids if structure_id not in out]
+        out.update(self._lookup_public_structures_bulk(missing))
+        missing = [structure_id for structure_id in structure_ids if structure_id not in out]
+        if not missing:
+            return out
+
+        clients = self._structure_clients()
+        if not clients:
+            return out
+
+        with ThreadPoolExecutor(max_workers=min(_STRUCTURE_LOOKUP_WORKERS, len(missing))) as ex:
+            fetched = dict(zip(missing, ex.map(lambda structure_id: self._fetch_structure(structure_id, clients), missing)))
+
+        resolved = {structure_id: info for structure_id, info in fetched.items() if info}
+        if resolved:
+            self._cache_structures(resolved)
+            out.update(resolved)
+        return out
+
+    # ------------------------------------------------------------------
+    # Multi-character ESI fallback
+    # ------------------------------------------------------------------
+
+    def _structure_clients(self, *, include_main: bool = True) -> list[tuple[int, Any]]:
+        """(negative-cache key, ESI client) for the main client and every character."""
         main_esi_client = getattr(self._state.esi_service, "_esi_client", None)
-        characters = char_manager.get_characters()
+        clients: list[tuple[int, Any]] = []
+        if include_main and main_esi_client is not None:
+            clients.append((int(getattr(main_esi_client, "character_id", None) or 0), main_esi_client))
 
-        for char in characters:
+        char_manager = getattr(self._state, "char_manager", None)
+        for char in getattr(char_manager, "_character_list", None) or []:
             try:
                 char.ensure_esi()
                 if char.esi_client is main_esi_client:
                     continue
-                data = char.esi_client.esi_get(
+                clients.append((int(char.character_id or 0), char.esi_client))
+            except Exception:
+                continue
+        return clients
+
+    def _fetch_structure(self, structure_id: int, clients: list[tuple[int, Any]]) -> dict | None:
+        """Ask each client in turn, skipping those recently denied for this structure."""
+        for client_key, client in clients:
+            now = time.time()
+            if _is_denied(structure_id, client_key, now):
+                continue
+            try:
+                data = client.esi_get(
                     f"/universe/structures/{structure_id}/",
                     suppress_forbidden_log=True,
                     suppress_not_found_log=True,
                 )
-                if data and isinstance(data, dict) and data.get("name"):
-                    logging.info(
-                        "Resolved structure %s (%s) via character %s",
-                        structure_id,
-                        data.get("name"),
-                        char.character_name,
-                    )
-                    return data
             except Exception:
                 continue
+            if data and isinstance(data, dict) and data.get("name"):
+                return data
+            # ESIClient returns None on 403/404.
+            _mark_denied(structure_id, client_key, now)
         return None
 
+    def _resolve_structure_via_characters(self, structure_id: int) -> dict | None:
+        """Try each character's authenticated ESI client to resolve a structure name."""
+        data = self._fetch_structure(structure_id, self._structure_clients(include_main=False))
+        if data:
+            logging.info("Resolved structure %s (%s) via character fallback", structure_id, data.get("name"))
+        return data
+
     # ------------------------------------------------------------------
     # Persistent structure name cache
     # ------------------------------------------------------------------
 
     def _cache_structure(self, structure_id: int, info: dict) -> None:
         """Upsert a structure name into the persistent cache."""
-        name = info.get("name")
-        if not name:
+        self._cache_structures({structure_id: info})
+
+    def _cache_structures(self, infos: dict[int, dict]) -> None:
+        """Upsert structure names into the persistent cache in one commit."""
+        infos = {structure_id: info for structure_id, info in infos.items() if info.get("name")}
+        if not infos:
             return
         try:
             session = self._state.db_app.session
-            record = session.query(StructureNameCacheModel).filter_by(
-                structure_id=structure_id,
-            ).first()
-            if record:
-                record.name = name
-                record.solar_system_id = info.get("solar_system_id")
-                record.owner_id = info.get("owner_id")
-                record.type_id = info.get("type_id")
-                record.updated_at = datetime.now(timezone.utc)
-            else:
-                record = StructureNameCacheModel(
-                    structure_id=structure_id,
-                    name=name,
-                    solar_system_id=info.get("solar_system_id"),
-                    owner_id=info.get("owner_id"),
-                    type_id=info.get("type_id"),
-                )
-                session.add(record)
+            records = {
+                record.structure_id: record
+                for record in session.query(StructureNameCacheModel)
+                .filter(StructureNameCacheModel.structure_id.in_(list(infos)))
+                .all()
+            }
+            for structure_id, info in infos.items():
+                record = records.get(structure_id)
+                if record:
+                    record.name = info.get("name")
+                    record.solar_system_id = info.get("solar_system_id")
+                    record.owner_id = info.get("owner_id")
+                    record.type_id = info.get("type_id")
+                    record.updated_at = datetime.now(timezone.utc)
+                else:
+                    session.add(
+                        StructureNameCacheModel(
+                            structure_id=structure_id,
+                            name=info.get("name"),
+                            solar_system_id=info.get("solar_system_id"),
+                            owner_id=info.get("owner_id"),
+                            type_id=info.get("type_id"),
+                        )
+                    )
             session.commit()
         except Exception as e:
-            logging.debug("Failed to cache structure %s: %s", structure_id, e)
+            logging.debug("Failed to cache structures %s: %s", sorted(infos), e)
             try:
                 self._state.db_app.session.rollback()
             except Exception:
@@ -145,35 +301,52 @@ class LocationsService:
 
     def _lookup_structure_cache(self, structure_id: int) -> dict | None:
         """Look up a structure name from the persistent cache."""
+        return self._lookup_structure_cache_bulk([structure_id]).get(structure_id)
+
+    def _lookup_structure_cache_bulk(self, structure_ids: list[int]) -> dict[int, dict]:
+        """Look up structure names from the persistent cache (one IN query)."""
         try:
-            record = self._state.db_app.session.query(StructureNameCacheModel).filter_by(
-                structure_id=structure_id,
-            ).first()
-            if record and record.name:
-                return {
-                    "name": record.name,
-                    "solar_system_id": record.solar_system_id,
-                    "owner_id": record.owner_id,
-                    "type_id": record.type_id,
-                }
+            records = (
+                self._state.db_app.session.query(StructureNameCacheModel)
+                .filter(StructureNameCacheModel.structure_id.in_(list(structure_ids)))
+                .all()
+            )
         except Exception:
-            pass
-        return None
+            return {}
+        return {
+            int(record.structure_id): {
+                "name": record.name,
+                "solar_system_id": record.solar_system_id,
+                "owner_id": record.owner_id,
+                "type_id": record.type_id,
+            }
+            for record in records
+            if record.name
+        }
 
     def _lookup_public_structures(self, structure_id: int) -> dict | None:
         """Look up a structure name from the public_structures table."""
+        return self._lookup_public_structures_bulk([structure_id]).get(structure_id)
+
+    def _lookup_public_structures_bulk(self, structure_ids: list[int]) -> dict[int, dict]:
+        """Look up structure names from the public_structures table (one IN query)."""
+        if not structure_ids:
+            return {}
         try:
-            from eve_online_industry_tracker.infrastructure.models import PublicStructuresModel
-            record = self._state.db_app.session.query(PublicStructuresModel).filter_by(
-                structure_id=structure_id,
-            ).first()
-            if record and record.structure_name:
-                return {
-                    "name": record.structure_name,
-                    "solar_system_id": record.system_id,
-                    "owner_id": record.owner_id,
-                    "type_id": record.type_id,
-                }
+            records = (
+                self._state.db_app.session.query(PublicStructuresModel)
+                .filter(PublicStructuresModel.structure_id.in_(list(structure_ids)))
+                .all()
+            )
         except Exception:
-            pass
-        return None
+            return {}
+        return {
+            int(record.structure_id): {
+                "name": record.structure_name,
+                "solar_system_id": record.system_id,
+                "owner_id": record.owner_id,
+                "type_id": record.type_id,
+            }
+            for record in records
+            if record.structure_name
+        }
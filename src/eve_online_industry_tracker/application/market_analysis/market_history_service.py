@@ -9,6 +9,89 @@ from eve_online_industry_tracker.infrastructure.models import MarketHistoryModel
 from eve_online_industry_tracker.infrastructure.session_provider import SessionProvider, StateSessionProvider
 
 
+def _price_stats(records: list[MarketHistoryModel]) -> dict[str, Any]:
+    if not records:
+        return {
+            "has_data": False,
+            "avg_42w": None,
+            "avg_7d": None,
+            "avg_1d": None,
+            "volatility": None,
+            "price_range": None,
+            "trend": None,
+        }
+
+    prices = [float(r.close) for r in records if r.close and r.close > 0]
+    if not prices:
+        return {
+            "has_data": False,
+            "avg_42w": None,
+            "avg_7d": None,
+            "avg_1d": None,
+            "volatility": None,
+            "price_range": None,
+            "trend": None,
+        }
+
+    # 42-week average
+    avg_42w = float(statistics.mean(prices))
+
+    # 7-day average (last 7 records)
+    prices_7d = prices[-7:] if len(prices) >= 7 else prices
+    avg_7d = float(statistics.mean(prices_7d))
+
+    # 1-day (last price)
+    avg_1d = prices[-1] if prices else None
+
+    # Volatility (std dev)
+    volatility = float(statistics.stdev(prices)) if len(prices) > 1 else 0.0
+
+    # Price trend (7d vs 42w)
+    trend_pct = ((avg_7d - avg_42w) / avg_42w * 100) if avg_42w > 0 else 0
+
+    return {
+        "has_data": True,
+        "avg_42w": avg_42w,
+        "avg_7d": avg_7d,
+        "avg_1d": avg_1d,
+        "volatility": volatility,
+        "volatility_pct": (volatility / avg_42w * 100) if avg_42w > 0 else 0,
+        "price_range": {
+            "min": float(min(prices)),
+            "max": float(max(prices)),
+        },
+        "trend_pct": trend_pct,  # positive = trending up
+        "record_count": len(records),
+    }
+
+
+def _volume_stats(records: list[MarketHistoryModel]) -> dict[str, Any]:
+    if not records:
+        return {
+            "has_data": False,
+            "total_volume": 0,
+            "avg_daily_volume": 0,
+            "peak_daily_volume": 0,
+        }
+
+    volumes = [int(r.volume) for r in records if r.volume is not None]
+    if not volumes:
+        return {
+            "has_data": False,
+            "total_volume": 0,
+            "avg_daily_volume": 0,
+            "peak_daily_volume": 0,
+        }
+
+    return {
+        "has_data": True,
+        "total_volume": int(sum(volumes)),
+        "avg_daily_volume": float(statistics.mean(volumes)),
+        "peak_daily_volume": int(max(volumes)),
+        "record_count": len(records),
+    }
+
+
 class MarketHistoryService:
     """Fetch, store, and analyze historical market price data."""
 
@@ -95,59 +178,7 @@ class MarketHistoryService:
                 )
             ).order_by(MarketHistoryModel.date).all()
 
-            if not records:
-                return {
-                    "has_data": False,
-                    "avg_42w": None,
-                    "avg_7d": None,
-                    "avg_1d": None,
-                    "volatility": None,
-                    "price_range": None,
-                    "trend": None,
-                }
-
-            prices = [float(r.close) for r in records if r.close and r.close > 0]
-            if not prices:
-                return {
-                    "has_data": False,
-                    "avg_42w": None,
-                    "avg_7d": None,
-                    "avg_1d": None,
-                    "volatility": None,
-                    "price_range": None,
-                    "trend": None,
-                }
-
-            # 42-week average
-            avg_42w = float(statistics.mean(prices))
-
-            # 7-day average (last 7 records)
-            prices_7d = prices[-7:] if len(prices) >= 7 else prices
-            avg_7d = float(statistics.mean(prices_7d))
-
-            # 1-day (last price)
-            avg_1d = prices[-1] if prices else None
-
-            # Volatility (std dev)
-            volatility = float(statistics.stdev(prices)) if len(prices) > 1 else 0.0
-
-            # Price trend (7d vs 42w)
-            trend_pct = ((avg_7d - avg_42w) / avg_42w * 100) if avg_42w > 0 else 0
-
-            return {
-                "has_data": True,
-                "avg_42w": avg_42w,
-                "avg_7d": avg_7d,
-                "avg_1d": avg_1d,
-                "volatility": volatility,
-                "volatility_pct": (volatility / avg_42w * 100) if avg_42w > 0 else 0,
-                "price_range": {
-                    "min": float(min(prices)),
-                    "max": float(max(prices)),
-                },
-                "trend_pct": trend_pct,  # positive = trending up
-                "record_count": len(records),
-            }
+            return _price_stats(records)
         finally:
             try:
                 app_session.close()
@@ -175,29 +206,41 @@ class MarketHistoryService:
                 )
             ).order_by(MarketHistoryModel.date).all()
 
-            if not records:
-                return {
-                    "has_data": False,
-                    "total_volume": 0,
-                    "avg_daily_volume": 0,
-                    "peak_daily_volume": 0,
-                }
-
-            volumes = [int(r.volume) for r in records if r.volume is not None]
-            if not volumes:
-                return {
-                    "has_data": False,
-                    "total_volume": 0,
-                    "avg_daily_volume": 0,
-                    "peak_daily_volume": 0,
-                }
+            return _volume_stats(records)
+        finally:
+            try:
+                app_session.close()
+            except Exception:
+                pass
+
+    def get_market_stats_bulk(
+        self,
+        *,
+        type_ids: list[int],
+        region_id: int = 10000002,
+        days: int = 42 * 7,
+    ) -> dict[int, tuple[dict[str, Any], dict[str, Any]]]:
+        """``(get_price_stats, get_volume_stats)`` per type_id from a single history query."""
+        ids = sorted({int(type_id) for type_id in type_ids or []})
+        if not ids:
+            return {}
+        app_session = self._sessions.app_session()
+        try:
+            cutoff_str = (datetime.utcnow() - timedelta(days=days)).date().isoformat()
+            records = app_session.query(MarketHistoryModel).filter(
+                and_(
+                    MarketHistoryModel.type_id.in_(ids),
+                    MarketHistoryModel.region_id == region_id,
+                    MarketHistoryModel.date >= cutoff_str,
+                )
+            ).order_by(MarketHistoryModel.type_id, MarketHistoryModel.date).all()
 
+            records_by_type: dict[int, list[MarketHistoryModel]] = {type_id: [] for type_id in ids}
+            for record in records:
+                records_by_type[int(record.type_id)].append(record)
             return {
-                "has_data": True,
-                "total_volume": int(sum(volumes)),
-                "avg_daily_volume": float(statistics.mean(volumes)),
-                "peak_daily_volume": int(max(volumes)),
-                "record_count": len(records),
+                type_id: (_price_stats(type_records), _volume_stats(type_records))
+                for type_id, type_records in records_by_type.items()
             }
         finally:
             try:
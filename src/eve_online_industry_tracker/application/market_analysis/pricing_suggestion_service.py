@@ -4,10 +4,10 @@ import json
 import logging
 import math
 import statistics
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Any
 
-from sqlalchemy import and_
+from sqlalchemy import and_, func, select
 from eve_online_industry_tracker.application.industry.sales_history_service import SalesHistoryService
 from eve_online_industry_tracker.application.market_analysis.market_history_service import MarketHistoryService
 from eve_online_industry_tracker.application.market_pricing import MarketPricingService
@@ -18,6 +18,13 @@ from eve_online_industry_tracker.infrastructure.session_provider import SessionP
 class PricingSuggestionService:
     """Suggest optimal sell prices based on market data and sales history."""
 
+    # Stored order-book snapshots stand in for a stale view cache up to this age.
+    _SNAPSHOT_FALLBACK_MAX_AGE_SECONDS = 6 * 3600
+    # Trailing window for undercut counts and depth-based sell-through.
+    _ORDERBOOK_HISTORY_WINDOW_SECONDS = 24 * 3600
+    # Best-price undercuts per window at which an undercut is not expected to hold.
+    _FREQUENT_UNDERCUTS = 6
+
     def __init__(self, *, state: Any, sessions: SessionProvider | None = None):
         self._state = state
         self._sessions = sessions or StateSessionProvider(state=state)
@@ -41,21 +48,153 @@ class PricingSuggestionService:
         my_sales = self._sales_history.suggest_sell_price(character_id=character_id, type_id=type_id)
         market_data = self._market_history.get_price_stats(type_id=type_id, region_id=region_id)
         volume_data = self._market_history.get_volume_stats(type_id=type_id, region_id=region_id)
-        cost_basis, acquisition_source, cost_source = self._get_cost_basis(
+        cost_basis_info = self._get_cost_basis(
             character_id=character_id, type_id=type_id, fallback_price=current_price
         )
         hub_price = self._get_hub_price(type_id=type_id, hub=hub)
         hub_buy_price = self._get_hub_buy_price(type_id=type_id, hub=hub)
         sales_tax, broker_fee = self._get_fees(character_id=character_id)
         raw_orderbook = self._get_orderbook_levels(type_id=type_id, region_id=region_id)
-        orderbook_levels = self._filter_orderbook_outliers(raw_orderbook)
+        orderbook_history = self._get_orderbook_history_bulk(type_ids=[type_id], hub=hub).get(int(type_id))
         min_target_margin = self._get_min_target_margin()
 
         fill_rate = self._get_fill_rate_velocity(
             character_id=character_id, type_id=type_id,
             current_price=current_price, lookback_days=90,
         )
-        seller_concentration = self._get_seller_concentration(orderbook_levels=orderbook_levels)
+        return self._build_suggestion(
+            current_price=current_price,
+            quantity=quantity,
+            order_duration_days=order_duration_days,
+            days_remaining=days_remaining,
+            my_sales=my_sales,
+            market_data=market_data,
+            volume_data=volume_data,
+            cost_basis_info=cost_basis_info,
+            hub_price=hub_price,
+            hub_buy_price=hub_buy_price,
+            sales_tax=sales_tax,
+            broker_fee=broker_fee,
+            raw_orderbook=raw_orderbook,
+            min_target_margin=min_target_margin,
+            fill_rate=fill_rate,
+            orderbook_history=orderbook_history,
+        )
+
+    def suggest_prices_bulk(
+        self,
+        *,
+        orders: list[dict[str, Any]],
+        hub: str = "jita",
+        region_id: int = 10000002,
+    ) -> dict[int, dict[str, Any]]:
+        """``suggest_price`` for many sell orders at once, keyed by order_id.
+
+        Each order needs ``order_id``, ``character_id``, ``type_id`` and ``price``, and may
+        carry ``quantity``, ``order_duration_days`` and ``days_remaining``. Inputs are
+        prefetched per source for all orders (one history query, one hub price read per
+        side, one orderbook query plus one snapshot read each for missing books and depth
+        history; sales, cost basis and fees once per character), so the
+        cost no longer grows with a query round-trip per order. Orders whose suggestion
+        fails are left out.
+        """
+        valid_orders = [
+            order for order in orders or []
+            if isinstance(order.get("order_id"), int)
+            and isinstance(order.get("character_id"), int)
+            and isinstance(order.get("type_id"), int)
+        ]
+        if not valid_orders:
+            return {}
+
+        type_ids = sorted({int(order["type_id"]) for order in valid_orders})
+        market_stats = self._market_history.get_market_stats_bulk(type_ids=type_ids, region_id=region_id)
+        hub_prices = self._get_hub_price_map(type_ids=type_ids, hub=hub, side="sell")
+        hub_buy_prices = self._get_hub_price_map(type_ids=type_ids, hub=hub, side="buy")
+        orderbooks = self._get_orderbook_levels_bulk(type_ids=type_ids, region_id=region_id)
+        orderbook_histories = self._get_orderbook_history_bulk(type_ids=type_ids, hub=hub)
+        min_target_margin = self._get_min_target_margin()
+
+        type_ids_by_character: dict[int, set[int]] = {}
+        for order in valid_orders:
+            type_ids_by_character.setdefault(int(order["character_id"]), set()).add(int(order["type_id"]))
+
+        sales_cutoff = (datetime.utcnow() - timedelta(days=30)).isoformat()
+        sold_history: dict[int, dict[int, list[dict[str, Any]]]] = {}
+        cost_rows: dict[int, tuple[dict[int, list[Any]], dict[int, Any]]] = {}
+        fees: dict[int, tuple[float, float]] = {}
+        for character_id, character_type_ids in type_ids_by_character.items():
+            sold_history[character_id] = self._sales_history.get_sold_history_bulk(
+                character_id=character_id, type_ids=sorted(character_type_ids), days=90
+            )
+            cost_rows[character_id] = self._get_cost_basis_rows_bulk(
+                character_id=character_id, type_ids=sorted(character_type_ids)
+            )
+            fees[character_id] = self._get_fees(character_id=character_id)
+
+        no_stats = ({"has_data": False}, {"has_data": False})
+        suggestions: dict[int, dict[str, Any]] = {}
+        for order in valid_orders:
+            character_id = int(order["character_id"])
+            type_id = int(order["type_id"])
+            try:
+                current_price = float(order.get("price") or 0.0)
+                history_90d = sold_history[character_id].get(type_id, [])
+                history_30d = [tx for tx in history_90d if tx["date"] and tx["date"] >= sales_cutoff]
+                assets_by_type, history_rows = cost_rows[character_id]
+                market_data, volume_data = market_stats.get(type_id, no_stats)
+                sales_tax, broker_fee = fees[character_id]
+                suggestions[int(order["order_id"])] = self._build_suggestion(
+                    current_price=current_price,
+                    quantity=int(order.get("quantity") or 0),
+                    order_duration_days=int(order.get("order_duration_days") or 90),
+                    days_remaining=order.get("days_remaining"),
+                    my_sales=self._sales_history.suggest_sell_price_from_history(history_30d),
+                    market_data=market_data,
+                    volume_data=volume_data,
+                    cost_basis_info=self._cost_basis_from_rows(
+                        assets=assets_by_type.get(type_id, []),
+                        history_row=history_rows.get(type_id),
+                        fallback_price=current_price,
+                    ),
+                    hub_price=hub_prices.get(type_id),
+                    hub_buy_price=hub_buy_prices.get(type_id),
+                    sales_tax=sales_tax,
+                    broker_fee=broker_fee,
+                    raw_orderbook=list(orderbooks.get(type_id, [])),
+                    min_target_margin=min_target_margin,
+                    fill_rate=self._fill_rate_from_history(history_90d, current_price=current_price, lookback_days=90),
+                    orderbook_history=orderbook_histories.get(type_id),
+                )
+            except Exception as exc:
+                logging.debug(f"suggest_prices_bulk error (order_id={order.get('order_id')}): {exc}")
+        return suggestions
+
+    def _build_suggestion(
+        self,
+        *,
+        current_price: float,
+        quantity: int,
+        order_duration_days: int,
+        days_remaining: int | None,
+        my_sales: dict[str, Any],
+        market_data: dict[str, Any],
+        volume_data: dict[str, Any],
+        cost_basis_info: tuple[float | None, str | None, str | None],
+        hub_price: float | None,
+        hub_buy_price: float | None,
+        sales_tax: float,
+        broker_fee: float,
+        raw_orderbook: list[list[float]],
+        min_target_margin: float,
+        fill_rate: dict[str, Any] | None,
+        orderbook_history: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        cost_basis, acquisition_source, cost_source = cost_basis_info
+        orderbook_levels = self._filter_orderbook_outliers(raw_orderbook)
+        seller_concentration = self._get_seller_concentration(
+            orderbook_levels=orderbook_levels, orderbook_history=orderbook_history
+        )
 
         breakdown = self._calculate_breakdown(
             my_sales=my_sales,
@@ -72,6 +211,9 @@ class PricingSuggestionService:
         confidence = self._assess_confidence(my_sales, market_data, volume_data, cost_basis)
 
         avg_daily_vol = float(volume_data.get("avg_daily_volume", 0)) if volume_data.get("has_data") else 0.0
+        if avg_daily_vol <= 0 and (orderbook_history or {}).get("volume_removed_per_day"):
+            # No regional history yet: use how fast the hub book has been drained instead.
+            avg_daily_vol = float(orderbook_history["volume_removed_per_day"])
         break_even = self._calc_break_even(cost_basis=cost_basis, sales_tax=sales_tax, broker_fee=broker_fee)
         min_target_price = self._calc_min_target_price(
             cost_basis=cost_basis, sales_tax=sales_tax, broker_fee=broker_fee,
@@ -202,6 +344,7 @@ class PricingSuggestionService:
             "price_band": price_band,
             "fill_rate_velocity": fill_rate,
             "seller_concentration": seller_concentration,
+            "orderbook_history": orderbook_history,
             "expiry_urgency": expiry_urgency,
             "expiry_urgency_detail": expiry_urgency_detail if expiry_urgency else None,
             "outlier_levels_removed": len(raw_orderbook) - len(orderbook_levels),
@@ -228,6 +371,14 @@ class PricingSuggestionService:
             logging.debug(f"_get_hub_buy_price error (type_id={type_id}): {exc}")
         return None
 
+    def _get_hub_price_map(self, *, type_ids: list[int], hub: str, side: str) -> dict[int, float | None]:
+        try:
+            price_map = self._market_pricing.get_type_price_map(type_ids=type_ids, hub=hub, side=side)
+        except Exception as exc:
+            logging.debug(f"_get_hub_price_map error ({side}, {len(type_ids)} types): {exc}")
+            return {}
+        return {int(type_id): float(row.get("unit_price") or 0) or None for type_id, row in price_map.items()}
+
     def _get_cost_basis(
         self, *, character_id: int, type_id: int, fallback_price: float | None = None
     ) -> tuple[float | None, str | None, str | None]:
@@ -240,51 +391,115 @@ class PricingSuggestionService:
                 )
             ).all()
 
-            if assets:
-                total_cost = 0.0
-                total_quantity = 0
-                sources: set[str] = set()
-                for asset in assets:
-                    cost = asset.acquisition_unit_cost
-                    qty = asset.quantity
-                    if cost and cost > 0 and qty and qty > 0:
-                        total_cost += cost * qty
-                        total_quantity += qty
-                    if asset.acquisition_source:
-                        sources.add(asset.acquisition_source)
-                if total_quantity > 0:
-                    avg_cost = total_cost / total_quantity
-                    source = (
-                        "manufactured" if "manufactured" in sources
-                        else "bought" if "bought" in sources or "market" in sources
-                        else list(sources)[0] if sources else None
+            history_row = None
+            if not self._asset_cost_basis(assets):
+                history_row = (
+                    app_session.query(CharacterAssetHistoryModel)
+                    .filter(
+                        and_(
+                            CharacterAssetHistoryModel.character_id == character_id,
+                            CharacterAssetHistoryModel.type_id == type_id,
+                            CharacterAssetHistoryModel.acquisition_unit_cost.isnot(None),
+                        )
                     )
-                    return avg_cost, source, "asset"
+                    .order_by(CharacterAssetHistoryModel.observed_at.desc())
+                    .first()
+                )
+            return self._cost_basis_from_rows(assets=assets, history_row=history_row, fallback_price=fallback_price)
+        finally:
+            try:
+                app_session.close()
+            except Exception:
+                pass
 
-            history_row = (
-                app_session.query(CharacterAssetHistoryModel)
-                .filter(
-                    and_(
+    def _get_cost_basis_rows_bulk(
+        self, *, character_id: int, type_ids: list[int]
+    ) -> tuple[dict[int, list[Any]], dict[int, Any]]:
+        """Asset rows and the latest costed asset-history row per type, in two queries."""
+        app_session = self._sessions.app_session()
+        try:
+            assets_by_type: dict[int, list[Any]] = {}
+            for asset in app_session.query(CharacterAssetsModel).filter(
+                and_(
+                    CharacterAssetsModel.character_id == character_id,
+                    CharacterAssetsModel.type_id.in_(type_ids),
+                )
+            ).all():
+                assets_by_type.setdefault(int(asset.type_id), []).append(asset)
+
+            missing = [type_id for type_id in type_ids if not self._asset_cost_basis(assets_by_type.get(type_id, []))]
+            history_rows: dict[int, Any] = {}
+            if missing:
+                ranked = (
+                    select(
+                        CharacterAssetHistoryModel.type_id,
+                        CharacterAssetHistoryModel.acquisition_unit_cost,
+                        CharacterAssetHistoryModel.acquisition_source,
+                        func.row_number()
+                        .over(
+                            partition_by=CharacterAssetHistoryModel.type_id,
+                            order_by=CharacterAssetHistoryModel.observed_at.desc(),
+                        )
+                        .label("rank"),
+                    )
+                    .where(
                         CharacterAssetHistoryModel.character_id == character_id,
-                        CharacterAssetHistoryModel.type_id == type_id,
+                        CharacterAssetHistoryModel.type_id.in_(missing),
                         CharacterAssetHistoryModel.acquisition_unit_cost.isnot(None),
                     )
+                    .subquery()
                 )
-                .order_by(CharacterAssetHistoryModel.observed_at.desc())
-                .first()
-            )
-            if history_row and history_row.acquisition_unit_cost and history_row.acquisition_unit_cost > 0:
-                return float(history_row.acquisition_unit_cost), history_row.acquisition_source or "unknown", "asset_history"
-
-            if fallback_price and fallback_price > 0:
-                return fallback_price, "market_order_fallback", "market_order_fallback"
-            return None, None, None
+                for row in app_session.execute(
+                    select(ranked.c.type_id, ranked.c.acquisition_unit_cost, ranked.c.acquisition_source).where(
+                        ranked.c.rank == 1
+                    )
+                ):
+                    history_rows[int(row.type_id)] = row
+            return assets_by_type, history_rows
         finally:
             try:
                 app_session.close()
             except Exception:
                 pass
 
+    @staticmethod
+    def _asset_cost_basis(assets: list[Any]) -> tuple[float, str | None] | None:
+        total_cost = 0.0
+        total_quantity = 0
+        sources: set[str] = set()
+        for asset in assets:
+            cost = asset.acquisition_unit_cost
+            qty = asset.quantity
+            if cost and cost > 0 and qty and qty > 0:
+                total_cost += cost * qty
+                total_quantity += qty
+            if asset.acquisition_source:
+                sources.add(asset.acquisition_source)
+        if total_quantity <= 0:
+            return None
+        source = (
+            "manufactured" if "manufactured" in sources
+            else "bought" if "bought" in sources or "market" in sources
+            else list(sources)[0] if sources else None
+        )
+        return total_cost / total_quantity, source
+
+    @classmethod
+    def _cost_basis_from_rows(
+        cls, *, assets: list[Any], history_row: Any, fallback_price: float | None
+    ) -> tuple[float | None, str | None, str | None]:
+        asset_basis = cls._asset_cost_basis(assets)
+        if asset_basis is not None:
+            avg_cost, source = asset_basis
+            return avg_cost, source, "asset"
+
+        if history_row is not None and history_row.acquisition_unit_cost and history_row.acquisition_unit_cost > 0:
+            return float(history_row.acquisition_unit_cost), history_row.acquisition_source or "unknown", "asset_history"
+
+        if fallback_price and fallback_price > 0:
+            return fallback_price, "market_order_fallback", "market_order_fallback"
+        return None, None, None
+
     def _get_fees(self, *, character_id: int) -> tuple[float, float]:
         try:
             app_session = self._sessions.app_session()
@@ -319,7 +534,56 @@ class PricingSuggestionService:
                 app_session.close()
         except Exception as exc:
             logging.debug(f"_get_orderbook_levels error (type_id={type_id}): {exc}")
-        return []
+        return self._get_snapshot_levels(type_ids=[type_id]).get(int(type_id), [])
+
+    def _get_orderbook_levels_bulk(self, *, type_ids: list[int], region_id: int = 10000002) -> dict[int, list[list[float]]]:
+        try:
+            from eve_online_industry_tracker.infrastructure.persistence.market_orderbook_cache_repo import (
+                get_cached_orderbook_levels_bulk,
+            )
+            app_session = self._sessions.app_session()
+            try:
+                cached = get_cached_orderbook_levels_bulk(
+                    app_session,
+                    hub="jita", region_id=region_id, station_id=60003760,
+                    side="sell", type_ids=type_ids, at_hub=True, ttl_seconds=3600,
+                )
+                out = {type_id: sorted(levels, key=lambda lv: lv[0]) for type_id, (levels, _) in cached.items()}
+            finally:
+                app_session.close()
+        except Exception as exc:
+            logging.debug(f"_get_orderbook_levels_bulk error ({len(type_ids)} types): {exc}")
+            out = {}
+        missing = [type_id for type_id in type_ids if int(type_id) not in out]
+        if missing:
+            out.update(self._get_snapshot_levels(type_ids=missing))
+        return out
+
+    def _get_snapshot_levels(self, *, type_ids: list[int]) -> dict[int, list[list[float]]]:
+        """Recent Jita sell books from the snapshot history, for types whose view cache is stale."""
+        try:
+            books = self._market_pricing.get_orderbook_snapshots_at(
+                type_ids=type_ids, hub="jita", side="sell",
+                max_age_seconds=self._SNAPSHOT_FALLBACK_MAX_AGE_SECONDS,
+            )
+        except Exception as exc:
+            logging.debug(f"_get_snapshot_levels error ({len(type_ids)} types): {exc}")
+            return {}
+        return {
+            type_id: sorted(([float(price), int(volume)] for price, volume in book["levels"]), key=lambda lv: lv[0])
+            for type_id, book in books.items()
+            if book.get("levels")
+        }
+
+    def _get_orderbook_history_bulk(self, *, type_ids: list[int], hub: str = "jita") -> dict[int, dict[str, Any]]:
+        try:
+            return self._market_pricing.get_orderbook_depth_deltas(
+                type_ids=type_ids, hub=hub, side="sell",
+                window_seconds=self._ORDERBOOK_HISTORY_WINDOW_SECONDS,
+            )
+        except Exception as exc:
+            logging.debug(f"_get_orderbook_history_bulk error ({len(type_ids)} types): {exc}")
+            return {}
 
     def _get_min_target_margin(self) -> float:
         try:
@@ -421,12 +685,19 @@ class PricingSuggestionService:
 
     # ── Market microstructure signals ─────────────────────────────────────────
 
-    def _get_seller_concentration(self, *, orderbook_levels: list[list[float]]) -> dict[str, Any]:
+    def _get_seller_concentration(
+        self,
+        *,
+        orderbook_levels: list[list[float]],
+        orderbook_history: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
         """Detect sniper risk by measuring how concentrated the front of the queue is.
 
         In EVE a single seller can instantly reset the queue by repricing. We use
         front-level volume fraction as a proxy: if one or two levels own >60-80%
-        of visible supply, the advised aggressive undercut may not last.
+        of visible supply, the advised aggressive undercut may not last. When the
+        snapshot history shows the best price being undercut over and over, the
+        same applies regardless of how the volume is spread.
         """
         if not orderbook_levels:
             return {"sniper_risk": False, "risk_label": "No orderbook data", "note": ""}
@@ -454,12 +725,22 @@ class PricingSuggestionService:
             risk_label = "Distributed"
             note = "Multiple sellers at varied levels — normal market"
 
+        recent_undercuts = int(orderbook_history["undercuts"]) if orderbook_history else None
+        if not sniper_risk and recent_undercuts is not None and recent_undercuts >= self._FREQUENT_UNDERCUTS:
+            sniper_risk = True
+            risk_label = "Frequent undercutting"
+            note = (
+                f"Best price was undercut {recent_undercuts} times in the last "
+                f"{self._ORDERBOOK_HISTORY_WINDOW_SECONDS // 3600}h — an undercut is unlikely to hold"
+            )
+
         return {
             "sniper_risk": sniper_risk,
             "front_1_volume_pct": round(front_1_fraction * 100, 1),
             "front_2_volume_pct": round(front_2_fraction * 100, 1),
             "num_price_levels": num_levels,
             "total_visible_volume": int(total_vol),
+            "recent_undercuts": recent_undercuts,
             "risk_label": risk_label,
             "note": note,
         }
@@ -484,6 +765,12 @@ class PricingSuggestionService:
         history = self._sales_history.get_sold_history(
             character_id=character_id, type_id=type_id, days=lookback_days
         )
+        return self._fill_rate_from_history(history, current_price=current_price, lookback_days=lookback_days)
+
+    @staticmethod
+    def _fill_rate_from_history(
+        history: list[dict[str, Any]], *, current_price: float, lookback_days: int = 90
+    ) -> dict[str, Any] | None:
         if len(history) < 2:
             return None
 
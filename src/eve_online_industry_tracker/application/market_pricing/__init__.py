@@ -1,3 +1,4 @@
+from .price_warmer import MarketPriceWarmer
 from .service import MarketPricingService
 
-__all__ = ["MarketPricingService"]
+__all__ = ["MarketPriceWarmer", "MarketPricingService"]
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+import logging
+import threading
+import time
+from typing import Any
+
+from flask_app.background_jobs import register_thread
+
+from eve_online_industry_tracker.config.admin_settings import ADMIN_SETTINGS_SCHEMA
+from eve_online_industry_tracker.infrastructure.persistence import market_working_set_repo
+from eve_online_industry_tracker.infrastructure.session_provider import SessionProvider, StateSessionProvider
+
+from .service import MarketPricingService
+
+
+class MarketPriceWarmer:
+    """Background refresher that keeps hub prices for the working set warm.
+
+    The working set is every product and material in the blueprint overview plus
+    whatever is owned or on an open order. Each cycle refetches the types whose cached
+    hub view is within ``lead_seconds`` of the price-cache TTL, oldest first, in small
+    batches with a pause in between, so ``get_type_price_map`` calls from users mostly
+    read a fresh cache instead of fanning out to ESI inline.
+    """
+
+    _THREAD_NAME = "market-price-warmer"
+    # Background warming stops for the cycle this far above the ESI low watermark,
+    # leaving the remaining error budget to interactive requests.
+    _ERROR_BUDGET_HEADROOM_FACTOR = 2
+
+    def __init__(self, *, state: Any, sessions: SessionProvider | None = None):
+        self._state = state
+        self._sessions = sessions or StateSessionProvider(state=state)
+
+        self._thread_lock = threading.Lock()
+        self._status_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._last_cycle: dict[str, Any] = {}
+        self._last_error: str | None = None
+
+    def start(self) -> None:
+        with self._thread_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+
+            self._thread = threading.Thread(
+                target=self._run,
+                daemon=True,
+                name=self._THREAD_NAME,
+            )
+            register_thread(self._state, self._THREAD_NAME, self._thread)
+            self._thread.start()
+
+    def get_status(self) -> dict[str, Any]:
+        with self._status_lock:
+            return {
+                "running": bool(self._thread is not None and self._thread.is_alive()),
+                "last_cycle": dict(self._last_cycle),
+                "last_error": self._last_error,
+            }
+
+    def _setting(self, key: str) -> Any:
+        admin = getattr(self._state, "admin_settings", None)
+        if admin:
+            return admin.get("price_warmer", key)
+        return ADMIN_SETTINGS_SCHEMA["price_warmer"]["settings"][key]["default"]
+
+    def _run(self) -> None:
+        shutdown_event = self._state.shutdown_event
+        while not shutdown_event.wait(float(self._setting("check_interval_seconds"))):
+            try:
+                self.warm_once()
+            except Exception as e:
+                with self._status_lock:
+                    self._last_error = str(e)
+                logging.warning("Market price warmer cycle failed: %s", e, exc_info=True)
+
+    # ------------------------------------------------------------------
+    # Working set
+    # ------------------------------------------------------------------
+
+    def _blueprint_type_ids(self) -> tuple[set[int], set[int]]:
+        """(product type_ids, material type_ids) from the industry job manager snapshot."""
+        manager = getattr(self._state, "industry_job_manager", None)
+        if manager is None:
+            return set(), set()
+
+        products: set[int] = set()
+        materials: set[int] = set()
+        for row in manager.get_blueprint_overview():
+            for job_name in ("manufacturing_job", "reaction_job", "invention_job"):
+                job = row.get(job_name)
+                if not isinstance(job, dict):
+                    continue
+                if job_name != "invention_job":
+                    products.update(
+                        int(entry.get("type_id") or 0) for entry in (job.get("products") or []) if isinstance(entry, dict)
+                    )
+                materials.update(
+                    int(entry.get("type_id") or 0) for entry in (job.get("materials") or []) if isinstance(entry, dict)
+                )
+        products.discard(0)
+        materials.discard(0)
+        return products, materials
+
+    def _owned_type_ids(self) -> set[int]:
+        app_session = self._sessions.app_session()
+        try:
+            return market_working_set_repo.list_owned_and_ordered_type_ids(app_session)
+        finally:
+            try:
+                app_session.close()
+            except Exception:
+                pass
+
+    def working_set(self, pricing: MarketPricingService) -> dict[tuple[str, str], set[int]]:
+        """type_ids to keep warm per (hub, side), following the configured price sources."""
+        products, materials = self._blueprint_type_ids()
+        sources = pricing.configured_price_sources()
+        targets: dict[tuple[str, str], set[int]] = {}
+        targets.setdefault(sources["product"], set()).update(products | self._owned_type_ids())
+        targets.setdefault(sources["material"], set()).update(materials)
+        return targets
+
+    # ------------------------------------------------------------------
+    # Warming
+    # ------------------------------------------------------------------
+
+    def _error_budget_low(self) -> bool:
+        error_budget = getattr(getattr(self._state, "esi_service", None), "error_budget", None)
+        if not callable(error_budget):
+            return False
+        remain, _ = error_budget()
+        if remain is None:
+            return False
+        admin = getattr(self._state, "admin_settings", None)
+        low_watermark = (
+            int(admin.get("esi_resilience", "esi_error_budget_low_watermark"))
+            if admin
+            else int(ADMIN_SETTINGS_SCHEMA["esi_resilience"]["settings"]["esi_error_budget_low_watermark"]["default"])
+        )
+        return int(remain) <= low_watermark * self._ERROR_BUDGET_HEADROOM_FACTOR
+
+    def due_type_ids(
+        self,
+        pricing: MarketPricingService,
+        *,
+        hub: str,
+        side: str,
+        type_ids: set[int],
+        now: float,
+    ) -> list[int]:
+        """Types never cached or within ``lead_seconds`` of expiry, oldest first."""
+        fetched_at = pricing.get_cached_view_ages(hub=hub, side=side)
+        refresh_after = max(0, pricing.material_price_cache_ttl_seconds() - int(self._setting("lead_seconds")))
+        due = [
+            type_id
+            for type_id in type_ids
+            if type_id not in fetched_at or now - fetched_at[type_id] >= refresh_after
+        ]
+        return sorted(due, key=lambda type_id: (fetched_at.get(type_id, 0.0), type_id))
+
+    def warm_once(self) -> dict[str, Any]:
+        """Run one warming cycle; returns per-(hub, side) due and refreshed counts."""
+        started_at = datetime.now(timezone.utc)
+        if getattr(self._state, "esi_service", None) is None:
+            return {}
+
+        pricing = MarketPricingService(state=self._state, sessions=self._sessions)
+        batch_size = max(1, int(self._setting("batch_size")))
+        pause_seconds = float(self._setting("pause_seconds"))
+        shutdown_event = getattr(self._state, "shutdown_event", None)
+
+        summary: dict[str, Any] = {}
+        for (hub, side), type_ids in self.working_set(pricing).items():
+            due = self.due_type_ids(pricing, hub=hub, side=side, type_ids=type_ids, now=time.time())
+            refreshed = 0
+            for start in range(0, len(due), batch_size):
+                if shutdown_event is not None and shutdown_event.is_set():
+                    break
+                if self._error_budget_low():
+                    logging.info("Market price warmer paused: ESI error budget is low")
+                    break
+                refreshed += pricing.refresh_type_prices(type_ids=due[start : start + batch_size], hub=hub, side=side)
+                if pause_seconds > 0 and start + batch_size < len(due) and shutdown_event is not None:
+                    if shutdown_event.wait(pause_seconds):
+                        break
+            summary[f"{hub}:{side}"] = {"working_set": len(type_ids), "due": len(due), "refreshed": refreshed}
+
+        if any(entry["refreshed"] for entry in summary.values()):
+            logging.info("Market price warmer refreshed %s", summary)
+        with self._status_lock:
+            self._last_cycle = {
+                "started_at": started_at.isoformat(),
+                "finished_at": datetime.now(timezone.utc).isoformat(),
+                "sources": summary,
+            }
+            self._last_error = None
+        return summary
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import logging
 import statistics
 import time
 import threading
 from typing import Any, Callable
 
+from eve_online_industry_tracker.config.admin_settings import ADMIN_SETTINGS_SCHEMA
+from eve_online_industry_tracker.infrastructure.persistence import market_orderbook_snapshot_repo
 from eve_online_industry_tracker.infrastructure.persistence import market_orderbook_view_cache_repo as market_orderbook_cache_repo
 from eve_online_industry_tracker.infrastructure.session_provider import SessionProvider, StateSessionProvider
 
@@ -25,6 +28,10 @@ class MarketPricingService:
     _region_volume_cache_lock = threading.Lock()
     _region_volume_cache: dict[str, tuple[float, dict[int, dict[str, Any]]]] = {}
 
+    _SNAPSHOT_PRUNE_INTERVAL_SECONDS = 3600
+    _snapshot_prune_lock = threading.Lock()
+    _snapshot_pruned_at = 0.0
+
     def __init__(self, *, state: Any, sessions: SessionProvider | None = None):
         self._state = state
         self._sessions = sessions or StateSessionProvider(state=state)
@@ -39,6 +46,15 @@ class MarketPricingService:
         normalized = str(hub or "").strip().lower()
         return normalized if normalized in cls._MARKET_HUBS else "jita"
 
+    @classmethod
+    def known_market_hubs(cls) -> list[str]:
+        return list(cls._MARKET_HUBS)
+
+    @classmethod
+    def normalize_market_hubs(cls, hubs: list[str] | None) -> list[str]:
+        """Normalized, de-duplicated hubs in the given order; every known hub when empty."""
+        return list(dict.fromkeys(cls.normalize_market_hub(hub) for hub in (hubs or list(cls._MARKET_HUBS))))
+
     @staticmethod
     def normalize_order_side(side: str | None) -> str:
         normalized = str(side or "").strip().lower()
@@ -93,6 +109,12 @@ class MarketPricingService:
         except Exception:
             return 3600
 
+    def _orderbook_history_setting(self, key: str) -> int:
+        admin = getattr(self._state, "admin_settings", None)
+        if admin:
+            return int(admin.get("orderbook_history", key))
+        return int(ADMIN_SETTINGS_SCHEMA["orderbook_history"]["settings"][key]["default"])
+
     def _fetch_order_book(
         self,
         *,
@@ -106,8 +128,14 @@ class MarketPricingService:
 
         normalized_side = self.normalize_order_side(side)
         if normalized_side == "buy":
-            return esi_service.get_buy_order_book(type_ids, region_id=region_id)
-        return esi_service.get_sell_order_book(type_ids, region_id=region_id)
+            order_books = esi_service.get_buy_order_book(type_ids, region_id=region_id)
+        else:
+            order_books = esi_service.get_sell_order_book(type_ids, region_id=region_id)
+        # ESI leaves out types without regional orders. Keep an (empty) book for every
+        # requested type so an empty view is cached and the type is not refetched on every
+        # request until the TTL runs out.
+        order_books = order_books or {}
+        return {int(type_id): order_books.get(int(type_id)) or [] for type_id in type_ids}
 
     def _build_cached_views(
         self,
@@ -115,8 +143,10 @@ class MarketPricingService:
         order_books: dict[int, list[dict[str, Any]]],
         station_id: int,
         side: str,
+        depth: int | None = None,
     ) -> dict[int, list[tuple[float, int]]]:
         normalized_side = self.normalize_order_side(side)
+        max_levels = int(depth) if depth is not None else self.orderbook_depth()
         out: dict[int, list[tuple[float, int]]] = {}
         for type_id, rows in (order_books or {}).items():
             filtered_rows = [
@@ -128,7 +158,7 @@ class MarketPricingService:
             )
 
             levels: list[tuple[float, int]] = []
-            for row in filtered_rows[: self.orderbook_depth()]:
+            for row in filtered_rows[:max_levels]:
                 try:
                     price = float(row.get("price") or 0.0)
                     volume = int(row.get("volume_remain") or 0)
@@ -169,6 +199,164 @@ class MarketPricingService:
             }
         return out
 
+    def _record_orderbook_snapshots(
+        self,
+        app_session: Any,
+        *,
+        hub: str,
+        region_id: int,
+        station_id: int,
+        side: str,
+        order_books: dict[int, list[dict[str, Any]]],
+        liquidity_by_type_id: dict[int, dict[str, int]],
+    ) -> None:
+        """Append the freshly fetched books to the snapshot history; never fails the caller."""
+        if not order_books:
+            return
+        try:
+            levels_by_type_id = self._build_cached_views(
+                order_books=order_books,
+                station_id=station_id,
+                side=side,
+                depth=self._orderbook_history_setting("snapshot_levels"),
+            )
+            market_orderbook_snapshot_repo.record_snapshots(
+                app_session,
+                hub=hub,
+                region_id=region_id,
+                station_id=station_id,
+                side=side,
+                snapshots_by_type_id={
+                    int(type_id): {**(liquidity_by_type_id.get(int(type_id)) or {}), "levels": levels}
+                    for type_id, levels in levels_by_type_id.items()
+                },
+            )
+            self._prune_orderbook_snapshots(app_session)
+        except Exception as e:
+            logging.warning("Failed recording order-book snapshots (%s %s): %s", hub, side, e)
+
+    def _prune_orderbook_snapshots(self, app_session: Any) -> None:
+        cls = type(self)
+        now = time.time()
+        with cls._snapshot_prune_lock:
+            if now - cls._snapshot_pruned_at < cls._SNAPSHOT_PRUNE_INTERVAL_SECONDS:
+                return
+            cls._snapshot_pruned_at = now
+        deleted = market_orderbook_snapshot_repo.prune_snapshots(
+            app_session,
+            raw_retention_seconds=self._orderbook_history_setting("raw_retention_hours") * 3600,
+            hourly_retention_seconds=self._orderbook_history_setting("hourly_retention_days") * 86400,
+            daily_retention_seconds=self._orderbook_history_setting("daily_retention_days") * 86400,
+            now=now,
+        )
+        if any(deleted.values()):
+            logging.info("Pruned order-book snapshots: %s", deleted)
+
+    def _refresh_hub_views(
+        self,
+        app_session: Any,
+        *,
+        hub_context: dict[str, Any],
+        side: str,
+        type_ids: list[int],
+    ) -> tuple[dict[int, list[tuple[float, int]]], float]:
+        """Fetch hub books from ESI, upsert the view cache and record snapshots (caller commits)."""
+        fetched_books = self._fetch_order_book(
+            type_ids=type_ids,
+            region_id=int(hub_context.get("region_id") or 10000002),
+            side=side,
+        )
+        return self._store_hub_views(app_session, hub_context=hub_context, side=side, order_books=fetched_books)
+
+    def _store_hub_views(
+        self,
+        app_session: Any,
+        *,
+        hub_context: dict[str, Any],
+        side: str,
+        order_books: dict[int, list[dict[str, Any]]],
+    ) -> tuple[dict[int, list[tuple[float, int]]], float]:
+        """Build hub views from fetched books, upsert the view cache and record snapshots (caller commits)."""
+        normalized_hub = str(hub_context.get("hub") or "jita")
+        region_id = int(hub_context.get("region_id") or 10000002)
+        station_id = int(hub_context.get("station_id") or 60003760)
+        views_by_type_id = self._build_cached_views(
+            order_books=order_books,
+            station_id=station_id,
+            side=side,
+        )
+        liquidity_by_type_id = self._build_liquidity_summaries(
+            order_books=order_books,
+            station_id=station_id,
+        )
+        now = time.time()
+        market_orderbook_cache_repo.upsert_views(
+            app_session,
+            hub=normalized_hub,
+            region_id=region_id,
+            station_id=station_id,
+            side=side,
+            at_hub=True,
+            views_by_type_id=views_by_type_id,
+            depth=self.orderbook_depth(),
+            liquidity_by_type_id=liquidity_by_type_id,
+        )
+        self._record_orderbook_snapshots(
+            app_session,
+            hub=normalized_hub,
+            region_id=region_id,
+            station_id=station_id,
+            side=side,
+            order_books=order_books,
+            liquidity_by_type_id=liquidity_by_type_id,
+        )
+        return views_by_type_id, now
+
+    @staticmethod
+    def _partition_order_books_by_station(
+        order_books: dict[int, list[dict[str, Any]]],
+        *,
+        station_ids: set[int],
+    ) -> dict[int, dict[int, list[dict[str, Any]]]]:
+        """Split region books into per-station books in one pass over the orders.
+
+        Every station gets an entry for every type in ``order_books`` (empty when it has
+        no orders there), matching what a single-hub fetch would cache.
+        """
+        out: dict[int, dict[int, list[dict[str, Any]]]] = {int(station_id): {} for station_id in station_ids}
+        for type_id, rows in (order_books or {}).items():
+            buckets = {station_id: books.setdefault(int(type_id), []) for station_id, books in out.items()}
+            for row in rows or []:
+                if not isinstance(row, dict):
+                    continue
+                bucket = buckets.get(int(row.get("location_id") or 0))
+                if bucket is not None:
+                    bucket.append(row)
+        return out
+
+    def _price_entry(
+        self,
+        levels: list[tuple[float, int]],
+        *,
+        hub_context: dict[str, Any],
+        side: str,
+        cached: bool,
+        fetched_at: Any,
+    ) -> dict[str, Any]:
+        normalized_hub = str(hub_context.get("hub") or "jita")
+        depth = self.orderbook_depth()
+        return {
+            **self._summarize_levels([[float(price), int(volume)] for price, volume in levels[:depth]]),
+            "cached": cached,
+            "fetched_at": fetched_at,
+            "hub": normalized_hub,
+            "hub_label": str(hub_context.get("label") or normalized_hub.title()),
+            "side": side,
+            "region_id": int(hub_context.get("region_id") or 10000002),
+            "station_id": int(hub_context.get("station_id") or 60003760),
+            "price_source": f"market_{normalized_hub}_{side}:{self.orderbook_smoothing()}:{depth}",
+        }
+
     def _summarize_levels(self, levels: list[list[float | int]]) -> dict[str, Any]:
         prices: list[float] = []
         volumes: list[int] = []
@@ -231,7 +419,6 @@ class MarketPricingService:
         region_id = int(hub_context.get("region_id") or 10000002)
         station_id = int(hub_context.get("station_id") or 60003760)
         ttl_seconds = self.material_price_cache_ttl_seconds()
-        depth = self.orderbook_depth()
         result: dict[int, dict[str, Any]] = {}
 
         app_session = self._sessions.app_session()
@@ -254,18 +441,12 @@ class MarketPricingService:
                 cached_levels = cached_view.get("levels") if isinstance(cached_view, dict) else None
                 if cached_levels is None:
                     continue
-                result[int(type_id)] = {
-                    **self._summarize_levels([[float(price), int(volume)] for price, volume in cached_levels[:depth]]),
-                    "cached": True,
-                    "fetched_at": cached_view.get("fetched_at") if isinstance(cached_view, dict) else None,
-                    "hub": normalized_hub,
-                    "hub_label": str(hub_context.get("label") or normalized_hub.title()),
-                    "side": normalized_side,
-                    "region_id": region_id,
-                    "station_id": station_id,
-                }
-                result[int(type_id)]["price_source"] = (
-                    f"market_{normalized_hub}_{normalized_side}:{self.orderbook_smoothing()}:{self.orderbook_depth()}"
+                result[int(type_id)] = self._price_entry(
+                    cached_levels,
+                    hub_context=hub_context,
+                    side=normalized_side,
+                    cached=True,
+                    fetched_at=cached_view.get("fetched_at") if isinstance(cached_view, dict) else None,
                 )
                 if progress_callback is not None:
                     progress_callback(
@@ -275,48 +456,21 @@ class MarketPricingService:
                     )
 
             if missing_ids:
-                fetched_books = self._fetch_order_book(
-                    type_ids=missing_ids,
-                    region_id=region_id,
-                    side=normalized_side,
-                )
-                views_by_type_id = self._build_cached_views(
-                    order_books=fetched_books,
-                    station_id=station_id,
-                    side=normalized_side,
-                )
-                liquidity_by_type_id = self._build_liquidity_summaries(
-                    order_books=fetched_books,
-                    station_id=station_id,
-                )
-                now = time.time()
-                market_orderbook_cache_repo.upsert_views(
+                views_by_type_id, now = self._refresh_hub_views(
                     app_session,
-                    hub=normalized_hub,
-                    region_id=region_id,
-                    station_id=station_id,
+                    hub_context=hub_context,
                     side=normalized_side,
-                    at_hub=True,
-                    views_by_type_id=views_by_type_id,
-                    depth=depth,
-                    liquidity_by_type_id=liquidity_by_type_id,
+                    type_ids=missing_ids,
                 )
 
                 total_missing = len(missing_ids)
                 for index, type_id in enumerate(missing_ids, start=1):
-                    fetched_levels = views_by_type_id.get(int(type_id), [])
-                    result[int(type_id)] = {
-                        **self._summarize_levels([[float(price), int(volume)] for price, volume in fetched_levels[:depth]]),
-                        "cached": False,
-                        "fetched_at": now,
-                        "hub": normalized_hub,
-                        "hub_label": str(hub_context.get("label") or normalized_hub.title()),
-                        "side": normalized_side,
-                        "region_id": region_id,
-                        "station_id": station_id,
-                    }
-                    result[int(type_id)]["price_source"] = (
-                        f"market_{normalized_hub}_{normalized_side}:{self.orderbook_smoothing()}:{self.orderbook_depth()}"
+                    result[int(type_id)] = self._price_entry(
+                        views_by_type_id.get(int(type_id), []),
+                        hub_context=hub_context,
+                        side=normalized_side,
+                        cached=False,
+                        fetched_at=now,
                     )
                     if progress_callback is not None:
                         progress_callback(
@@ -334,6 +488,148 @@ class MarketPricingService:
 
         return result
 
+    def get_multi_hub_price_map(
+        self,
+        *,
+        type_ids: list[int],
+        hubs: list[str] | None = None,
+        side: str = "sell",
+    ) -> dict[int, dict[str, dict[str, Any]]]:
+        """Price ``type_ids`` at several hubs at once: ``{type_id: {hub: price entry}}``.
+
+        Fresh cached views are used per hub as in ``get_type_price_map``. For the rest,
+        each region's books are fetched once for every type missing at any hub in it, and
+        one pass over those orders splits them by hub station before the per-hub views are
+        built and cached. Defaults to every known hub.
+        """
+        normalized_type_ids = sorted({int(type_id) for type_id in (type_ids or []) if int(type_id) > 0})
+        if not normalized_type_ids or getattr(self._state, "esi_service", None) is None:
+            return {}
+
+        normalized_side = self.normalize_order_side(side)
+        hub_contexts = [self._market_hub_context(hub) for hub in self.normalize_market_hubs(hubs)]
+        ttl_seconds = self.material_price_cache_ttl_seconds()
+        result: dict[int, dict[str, dict[str, Any]]] = {type_id: {} for type_id in normalized_type_ids}
+
+        app_session = self._sessions.app_session()
+        try:
+            missing_by_hub: dict[str, list[int]] = {}
+            contexts_by_region: dict[int, list[dict[str, Any]]] = {}
+            for hub_context in hub_contexts:
+                hub = str(hub_context["hub"])
+                cached_views = market_orderbook_cache_repo.get_views(
+                    app_session,
+                    hub=hub,
+                    region_id=int(hub_context["region_id"]),
+                    station_id=int(hub_context["station_id"]),
+                    side=normalized_side,
+                    at_hub=True,
+                    type_ids=normalized_type_ids,
+                    ttl_seconds=ttl_seconds,
+                )
+                for type_id in normalized_type_ids:
+                    cached_view = cached_views.get(type_id)
+                    if not isinstance(cached_view, dict) or cached_view.get("levels") is None:
+                        missing_by_hub.setdefault(hub, []).append(type_id)
+                        continue
+                    result[type_id][hub] = self._price_entry(
+                        cached_view["levels"],
+                        hub_context=hub_context,
+                        side=normalized_side,
+                        cached=True,
+                        fetched_at=cached_view.get("fetched_at"),
+                    )
+                if hub in missing_by_hub:
+                    contexts_by_region.setdefault(int(hub_context["region_id"]), []).append(hub_context)
+
+            for region_id, region_contexts in contexts_by_region.items():
+                region_type_ids = sorted(
+                    {type_id for hub_context in region_contexts for type_id in missing_by_hub[str(hub_context["hub"])]}
+                )
+                fetched_books = self._fetch_order_book(type_ids=region_type_ids, region_id=region_id, side=normalized_side)
+                books_by_station = self._partition_order_books_by_station(
+                    fetched_books,
+                    station_ids={int(hub_context["station_id"]) for hub_context in region_contexts},
+                )
+                for hub_context in region_contexts:
+                    hub = str(hub_context["hub"])
+                    views_by_type_id, now = self._store_hub_views(
+                        app_session,
+                        hub_context=hub_context,
+                        side=normalized_side,
+                        order_books=books_by_station.get(int(hub_context["station_id"])) or {},
+                    )
+                    for type_id in missing_by_hub[hub]:
+                        result[type_id][hub] = self._price_entry(
+                            views_by_type_id.get(type_id, []),
+                            hub_context=hub_context,
+                            side=normalized_side,
+                            cached=False,
+                            fetched_at=now,
+                        )
+
+            if contexts_by_region:
+                app_session.commit()
+        finally:
+            try:
+                app_session.close()
+            except Exception:
+                pass
+
+        return result
+
+    def configured_price_sources(self) -> dict[str, tuple[str, str]]:
+        """(hub, side) for the configured "material" and "product" price sources, e.g. "Jita Sell"."""
+        cfg = self._market_pricing_cfg()
+        sources: dict[str, tuple[str, str]] = {}
+        for role in ("material", "product"):
+            words = str(cfg.get(f"{role}_price_source_default") or "").strip().lower().split()
+            hub = words[0] if words and words[0] in self._MARKET_HUBS else "jita"
+            side = words[-1] if words and words[-1] in {"buy", "sell"} else "sell"
+            sources[role] = (hub, side)
+        return sources
+
+    def get_cached_view_ages(self, *, hub: str = "jita", side: str = "sell") -> dict[int, float]:
+        """fetched_at per type for every cached hub view, fresh or not; no ESI calls."""
+        hub_context = self._market_hub_context(hub)
+        app_session = self._sessions.app_session()
+        try:
+            return market_orderbook_cache_repo.get_fetched_at(
+                app_session,
+                hub=str(hub_context.get("hub") or "jita"),
+                region_id=int(hub_context.get("region_id") or 10000002),
+                station_id=int(hub_context.get("station_id") or 60003760),
+                side=self.normalize_order_side(side),
+                at_hub=True,
+            )
+        finally:
+            try:
+                app_session.close()
+            except Exception:
+                pass
+
+    def refresh_type_prices(self, *, type_ids: list[int], hub: str = "jita", side: str = "sell") -> int:
+        """Refetch hub books for ``type_ids`` regardless of cache age; returns the number refreshed."""
+        normalized_type_ids = sorted({int(type_id) for type_id in (type_ids or []) if int(type_id) > 0})
+        if not normalized_type_ids or getattr(self._state, "esi_service", None) is None:
+            return 0
+
+        app_session = self._sessions.app_session()
+        try:
+            views_by_type_id, _ = self._refresh_hub_views(
+                app_session,
+                hub_context=self._market_hub_context(hub),
+                side=self.normalize_order_side(side),
+                type_ids=normalized_type_ids,
+            )
+            app_session.commit()
+        finally:
+            try:
+                app_session.close()
+            except Exception:
+                pass
+        return len(views_by_type_id)
+
     def get_hub_liquidity_map(
         self,
         *,
@@ -397,6 +693,15 @@ class MarketPricingService:
                     depth=self.orderbook_depth(),
                     liquidity_by_type_id=sell_summary,
                 )
+                self._record_orderbook_snapshots(
+                    app_session,
+                    hub=normalized_hub,
+                    region_id=region_id,
+                    station_id=station_id,
+                    side="sell",
+                    order_books=sell_books,
+                    liquidity_by_type_id=sell_summary,
+                )
                 cached_sell_summary.update(sell_summary)
 
             if missing_buy_ids:
@@ -416,6 +721,15 @@ class MarketPricingService:
                     depth=self.orderbook_depth(),
                     liquidity_by_type_id=buy_summary,
                 )
+                self._record_orderbook_snapshots(
+                    app_session,
+                    hub=normalized_hub,
+                    region_id=region_id,
+                    station_id=station_id,
+                    side="buy",
+                    order_books=buy_books,
+                    liquidity_by_type_id=buy_summary,
+                )
                 cached_buy_summary.update(buy_summary)
 
             app_session.commit()
@@ -442,6 +756,65 @@ class MarketPricingService:
 
         return result
 
+    def get_orderbook_snapshots_at(
+        self,
+        *,
+        type_ids: list[int],
+        hub: str = "jita",
+        side: str = "sell",
+        at: float | None = None,
+        max_age_seconds: int = 24 * 3600,
+    ) -> dict[int, dict[str, Any]]:
+        """The stored hub book per type as of ``at`` (default: now), without calling ESI."""
+        normalized_type_ids = sorted({int(type_id) for type_id in (type_ids or []) if int(type_id) > 0})
+        if not normalized_type_ids:
+            return {}
+        app_session = self._sessions.app_session()
+        try:
+            return market_orderbook_snapshot_repo.get_books_at(
+                app_session,
+                hub=self.normalize_market_hub(hub),
+                side=self.normalize_order_side(side),
+                type_ids=normalized_type_ids,
+                at=at,
+                max_age_seconds=max_age_seconds,
+            )
+        finally:
+            try:
+                app_session.close()
+            except Exception:
+                pass
+
+    def get_orderbook_depth_deltas(
+        self,
+        *,
+        type_ids: list[int],
+        hub: str = "jita",
+        side: str = "sell",
+        window_seconds: int = 24 * 3600,
+        until: float | None = None,
+    ) -> dict[int, dict[str, Any]]:
+        """How hub depth and the best price moved per type over the trailing window."""
+        normalized_type_ids = sorted({int(type_id) for type_id in (type_ids or []) if int(type_id) > 0})
+        if not normalized_type_ids:
+            return {}
+        end = float(until if until is not None else time.time())
+        app_session = self._sessions.app_session()
+        try:
+            return market_orderbook_snapshot_repo.get_depth_deltas(
+                app_session,
+                hub=self.normalize_market_hub(hub),
+                side=self.normalize_order_side(side),
+                type_ids=normalized_type_ids,
+                since=end - float(max(0, int(window_seconds))),
+                until=end,
+            )
+        finally:
+            try:
+                app_session.close()
+            except Exception:
+                pass
+
     def get_region_daily_volume_map(
         self,
         *,
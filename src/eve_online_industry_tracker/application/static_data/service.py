@@ -10,12 +10,17 @@ from eve_online_industry_tracker.infrastructure.session_provider import (
 
 from eve_online_industry_tracker.infrastructure.static_data_adapter import (
     build_all_materials,
-    build_all_ores,
     get_all_facilities,
+    get_ore_catalog,
     run_optimize,
+    run_optimize_batch,
 )
 
 
+MAX_BATCH_DEMAND_SETS = 100
+BATCH_STRATEGIES = ("shared", "independent")
+
+
 class StaticDataService:
     def __init__(self, *, state: Any, sessions: SessionProvider | None = None):
         self._state = state
@@ -40,6 +45,44 @@ class StaticDataService:
             language=language,
         )
 
+    def optimize_ore_batch(self, payload: dict, *, max_workers: int | None = None) -> Any:
+        character_id = payload["character_id"]
+        character = self._state.char_manager.get_character_by_id(character_id)
+        if not character:
+            raise ServiceError(f"Character ID {character_id} not found", status_code=400)
+
+        strategy = str(payload.get("strategy") or "shared")
+        if strategy not in BATCH_STRATEGIES:
+            raise ServiceError(f"strategy must be one of: {', '.join(BATCH_STRATEGIES)}", status_code=400)
+
+        raw_sets = payload.get("demand_sets")
+        if not isinstance(raw_sets, list) or not raw_sets:
+            raise ServiceError("demand_sets must be a non-empty list", status_code=400)
+        if len(raw_sets) > MAX_BATCH_DEMAND_SETS:
+            raise ServiceError(f"At most {MAX_BATCH_DEMAND_SETS} demand sets per request", status_code=400)
+
+        demand_sets = []
+        for index, raw in enumerate(raw_sets):
+            if not isinstance(raw, dict) or not isinstance(raw.get("demands"), dict):
+                raise ServiceError(f"demand_sets[{index}] must be an object with a demands map", status_code=400)
+            demands = {str(name): qty for name, qty in raw["demands"].items() if isinstance(qty, (int, float)) and qty > 0}
+            if not demands:
+                raise ServiceError(f"demand_sets[{index}] has no positive demands", status_code=400)
+            demand_sets.append({"id": str(raw.get("id") or f"set-{index + 1}"), "demands": demands})
+        if len({row["id"] for row in demand_sets}) != len(demand_sets):
+            raise ServiceError("demand_sets ids must be unique", status_code=400)
+
+        sde_session = self._sessions.sde_session()
+        language = getattr(getattr(self._state, "db_sde", None), "language", None) or "en"
+        return run_optimize_batch(
+            {**payload, "strategy": strategy, "demand_sets": demand_sets},
+            character=character,
+            esi_service=self._state.esi_service,
+            sde_session=sde_session,
+            language=language,
+            max_workers=max_workers,
+        )
+
     def list_materials_cached(self) -> Any:
         if self._state.materials_cache is None:
             session = self._sessions.sde_session()
@@ -50,4 +93,4 @@ class StaticDataService:
     def list_ores(self) -> Any:
         session = self._sessions.sde_session()
         language = getattr(getattr(self._state, "db_sde", None), "language", None) or "en"
-        return build_all_ores(session, language)
+        return get_ore_catalog(session, language)
@@ -19,8 +19,8 @@ except ImportError:
 
 from flask_app.app import create_app
 from flask_app.bootstrap import start_background_initialization
+from flask_app.serving import serve_app
 from flask_app.settings import (
-    flask_debug,
     flask_host,
     flask_port,
     health_poll_timeout_seconds,
@@ -40,8 +40,12 @@ def run_flask() -> None:
         pass
 
     app = create_app()
-    start_background_initialization(app_state=app.extensions.get("app_state"), refresh_metadata=refresh_metadata_on_startup())
-    app.run(host=flask_host(), port=flask_port(), debug=flask_debug(), use_reloader=False)
+    serve_app(
+        app,
+        initialize=lambda: start_background_initialization(
+            app_state=app.extensions.get("app_state"), refresh_metadata=refresh_metadata_on_startup()
+        ),
+    )
 
 
 def run_streamlit() -> subprocess.Popen:
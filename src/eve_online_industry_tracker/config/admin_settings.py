@@ -177,6 +177,81 @@ ADMIN_SETTINGS_SCHEMA: dict[str, dict[str, Any]] = {
             },
         },
     },
+    "orderbook_history": {
+        "label": "Order Book History",
+        "settings": {
+            "snapshot_levels": {
+                "type": "int",
+                "default": 10,
+                "min": 1,
+                "max": 50,
+                "label": "Snapshot levels",
+                "help": "Best orders kept per order-book snapshot (total depth is always kept).",
+            },
+            "raw_retention_hours": {
+                "type": "int",
+                "default": 48,
+                "min": 1,
+                "max": 336,
+                "label": "Keep every snapshot for (hours)",
+                "help": "Snapshots newer than this are kept at full resolution.",
+            },
+            "hourly_retention_days": {
+                "type": "int",
+                "default": 14,
+                "min": 1,
+                "max": 90,
+                "label": "Keep hourly snapshots for (days)",
+                "help": "Older snapshots are thinned to the last one per hour up to this age.",
+            },
+            "daily_retention_days": {
+                "type": "int",
+                "default": 180,
+                "min": 7,
+                "max": 730,
+                "label": "Keep daily snapshots for (days)",
+                "help": "Then to the last one per day up to this age; older snapshots are deleted.",
+            },
+        },
+    },
+    "price_warmer": {
+        "label": "Price Warmer",
+        "settings": {
+            "lead_seconds": {
+                "type": "int",
+                "default": 300,
+                "min": 0,
+                "max": 3600,
+                "label": "Refresh ahead of expiry (seconds)",
+                "help": "Cached hub prices are refetched this long before the price cache TTL runs out.",
+            },
+            "batch_size": {
+                "type": "int",
+                "default": 100,
+                "min": 10,
+                "max": 1000,
+                "label": "Types per batch",
+                "help": "Types refetched from ESI per warmer batch.",
+            },
+            "pause_seconds": {
+                "type": "float",
+                "default": 5.0,
+                "min": 0.0,
+                "max": 120.0,
+                "step": 1.0,
+                "label": "Pause between batches (seconds)",
+                "help": "Spreads warming over time so interactive requests keep ESI headroom.",
+            },
+            "check_interval_seconds": {
+                "type": "int",
+                "default": 60,
+                "min": 10,
+                "max": 3600,
+                "label": "Check interval (seconds)",
+                "help": "How often the warmer looks for prices nearing expiry.",
+            },
+        },
+    },
     "industry": {
         "label": "Industry",
         "settings": {
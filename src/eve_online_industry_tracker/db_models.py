@@ -7,6 +7,7 @@ Centralizes model imports so consumers use a single stable path:
 """
 
 from eve_online_industry_tracker.infrastructure.models import (
+    BackgroundJobModel,
     BaseApp,
     BaseOauth,
     BaseSde,
@@ -15,7 +16,9 @@ from eve_online_industry_tracker.infrastructure.models import (
     CharacterAssetHistoryModel,
     CharacterAssetsModel,
     CharacterIndustryJobsModel,
+    CharacterMarketOrdersModel,
     CharacterModel,
+    CharacterRealizedProfitStateModel,
     CharacterRealizedSalesLedgerModel,
     CharacterWalletJournalModel,
     CharacterWalletTransactionsModel,
@@ -24,6 +27,7 @@ from eve_online_industry_tracker.infrastructure.models import (
     CorporationIndustryJobsModel,
     CorporationModel,
     CorporationWalletJournalModel,
+    CorporationRealizedProfitStateModel,
     CorporationRealizedSalesLedgerModel,
     CorporationStructuresModel,
     CorporationWalletTransactionsModel,
@@ -37,9 +41,11 @@ from eve_online_industry_tracker.infrastructure.models import (
     NpcStations,
     OAuthCharacter,
     PublicStructuresModel,
+    PublicStructuresScanScheduleModel,
     PublicStructuresScanStateModel,
     StructureNameCacheModel,
     MarketOrderbookViewCacheModel,
+    MarketOrderbookSnapshotModel,
     Races,
     StationOperations,
     StationServices,
@@ -48,6 +54,7 @@ from eve_online_industry_tracker.infrastructure.models import (
 )
 
 __all__ = [
+    "BackgroundJobModel",
     "BaseApp",
     "BaseOauth",
     "BaseSde",
@@ -56,7 +63,9 @@ __all__ = [
     "CharacterAssetHistoryModel",
     "CharacterAssetsModel",
     "CharacterIndustryJobsModel",
+    "CharacterMarketOrdersModel",
     "CharacterModel",
+    "CharacterRealizedProfitStateModel",
     "CharacterRealizedSalesLedgerModel",
     "CharacterWalletJournalModel",
     "CharacterWalletTransactionsModel",
@@ -65,6 +74,7 @@ __all__ = [
     "CorporationIndustryJobsModel",
     "CorporationModel",
     "CorporationWalletJournalModel",
+    "CorporationRealizedProfitStateModel",
     "CorporationRealizedSalesLedgerModel",
     "CorporationStructuresModel",
     "CorporationWalletTransactionsModel",
@@ -78,9 +88,11 @@ __all__ = [
     "NpcStations",
     "OAuthCharacter",
     "PublicStructuresModel",
+    "PublicStructuresScanScheduleModel",
     "PublicStructuresScanStateModel",
     "StructureNameCacheModel",
     "MarketOrderbookViewCacheModel",
+    "MarketOrderbookSnapshotModel",
     "Races",
     "StationOperations",
     "StationServices",
@@ -1,19 +1,149 @@
 import os
 import json
+import logging
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd  # pyright: ignore[reportMissingModuleSource]
 from sqlalchemy import create_engine, text, DDL, event  # pyright: ignore[reportMissingImports]
-from sqlalchemy.orm import scoped_session, sessionmaker  # pyright: ignore[reportMissingImports]
-from typing import Optional, List
+from sqlalchemy.pool import QueuePool  # pyright: ignore[reportMissingImports]
+from sqlalchemy.orm import Session, scoped_session, sessionmaker  # pyright: ignore[reportMissingImports]
+from typing import Callable, Optional, List, TypeVar
+
+
+T = TypeVar("T")
+
+# Per-connection SQLite tuning. WAL + synchronous=NORMAL is durable across application
+# crashes (only an OS crash can lose the last commits) and avoids an fsync per commit.
+SQLITE_BUSY_TIMEOUT_MS = 60000
+SQLITE_CACHE_SIZE_KIB = 16384
+SQLITE_MMAP_SIZE_BYTES = 256 * 1024 * 1024
+# Immutable databases (the SDE) can map the whole file.
+SQLITE_IMMUTABLE_MMAP_SIZE_BYTES = 2 * 1024 * 1024 * 1024
+
+
+def _apply_sqlite_pragmas(dbapi_conn, *, read_only: bool = False, immutable: bool = False) -> None:
+    cursor = dbapi_conn.cursor()
+    if not read_only:
+        cursor.execute("PRAGMA journal_mode=WAL")
+    if not immutable:
+        cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KIB}")
+    cursor.execute(f"PRAGMA mmap_size={SQLITE_IMMUTABLE_MMAP_SIZE_BYTES if immutable else SQLITE_MMAP_SIZE_BYTES}")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    if read_only:
+        cursor.execute("PRAGMA query_only=1")
+    cursor.close()
+
+
+def _fold_wal_into_database(path: str) -> None:
+    """Checkpoint a leftover WAL file and switch to rollback journaling.
+
+    Immutable readers ignore ``-wal`` files, so pages still sitting there (e.g. after an
+    import that did not close cleanly) would be invisible.
+    """
+    wal_path = f"{path}-wal"
+    if not os.path.exists(wal_path) or os.path.getsize(wal_path) == 0:
+        return
+    conn = sqlite3.connect(path, timeout=60)
+    try:
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        conn.execute("PRAGMA journal_mode=DELETE")
+    finally:
+        conn.close()
+
+
+def _copy_tables_to_memory(conn: sqlite3.Connection, *, tables: List[str]) -> List[str]:
+    """Copy ``tables`` (schema, rows and indexes) from the attached ``disk`` schema into ``main``."""
+    copied: List[str] = []
+    for table in tables:
+        row = conn.execute(
+            "SELECT sql FROM disk.sqlite_master WHERE type = 'table' AND name = ?", (table,)
+        ).fetchone()
+        if row is None or not row[0]:
+            logging.warning("SDE table %s not found; it stays on disk.", table)
+            continue
+        conn.execute(row[0])
+        conn.execute(f'INSERT INTO main."{table}" SELECT * FROM disk."{table}"')
+        for (index_sql,) in conn.execute(
+            "SELECT sql FROM disk.sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL", (table,)
+        ).fetchall():
+            conn.execute(index_sql)
+        copied.append(table)
+    conn.commit()
+    return copied
 
 
 # ----------------------------
 # DatabaseManager
 # ----------------------------
 class DatabaseManager:
-    def __init__(self, db_uri: str, language: str = "en"):
+    def __init__(
+        self,
+        db_uri: str,
+        language: str = "en",
+        *,
+        read_only: bool = False,
+        ram_tables: Optional[List[str]] = None,
+    ):
         self.db_uri = db_uri
         self.language = language
+        # Keeps a shared in-memory database alive while ram_tables are in use.
+        self._ram_keeper: Optional[sqlite3.Connection] = None
+
+        # Read-only databases that never change while the app runs (the SDE) are opened
+        # immutable: no locks, no WAL, no change detection.
+        path = self.sqlite_file_path()
+        self.read_only = bool(read_only) and path is not None and os.path.exists(path)
+        if read_only and not self.read_only:
+            logging.warning("Cannot open %s read-only (not an existing SQLite file); opening read-write.", db_uri)
+
+        self._ram_tables = list(ram_tables or [])
+        self._generation = 0
+        self._open_engines()
 
+        # All writes submitted through run_write() execute on one thread, in order.
+        self._writer_lock = threading.Lock()
+        self._writer: Optional[ThreadPoolExecutor] = None
+        self._writer_local = threading.local()
+
+    def _open_engines(self) -> None:
+        if self.read_only:
+            self.engine = self._create_immutable_engine(self.sqlite_file_path(), ram_tables=self._ram_tables)
+            self.read_engine = self.engine
+        else:
+            self._init_read_write_engines()
+
+        self.Session = sessionmaker(bind=self.engine)
+        # Thread-local session proxy. Safe with Flask (multi-threaded) and other callers.
+        self.session = scoped_session(self.Session)
+        self.ReadSession = sessionmaker(bind=self.read_engine)
+        self.WriteSession = sessionmaker(bind=self.engine, expire_on_commit=False)
+
+    def dispose(self) -> None:
+        """Close the pooled connections of both engines."""
+        for engine in {self.engine, self.read_engine}:
+            engine.dispose()
+
+    def reopen(self) -> None:
+        """Open the database file again with fresh engines and dispose the old ones.
+
+        Immutable databases never notice changes to their file, so the SDE is reopened
+        after ``scripts/import_sde.py --update`` replaced it. Sessions already in use keep
+        their connection (and the old file) until they are closed.
+        """
+        old_engines = {self.engine, self.read_engine}
+        old_ram_keeper = self._ram_keeper
+        self._generation += 1
+        self._open_engines()
+        for engine in old_engines:
+            engine.dispose()
+        if old_ram_keeper is not None:
+            old_ram_keeper.close()
+
+    def _init_read_write_engines(self) -> None:
         # Engine kwargs
         engine_kwargs = dict(echo=False, future=True)
 
@@ -34,19 +164,120 @@ class DatabaseManager:
         if self.db_uri.startswith("sqlite"):
             @event.listens_for(self.engine, "connect")
             def _set_sqlite_pragmas(dbapi_conn, connection_record):
-                cursor = dbapi_conn.cursor()
-                cursor.execute("PRAGMA journal_mode=WAL")
-                cursor.execute("PRAGMA busy_timeout=60000")
-                cursor.close()
+                _apply_sqlite_pragmas(dbapi_conn)
 
             with self.engine.connect() as conn:
                 conn.execute(text("PRAGMA journal_mode=WAL"))
-                conn.execute(text("PRAGMA busy_timeout=60000"))
+                conn.execute(text(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}"))
                 conn.commit()
 
-        self.Session = sessionmaker(bind=self.engine)
-        # Thread-local session proxy. Safe with Flask (multi-threaded) and other callers.
-        self.session = scoped_session(self.Session)
+        # Read-only connections (mode=ro + query_only) for SQLite files; they never take
+        # the write lock, so reads are not queued behind a refresh storm. Other databases
+        # (and in-memory SQLite) share the main engine.
+        self.read_engine = self._create_read_engine() or self.engine
+
+    def sqlite_file_path(self) -> Optional[str]:
+        """Absolute path of the SQLite database file; None for other or in-memory databases."""
+        if not self.db_uri.startswith("sqlite:///"):
+            return None
+        path = self.db_uri[len("sqlite:///"):].split("?", 1)[0]
+        if not path or path == ":memory:" or path.startswith("file:"):
+            return None
+        return os.path.abspath(path)
+
+    def _create_read_engine(self):
+        path = self.sqlite_file_path()
+        if path is None:
+            return None
+        read_engine = create_engine(
+            f"sqlite:///file:{path}?mode=ro&uri=true",
+            echo=False,
+            future=True,
+            connect_args={"check_same_thread": False, "timeout": 60},
+            pool_size=20,
+            max_overflow=30,
+        )
+
+        @event.listens_for(read_engine, "connect")
+        def _set_read_only_pragmas(dbapi_conn, connection_record):
+            _apply_sqlite_pragmas(dbapi_conn, read_only=True)
+
+        return read_engine
+
+    def _create_immutable_engine(self, path: str, *, ram_tables: List[str]):
+        try:
+            _fold_wal_into_database(path)
+        except Exception as e:
+            logging.warning("Failed checkpointing WAL of %s: %s", path, e)
+
+        disk_uri = f"file:{path}?mode=ro&immutable=1"
+        # No locking, so a modest pool suffices; QueuePool also for the "sqlite://" creator URL.
+        engine_kwargs = dict(echo=False, future=True, poolclass=QueuePool, pool_size=10, max_overflow=20)
+
+        if ram_tables:
+            # Hot tables live in a shared in-memory database; the file is attached as
+            # "disk". Unqualified names resolve to main first, so queries need no changes.
+            memory_uri = f"file:sde_ram_{id(self)}_{self._generation}?mode=memory&cache=shared"
+            self._ram_keeper = sqlite3.connect(memory_uri, uri=True, check_same_thread=False)
+            self._ram_keeper.execute("ATTACH DATABASE ? AS disk", (disk_uri,))
+            started = time.perf_counter()
+            copied = _copy_tables_to_memory(self._ram_keeper, tables=ram_tables)
+            logging.info("Loaded SDE tables into memory in %.1fs: %s", time.perf_counter() - started, ", ".join(copied))
+
+            def _connect_ram() -> sqlite3.Connection:
+                conn = sqlite3.connect(memory_uri, uri=True, check_same_thread=False)
+                conn.execute("ATTACH DATABASE ? AS disk", (disk_uri,))
+                return conn
+
+            engine = create_engine("sqlite://", creator=_connect_ram, **engine_kwargs)
+        else:
+            engine = create_engine(
+                f"sqlite:///{disk_uri}&uri=true",
+                connect_args={"check_same_thread": False},
+                **engine_kwargs,
+            )
+
+        @event.listens_for(engine, "connect")
+        def _set_immutable_pragmas(dbapi_conn, connection_record):
+            _apply_sqlite_pragmas(dbapi_conn, read_only=True, immutable=True)
+
+        return engine
+
+    def read_session(self) -> Session:
+        """New session on the read-only pool. Callers must close it."""
+        return self.ReadSession()
+
+    def run_write(self, work: Callable[[Session], T], *, timeout: Optional[float] = None) -> T:
+        """Run ``work(session)`` on this database's single writer thread and commit.
+
+        SQLite serialises writers anyway; queueing in-process writes on one thread
+        replaces busy_timeout waits and "database is locked" retries with FIFO order.
+        The session is rolled back if ``work`` raises. Nested calls join the outer session.
+        """
+        if self.read_only:
+            raise RuntimeError(f"{self.get_db_name()} is opened read-only")
+        active_session = getattr(self._writer_local, "session", None)
+        if active_session is not None:
+            return work(active_session)
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"db-writer-{self.get_db_name()}")
+            writer = self._writer
+        return writer.submit(self._run_write_task, work).result(timeout=timeout)
+
+    def _run_write_task(self, work: Callable[[Session], T]) -> T:
+        session = self.WriteSession()
+        self._writer_local.session = session
+        try:
+            result = work(session)
+            session.commit()
+            return result
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            self._writer_local.session = None
+            session.close()
 
     def safe_commit(self) -> None:
         """Commit the current session, rolling back on error."""
@@ -120,10 +351,7 @@ class DatabaseManager:
         if language is None:
             language = self.language
 
-        def query(session, table_name):
-            return pd.read_sql_table(table_name, session.bind)
-
-        df = self.safe_query(query, table_name)
+        df = pd.read_sql_table(table_name, self.read_engine)
 
         # Parse only explicitly declared JSON columns
         if json_columns:
@@ -8,7 +8,7 @@ import random
 import requests
 from typing import Any, Dict, Iterable, List, Optional, Union
 
-from eve_online_industry_tracker.infrastructure.esi_client import ESIClient
+from eve_online_industry_tracker.infrastructure.esi_client import _ESI_ERROR_LIMITER, ESIClient
 from utils.requests_ssl import get_requests_ssl_kwargs
 
 try:
@@ -668,14 +668,7 @@ class ESIService:
         # ESI limit is reasonably high, but we chunk to be safe.
         chunk_size = 500
         for i in range(0, len(missing), chunk_size):
-            chunk = missing[i : i + chunk_size]
-            try:
-                data = self._esi_client.esi_post("/universe/names/", json=chunk, use_cache=False)
-            except Exception:
-                data = None
-
-            rows = list(data) if isinstance(data, list) else []
-            for row in rows:
+            for row in self._post_universe_names(missing[i : i + chunk_size]):
                 if not isinstance(row, dict):
                     continue
                 rid = row.get("id")
@@ -691,6 +684,23 @@ class ESIService:
         self._universe_names_cache_ttl_seconds = ttl
         return result
 
+    def _post_universe_names(self, chunk: list[int]) -> list[Any]:
+        """POST one chunk to /universe/names/.
+
+        ESI rejects the whole request (404, returned as None) if any ID is invalid, so
+        a rejected chunk is split in halves until the invalid IDs are isolated.
+        """
+        try:
+            data = self._esi_client.esi_post("/universe/names/", json=chunk, use_cache=False)
+        except Exception:
+            return []
+        if isinstance(data, list):
+            return data
+        if data is None and len(chunk) > 1:
+            middle = len(chunk) // 2
+            return self._post_universe_names(chunk[:middle]) + self._post_universe_names(chunk[middle:])
+        return []
+
     def resolve_universe_names(self, ids: List[int]) -> Dict[int, str]:
         """Resolve universe IDs to names using /universe/names/ (batched)."""
         if not ids:
@@ -719,6 +729,10 @@ class ESIService:
         return out
 
 
+    def error_budget(self) -> tuple[Optional[int], Optional[int]]:
+        """(errors remaining, seconds until reset) from the last ESI error-limit headers; None until seen."""
+        return _ESI_ERROR_LIMITER.snapshot()
+
     def list_universe_structure_ids(self, *, filter: Optional[str] = None) -> List[int]:
         """List structure IDs from /universe/structures.
 
@@ -0,0 +1,469 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Mapping
+
+from eve_online_industry_tracker.infrastructure.persistence import background_jobs_repo
+from eve_online_industry_tracker.infrastructure.session_provider import SessionProvider, StateSessionProvider
+
+
+ACTIVE_JOB_STATUSES = frozenset({"queued", "running"})
+
+
+def job_params_hash(params: Mapping[str, Any] | None) -> str:
+    """Stable hash of normalized job params; identical requests share one job."""
+    canonical = json.dumps(dict(params or {}), sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def find_active_job(jobs: Mapping[str, Any], params: Mapping[str, Any]) -> dict[str, Any] | None:
+    """Return the queued/running job with the same params hash, if any. Caller must hold the store lock."""
+    target = job_params_hash(params)
+    for job in jobs.values():
+        if not isinstance(job, dict):
+            continue
+        if str(job.get("status") or "").strip().lower() not in ACTIVE_JOB_STATUSES:
+            continue
+        if str(job.get("params_hash") or job_params_hash(job.get("request_params"))) == target:
+            return job
+    return None
+
+
+def claim_job(store: Any, params: Mapping[str, Any], *, step_count: int) -> tuple[dict[str, Any], bool]:
+    """Return ``(job, created)``: an active job with identical params, or a newly queued one.
+
+    Lookup and insert happen under one lock acquisition so concurrent requests served
+    by a threaded WSGI server cannot both start a job for the same params.
+    """
+    with store.lock:
+        existing_job = find_active_job(store.jobs, params)
+        if existing_job is not None:
+            return dict(existing_job), False
+
+        job_id = str(uuid.uuid4())
+        created_at = datetime.now(timezone.utc).isoformat()
+        store.jobs[job_id] = {
+            "job_id": job_id,
+            "request_params": dict(params),
+            "params_hash": job_params_hash(params),
+            "status": "queued",
+            "progress_fraction": 0.0,
+            "progress_label": "Queued",
+            "progress_meta": {
+                "stage": "queued",
+                "step": 0,
+                "step_count": int(step_count),
+            },
+            "created_at": created_at,
+            "updated_at": created_at,
+            "result": None,
+            "result_meta": {},
+            "result_count": 0,
+            "error_message": None,
+            "revision": 0,
+        }
+        return dict(store.jobs[job_id]), True
+
+
+def update_job(
+    store: Any,
+    job_id: str,
+    *,
+    job_kind: str = "job",
+    status: str | None = None,
+    progress_fraction: float | None = None,
+    progress_label: str | None = None,
+    result: list[dict[str, Any]] | None = None,
+    result_meta: dict[str, Any] | None = None,
+    error_message: str | None = None,
+    progress_meta: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """Apply a progress/result update to a job, bump its revision and wake progress streams."""
+    with store.lock:
+        job = store.jobs.get(str(job_id))
+        if job is None:
+            raise RuntimeError(f"Unknown {job_kind}: {job_id}")
+        if status is not None:
+            job["status"] = str(status)
+        if progress_fraction is not None:
+            job["progress_fraction"] = max(0.0, min(1.0, float(progress_fraction)))
+        if progress_label is not None:
+            job["progress_label"] = str(progress_label)
+        if progress_meta is not None:
+            job["progress_meta"] = dict(progress_meta)
+        if result is not None:
+            job["result"] = result
+            job["result_count"] = len(result)
+        if result_meta is not None:
+            job["result_meta"] = dict(result_meta)
+        if error_message is not None:
+            job["error_message"] = str(error_message)
+        job["updated_at"] = datetime.now(timezone.utc).isoformat()
+        job["revision"] = int(job.get("revision") or 0) + 1
+        changed = getattr(store, "changed", None)
+        if changed is not None:
+            changed.notify_all()
+        return dict(job)
+
+
+def job_start_response(job: Mapping[str, Any]) -> dict[str, Any]:
+    """The payload a job-start endpoint returns for a claimed job."""
+    return {
+        "job_id": str(job.get("job_id") or ""),
+        "created_at": job.get("created_at"),
+        "updated_at": job.get("updated_at"),
+        "progress_label": str(job.get("progress_label") or "Queued"),
+        "progress_meta": dict(job.get("progress_meta") or {}),
+    }
+
+
+def _state_job_queue(state: Any, kind: str) -> DurableJobQueue | None:
+    queue = getattr(state, "job_queue", None)
+    if queue is None or not queue.handles(kind):
+        return None
+    return queue
+
+
+def restore_job(state: Any, kind: str, job_id: str) -> None:
+    """Reload a job trimmed from memory by the job queue, if ``kind`` is queue-managed."""
+    queue = _state_job_queue(state, kind)
+    if queue is not None:
+        queue.restore(kind, str(job_id))
+
+
+def dispatch_job(state: Any, kind: str, job: Mapping[str, Any], run: Callable[[str, dict[str, Any]], None]) -> None:
+    """Run a freshly claimed job on ``state.job_queue``, or on a daemon thread when no queue handles ``kind``."""
+    queue = _state_job_queue(state, kind)
+    if queue is not None:
+        queue.submit(kind, dict(job))
+        return
+
+    job_id = str(job["job_id"])
+    thread = threading.Thread(
+        target=run,
+        args=(job_id, dict(job.get("request_params") or {})),
+        daemon=True,
+        name=f"{kind.replace('_', '-')}-{job_id[:8]}",
+    )
+    _register_background_thread(state, thread)
+    thread.start()
+
+
+def _register_background_thread(state: Any, thread: threading.Thread) -> None:
+    # Same bookkeeping as flask_app.background_jobs.register_thread, so shutdown joins the thread.
+    lock = getattr(state, "background_threads_lock", None)
+    threads = getattr(state, "background_threads", None)
+    if lock is None or threads is None:
+        return
+    with lock:
+        threads[thread.name] = thread
+
+
+@dataclass(frozen=True)
+class JobQueueConfig:
+    # Worker threads shared by all kinds; the global cap on concurrent jobs.
+    max_workers: int = 2
+    # Max concurrent jobs per concurrency group (a group defaults to the kind itself).
+    group_limits: Mapping[str, int] = field(default_factory=dict)
+    default_group_limit: int = 1
+    # Finished jobs are dropped from the app DB after this long.
+    result_ttl_seconds: float = 6 * 3600.0
+    # Finished jobs kept in memory per kind; older ones are reloaded from the DB on demand.
+    max_finished_in_memory: int = 4
+
+
+@dataclass
+class _JobKind:
+    kind: str
+    handler: Callable[[str, dict[str, Any]], None] | None
+    durable: bool
+    concurrency_group: str
+
+
+@dataclass
+class _QueuedTask:
+    kind: str
+    run: Callable[[], None]
+    job_id: str | None = None
+
+
+class DurableJobQueue:
+    """Bounded worker pool for background refresh work.
+
+    Durable kinds mirror their in-memory job store (``state.jobs.<kind>``) into the
+    ``background_jobs`` table: queued jobs survive a restart and are resumed, and finished
+    results are trimmed from memory and reloaded from the DB until they expire.
+    Transient kinds (``durable=False``) only share the worker pool and concurrency limits.
+    """
+
+    def __init__(self, *, state: Any, config: JobQueueConfig | None = None, sessions: SessionProvider | None = None):
+        self._state = state
+        self._config = config or JobQueueConfig()
+        self._sessions = sessions or StateSessionProvider(state=state)
+        self._kinds: dict[str, _JobKind] = {}
+        self._pending: deque[_QueuedTask] = deque()
+        self._running_by_group: dict[str, int] = {}
+        self._cond = threading.Condition()
+        self._workers: list[threading.Thread] = []
+
+    # -----------------
+    # Registration
+    # -----------------
+
+    def register(
+        self,
+        kind: str,
+        handler: Callable[[str, dict[str, Any]], None] | None = None,
+        *,
+        durable: bool = True,
+        concurrency_group: str | None = None,
+    ) -> None:
+        """Register a job kind. Durable kinds need ``handler(job_id, request_params)``."""
+        if durable and handler is None:
+            raise ValueError(f"Durable job kind {kind!r} needs a handler")
+        self._kinds[str(kind)] = _JobKind(
+            kind=str(kind),
+            handler=handler,
+            durable=bool(durable),
+            concurrency_group=str(concurrency_group or kind),
+        )
+
+    def handles(self, kind: str) -> bool:
+        return str(kind) in self._kinds
+
+    def _job_kind(self, kind: str) -> _JobKind:
+        job_kind = self._kinds.get(str(kind))
+        if job_kind is None:
+            raise RuntimeError(f"Unknown background job kind: {kind}")
+        return job_kind
+
+    def _store(self, kind: str) -> Any:
+        store = getattr(getattr(self._state, "jobs", None), str(kind), None)
+        if store is None:
+            raise RuntimeError(f"Job store for {kind} is not initialized")
+        return store
+
+    def _group_limit(self, group: str) -> int:
+        return max(1, int(self._config.group_limits.get(group, self._config.default_group_limit)))
+
+    # -----------------
+    # Submission
+    # -----------------
+
+    def submit(self, kind: str, job: dict[str, Any]) -> None:
+        """Persist a freshly claimed job and queue its handler."""
+        job_kind = self._job_kind(kind)
+        if not job_kind.durable or job_kind.handler is None:
+            raise RuntimeError(f"Background job kind {kind} is not durable")
+        job_id = str(job["job_id"])
+        params = dict(job.get("request_params") or {})
+        self._persist(kind, job)
+        handler = job_kind.handler
+        self._enqueue(_QueuedTask(kind=job_kind.kind, job_id=job_id, run=lambda: handler(job_id, params)))
+
+    def submit_task(self, kind: str, run: Callable[[], None]) -> None:
+        """Queue a transient (non-persisted) task under ``kind``'s concurrency limits."""
+        self._enqueue(_QueuedTask(kind=self._job_kind(kind).kind, run=run))
+
+    def _enqueue(self, task: _QueuedTask) -> None:
+        with self._cond:
+            self._pending.append(task)
+            self._ensure_workers()
+            self._cond.notify_all()
+
+    def _ensure_workers(self) -> None:
+        # Caller must hold self._cond.
+        self._workers = [worker for worker in self._workers if worker.is_alive()]
+        while len(self._workers) < max(1, int(self._config.max_workers)):
+            worker = threading.Thread(
+                target=self._worker_loop,
+                daemon=True,
+                name=f"background-job-worker-{len(self._workers) + 1}",
+            )
+            self._register_worker(worker)
+            self._workers.append(worker)
+            worker.start()
+
+    def _register_worker(self, worker: threading.Thread) -> None:
+        _register_background_thread(self._state, worker)
+
+    def _shutting_down(self) -> bool:
+        shutdown_event = getattr(self._state, "shutdown_event", None)
+        return shutdown_event is not None and shutdown_event.is_set()
+
+    def _next_runnable(self) -> _QueuedTask | None:
+        # Caller must hold self._cond. FIFO, skipping tasks whose group is at its limit.
+        for index, task in enumerate(self._pending):
+            group = self._kinds[task.kind].concurrency_group
+            if self._running_by_group.get(group, 0) < self._group_limit(group):
+                del self._pending[index]
+                self._running_by_group[group] = self._running_by_group.get(group, 0) + 1
+                return task
+        return None
+
+    def _worker_loop(self) -> None:
+        while not self._shutting_down():
+            with self._cond:
+                task = self._next_runnable()
+                if task is None:
+                    # Timed wait so workers notice the shutdown event.
+                    self._cond.wait(timeout=1.0)
+                    continue
+            try:
+                task.run()
+            except Exception as e:
+                logging.warning("Background job %s (%s) failed: %s", task.job_id or "-", task.kind, e, exc_info=True)
+            finally:
+                if task.job_id is not None:
+                    self._on_job_finished(task.kind, task.job_id)
+                with self._cond:
+                    group = self._kinds[task.kind].concurrency_group
+                    self._running_by_group[group] = max(0, self._running_by_group.get(group, 0) - 1)
+                    self._cond.notify_all()
+
+    # -----------------
+    # Persistence
+    # -----------------
+
+    def _persist(self, kind: str, job: dict[str, Any]) -> None:
+        is_finished = str(job.get("status") or "").strip().lower() not in ACTIVE_JOB_STATUSES
+        expires_at = time.time() + float(self._config.result_ttl_seconds) if is_finished else None
+        session = None
+        try:
+            session = self._sessions.app_session()
+            background_jobs_repo.save_job(
+                session,
+                kind=kind,
+                params_hash=str(job.get("params_hash") or job_params_hash(job.get("request_params"))),
+                job=job,
+                expires_at=expires_at,
+            )
+        except Exception as e:
+            logging.warning("Failed persisting background job %s: %s", job.get("job_id"), e)
+        finally:
+            if session is not None:
+                session.close()
+
+    def _on_job_finished(self, kind: str, job_id: str) -> None:
+        store = self._store(kind)
+        with store.lock:
+            job = store.jobs.get(str(job_id))
+            snapshot = dict(job) if job is not None else None
+        if snapshot is not None:
+            self._persist(kind, snapshot)
+        self.evict_expired()
+
+    def restore(self, kind: str, job_id: str) -> bool:
+        """Load a job evicted from memory (or left by a previous process) back into its store."""
+        job_kind = self._kinds.get(str(kind))
+        if job_kind is None or not job_kind.durable:
+            return False
+        store = self._store(kind)
+        with store.lock:
+            if str(job_id) in store.jobs:
+                return True
+        session = None
+        try:
+            session = self._sessions.app_session()
+            job = background_jobs_repo.get_job(session, kind=kind, job_id=str(job_id))
+        except Exception as e:
+            logging.warning("Failed loading background job %s: %s", job_id, e)
+            return False
+        finally:
+            if session is not None:
+                session.close()
+        if job is None:
+            return False
+        with store.lock:
+            store.jobs.setdefault(str(job_id), job)
+        return True
+
+    def resume(self) -> int:
+        """Re-queue jobs a previous process left queued or running. Returns the number resumed."""
+        resumed = 0
+        for job_kind in list(self._kinds.values()):
+            if not job_kind.durable:
+                continue
+            session = None
+            try:
+                session = self._sessions.app_session()
+                jobs = background_jobs_repo.list_unfinished_jobs(session, kind=job_kind.kind)
+            except Exception as e:
+                logging.warning("Failed loading unfinished %s jobs: %s", job_kind.kind, e)
+                continue
+            finally:
+                if session is not None:
+                    session.close()
+
+            store = self._store(job_kind.kind)
+            for job in jobs:
+                # Handlers restart from scratch, so progress from the old process is discarded.
+                progress_meta = dict(job.get("progress_meta") or {})
+                job.update(
+                    status="queued",
+                    progress_fraction=0.0,
+                    progress_label="Queued (resumed after restart)",
+                    progress_meta={"stage": "queued", "step": 0, "step_count": progress_meta.get("step_count")},
+                    updated_at=datetime.now(timezone.utc).isoformat(),
+                )
+                with store.lock:
+                    if job["job_id"] in store.jobs:
+                        continue
+                    store.jobs[job["job_id"]] = job
+                self.submit(job_kind.kind, dict(job))
+                resumed += 1
+        return resumed
+
+    def evict_expired(self) -> int:
+        """Trim finished jobs from memory and delete expired rows. Returns the number of DB rows removed."""
+        now = time.time()
+        ttl = float(self._config.result_ttl_seconds)
+        keep = max(0, int(self._config.max_finished_in_memory))
+        for job_kind in list(self._kinds.values()):
+            if not job_kind.durable:
+                continue
+            store = self._store(job_kind.kind)
+            with store.lock:
+                finished = sorted(
+                    (job for job in store.jobs.values() if isinstance(job, dict) and str(job.get("status") or "") not in ACTIVE_JOB_STATUSES),
+                    key=lambda job: str(job.get("updated_at") or ""),
+                    reverse=True,
+                )
+                for index, job in enumerate(finished):
+                    age = now - _iso_to_epoch(job.get("updated_at"), default=now)
+                    if index >= keep or age > ttl:
+                        store.jobs.pop(str(job.get("job_id")), None)
+
+        session = None
+        try:
+            session = self._sessions.app_session()
+            return background_jobs_repo.delete_expired_jobs(session, now=now)
+        except Exception as e:
+            logging.warning("Failed deleting expired background jobs: %s", e)
+            return 0
+        finally:
+            if session is not None:
+                session.close()
+
+    def stats(self) -> dict[str, Any]:
+        with self._cond:
+            return {
+                "workers": len([worker for worker in self._workers if worker.is_alive()]),
+                "pending": len(self._pending),
+                "running_by_group": {group: count for group, count in self._running_by_group.items() if count},
+            }
+
+
+def _iso_to_epoch(value: Any, *, default: float) -> float:
+    try:
+        return datetime.fromisoformat(str(value)).timestamp()
+    except (TypeError, ValueError):
+        return default
@@ -176,6 +176,23 @@ class CharacterRealizedSalesLedgerModel(BaseApp):
 
     updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
 
+class CharacterRealizedProfitStateModel(BaseApp):
+    """Persisted FIFO state for incremental realized-profit ledger rebuilds.
+
+    Stores the remaining lots per type after the last rebuild together with the
+    watermarks used to detect which wallet transactions and industry jobs are new.
+    """
+    __tablename__ = "character_realized_profit_state"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    character_id: Mapped[int] = mapped_column(Integer, unique=True, nullable=False)
+    last_transaction_id: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+    transaction_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    job_watermark_date: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    job_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    fifo_state: Mapped[Optional[dict[str, Any]]] = mapped_column(JSON, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
+
 class CharacterMarketOrdersModel(BaseApp):
     __tablename__ = "character_market_orders"
 
@@ -581,6 +598,18 @@ class CorporationRealizedSalesLedgerModel(BaseApp):
 
     updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
 
+class CorporationRealizedProfitStateModel(BaseApp):
+    __tablename__ = "corporation_realized_profit_state"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    corporation_id: Mapped[int] = mapped_column(Integer, unique=True, nullable=False)
+    last_transaction_id: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+    transaction_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    job_watermark_date: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    job_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    fifo_state: Mapped[Optional[dict[str, Any]]] = mapped_column(JSON, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
+
 class CorporationStructuresModel(BaseApp):
     __tablename__ = "corporation_structures"
 
@@ -668,6 +697,40 @@ class PublicStructuresScanStateModel(BaseApp):
     updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
 
 
+class PublicStructuresScanScheduleModel(BaseApp):
+    __tablename__ = "public_structures_scan_schedule"
+
+    # Per-structure bookkeeping for the global scanner (see public_structures_scan_scheduler.py).
+    structure_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    system_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    last_status: Mapped[str] = mapped_column(String, nullable=False)  # 'ok', 'denied' (403/404) or 'error'
+    consecutive_denials: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    last_checked_at: Mapped[float] = mapped_column(Float, nullable=False)  # epoch seconds
+    next_check_at: Mapped[float] = mapped_column(Float, nullable=False)
+
+
+class BackgroundJobModel(BaseApp):
+    __tablename__ = "background_jobs"
+
+    # Durable copy of a queued background job (see infrastructure/job_queue.py).
+    job_id: Mapped[str] = mapped_column(String, primary_key=True)
+    kind: Mapped[str] = mapped_column(String, nullable=False, index=True)
+    params_hash: Mapped[str] = mapped_column(String, nullable=False)
+    request_params: Mapped[Optional[dict[str, Any]]] = mapped_column(JSON, nullable=True)
+    status: Mapped[str] = mapped_column(String, nullable=False, default="queued")
+    progress_fraction: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    progress_label: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    progress_meta: Mapped[Optional[dict[str, Any]]] = mapped_column(JSON, nullable=True)
+    result: Mapped[Optional[list[dict[str, Any]]]] = mapped_column(JSON, nullable=True)
+    result_meta: Mapped[Optional[dict[str, Any]]] = mapped_column(JSON, nullable=True)
+    result_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    error_message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    revision: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    created_at: Mapped[Optional[str]] = mapped_column(String, nullable=True)  # ISO-8601, as in the job payload
+    updated_at: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    expires_at: Mapped[Optional[float]] = mapped_column(Float, nullable=True)  # epoch seconds; set once finished
+
+
 class MarketOrderbookViewCacheModel(BaseApp):
     __tablename__ = "market_orderbook_view_cache"
     __table_args__ = (
@@ -702,6 +765,25 @@ class MarketOrderbookViewCacheModel(BaseApp):
     fetched_at: Mapped[float] = mapped_column(Float, nullable=False)
     version: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
 
+
+class MarketOrderbookSnapshotModel(BaseApp):
+    __tablename__ = "market_orderbook_snapshots"
+
+    # Append-only history of hub order books, one row per (hub, side, type) per ESI fetch;
+    # thinned to hourly/daily rows by market_orderbook_snapshot_repo.prune_snapshots.
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    hub: Mapped[str] = mapped_column(String, nullable=False)
+    region_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    station_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    side: Mapped[str] = mapped_column(String, nullable=False)  # 'buy' or 'sell'
+    type_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    captured_at: Mapped[float] = mapped_column(Float, nullable=False)  # epoch seconds
+    best_price: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    total_volume: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    order_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    levels: Mapped[Optional[list[list[float | int]]]] = mapped_column(JSON, nullable=True)  # top-N [price, volume]
+
+
 class IndustryProfilesModel(BaseApp):
     __tablename__ = "industry_profiles"
 
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy import delete, select
+
+from eve_online_industry_tracker.db_models import BackgroundJobModel
+
+
+_JOB_FIELDS = (
+    "request_params",
+    "status",
+    "progress_fraction",
+    "progress_label",
+    "progress_meta",
+    "result",
+    "result_meta",
+    "result_count",
+    "error_message",
+    "revision",
+    "created_at",
+    "updated_at",
+)
+
+
+def _row_to_job(row: BackgroundJobModel) -> dict[str, Any]:
+    return {
+        "job_id": str(row.job_id),
+        "params_hash": str(row.params_hash),
+        "request_params": dict(row.request_params or {}),
+        "status": str(row.status or "queued"),
+        "progress_fraction": float(row.progress_fraction or 0.0),
+        "progress_label": row.progress_label,
+        "progress_meta": dict(row.progress_meta or {}),
+        "created_at": row.created_at,
+        "updated_at": row.updated_at,
+        "result": row.result,
+        "result_meta": dict(row.result_meta or {}),
+        "result_count": int(row.result_count or 0),
+        "error_message": row.error_message,
+        "revision": int(row.revision or 0),
+    }
+
+
+def save_job(session, *, kind: str, params_hash: str, job: dict[str, Any], expires_at: float | None) -> None:
+    """Insert or update the durable copy of a job payload."""
+    row = session.get(BackgroundJobModel, str(job["job_id"]))
+    if row is None:
+        row = BackgroundJobModel(job_id=str(job["job_id"]), kind=str(kind), params_hash=str(params_hash))
+        session.add(row)
+    for name in _JOB_FIELDS:
+        if name in job:
+            setattr(row, name, job[name])
+    row.expires_at = expires_at
+    session.commit()
+
+
+def get_job(session, *, kind: str, job_id: str) -> dict[str, Any] | None:
+    row = session.execute(
+        select(BackgroundJobModel).where(BackgroundJobModel.job_id == str(job_id), BackgroundJobModel.kind == str(kind))
+    ).scalar_one_or_none()
+    return _row_to_job(row) if row is not None else None
+
+
+def list_unfinished_jobs(session, *, kind: str) -> list[dict[str, Any]]:
+    rows = session.execute(
+        select(BackgroundJobModel)
+        .where(BackgroundJobModel.kind == str(kind), BackgroundJobModel.status.in_(("queued", "running")))
+        .order_by(BackgroundJobModel.created_at)
+    ).scalars()
+    return [_row_to_job(row) for row in rows]
+
+
+def delete_expired_jobs(session, *, now: float) -> int:
+    result = session.execute(
+        delete(BackgroundJobModel).where(BackgroundJobModel.expires_at.is_not(None), BackgroundJobModel.expires_at < float(now))
+    )
+    session.commit()
+    return int(result.rowcount or 0)
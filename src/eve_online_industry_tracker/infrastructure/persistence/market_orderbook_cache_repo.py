@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import time
 from typing import Any
 
 from eve_online_industry_tracker.db_models import MarketOrderbookViewCacheModel
@@ -31,12 +32,55 @@ def get_cached_orderbook_levels(
     )
     if row is None:
         return None
+    return _fresh_levels(row, ttl_seconds=ttl_seconds)
 
+
+def get_cached_orderbook_levels_bulk(
+    session: Any,
+    *,
+    hub: str,
+    region_id: int,
+    station_id: int,
+    side: str,
+    type_ids: list[int],
+    at_hub: bool,
+    ttl_seconds: int,
+) -> dict[int, tuple[list[list[float | int]], float]]:
+    """``get_cached_orderbook_levels`` for many types in one query; stale or missing types are absent."""
+    ids = sorted({int(type_id) for type_id in type_ids or []})
+    if not ids:
+        return {}
+    rows = (
+        session.query(MarketOrderbookViewCacheModel)
+        .filter(
+            MarketOrderbookViewCacheModel.hub == str(hub),
+            MarketOrderbookViewCacheModel.region_id == int(region_id),
+            MarketOrderbookViewCacheModel.station_id == int(station_id),
+            MarketOrderbookViewCacheModel.side == str(side),
+            MarketOrderbookViewCacheModel.type_id.in_(ids),
+            MarketOrderbookViewCacheModel.at_hub == bool(at_hub),
+        )
+        .order_by(MarketOrderbookViewCacheModel.fetched_at.desc())
+        .all()
+    )
+    out: dict[int, tuple[list[list[float | int]], float]] = {}
+    seen: set[int] = set()
+    for row in rows:
+        type_id = int(row.type_id)
+        if type_id in seen:
+            continue
+        seen.add(type_id)
+        fresh = _fresh_levels(row, ttl_seconds=ttl_seconds)
+        if fresh is not None:
+            out[type_id] = fresh
+    return out
+
+
+def _fresh_levels(row: Any, *, ttl_seconds: int) -> tuple[list[list[float | int]], float] | None:
     try:
         fetched_at = float(row.fetched_at)
     except Exception:
         return None
-    import time
 
     if fetched_at + max(0, int(ttl_seconds)) < time.time():
         return None
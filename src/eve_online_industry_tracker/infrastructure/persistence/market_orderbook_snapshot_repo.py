@@ -0,0 +1,345 @@
+from __future__ import annotations
+
+"""Time series of hub order-book snapshots.
+
+``market_orderbook_view_cache`` only holds the latest view per type. Every ESI fetch
+also appends a compact snapshot here (top-N levels plus total depth and order count),
+so callers can ask what the book looked like at a given time and how depth moved over
+a window without another ESI call. ``prune_snapshots`` keeps recent snapshots as-is
+and thins older ones to one per hour, then one per day, before dropping them.
+"""
+
+import json
+import time
+from typing import Any
+
+from sqlalchemy import bindparam, text
+
+
+HOUR_SECONDS = 3600
+DAY_SECONDS = 24 * HOUR_SECONDS
+
+
+def _normalize_hub(hub: str | None) -> str:
+    h = str(hub or "").strip().lower()
+    return h or "jita"
+
+
+def _normalize_side(side: str | None) -> str | None:
+    s = str(side or "").strip().lower()
+    return s if s in {"buy", "sell"} else None
+
+
+def _normalize_type_ids(type_ids: list[int] | None) -> list[int]:
+    return sorted({int(t) for t in (type_ids or []) if t is not None and int(t) > 0})
+
+
+def _parse_levels(levels_raw: Any) -> list[tuple[float, int]]:
+    levels_obj: Any = levels_raw
+    if isinstance(levels_obj, str):
+        try:
+            levels_obj = json.loads(levels_obj)
+        except Exception:
+            return []
+    if not isinstance(levels_obj, list):
+        return []
+
+    levels: list[tuple[float, int]] = []
+    for pair in levels_obj:
+        if not isinstance(pair, (list, tuple)) or len(pair) != 2:
+            continue
+        try:
+            price_f = float(pair[0])
+            vol_i = int(pair[1])
+        except Exception:
+            continue
+        if price_f > 0 and vol_i > 0:
+            levels.append((price_f, vol_i))
+    return levels
+
+
+def _bind(session: Any) -> Any:
+    try:
+        return session.get_bind()
+    except Exception:
+        return getattr(session, "bind", None)
+
+
+def record_snapshots(
+    session,
+    *,
+    hub: str,
+    region_id: int,
+    station_id: int,
+    side: str,
+    snapshots_by_type_id: dict[int, dict[str, Any]],
+    captured_at: float | None = None,
+) -> int:
+    """Append one snapshot per type; returns the number of rows written.
+
+    Each value carries ``levels`` (best-first [price, volume] pairs), ``total_volume``
+    and ``order_count``. Types with an empty book are recorded too, so a book that
+    emptied out shows up as a depth drop rather than as a gap.
+    """
+
+    if session is None or not snapshots_by_type_id:
+        return 0
+
+    side_n = _normalize_side(side)
+    if side_n is None:
+        return 0
+
+    # Write via the underlying bind/engine so we don't commit unrelated ORM state.
+    bind = _bind(session)
+    if bind is None:
+        return 0
+
+    hub_n = _normalize_hub(hub)
+    captured = float(captured_at if captured_at is not None else time.time())
+    rows: list[dict[str, Any]] = []
+    for type_id, snapshot in snapshots_by_type_id.items():
+        try:
+            tid = int(type_id)
+        except Exception:
+            continue
+        if tid <= 0:
+            continue
+        levels = [[float(p), int(v)] for (p, v) in ((snapshot or {}).get("levels") or [])]
+        rows.append(
+            {
+                "hub": hub_n,
+                "region_id": int(region_id),
+                "station_id": int(station_id),
+                "side": side_n,
+                "type_id": tid,
+                "captured_at": captured,
+                "best_price": float(levels[0][0]) if levels else None,
+                "total_volume": int((snapshot or {}).get("total_volume") or 0),
+                "order_count": int((snapshot or {}).get("order_count") or 0),
+                "levels": json.dumps(levels),
+            }
+        )
+
+    if not rows:
+        return 0
+
+    with bind.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO market_orderbook_snapshots "
+                "(hub, region_id, station_id, side, type_id, captured_at, best_price, total_volume, order_count, levels) "
+                "VALUES (:hub, :region_id, :station_id, :side, :type_id, :captured_at, :best_price, :total_volume, :order_count, :levels)"
+            ),
+            rows,
+        )
+    return len(rows)
+
+
+def get_books_at(
+    session,
+    *,
+    hub: str,
+    side: str,
+    type_ids: list[int],
+    at: float | None = None,
+    max_age_seconds: int = DAY_SECONDS,
+) -> dict[int, dict[str, Any]]:
+    """The latest snapshot per type taken at or before ``at`` (default: now).
+
+    Snapshots older than ``max_age_seconds`` before ``at`` are ignored; types without
+    one are absent from the result.
+    """
+
+    if session is None:
+        return {}
+
+    ids = _normalize_type_ids(type_ids)
+    side_n = _normalize_side(side)
+    if not ids or side_n is None:
+        return {}
+
+    at_f = float(at if at is not None else time.time())
+    rows = session.execute(
+        text(
+            "SELECT s.type_id, s.captured_at, s.best_price, s.total_volume, s.order_count, s.levels "
+            "FROM market_orderbook_snapshots s "
+            "JOIN ("
+            "SELECT type_id, MAX(captured_at) AS captured_at FROM market_orderbook_snapshots "
+            "WHERE hub = :hub AND side = :side AND type_id IN :type_ids "
+            "AND captured_at <= :at AND captured_at >= :min_captured_at "
+            "GROUP BY type_id"
+            ") latest ON latest.type_id = s.type_id AND latest.captured_at = s.captured_at "
+            "WHERE s.hub = :hub AND s.side = :side"
+        ).bindparams(bindparam("type_ids", expanding=True)),
+        {
+            "hub": _normalize_hub(hub),
+            "side": side_n,
+            "type_ids": ids,
+            "at": at_f,
+            "min_captured_at": at_f - float(max(0, int(max_age_seconds or 0))),
+        },
+    ).fetchall()
+
+    out: dict[int, dict[str, Any]] = {}
+    for type_id, captured_at, best_price, total_volume, order_count, levels_raw in rows or []:
+        out[int(type_id)] = {
+            "captured_at": float(captured_at),
+            "best_price": float(best_price) if best_price is not None else None,
+            "total_volume": int(total_volume or 0),
+            "order_count": int(order_count or 0),
+            "levels": _parse_levels(levels_raw),
+        }
+    return out
+
+
+def summarize_depth_series(points: list[tuple[float, float | None, int]], *, side: str) -> dict[str, Any] | None:
+    """Depth movement over time-ordered ``(captured_at, best_price, total_volume)`` points.
+
+    ``volume_removed`` sums the depth drops between consecutive snapshots: fills and
+    cancellations, net of orders placed in between, so it is a sell-through proxy rather
+    than a trade count. ``undercuts`` counts snapshots where the best price moved in the
+    competitive direction (down for sell books, up for buy books).
+    """
+
+    if not points:
+        return None
+
+    volume_removed = 0
+    volume_added = 0
+    best_price_changes = 0
+    undercuts = 0
+    for (_, prev_price, prev_volume), (_, price, volume) in zip(points, points[1:]):
+        if volume < prev_volume:
+            volume_removed += prev_volume - volume
+        else:
+            volume_added += volume - prev_volume
+        if prev_price is not None and price is not None and price != prev_price:
+            best_price_changes += 1
+            if (price < prev_price) if side == "sell" else (price > prev_price):
+                undercuts += 1
+
+    start_at, start_price, start_volume = points[0]
+    end_at, end_price, end_volume = points[-1]
+    span_days = max(0.0, float(end_at) - float(start_at)) / DAY_SECONDS
+    return {
+        "snapshot_count": len(points),
+        "start_at": float(start_at),
+        "end_at": float(end_at),
+        "start_total_volume": int(start_volume),
+        "end_total_volume": int(end_volume),
+        "depth_delta": int(end_volume) - int(start_volume),
+        "volume_removed": int(volume_removed),
+        "volume_added": int(volume_added),
+        "volume_removed_per_day": float(volume_removed / span_days) if span_days > 0 else None,
+        "best_price_start": start_price,
+        "best_price_end": end_price,
+        "best_price_changes": int(best_price_changes),
+        "undercuts": int(undercuts),
+    }
+
+
+def get_depth_deltas(
+    session,
+    *,
+    hub: str,
+    side: str,
+    type_ids: list[int],
+    since: float,
+    until: float | None = None,
+) -> dict[int, dict[str, Any]]:
+    """Per-type depth movement between ``since`` and ``until`` (default: now).
+
+    See ``summarize_depth_series`` for the fields; types without snapshots in the
+    window are absent.
+    """
+
+    if session is None:
+        return {}
+
+    ids = _normalize_type_ids(type_ids)
+    side_n = _normalize_side(side)
+    if not ids or side_n is None:
+        return {}
+
+    rows = session.execute(
+        text(
+            "SELECT type_id, captured_at, best_price, total_volume "
+            "FROM market_orderbook_snapshots "
+            "WHERE hub = :hub AND side = :side AND type_id IN :type_ids "
+            "AND captured_at >= :since AND captured_at <= :until "
+            "ORDER BY type_id, captured_at"
+        ).bindparams(bindparam("type_ids", expanding=True)),
+        {
+            "hub": _normalize_hub(hub),
+            "side": side_n,
+            "type_ids": ids,
+            "since": float(since),
+            "until": float(until if until is not None else time.time()),
+        },
+    ).fetchall()
+
+    points_by_type: dict[int, list[tuple[float, float | None, int]]] = {}
+    for type_id, captured_at, best_price, total_volume in rows or []:
+        points_by_type.setdefault(int(type_id), []).append(
+            (float(captured_at), float(best_price) if best_price is not None else None, int(total_volume or 0))
+        )
+
+    out: dict[int, dict[str, Any]] = {}
+    for type_id, points in points_by_type.items():
+        summary = summarize_depth_series(points, side=side_n)
+        if summary is not None:
+            out[type_id] = summary
+    return out
+
+
+def prune_snapshots(
+    session,
+    *,
+    raw_retention_seconds: int,
+    hourly_retention_seconds: int,
+    daily_retention_seconds: int,
+    now: float | None = None,
+) -> dict[str, int]:
+    """Apply the retention policy; returns rows deleted per step.
+
+    Snapshots newer than ``raw_retention_seconds`` are kept as-is. Up to
+    ``hourly_retention_seconds`` the last snapshot per (book, hour) survives, up to
+    ``daily_retention_seconds`` the last per (book, day); anything older is dropped.
+    """
+
+    if session is None:
+        return {}
+
+    bind = _bind(session)
+    if bind is None:
+        return {}
+
+    now_f = float(now if now is not None else time.time())
+    raw_cutoff = now_f - float(max(0, int(raw_retention_seconds)))
+    hourly_cutoff = min(raw_cutoff, now_f - float(max(0, int(hourly_retention_seconds))))
+    daily_cutoff = min(hourly_cutoff, now_f - float(max(0, int(daily_retention_seconds))))
+
+    downsample = (
+        "DELETE FROM market_orderbook_snapshots "
+        "WHERE captured_at >= :lo AND captured_at < :hi AND id NOT IN ("
+        "SELECT MAX(id) FROM market_orderbook_snapshots "
+        "WHERE captured_at >= :lo AND captured_at < :hi "
+        "GROUP BY hub, region_id, station_id, side, type_id, CAST(captured_at / :bucket AS INTEGER)"
+        ")"
+    )
+    deleted: dict[str, int] = {}
+    with bind.begin() as conn:
+        deleted["expired"] = int(
+            conn.execute(
+                text("DELETE FROM market_orderbook_snapshots WHERE captured_at < :cutoff"),
+                {"cutoff": daily_cutoff},
+            ).rowcount
+            or 0
+        )
+        deleted["daily"] = int(
+            conn.execute(text(downsample), {"lo": daily_cutoff, "hi": hourly_cutoff, "bucket": DAY_SECONDS}).rowcount or 0
+        )
+        deleted["hourly"] = int(
+            conn.execute(text(downsample), {"lo": hourly_cutoff, "hi": raw_cutoff, "bucket": HOUR_SECONDS}).rowcount or 0
+        )
+    return deleted
@@ -115,6 +115,42 @@ def get_views(
     return out
 
 
+def get_fetched_at(
+    session,
+    *,
+    hub: str,
+    region_id: int,
+    station_id: int,
+    side: str,
+    at_hub: bool,
+) -> dict[int, float]:
+    """Return fetched_at per type for every cached view under one key, regardless of age."""
+
+    if session is None:
+        return {}
+
+    side_n = str(side or "").strip().lower()
+    if side_n not in {"buy", "sell"}:
+        return {}
+
+    rows = session.execute(
+        text(
+            "SELECT type_id, fetched_at FROM market_orderbook_view_cache "
+            "WHERE hub = :hub AND region_id = :region_id AND station_id = :station_id "
+            "AND side = :side AND at_hub = :at_hub AND version = :version"
+        ),
+        {
+            "hub": _normalize_hub(hub),
+            "region_id": int(region_id),
+            "station_id": int(station_id),
+            "side": side_n,
+            "at_hub": 1 if bool(at_hub) else 0,
+            "version": int(_CACHE_VERSION),
+        },
+    ).fetchall()
+    return {int(type_id): float(fetched_at or 0.0) for type_id, fetched_at in rows or []}
+
+
 def get_liquidity_summaries(
     session,
     *,
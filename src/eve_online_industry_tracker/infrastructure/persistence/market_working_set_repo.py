@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from sqlalchemy import select, union
+
+from eve_online_industry_tracker.db_models import CharacterAssetsModel, CharacterMarketOrdersModel, CorporationAssetsModel
+
+
+def list_owned_and_ordered_type_ids(session) -> set[int]:
+    """Distinct type_ids in character and corporation assets plus open character market orders."""
+    rows = session.execute(
+        union(
+            select(CharacterAssetsModel.type_id),
+            select(CorporationAssetsModel.type_id),
+            select(CharacterMarketOrdersModel.type_id),
+        )
+    ).scalars()
+    return {int(type_id) for type_id in rows if type_id is not None and int(type_id) > 0}
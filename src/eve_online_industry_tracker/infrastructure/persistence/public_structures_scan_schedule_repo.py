@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from typing import Iterable
+
+from sqlalchemy import select
+
+from eve_online_industry_tracker.db_models import IndustryProfilesModel, PublicStructuresScanScheduleModel
+
+
+def load_schedule(session) -> dict[int, dict]:
+    """All per-structure scan entries keyed by structure_id."""
+    rows = session.execute(
+        select(
+            PublicStructuresScanScheduleModel.structure_id,
+            PublicStructuresScanScheduleModel.system_id,
+            PublicStructuresScanScheduleModel.last_status,
+            PublicStructuresScanScheduleModel.consecutive_denials,
+            PublicStructuresScanScheduleModel.last_checked_at,
+            PublicStructuresScanScheduleModel.next_check_at,
+        )
+    ).all()
+    return {
+        int(structure_id): {
+            "system_id": int(system_id) if system_id is not None else None,
+            "last_status": str(last_status),
+            "consecutive_denials": int(consecutive_denials or 0),
+            "last_checked_at": float(last_checked_at),
+            "next_check_at": float(next_check_at),
+        }
+        for structure_id, system_id, last_status, consecutive_denials, last_checked_at, next_check_at in rows
+    }
+
+
+def upsert_many(session, entries: Iterable[dict]) -> int:
+    """Upsert scan entries; each item carries structure_id plus the load_schedule fields."""
+    count = 0
+    for item in entries:
+        structure_id = item.get("structure_id")
+        if not structure_id:
+            continue
+        session.merge(
+            PublicStructuresScanScheduleModel(
+                structure_id=int(structure_id),
+                system_id=(int(item["system_id"]) if item.get("system_id") is not None else None),
+                last_status=str(item["last_status"]),
+                consecutive_denials=int(item.get("consecutive_denials") or 0),
+                last_checked_at=float(item["last_checked_at"]),
+                next_check_at=float(item["next_check_at"]),
+            )
+        )
+        count += 1
+
+    session.commit()
+    return count
+
+
+def list_industry_profile_system_ids(session) -> set[int]:
+    """Solar systems referenced by any industry profile; their structures are scanned first."""
+    rows = session.execute(
+        select(IndustryProfilesModel.system_id).where(IndustryProfilesModel.system_id.is_not(None)).distinct()
+    ).scalars()
+    return {int(system_id) for system_id in rows}
@@ -5,17 +5,30 @@ import threading
 import time
 from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
-from typing import Any
+from typing import Any, Iterator
 
-from eve_online_industry_tracker.db_models import PublicStructuresModel, PublicStructuresScanStateModel
+from eve_online_industry_tracker.db_models import (
+    PublicStructuresModel,
+    PublicStructuresScanScheduleModel,
+    PublicStructuresScanStateModel,
+)
 
-from eve_online_industry_tracker.infrastructure.persistence import public_structures_repo, public_structures_scan_state_repo
+from eve_online_industry_tracker.infrastructure import public_structures_scan_scheduler
+from eve_online_industry_tracker.infrastructure.persistence import (
+    public_structures_repo,
+    public_structures_scan_schedule_repo,
+    public_structures_scan_state_repo,
+)
 from eve_online_industry_tracker.infrastructure.public_structures_scan_job import (
     PublicStructuresGlobalScanJob,
     PublicStructuresScanConfig,
 )
 
 
+# Transient job-queue kind for on-demand per-system refreshes.
+PUBLIC_STRUCTURES_REFRESH_JOB_KIND = "public_structures_refresh"
+
+
 def _ensure_table_exists(session) -> None:
     try:
         engine = session.get_bind()
@@ -34,6 +47,14 @@ def _ensure_scan_state_table_exists(session) -> None:
         pass
 
 
+def _ensure_scan_schedule_table_exists(session) -> None:
+    try:
+        engine = session.get_bind()
+        PublicStructuresScanScheduleModel.__table__.create(bind=engine, checkfirst=True)
+    except Exception:
+        pass
+
+
 def get_cached_public_structures(*, state: Any, system_id: int, ttl_seconds: int) -> tuple[list[dict], bool]:
     """Return cached structures for a system + whether the cache is fresh."""
 
@@ -181,7 +202,11 @@ def trigger_refresh_public_structures_for_system(
             with state.public_structures_refresh_lock:
                 state.public_structures_refreshing_system_ids.discard(system_id)
 
-    threading.Thread(target=_run, daemon=True, name=f"public-structures-refresh-{system_id}").start()
+    queue = getattr(state, "job_queue", None)
+    if queue is not None and queue.handles(PUBLIC_STRUCTURES_REFRESH_JOB_KIND):
+        queue.submit_task(PUBLIC_STRUCTURES_REFRESH_JOB_KIND, _run)
+    else:
+        threading.Thread(target=_run, daemon=True, name=f"public-structures-refresh-{system_id}").start()
     return True
 
 
@@ -195,9 +220,14 @@ def trigger_global_public_structures_scan(
     pause_seconds: float = 5.0,
     stop_event: threading.Event | None = None,
     request_timeout_seconds: float = 15.0,
+    recheck_seconds: float = 7 * 24 * 3600.0,
+    denied_backoff_seconds: float = 24 * 3600.0,
 ) -> bool:
     """Start a background global scan that tries to populate public_structures for all accessible structures.
 
+    Structures are only revisited when their per-structure schedule says they are due
+    (see `public_structures_scan_scheduler`).
+
     Backward-compatible wrapper around `PublicStructuresGlobalScanJob`.
     """
 
@@ -220,6 +250,8 @@ def trigger_global_public_structures_scan(
         batch_size=int(batch_size),
         pause_seconds=float(pause_seconds),
         request_timeout_seconds=float(request_timeout_seconds),
+        recheck_seconds=float(recheck_seconds),
+        denied_backoff_seconds=float(denied_backoff_seconds),
     )
     return bool(job.start(state=state, config=cfg))
 
@@ -240,13 +272,15 @@ def stop_global_public_structures_scan(*, state: Any) -> bool:
     return bool(job.stop(state=state))
 
 
-def _persist_global_cursor(*, state: Any, cursor: int) -> None:
+def _commit_global_batch(*, state: Any, rows: list[dict], entries: list[dict]) -> None:
     if state.db_app is None:
         return
     session = state.db_app.Session()
     try:
-        _ensure_scan_state_table_exists(session)
-        public_structures_scan_state_repo.set_cursor(session, int(cursor))
+        _ensure_table_exists(session)
+        _ensure_scan_schedule_table_exists(session)
+        public_structures_repo.upsert_many(session, rows)
+        public_structures_scan_schedule_repo.upsert_many(session, entries)
     finally:
         try:
             session.close()
@@ -254,20 +288,26 @@ def _persist_global_cursor(*, state: Any, cursor: int) -> None:
             pass
 
 
-def _commit_global_batch(*, state: Any, rows: list[dict], new_cursor: int) -> None:
-    if state.db_app is None:
-        return
-    session = state.db_app.Session()
-    try:
-        _ensure_table_exists(session)
-        _ensure_scan_state_table_exists(session)
-        public_structures_repo.upsert_many(session, rows)
-        public_structures_scan_state_repo.set_cursor(session, int(new_cursor))
-    finally:
+def _scan_workers(*, state: Any, max_workers: int) -> int:
+    """Concurrency for the next requests, scaled down as the ESI error budget runs low."""
+    remain = None
+    error_budget = getattr(state.esi_service, "error_budget", None)
+    if callable(error_budget):
         try:
-            session.close()
+            remain, _ = error_budget()
         except Exception:
-            pass
+            remain = None
+    workers = public_structures_scan_scheduler.workers_for_error_budget(remain, max_workers=max_workers)
+    state.public_structures_global_scan_workers = workers
+    return workers
+
+
+def _submit_up_to(ex: ThreadPoolExecutor, in_flight: set, ids: Iterator[int], fn: Any, limit: int) -> None:
+    while len(in_flight) < limit:
+        sid = next(ids, None)
+        if sid is None:
+            return
+        in_flight.add(ex.submit(fn, sid))
 
 
 def _global_scan_loop(
@@ -280,30 +320,73 @@ def _global_scan_loop(
     pause_seconds: float,
     stop_event: threading.Event | None,
     request_timeout_seconds: float,
+    recheck_seconds: float = 7 * 24 * 3600,
+    denied_backoff_seconds: float = 24 * 3600,
 ) -> None:
     if state.db_app is None or state.esi_service is None:
         return
 
     structure_ids = state.esi_service.list_universe_structure_ids(filter=None)
-    total = len(structure_ids)
-    state.public_structures_global_scan_total_ids = total
-    if total == 0:
+    if not structure_ids:
+        state.public_structures_global_scan_total_ids = 0
         return
 
     session = state.db_app.Session()
     try:
         _ensure_table_exists(session)
         _ensure_scan_state_table_exists(session)
-        cursor = public_structures_scan_state_repo.get_cursor(session)
+        _ensure_scan_schedule_table_exists(session)
+        schedule = public_structures_scan_schedule_repo.load_schedule(session)
+        priority_system_ids = public_structures_scan_schedule_repo.list_industry_profile_system_ids(session)
     finally:
         session.close()
 
-    if cursor < 0 or cursor >= total:
-        cursor = 0
+    # Only IDs whose next check is due are visited; progress and resume come from the
+    # per-structure schedule, so the old positional cursor is no longer read.
+    plan = public_structures_scan_scheduler.plan_scan(
+        structure_ids, schedule, priority_system_ids=priority_system_ids, now=time.time()
+    )
+    total = len(plan)
+    state.public_structures_global_scan_total_ids = total
+    state.public_structures_global_scan_skipped = len(set(structure_ids)) - total
+    logging.info(
+        "Global public structures scan: %s of %s structure IDs due (%s never seen).",
+        total,
+        len(set(structure_ids)),
+        sum(1 for sid in plan if sid not in schedule),
+    )
 
     max_workers = max(1, int(max_workers))
     batch_size = max(1, int(batch_size))
     scan_cap = max(1, int(scan_cap))
+    pending_ids = list(plan)
+
+    def fetch_one(structure_id: int) -> tuple[int, str, dict | None]:
+        try:
+            data = state.esi_service.get_universe_structure(
+                int(structure_id),
+                timeout_seconds=float(request_timeout_seconds),
+                suppress_forbidden_log=True,
+                suppress_not_found_log=True,
+            )
+        except Exception:
+            return int(structure_id), "error", None
+        # ESIClient returns None on 403/404.
+        if not isinstance(data, dict):
+            return int(structure_id), "denied", None
+        val = data.get("solar_system_id")
+        try:
+            system_id = int(val) if isinstance(val, (int, str)) else None
+        except Exception:
+            system_id = None
+        return int(structure_id), "ok", {
+            "structure_id": int(structure_id),
+            "system_id": system_id,
+            "owner_id": data.get("owner_id"),
+            "type_id": data.get("type_id"),
+            "structure_name": data.get("name"),
+            "services": data.get("services"),
+        }
 
     ex: ThreadPoolExecutor | None = None
     try:
@@ -317,12 +400,11 @@ def _global_scan_loop(
                     pass
                 return
 
-            state.public_structures_global_scan_cursor = int(cursor)
+            state.public_structures_global_scan_cursor = int(total - len(pending_ids))
             state.public_structures_global_scan_last_heartbeat_at = datetime.utcnow()
 
             slice_start = time.time()
-            slice_end_cursor = min(total, cursor + scan_cap)
-            ids_slice = structure_ids[cursor:slice_end_cursor]
+            ids_slice = pending_ids[:scan_cap]
             if not ids_slice:
                 session = state.db_app.Session()
                 try:
@@ -330,48 +412,16 @@ def _global_scan_loop(
                     public_structures_scan_state_repo.mark_completed(session)
                 finally:
                     session.close()
-                logging.info("Global public structures scan completed a full pass (total_ids=%s).", total)
+                logging.info("Global public structures scan completed a full pass (due_ids=%s).", total)
                 return
 
-            def fetch_one(structure_id: int):
-                try:
-                    data = state.esi_service.get_universe_structure(
-                        int(structure_id),
-                        timeout_seconds=float(request_timeout_seconds),
-                    )
-                    if not isinstance(data, dict):
-                        return None
-                    val = data.get("solar_system_id")
-                    if isinstance(val, (int, str)):
-                        try:
-                            system_id = int(val)
-                        except Exception:
-                            system_id = None
-                    else:
-                        system_id = None
-                    return {
-                        "structure_id": int(structure_id),
-                        "system_id": system_id,
-                        "owner_id": data.get("owner_id"),
-                        "type_id": data.get("type_id"),
-                        "structure_name": data.get("name"),
-                        "services": data.get("services"),
-                    }
-                except Exception:
-                    return None
-
             rows_batch: list[dict] = []
-            attempted_in_slice = 0
+            entries_batch: list[dict] = []
+            checked: set[int] = set()
 
             it = iter(ids_slice)
-            in_flight = set()
-
-            for _ in range(max_workers):
-                try:
-                    sid = next(it)
-                except StopIteration:
-                    break
-                in_flight.add(ex.submit(fetch_one, sid))
+            in_flight: set = set()
+            _submit_up_to(ex, in_flight, it, fetch_one, _scan_workers(state=state, max_workers=max_workers))
 
             while in_flight:
                 if stop_event is not None and stop_event.is_set():
@@ -394,25 +444,35 @@ def _global_scan_loop(
                     return_when=FIRST_COMPLETED,
                 )
 
+                now = time.time()
                 for fut in done:
-                    attempted_in_slice += 1
                     state.public_structures_global_scan_attempted += 1
                     try:
-                        item = fut.result()
+                        structure_id, status, item = fut.result()
                     except Exception:
-                        item = None
-                    if item and item.get("structure_id") and item.get("system_id"):
+                        continue
+                    checked.add(structure_id)
+                    entry = public_structures_scan_scheduler.next_entry(
+                        schedule.get(structure_id),
+                        status=status,
+                        system_id=(item or {}).get("system_id"),
+                        now=now,
+                        priority_system_ids=priority_system_ids,
+                        recheck_seconds=float(recheck_seconds),
+                        denied_backoff_seconds=float(denied_backoff_seconds),
+                    )
+                    schedule[structure_id] = entry
+                    entries_batch.append({"structure_id": structure_id, **entry})
+                    if item and item.get("system_id"):
                         rows_batch.append(item)
-                    if len(rows_batch) >= batch_size:
-                        _commit_global_batch(state=state, rows=rows_batch, new_cursor=cursor + attempted_in_slice)
+                    if len(entries_batch) >= batch_size:
+                        _commit_global_batch(state=state, rows=rows_batch, entries=entries_batch)
                         state.public_structures_global_scan_rows_written += len(rows_batch)
                         rows_batch = []
+                        entries_batch = []
 
-                    try:
-                        sid = next(it)
-                    except StopIteration:
-                        continue
-                    in_flight.add(ex.submit(fetch_one, sid))
+                # Re-read the error budget each round so a burst of 403s throttles the scan.
+                _submit_up_to(ex, in_flight, it, fetch_one, _scan_workers(state=state, max_workers=max_workers))
 
             # If we broke due to time budget, cancel pending work so we don't block shutdown
             # or waste requests after we've moved on.
@@ -423,19 +483,19 @@ def _global_scan_loop(
                 except Exception:
                     pass
 
-            if rows_batch:
-                _commit_global_batch(state=state, rows=rows_batch, new_cursor=cursor + attempted_in_slice)
+            if entries_batch:
+                _commit_global_batch(state=state, rows=rows_batch, entries=entries_batch)
                 state.public_structures_global_scan_rows_written += len(rows_batch)
 
-            cursor = min(total, cursor + attempted_in_slice)
-            _persist_global_cursor(state=state, cursor=cursor)
+            # Unchecked IDs from this slice (time budget ran out) go first next time.
+            pending_ids = [sid for sid in ids_slice if sid not in checked] + pending_ids[len(ids_slice):]
 
             if pause_seconds > 0:
                 if stop_event is not None and stop_event.is_set():
                     return
                 time.sleep(pause_seconds)
 
-            if attempted_in_slice == 0:
+            if not checked:
                 if stop_event is not None and stop_event.is_set():
                     return
                 time.sleep(max(1.0, pause_seconds))
@@ -15,6 +15,8 @@ class PublicStructuresScanConfig:
     batch_size: int = 100
     pause_seconds: float = 5.0
     request_timeout_seconds: float = 5.0
+    recheck_seconds: float = 7 * 24 * 3600.0
+    denied_backoff_seconds: float = 24 * 3600.0
 
 
 class PublicStructuresGlobalScanJob:
@@ -54,6 +56,8 @@ class PublicStructuresGlobalScanJob:
             state.public_structures_global_scan_error = None
             state.public_structures_global_scan_attempted = 0
             state.public_structures_global_scan_rows_written = 0
+            state.public_structures_global_scan_skipped = 0
+            state.public_structures_global_scan_workers = None
 
         def _run() -> None:
             try:
@@ -69,6 +73,8 @@ class PublicStructuresGlobalScanJob:
                     pause_seconds=float(config.pause_seconds),
                     stop_event=stop_event,
                     request_timeout_seconds=float(config.request_timeout_seconds),
+                    recheck_seconds=float(config.recheck_seconds),
+                    denied_backoff_seconds=float(config.denied_backoff_seconds),
                 )
             except Exception as e:
                 state.public_structures_global_scan_error = str(e)
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+"""Which structure IDs the global public-structures scan checks, in what order, how fast.
+
+Every ID from ``/universe/structures/`` gets a next-check time after it is fetched:
+confirmed structures are rechecked after ``recheck_seconds`` (a quarter of that in
+systems our industry profiles use), IDs that answer 403/404 back off exponentially
+(those responses also spend ESI error budget), and transient failures retry within
+the hour. A pass only visits IDs that are due, so after the first pass most of the
+list is skipped.
+"""
+
+import math
+from typing import Any, Iterable, Optional
+
+
+DAY_SECONDS = 24 * 3600
+ERROR_RETRY_SECONDS = 3600
+MAX_DENIED_BACKOFF_SECONDS = 30 * DAY_SECONDS
+PRIORITY_RECHECK_FACTOR = 0.25
+# ESI allows 100 errors per window; below this many left the scan runs single-threaded.
+ERROR_BUDGET_FLOOR = 10
+ERROR_BUDGET_WINDOW = 100
+
+
+def plan_scan(
+    structure_ids: Iterable[int],
+    schedule: dict[int, dict[str, Any]],
+    *,
+    priority_system_ids: set[int],
+    now: float,
+) -> list[int]:
+    """Due IDs in scan order: known structures in priority systems, never-seen IDs, the rest.
+
+    Never-seen IDs keep their listing order; known IDs go oldest next-check first.
+    """
+    priority: list[tuple[float, int]] = []
+    unseen: list[int] = []
+    due: list[tuple[float, int]] = []
+    seen_ids: set[int] = set()
+    for structure_id in structure_ids:
+        sid = int(structure_id)
+        if sid in seen_ids:
+            continue
+        seen_ids.add(sid)
+        entry = schedule.get(sid)
+        if entry is None:
+            unseen.append(sid)
+            continue
+        next_check_at = float(entry.get("next_check_at") or 0.0)
+        if next_check_at > now:
+            continue
+        if entry.get("system_id") in priority_system_ids:
+            priority.append((next_check_at, sid))
+        else:
+            due.append((next_check_at, sid))
+    return [sid for _, sid in sorted(priority)] + unseen + [sid for _, sid in sorted(due)]
+
+
+def next_entry(
+    previous: Optional[dict[str, Any]],
+    *,
+    status: str,
+    system_id: Optional[int],
+    now: float,
+    priority_system_ids: set[int],
+    recheck_seconds: float,
+    denied_backoff_seconds: float,
+) -> dict[str, Any]:
+    """Schedule entry after a check that ended in ``status`` ('ok', 'denied' or 'error')."""
+    previous = previous or {}
+    known_system_id = system_id if system_id is not None else previous.get("system_id")
+    consecutive_denials = 0
+    if status == "ok":
+        delay = float(recheck_seconds)
+        if known_system_id in priority_system_ids:
+            delay *= PRIORITY_RECHECK_FACTOR
+    elif status == "denied":
+        consecutive_denials = int(previous.get("consecutive_denials") or 0) + 1
+        delay = min(float(MAX_DENIED_BACKOFF_SECONDS), float(denied_backoff_seconds) * 2 ** (consecutive_denials - 1))
+    else:
+        # Keep the denial streak: a timeout says nothing about access.
+        consecutive_denials = int(previous.get("consecutive_denials") or 0)
+        delay = min(float(recheck_seconds), float(ERROR_RETRY_SECONDS))
+    return {
+        "system_id": known_system_id,
+        "last_status": status,
+        "consecutive_denials": consecutive_denials,
+        "last_checked_at": float(now),
+        "next_check_at": float(now) + max(0.0, delay),
+    }
+
+
+def workers_for_error_budget(remain: Optional[int], *, max_workers: int) -> int:
+    """Concurrency allowed with ``remain`` ESI errors left in the current window."""
+    max_workers = max(1, int(max_workers))
+    if remain is None:
+        return max_workers
+    if remain <= ERROR_BUDGET_FLOOR:
+        return 1
+    headroom = (int(remain) - ERROR_BUDGET_FLOOR) / float(ERROR_BUDGET_WINDOW - ERROR_BUDGET_FLOOR)
+    return max(1, min(max_workers, math.ceil(max_workers * headroom)))
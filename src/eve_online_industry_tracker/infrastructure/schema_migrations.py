@@ -88,6 +88,53 @@ def _ensure_column(db: DatabaseManager, *, table: str, column: str, ddl_type: st
         logging.warning("Failed adding column %s.%s: %s", table, column, str(e))
 
 
+# Composite indexes for the hot, owner-scoped read paths: (index name, table, columns).
+# market_history and the asset history tables are already covered by their unique key and
+# the indexes created below; tests/test_app_db_query_plans.py checks the repository queries
+# against this list with EXPLAIN QUERY PLAN.
+_HOT_PATH_INDEXES: tuple[tuple[str, str, tuple[str, ...]], ...] = (
+    # Sales history, FIFO lot reconstruction and incremental realized-profit rebuilds
+    ("idx_character_wallet_transactions_owner_type_date", "character_wallet_transactions", ("character_id", "type_id", "date")),
+    ("idx_character_wallet_transactions_owner_tx", "character_wallet_transactions", ("character_id", "transaction_id")),
+    ("idx_corporation_wallet_transactions_owner_type_date", "corporation_wallet_transactions", ("corporation_id", "type_id", "date")),
+    ("idx_corporation_wallet_transactions_owner_tx", "corporation_wallet_transactions", ("corporation_id", "transaction_id")),
+    # Journal refresh and realized-profit fee lookups
+    ("idx_character_wallet_journal_owner_ref", "character_wallet_journal", ("character_id", "wallet_journal_id")),
+    ("idx_corporation_wallet_journal_owner_ref", "corporation_wallet_journal", ("corporation_id", "wallet_journal_id")),
+    # Active-job views, job slot counts and product cost history
+    ("idx_character_industry_jobs_owner_status_product", "character_industry_jobs", ("character_id", "status", "product_type_id")),
+    ("idx_character_industry_jobs_owner_product", "character_industry_jobs", ("character_id", "product_type_id")),
+    ("idx_character_industry_jobs_status", "character_industry_jobs", ("status",)),
+    ("idx_corporation_industry_jobs_owner_status_product", "corporation_industry_jobs", ("corporation_id", "status", "product_type_id")),
+    ("idx_corporation_industry_jobs_owner_product", "corporation_industry_jobs", ("corporation_id", "product_type_id")),
+    ("idx_corporation_industry_jobs_status", "corporation_industry_jobs", ("status",)),
+    # Owned blueprint/inventory lookups and per-owner asset/order refreshes
+    ("idx_character_assets_owner_category", "character_assets", ("character_id", "type_category_name")),
+    ("idx_corporation_assets_owner_category", "corporation_assets", ("corporation_id", "type_category_name")),
+    ("idx_character_market_orders_owner", "character_market_orders", ("character_id",)),
+    # Order-book history: book-at-time / depth-delta reads and retention sweeps
+    ("idx_market_orderbook_snapshots_key_time", "market_orderbook_snapshots", ("hub", "side", "type_id", "captured_at")),
+    ("idx_market_orderbook_snapshots_time", "market_orderbook_snapshots", ("captured_at",)),
+)
+
+
+def _ensure_hot_path_indexes(db: DatabaseManager) -> None:
+    """Index-advisor pass: create the indexes in _HOT_PATH_INDEXES on tables that exist."""
+    for name, table, columns in _HOT_PATH_INDEXES:
+        existing = _table_columns(db, table)
+        if not existing:
+            continue
+        missing = [column for column in columns if column not in existing]
+        if missing:
+            logging.warning("Skipping index %s: %s lacks columns %s", name, table, ", ".join(missing))
+            continue
+        _ensure_index(
+            db,
+            name=name,
+            ddl=f"CREATE INDEX IF NOT EXISTS {name} ON {table}({', '.join(columns)})",
+        )
+
+
 def ensure_app_schema(db_app: DatabaseManager) -> None:
     """Best-effort forward migrations for the app DB.
 
@@ -443,3 +490,28 @@ def ensure_app_schema(db_app: DatabaseManager) -> None:
             "ON corporation_realized_sales_ledger(corporation_id, date)"
         ),
     )
+
+    # Persisted FIFO state for incremental realized-profit rebuilds
+    for owner_column, table in (
+        ("character_id", "character_realized_profit_state"),
+        ("corporation_id", "corporation_realized_profit_state"),
+    ):
+        _ensure_table(
+            db_app,
+            table=table,
+            ddl=(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                f"{owner_column} INTEGER NOT NULL UNIQUE,"
+                "last_transaction_id INTEGER NULL,"
+                "transaction_count INTEGER NOT NULL DEFAULT 0,"
+                "job_watermark_date TEXT NULL,"
+                "job_count INTEGER NOT NULL DEFAULT 0,"
+                "fifo_state JSON NULL,"
+                "updated_at DATETIME DEFAULT CURRENT_TIMESTAMP"
+                ")"
+            ),
+        )
+
+    # Last, so every table and column the indexes cover already exists
+    _ensure_hot_path_indexes(db_app)
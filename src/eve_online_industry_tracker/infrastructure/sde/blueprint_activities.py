@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+"""Process-wide cache of blueprint activities, keyed by SDE build.
+
+The blueprints table is loaded once per SDE engine and build number; provenance,
+invention-cost and realized-profit code read products, quantities, materials and
+invention probabilities from here instead of querying ``Blueprints`` per job.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from eve_online_industry_tracker.db_models import Blueprints
+from eve_online_industry_tracker.infrastructure.sde.build_cache import get_build_keyed, invalidate_build_keyed
+
+
+_CACHE_KEY = "blueprint_activities"
+# SDE tables the cache is built from.
+BLUEPRINT_ACTIVITY_TABLES = frozenset({"blueprints"})
+
+
+def _safe_int(value: Any) -> Optional[int]:
+    try:
+        if value is None:
+            return None
+        return int(value)
+    except Exception:
+        return None
+
+
+def _safe_float(value: Any) -> Optional[float]:
+    try:
+        if value is None:
+            return None
+        return float(value)
+    except Exception:
+        return None
+
+
+def invention_probability(invention: dict[str, Any]) -> Optional[float]:
+    """Base invention probability, or None when products disagree."""
+    probability = _safe_float(invention.get("probability"))
+    if probability is not None and probability > 0:
+        return probability
+    products = invention.get("products") or []
+    raw_probs: list[float] = []
+    for product in products:
+        if not isinstance(product, dict):
+            continue
+        prob = _safe_float(product.get("probability"))
+        if prob is not None and prob > 0:
+            raw_probs.append(float(prob))
+    if not raw_probs:
+        return None
+    if len(raw_probs) == 1:
+        return raw_probs[0]
+    if max(raw_probs) - min(raw_probs) < 1e-9:
+        return raw_probs[0]
+    return None
+
+
+@dataclass(frozen=True)
+class BlueprintActivityCache:
+    """Read-only view over every blueprint's activities for one SDE build."""
+
+    build_number: Optional[int]
+    activities_by_blueprint_type_id: dict[int, dict[str, Any]]
+    max_production_limit_by_blueprint_type_id: dict[int, int]
+    invention_source_by_target_blueprint_type_id: dict[int, dict[str, Any]]
+    _output_quantity_by_key: dict[tuple[int, str, int], int] = field(default_factory=dict, repr=False)
+    _first_output_quantity_by_key: dict[tuple[int, str], int] = field(default_factory=dict, repr=False)
+
+    def has_blueprint(self, blueprint_type_id: int) -> bool:
+        return int(blueprint_type_id) in self.activities_by_blueprint_type_id
+
+    def activity(self, blueprint_type_id: int, activity: str = "manufacturing") -> Optional[dict[str, Any]]:
+        activities = self.activities_by_blueprint_type_id.get(int(blueprint_type_id))
+        if not activities:
+            return None
+        payload = activities.get(activity)
+        return payload if isinstance(payload, dict) else None
+
+    def materials(self, blueprint_type_id: int, activity: str = "manufacturing") -> list[dict[str, Any]]:
+        payload = self.activity(blueprint_type_id, activity) or {}
+        materials = payload.get("materials")
+        return [m for m in materials if isinstance(m, dict)] if isinstance(materials, list) else []
+
+    def products(self, blueprint_type_id: int, activity: str = "manufacturing") -> list[dict[str, Any]]:
+        payload = self.activity(blueprint_type_id, activity) or {}
+        products = payload.get("products")
+        return [p for p in products if isinstance(p, dict)] if isinstance(products, list) else []
+
+    def material_type_ids(self, blueprint_type_id: int, activity: str = "manufacturing") -> list[int]:
+        out: list[int] = []
+        for material in self.materials(blueprint_type_id, activity):
+            type_id = _safe_int(material.get("typeID"))
+            if type_id is not None:
+                out.append(int(type_id))
+        return out
+
+    def output_quantity_per_run(
+        self,
+        blueprint_type_id: int,
+        product_type_id: int,
+        activity: str = "manufacturing",
+    ) -> Optional[int]:
+        """Units produced per run, falling back to the first listed product."""
+        quantity = self._output_quantity_by_key.get((int(blueprint_type_id), activity, int(product_type_id)))
+        if quantity is None:
+            quantity = self._first_output_quantity_by_key.get((int(blueprint_type_id), activity))
+        return int(quantity) if quantity and quantity > 0 else None
+
+    def max_production_limit(self, blueprint_type_id: int) -> Optional[int]:
+        return self.max_production_limit_by_blueprint_type_id.get(int(blueprint_type_id))
+
+    def invention_source(self, target_blueprint_type_id: int) -> Optional[dict[str, Any]]:
+        """Source blueprint, invention activity and base probability for a T2 blueprint."""
+        return self.invention_source_by_target_blueprint_type_id.get(int(target_blueprint_type_id))
+
+
+def _load_blueprint_activity_cache(session: Any, *, build_number: Optional[int]) -> BlueprintActivityCache:
+    activities_by_blueprint_type_id: dict[int, dict[str, Any]] = {}
+    max_production_limit_by_blueprint_type_id: dict[int, int] = {}
+    invention_source_by_target_blueprint_type_id: dict[int, dict[str, Any]] = {}
+    output_quantity_by_key: dict[tuple[int, str, int], int] = {}
+    first_output_quantity_by_key: dict[tuple[int, str], int] = {}
+
+    rows = session.query(
+        Blueprints.blueprintTypeID,
+        Blueprints.maxProductionLimit,
+        Blueprints.activities,
+    ).all()
+    for blueprint_type_id, max_production_limit, activities in rows:
+        blueprint_type_id = _safe_int(blueprint_type_id)
+        if not blueprint_type_id:
+            continue
+        # First row wins, matching the previous filter_by(...).first() lookups.
+        if int(blueprint_type_id) in activities_by_blueprint_type_id:
+            continue
+        activities = activities if isinstance(activities, dict) else {}
+        activities_by_blueprint_type_id[int(blueprint_type_id)] = activities
+        limit = _safe_int(max_production_limit)
+        if limit is not None:
+            max_production_limit_by_blueprint_type_id[int(blueprint_type_id)] = int(limit)
+
+        for activity_name, activity in activities.items():
+            if not isinstance(activity, dict):
+                continue
+            products = activity.get("products")
+            if not isinstance(products, list) or not products:
+                continue
+            first = products[0]
+            if isinstance(first, dict):
+                first_quantity = _safe_int(first.get("quantity"))
+                if first_quantity is not None:
+                    first_output_quantity_by_key[(int(blueprint_type_id), str(activity_name))] = int(first_quantity)
+            for product in products:
+                if not isinstance(product, dict):
+                    continue
+                product_type_id = _safe_int(product.get("typeID"))
+                quantity = _safe_int(product.get("quantity"))
+                if product_type_id is None or quantity is None:
+                    continue
+                output_quantity_by_key.setdefault((int(blueprint_type_id), str(activity_name), int(product_type_id)), int(quantity))
+
+        invention = activities.get("invention")
+        if not isinstance(invention, dict):
+            continue
+        probability = invention_probability(invention)
+        for product in invention.get("products") or []:
+            if not isinstance(product, dict):
+                continue
+            target_blueprint_type_id = _safe_int(product.get("typeID"))
+            if not target_blueprint_type_id or target_blueprint_type_id <= 0:
+                continue
+            if int(target_blueprint_type_id) in invention_source_by_target_blueprint_type_id:
+                continue
+            invention_source_by_target_blueprint_type_id[int(target_blueprint_type_id)] = {
+                "source_blueprint_type_id": int(blueprint_type_id),
+                "invention": invention,
+                "probability": probability,
+            }
+
+    return BlueprintActivityCache(
+        build_number=build_number,
+        activities_by_blueprint_type_id=activities_by_blueprint_type_id,
+        max_production_limit_by_blueprint_type_id=max_production_limit_by_blueprint_type_id,
+        invention_source_by_target_blueprint_type_id=invention_source_by_target_blueprint_type_id,
+        _output_quantity_by_key=output_quantity_by_key,
+        _first_output_quantity_by_key=first_output_quantity_by_key,
+    )
+
+
+def get_blueprint_activity_cache(session: Any) -> BlueprintActivityCache:
+    """Return the blueprint activity cache for the SDE behind ``session``.
+
+    Loaded once per SDE engine; reloaded when the recorded SDE build changes.
+    """
+    return get_build_keyed(
+        session,
+        _CACHE_KEY,
+        lambda sde_session, build_number: _load_blueprint_activity_cache(sde_session, build_number=build_number),
+        tables=BLUEPRINT_ACTIVITY_TABLES,
+    )
+
+
+def invalidate_blueprint_activity_cache(session: Any | None = None) -> None:
+    """Drop the cache for one SDE session's engine, or for every engine."""
+    invalidate_build_keyed(session, predicate=lambda key: key == _CACHE_KEY)
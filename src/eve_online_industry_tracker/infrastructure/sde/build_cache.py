@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+"""Process-wide caches of SDE-derived data, keyed by SDE engine and build number.
+
+Each cache is identified by a key (e.g. ``"blueprint_activities"`` or
+``("dimensions", "en")``). Entries are held per SDE engine, re-check the recorded
+SDE build at most once per interval, and reload when the build changes. Entries that
+declare the SDE tables they read survive an incremental SDE update (see
+``carry_over_build_keyed``) unless one of those tables changed.
+"""
+
+from dataclasses import dataclass
+import threading
+import time
+import weakref
+from typing import Any, Callable, Hashable, Iterable, Optional, TypeVar
+
+from sqlalchemy import text  # pyright: ignore[reportMissingImports]
+
+
+T = TypeVar("T")
+
+# How often a cached entry re-checks the current SDE build number.
+_BUILD_CHECK_INTERVAL_SECONDS = 60.0
+
+
+@dataclass
+class _CacheEntry:
+    value: Any
+    build_number: Optional[int]
+    checked_at: float
+    # SDE tables the value was built from; None when unknown (always reloaded after an update).
+    tables: Optional[frozenset[str]] = None
+
+
+_CACHE_LOCK = threading.Lock()
+_CACHES: "weakref.WeakKeyDictionary[Any, dict[Hashable, _CacheEntry]]" = weakref.WeakKeyDictionary()
+
+
+def _safe_int(value: Any) -> Optional[int]:
+    try:
+        if value is None:
+            return None
+        return int(value)
+    except Exception:
+        return None
+
+
+def session_bind(session: Any) -> Any:
+    try:
+        return session.get_bind()
+    except Exception:
+        return None
+
+
+def current_sde_build_number(bind: Any) -> Optional[int]:
+    """Build number recorded by ``scripts/import_sde.py``; None when unknown."""
+    if bind is None:
+        return None
+    try:
+        with bind.connect() as conn:
+            row = conn.execute(
+                text("SELECT build_number FROM sde_version WHERE is_current = 1 ORDER BY id DESC LIMIT 1")
+            ).first()
+    except Exception:
+        return None
+    return _safe_int(row[0]) if row is not None else None
+
+
+def get_build_keyed(
+    session: Any,
+    key: Hashable,
+    loader: Callable[[Any, Optional[int]], T],
+    *,
+    tables: Iterable[str] | None = None,
+) -> T:
+    """Return the cached value for ``key`` on the SDE behind ``session``.
+
+    ``loader(session, build_number)`` builds the value on first use and whenever the
+    recorded SDE build changes. ``tables`` lists the SDE tables the value is built from.
+    """
+    bind = session_bind(session)
+    if bind is None:
+        return loader(session, None)
+
+    now = time.monotonic()
+    with _CACHE_LOCK:
+        entry = _CACHES.get(bind, {}).get(key)
+        if entry is not None and now - entry.checked_at < _BUILD_CHECK_INTERVAL_SECONDS:
+            return entry.value
+
+    build_number = current_sde_build_number(bind)
+    with _CACHE_LOCK:
+        entry = _CACHES.get(bind, {}).get(key)
+        if entry is not None and entry.build_number == build_number:
+            entry.checked_at = now
+            return entry.value
+
+    value = loader(session, build_number)
+    with _CACHE_LOCK:
+        entries = _CACHES.get(bind)
+        if entries is None:
+            entries = {}
+            _CACHES[bind] = entries
+        entries[key] = _CacheEntry(
+            value=value,
+            build_number=build_number,
+            checked_at=now,
+            tables=frozenset(tables) if tables is not None else None,
+        )
+    return value
+
+
+def invalidate_build_keyed(session: Any | None = None, *, predicate: Callable[[Hashable], bool] | None = None) -> None:
+    """Drop cached values for one SDE session's engine (or all engines), optionally filtered by key."""
+    with _CACHE_LOCK:
+        if session is None:
+            targets = list(_CACHES.values())
+        else:
+            bind = session_bind(session)
+            entries = _CACHES.get(bind) if bind is not None else None
+            targets = [entries] if entries is not None else []
+        for entries in targets:
+            if predicate is None:
+                entries.clear()
+                continue
+            for key in [key for key in entries if predicate(key)]:
+                entries.pop(key, None)
+
+
+def carry_over_build_keyed(
+    old_bind: Any,
+    new_bind: Any,
+    *,
+    build_number: Optional[int],
+    changed_tables: Iterable[str] | None,
+) -> list[Hashable]:
+    """Move cached values from a disposed SDE engine to its replacement.
+
+    Values whose declared tables are all unchanged are kept and re-stamped with the new
+    build number; the rest are dropped and reload on next use. ``changed_tables=None``
+    drops everything. Returns the dropped keys.
+    """
+    changed = frozenset(changed_tables) if changed_tables is not None else None
+    now = time.monotonic()
+    dropped: list[Hashable] = []
+    with _CACHE_LOCK:
+        entries = _CACHES.pop(old_bind, None) or {}
+        target = _CACHES.get(new_bind)
+        if target is None:
+            target = {}
+            _CACHES[new_bind] = target
+        for key, entry in entries.items():
+            if changed is None or entry.tables is None or entry.tables & changed:
+                dropped.append(key)
+                continue
+            entry.build_number = build_number
+            entry.checked_at = now
+            target.setdefault(key, entry)
+    return dropped
@@ -0,0 +1,284 @@
+from __future__ import annotations
+
+"""In-memory SDE dimension tables (types, groups, categories, races, factions, meta groups).
+
+Loaded lazily once per SDE engine, build number and language, so enrichment code can join
+type -> group -> category without querying the SDE per call. Localized names and
+descriptions hold the stored text for that language unchanged (markup included, "" when
+the language is missing); callers that want display text apply ``parse_localized``.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from sqlalchemy import MetaData, Table, select  # pyright: ignore[reportMissingImports]
+
+from eve_online_industry_tracker.db_models import Categories, Factions, Groups, Races, Types
+from eve_online_industry_tracker.infrastructure.sde.build_cache import get_build_keyed, invalidate_build_keyed
+from eve_online_industry_tracker.infrastructure.sde.localization import localized_value
+
+
+_CACHE_KEY = "dimensions"
+# SDE tables the cache is built from.
+SDE_DIMENSION_TABLES = frozenset({"types", "groups", "categories", "races", "factions", "metaGroups"})
+
+
+@dataclass(frozen=True)
+class TypeDimension:
+    type_id: int
+    name: str
+    description: str
+    group_id: Optional[int]
+    market_group_id: Optional[int]
+    meta_group_id: Optional[int]
+    race_id: Optional[int]
+    faction_id: Optional[int]
+    published: Optional[bool]
+    volume: Optional[float]
+    repackaged_volume: Optional[float]
+    capacity: Optional[float]
+    radius: Optional[float]
+    portion_size: Optional[int]
+    base_price: Optional[float]
+    icon_id: Optional[int]
+
+
+@dataclass(frozen=True)
+class GroupDimension:
+    group_id: int
+    name: str
+    category_id: Optional[int]
+    published: Optional[bool]
+    icon_id: Optional[int]
+    anchorable: Optional[bool]
+    anchored: Optional[bool]
+    use_base_price: Optional[bool]
+    fittable_non_singleton: Optional[bool]
+    repackaged_volume: Optional[float]
+
+
+@dataclass(frozen=True)
+class CategoryDimension:
+    category_id: int
+    name: str
+    icon_id: Optional[int]
+
+
+@dataclass(frozen=True)
+class RaceDimension:
+    race_id: int
+    name: str
+    description: str
+    icon_id: Optional[int]
+    ship_type_id: Optional[int]
+    skills: Any
+
+
+@dataclass(frozen=True)
+class FactionDimension:
+    faction_id: int
+    name: str
+    description: str
+    short_description: str
+    corporation_id: Optional[int]
+    militia_corporation_id: Optional[int]
+    solar_system_id: Optional[int]
+    member_races: Any
+    flat_logo: Optional[str]
+    flat_logo_with_name: Optional[str]
+
+
+@dataclass(frozen=True)
+class MetaGroupDimension:
+    meta_group_id: int
+    name: str
+    color: Any
+    icon_id: Optional[int]
+
+
+@dataclass(frozen=True)
+class SdeDimensions:
+    build_number: Optional[int]
+    language: str
+    types: dict[int, TypeDimension]
+    groups: dict[int, GroupDimension]
+    categories: dict[int, CategoryDimension]
+    races: dict[int, RaceDimension]
+    factions: dict[int, FactionDimension]
+    meta_groups: dict[int, MetaGroupDimension]
+
+    def get_type(self, type_id: Any) -> Optional[TypeDimension]:
+        try:
+            return self.types.get(int(type_id))
+        except (TypeError, ValueError):
+            return None
+
+    def group_for_type(self, type_id: Any) -> Optional[GroupDimension]:
+        type_dim = self.get_type(type_id)
+        if type_dim is None or type_dim.group_id is None:
+            return None
+        return self.groups.get(int(type_dim.group_id))
+
+    def category_for_type(self, type_id: Any) -> Optional[CategoryDimension]:
+        group_dim = self.group_for_type(type_id)
+        if group_dim is None or group_dim.category_id is None:
+            return None
+        return self.categories.get(int(group_dim.category_id))
+
+    def race_for_type(self, type_id: Any) -> Optional[RaceDimension]:
+        type_dim = self.get_type(type_id)
+        if type_dim is None or type_dim.race_id is None:
+            return None
+        return self.races.get(int(type_dim.race_id))
+
+    def faction_for_type(self, type_id: Any) -> Optional[FactionDimension]:
+        type_dim = self.get_type(type_id)
+        if type_dim is None or type_dim.faction_id is None:
+            return None
+        return self.factions.get(int(type_dim.faction_id))
+
+    def meta_group_for_type(self, type_id: Any) -> Optional[MetaGroupDimension]:
+        type_dim = self.get_type(type_id)
+        if type_dim is None or type_dim.meta_group_id is None:
+            return None
+        return self.meta_groups.get(int(type_dim.meta_group_id))
+
+
+def _load_meta_groups(session: Any, language: str) -> dict[int, MetaGroupDimension]:
+    try:
+        meta_groups_table = Table("metaGroups", MetaData(), autoload_with=session.get_bind())
+        rows = session.execute(
+            select(
+                meta_groups_table.c.id,
+                meta_groups_table.c.color,
+                meta_groups_table.c.name,
+                meta_groups_table.c.iconID,
+            )
+        ).all()
+    except Exception:
+        # metaGroups is optional in trimmed SDE imports.
+        return {}
+    return {
+        int(row.id): MetaGroupDimension(
+            meta_group_id=int(row.id),
+            name=localized_value(row.name, language),
+            color=row.color,
+            icon_id=row.iconID,
+        )
+        for row in rows
+    }
+
+
+def _load_sde_dimensions(session: Any, *, language: str, build_number: Optional[int]) -> SdeDimensions:
+    types = {
+        int(row.id): TypeDimension(
+            type_id=int(row.id),
+            name=localized_value(row.name, language),
+            description=localized_value(row.description, language),
+            group_id=row.groupID,
+            market_group_id=row.marketGroupID,
+            meta_group_id=row.metaGroupID,
+            race_id=row.raceID,
+            faction_id=row.factionID,
+            published=row.published,
+            volume=row.volume,
+            repackaged_volume=row.repackaged_volume,
+            capacity=row.capacity,
+            radius=row.radius,
+            portion_size=row.portionSize,
+            base_price=row.basePrice,
+            icon_id=row.iconID,
+        )
+        for row in session.query(
+            Types.id,
+            Types.name,
+            Types.description,
+            Types.groupID,
+            Types.marketGroupID,
+            Types.metaGroupID,
+            Types.raceID,
+            Types.factionID,
+            Types.published,
+            Types.volume,
+            Types.repackaged_volume,
+            Types.capacity,
+            Types.radius,
+            Types.portionSize,
+            Types.basePrice,
+            Types.iconID,
+        ).all()
+    }
+    groups = {
+        int(row.id): GroupDimension(
+            group_id=int(row.id),
+            name=localized_value(row.name, language),
+            category_id=row.categoryID,
+            published=row.published,
+            icon_id=row.iconID,
+            anchorable=row.anchorable,
+            anchored=row.anchored,
+            use_base_price=row.useBasePrice,
+            fittable_non_singleton=row.fittableNonSingleton,
+            repackaged_volume=row.repackaged_volume,
+        )
+        for row in session.query(Groups).all()
+    }
+    categories = {
+        int(row.id): CategoryDimension(
+            category_id=int(row.id),
+            name=localized_value(row.name, language),
+            icon_id=row.iconID,
+        )
+        for row in session.query(Categories).all()
+    }
+    races = {
+        int(row.id): RaceDimension(
+            race_id=int(row.id),
+            name=localized_value(row.name, language),
+            description=localized_value(row.description, language),
+            icon_id=row.iconID,
+            ship_type_id=row.shipTypeID,
+            skills=row.skills,
+        )
+        for row in session.query(Races).all()
+    }
+    factions = {
+        int(row.id): FactionDimension(
+            faction_id=int(row.id),
+            name=localized_value(row.name, language),
+            description=localized_value(row.description, language),
+            short_description=localized_value(row.shortDescription, language),
+            corporation_id=row.corporationID,
+            militia_corporation_id=row.militiaCorporationID,
+            solar_system_id=row.solarSystemID,
+            member_races=row.memberRaces,
+            flat_logo=row.flatLogo,
+            flat_logo_with_name=row.flatLogoWithName,
+        )
+        for row in session.query(Factions).all()
+    }
+    return SdeDimensions(
+        build_number=build_number,
+        language=str(language),
+        types=types,
+        groups=groups,
+        categories=categories,
+        races=races,
+        factions=factions,
+        meta_groups=_load_meta_groups(session, language),
+    )
+
+
+def get_sde_dimensions(session: Any, language: str) -> SdeDimensions:
+    """Return the dimension cache for the SDE behind ``session`` in ``language``."""
+    return get_build_keyed(
+        session,
+        (_CACHE_KEY, str(language)),
+        lambda sde_session, build_number: _load_sde_dimensions(sde_session, language=str(language), build_number=build_number),
+        tables=SDE_DIMENSION_TABLES,
+    )
+
+
+def invalidate_sde_dimensions(session: Any | None = None) -> None:
+    """Drop cached dimensions (all languages) for one SDE session's engine, or every engine."""
+    invalidate_build_keyed(session, predicate=lambda key: isinstance(key, tuple) and key[:1] == (_CACHE_KEY,))
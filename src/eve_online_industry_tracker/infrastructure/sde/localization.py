@@ -25,3 +25,19 @@ def parse_localized(raw: Any, language: str) -> str:
 
     clean = re.sub(r"<[^>]+>", "", text).replace("\r\n", "<br>").strip()
     return clean
+
+
+def localized_value(raw: Any, language: str) -> str:
+    """Return the stored text for ``language`` as-is: no markup stripping, no fallback language."""
+    if isinstance(raw, str):
+        try:
+            data = json.loads(raw)
+        except json.JSONDecodeError:
+            return raw
+        if not isinstance(data, dict):
+            return raw
+        raw = data
+    if isinstance(raw, dict):
+        value = raw.get(language)
+        return "" if value is None else str(value)
+    return "" if raw is None else str(raw)
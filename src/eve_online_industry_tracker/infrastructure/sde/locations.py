@@ -13,9 +13,13 @@ from eve_online_industry_tracker.db_models import (
     StationServices,
 )
 
+from eve_online_industry_tracker.infrastructure.sde.build_cache import get_build_keyed
 from eve_online_industry_tracker.infrastructure.sde.localization import parse_localized
 
 
+NPC_STATION_INDEX_TABLES = frozenset({"npcStations"})
+
+
 def get_solar_systems(session: Any, language: str) -> list[dict]:
     solar_systems_q = session.query(MapSolarSystems).all()
 
@@ -115,3 +119,34 @@ def get_npc_stations(session: Any, language: str, system_id: int) -> list[dict]:
         )
 
     return stations
+
+
+def get_npc_station_index(session: Any) -> dict[int, dict]:
+    """station_id -> ESI-style station fields for every NPC station, cached per SDE engine and build.
+
+    Names are not part of the SDE station rows; callers resolve those separately.
+    """
+    return get_build_keyed(
+        session,
+        "npc_station_index",
+        lambda sde_session, _build_number: {
+            int(row.id): {
+                "system_id": row.solarSystemID,
+                "type_id": row.typeID,
+                "owner": row.ownerID,
+                "position": row.position,
+                "reprocessing_efficiency": row.reprocessingEfficiency,
+                "reprocessing_stations_take": row.reprocessingStationsTake,
+            }
+            for row in sde_session.query(
+                NpcStations.id,
+                NpcStations.solarSystemID,
+                NpcStations.typeID,
+                NpcStations.ownerID,
+                NpcStations.position,
+                NpcStations.reprocessingEfficiency,
+                NpcStations.reprocessingStationsTake,
+            ).all()
+        },
+        tables=NPC_STATION_INDEX_TABLES,
+    )
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+"""Pick up SDE updates written by ``scripts/import_sde.py`` without restarting the app.
+
+The importer builds the new SDE in a copy and swaps it in atomically, recording a hash
+of each table's source in ``sde_table_state``. The app opens the SDE immutable, so it
+never sees the swap by itself: ``SdeReloader.check`` notices the new file, diffs the
+table hashes, reopens the SDE engines and drops only the caches built from changed
+tables. On Windows the swap fails while the app holds the file open; the importer then
+leaves ``<sde>.pending``, which is moved into place here once the pool is closed.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+from typing import Any, Callable, Optional
+
+from eve_online_industry_tracker.infrastructure.sde.build_cache import carry_over_build_keyed, current_sde_build_number
+
+
+SDE_TABLE_STATE_TABLE = "sde_table_state"
+PENDING_SUFFIX = ".pending"
+
+
+def file_signature(path: str) -> Optional[tuple[int, int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (int(stat.st_ino), int(stat.st_size), int(stat.st_mtime_ns))
+
+
+def read_table_hashes(path: str) -> dict[str, str]:
+    """Source hash per SDE table as recorded by the importer; empty for older imports."""
+    try:
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    except sqlite3.Error:
+        return {}
+    try:
+        rows = conn.execute(f"SELECT table_name, source_hash FROM {SDE_TABLE_STATE_TABLE}").fetchall()
+    except sqlite3.Error:
+        return {}
+    finally:
+        conn.close()
+    return {str(table): str(source_hash) for table, source_hash in rows}
+
+
+class SdeReloader:
+    """Reopen the SDE when its file was replaced and invalidate what depends on changed tables.
+
+    ``on_tables_changed(changed)`` is called after a reload; ``changed`` is None when the
+    changed tables are unknown (an import without table hashes), meaning "everything".
+    """
+
+    def __init__(self, *, db_sde: Any, on_tables_changed: Callable[[Optional[frozenset[str]]], None] | None = None):
+        self._db = db_sde
+        self._on_tables_changed = on_tables_changed
+        self._lock = threading.Lock()
+        self._path: Optional[str] = db_sde.sqlite_file_path() if db_sde is not None else None
+        self._signature = file_signature(self._path) if self._path else None
+        self._hashes = read_table_hashes(self._path) if self._path else {}
+
+    def check(self, *, force: bool = False) -> dict[str, Any]:
+        """Reload if the SDE file changed (or ``force``). Returns what was done."""
+        if self._path is None:
+            return {"reloaded": False, "reason": "SDE is not a SQLite file"}
+
+        with self._lock:
+            pending_path = f"{self._path}{PENDING_SUFFIX}"
+            has_pending = os.path.exists(pending_path)
+            if not force and not has_pending and file_signature(self._path) == self._signature:
+                return {"reloaded": False, "reason": "unchanged"}
+
+            if has_pending:
+                # Close pooled connections so the file can be replaced; reopen() follows below.
+                self._db.engine.dispose()
+                try:
+                    os.replace(pending_path, self._path)
+                except OSError as e:
+                    logging.warning("Cannot apply pending SDE update yet (file in use): %s", e)
+                    return {"reloaded": False, "reason": f"pending update not applied: {e}"}
+
+            hashes = read_table_hashes(self._path)
+            changed: Optional[frozenset[str]]
+            if hashes and self._hashes:
+                changed = frozenset(
+                    table for table in set(hashes) | set(self._hashes) if hashes.get(table) != self._hashes.get(table)
+                )
+            else:
+                changed = None
+
+            old_engine = self._db.engine
+            self._db.reopen()
+            dropped = carry_over_build_keyed(
+                old_engine,
+                self._db.engine,
+                build_number=current_sde_build_number(self._db.engine),
+                changed_tables=changed,
+            )
+            self._signature = file_signature(self._path)
+            self._hashes = hashes
+
+        if self._on_tables_changed is not None and (changed is None or changed):
+            try:
+                self._on_tables_changed(changed)
+            except Exception as e:
+                logging.warning("SDE reload callback failed: %s", e, exc_info=True)
+
+        logging.info(
+            "Reloaded SDE; changed tables: %s",
+            "unknown" if changed is None else (", ".join(sorted(changed)) or "none"),
+        )
+        return {
+            "reloaded": True,
+            "changed_tables": None if changed is None else sorted(changed),
+            "invalidated_caches": [str(key) for key in dropped],
+        }
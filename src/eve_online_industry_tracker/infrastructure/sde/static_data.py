@@ -3,9 +3,14 @@ from __future__ import annotations
 from typing import Any
 
 from eve_online_industry_tracker.infrastructure.persistence import sde_static_repo
+from eve_online_industry_tracker.infrastructure.sde.build_cache import get_build_keyed
 from eve_online_industry_tracker.infrastructure.sde.localization import parse_localized
 
 
+# SDE tables the ore and material catalogs are built from.
+ORE_CATALOG_TABLES = frozenset({"types", "groups", "categories", "typeMaterials"})
+
+
 def build_all_ores(session: Any, language: str) -> list[dict]:
     groups = sde_static_repo.get_ore_groups(session)
     if not groups:
@@ -110,3 +115,23 @@ def build_all_materials(session: Any, language: str) -> list[dict]:
 
     out.sort(key=lambda r: r["id"])
     return out
+
+
+def get_ore_catalog(session: Any, language: str) -> list[dict]:
+    """``build_all_ores`` cached per SDE engine and build. Treat the result as read-only."""
+    return get_build_keyed(
+        session,
+        ("ore_catalog", str(language)),
+        lambda sde_session, _build_number: build_all_ores(sde_session, language),
+        tables=ORE_CATALOG_TABLES,
+    )
+
+
+def get_material_catalog(session: Any, language: str) -> list[dict]:
+    """``build_all_materials`` cached per SDE engine and build. Treat the result as read-only."""
+    return get_build_keyed(
+        session,
+        ("material_catalog", str(language)),
+        lambda sde_session, _build_number: build_all_materials(sde_session, language),
+        tables=ORE_CATALOG_TABLES,
+    )
@@ -2,10 +2,7 @@ from __future__ import annotations
 
 from typing import Any
 
-from sqlalchemy import MetaData, Table, select  # pyright: ignore[reportMissingImports]
-
-from eve_online_industry_tracker.db_models import Categories, Factions, Groups, Races, Types
-
+from eve_online_industry_tracker.infrastructure.sde.dimensions import get_sde_dimensions
 from eve_online_industry_tracker.infrastructure.sde.localization import parse_localized
 
 
@@ -14,95 +11,60 @@ def get_type_data(session: Any, language: str, type_ids: list[int]) -> dict[int,
     if not type_ids:
         return {}
 
-    types_q = session.query(Types).filter(Types.id.in_(type_ids)).all()
-    bind = session.get_bind()
-
-    meta_group_ids = {t.metaGroupID for t in types_q if getattr(t, "metaGroupID", None) is not None}
-    meta_group_data_map: dict[int, dict[str, Any]] = {}
-    if meta_group_ids:
-        meta_groups_table = Table("metaGroups", MetaData(), autoload_with=bind)
-        meta_group_rows = session.execute(
-            select(
-                meta_groups_table.c.id,
-                meta_groups_table.c.color,
-                meta_groups_table.c.name,
-                meta_groups_table.c.iconID,
-            ).where(meta_groups_table.c.id.in_(meta_group_ids))
-        )
-        meta_group_data_map = {
-            int(row.id): {
-                "id": int(row.id),
-                "color": row.color,
-                "name": row.name,
-                "icon_id": row.iconID,
-            }
-            for row in meta_group_rows
-        }
-
-    group_ids = {t.groupID for t in types_q if getattr(t, "groupID", None) is not None}
-    group_data_map = {g.id: g for g in session.query(Groups).filter(Groups.id.in_(group_ids)).all()}
-
-    category_ids = {g.categoryID for g in group_data_map.values() if getattr(g, "categoryID", None) is not None}
-    category_data_map = {c.id: c for c in session.query(Categories).filter(Categories.id.in_(category_ids)).all()}
-
-    race_ids = {t.raceID for t in types_q if getattr(t, "raceID", None) is not None}
-    race_data_map = {r.id: r for r in session.query(Races).filter(Races.id.in_(race_ids)).all()}
-
-    faction_ids = {t.factionID for t in types_q if getattr(t, "factionID", None) is not None}
-    faction_data_map = {f.id: f for f in session.query(Factions).filter(Factions.id.in_(faction_ids)).all()}
-
+    dimensions = get_sde_dimensions(session, language)
     result: dict[int, dict] = {}
 
-    for t in types_q:
-        raw_meta_group_id = getattr(t, "metaGroupID", None)
-        meta_group_id = int(raw_meta_group_id) if raw_meta_group_id is not None else None
-        meta_group = meta_group_data_map.get(meta_group_id) if meta_group_id is not None else None
-        group = group_data_map.get(t.groupID)
-        category = category_data_map.get(group.categoryID) if group else None
-        race = race_data_map.get(t.raceID) if getattr(t, "raceID", None) is not None else None
-        faction = faction_data_map.get(t.factionID) if getattr(t, "factionID", None) is not None else None
-
-        result[t.id] = {
-            "type_id": t.id,
-            "type_name": parse_localized(t.name, language) or str(t.id),
-            "volume": getattr(t, "volume", None),
-            "repackaged_volume": getattr(t, "repackagedVolume", None),
-            "radius": getattr(t, "radius", None),
-            "portion_size": getattr(t, "portionSize", None),
-            "description": parse_localized(getattr(t, "description", None), language),
-            "base_price": getattr(t, "basePrice", None),
-            "icon_id": getattr(t, "iconID", None),
-            "meta_group_id": getattr(t, "metaGroupID", None),
-            "meta_group_name": parse_localized(meta_group.get("name"), language) if meta_group else "",
-            "meta_group_color": meta_group.get("color") if meta_group else None,
-            "meta_group_icon_id": meta_group.get("icon_id") if meta_group else None,
-            "group_id": getattr(t, "groupID", None),
-            "group_name": parse_localized(getattr(group, "name", None), language) if group else "",
-            "group_icon_id": getattr(group, "iconID", None) if group else None,
-            "group_anchorable": getattr(group, "anchorable", None) if group else None,
-            "group_anchored": getattr(group, "anchored", None) if group else None,
-            "group_use_base_price": getattr(group, "useBasePrice", None) if group else None,
-            "group_fittable_non_singleton": getattr(group, "fittableNonSingleton", None) if group else None,
-            "group_repackaged_volume": getattr(group, "repackagedVolume", None) if group else None,
-            "category_id": getattr(group, "categoryID", None) if group else None,
-            "category_name": parse_localized(getattr(category, "name", None), language) if category else "",
-            "category_icon_id": getattr(category, "iconID", None) if category else None,
-            "race_id": getattr(t, "raceID", None),
-            "race_name": parse_localized(getattr(race, "name", None), language) if race else "",
-            "race_description": parse_localized(getattr(race, "description", None), language) if race else "",
-            "race_icon_id": getattr(race, "iconID", None) if race else None,
-            "race_ship_type_id": getattr(race, "shipTypeID", None) if race else None,
-            "race_skills": getattr(race, "skills", None) if race else None,
-            "faction_id": getattr(t, "factionID", None),
-            "faction_name": parse_localized(getattr(faction, "name", None), language) if faction else "",
-            "faction_description": parse_localized(getattr(faction, "description", None), language) if faction else "",
-            "faction_short_description": parse_localized(getattr(faction, "shortDescription", None), language) if faction else "",
-            "faction_flat_logo": getattr(faction, "factionFlatLogo", None) if faction else None,
-            "faction_logo_with_name": getattr(faction, "factionLogoWithName", None) if faction else None,
-            "faction_member_races": getattr(faction, "memberRaces", None) if faction else None,
-            "faction_corporation_id": getattr(faction, "corporationID", None) if faction else None,
-            "faction_militia_corporation_id": getattr(faction, "militiaCorporationID", None) if faction else None,
-            "faction_solar_system_id": getattr(faction, "solarSystemID", None) if faction else None,
+    for type_id in type_ids:
+        t = dimensions.get_type(type_id)
+        if t is None or t.type_id in result:
+            continue
+        meta_group = dimensions.meta_groups.get(int(t.meta_group_id)) if t.meta_group_id is not None else None
+        group = dimensions.groups.get(int(t.group_id)) if t.group_id is not None else None
+        category = dimensions.categories.get(int(group.category_id)) if group and group.category_id is not None else None
+        race = dimensions.races.get(int(t.race_id)) if t.race_id is not None else None
+        faction = dimensions.factions.get(int(t.faction_id)) if t.faction_id is not None else None
+
+        result[t.type_id] = {
+            "type_id": t.type_id,
+            "type_name": parse_localized(t.name, language) or str(t.type_id),
+            "volume": t.volume,
+            "repackaged_volume": t.repackaged_volume,
+            "radius": t.radius,
+            "portion_size": t.portion_size,
+            "description": parse_localized(t.description, language),
+            "base_price": t.base_price,
+            "icon_id": t.icon_id,
+            "meta_group_id": t.meta_group_id,
+            "meta_group_name": parse_localized(meta_group.name, language) if meta_group else "",
+            "meta_group_color": meta_group.color if meta_group else None,
+            "meta_group_icon_id": meta_group.icon_id if meta_group else None,
+            "group_id": t.group_id,
+            "group_name": parse_localized(group.name, language) if group else "",
+            "group_icon_id": group.icon_id if group else None,
+            "group_anchorable": group.anchorable if group else None,
+            "group_anchored": group.anchored if group else None,
+            "group_use_base_price": group.use_base_price if group else None,
+            "group_fittable_non_singleton": group.fittable_non_singleton if group else None,
+            "group_repackaged_volume": group.repackaged_volume if group else None,
+            "category_id": group.category_id if group else None,
+            "category_name": parse_localized(category.name, language) if category else "",
+            "category_icon_id": category.icon_id if category else None,
+            "race_id": t.race_id,
+            "race_name": parse_localized(race.name, language) if race else "",
+            "race_description": parse_localized(race.description, language) if race else "",
+            "race_icon_id": race.icon_id if race else None,
+            "race_ship_type_id": race.ship_type_id if race else None,
+            "race_skills": race.skills if race else None,
+            "faction_id": t.faction_id,
+            "faction_name": parse_localized(faction.name, language) if faction else "",
+            "faction_description": parse_localized(faction.description, language) if faction else "",
+            "faction_short_description": parse_localized(faction.short_description, language) if faction else "",
+            "faction_flat_logo": faction.flat_logo if faction else None,
+            "faction_logo_with_name": faction.flat_logo_with_name if faction else None,
+            "faction_member_races": faction.member_races if faction else None,
+            "faction_corporation_id": faction.corporation_id if faction else None,
+            "faction_militia_corporation_id": faction.militia_corporation_id if faction else None,
+            "faction_solar_system_id": faction.solar_system_id if faction else None,
         }
 
     return result
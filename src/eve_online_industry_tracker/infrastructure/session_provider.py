@@ -6,6 +6,8 @@ from typing import Any, Protocol
 class SessionProvider(Protocol):
     def app_session(self) -> Any: ...
 
+    def app_read_session(self) -> Any: ...
+
     def sde_session(self) -> Any: ...
 
     def oauth_session(self) -> Any: ...
@@ -26,6 +28,14 @@ class StateSessionProvider:
             raise RuntimeError("db_app not initialized")
         return db.Session()
 
+    def app_read_session(self) -> Any:
+        # Read-only pool; falls back to a regular session for managers without one.
+        db = getattr(self._state, "db_app", None)
+        if db is None:
+            raise RuntimeError("db_app not initialized")
+        read_session = getattr(db, "read_session", None)
+        return read_session() if read_session is not None else db.Session()
+
     def sde_session(self) -> Any:
         db = getattr(self._state, "db_sde", None)
         if db is None:
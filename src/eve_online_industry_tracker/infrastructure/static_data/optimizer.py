@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import time
+
 from pulp import (  # pyright: ignore[reportMissingImports]
     LpBinary,
+    LpContinuous,
     LpInteger,
     LpMinimize,
     LpProblem,
@@ -12,6 +15,10 @@ from pulp import (  # pyright: ignore[reportMissingImports]
 )
 
 
+# Tiny cost on surplus material so the solver prefers not to overshoot demand.
+_OVERFLOW_PENALTY = 1e-6
+
+
 def optimize_ore_tiered(
     demands,
     ores,
@@ -19,12 +26,29 @@ def optimize_ore_tiered(
     order_book,
     max_ore_types=None,
     mode="min_cost",
+    *,
+    relaxed=False,
+    prune=True,
+    warm_start=None,
+    time_limit_seconds=30.0,
 ):
+    """Buy ore from tiered sell orders to cover ``demands`` at minimum cost (or volume/types).
+
+    ``relaxed`` solves the LP relaxation instead: fractional batches and ore-type
+    selection, typically in milliseconds, as a preview of the integer plan's cost.
+    ``warm_start`` maps ``(ore_id, unit_price)`` to batches from an earlier solution and
+    is handed to CBC as its starting incumbent. Pass ``prune=False`` when ``order_book``
+    is already the output of ``prune_and_merge_order_book`` for these demands.
+    """
     prob = LpProblem("TieredOreOptimization", LpMinimize)
 
-    order_book = _prune_and_merge_order_book(order_book, ores, demands)
+    if prune:
+        order_book = prune_and_merge_order_book(order_book, ores, demands)
 
-    y = {o["id"]: LpVariable(f"y_{o['id']}", 0, 1, LpBinary) for o in ores}
+    if relaxed:
+        y = {o["id"]: LpVariable(f"y_{o['id']}", 0, 1, LpContinuous) for o in ores}
+    else:
+        y = {o["id"]: LpVariable(f"y_{o['id']}", 0, 1, LpBinary) for o in ores}
     ore_batch_volume = {o["id"]: float(o.get("batch_volume", 0.0) or 0.0) for o in ores}
 
     tier_vars = {}
@@ -39,7 +63,9 @@ def optimize_ore_tiered(
             max_batches = int(tier["volume_remain"] // batch_size) if batch_size > 0 else 0
             if max_batches <= 0:
                 continue
-            var = LpVariable(f"z_{oid}_{idx}", lowBound=0, upBound=max_batches, cat=LpInteger)
+            var = LpVariable(
+                f"z_{oid}_{idx}", lowBound=0, upBound=max_batches, cat=LpContinuous if relaxed else LpInteger
+            )
             tier_vars[oid].append(
                 {
                     "var": var,
@@ -62,45 +88,234 @@ def optimize_ore_tiered(
             >= demands.get(m, 0)
         )
 
-    cost_terms = []
-    for oid, tvs in tier_vars.items():
-        for tv in tvs:
-            cost_terms.append(tv["var"] * tv["batch_size"] * tv["price"])
-
-    base_cost = lpSum(cost_terms)
+    base_cost = lpSum(tv["var"] * tv["batch_size"] * tv["price"] for tvs in tier_vars.values() for tv in tvs)
     total_ore_volume = lpSum(tv["var"] * ore_batch_volume.get(oid, 0.0) for oid, tvs in tier_vars.items() for tv in tvs)
-    ore_type_count = lpSum(y[oid] for oid in y)
+    overflow_penalty = _OVERFLOW_PENALTY * lpSum(s[m] for m in materials)
+    prob += _mode_objective(
+        mode,
+        base_cost=base_cost,
+        total_ore_volume=total_ore_volume,
+        ore_type_count=lpSum(y[oid] for oid in y),
+        overflow_penalty=overflow_penalty,
+        tier_vars=tier_vars,
+        ore_batch_volume=ore_batch_volume,
+    )
 
-    penalty = 1e-6
-    overflow_penalty = penalty * lpSum(s[m] for m in materials)
+    if max_ore_types is not None:
+        prob += lpSum(y[oid] for oid in y) <= max_ore_types
 
-    if mode == "min_volume":
-        objective = total_ore_volume + (1e-9 * base_cost) + overflow_penalty
-    elif mode == "min_ore_types":
-        objective = ore_type_count + (1e-9 * base_cost) + overflow_penalty
-    elif mode == "balanced":
-        cost_upper_bound = sum(tv["max_batches"] * tv["batch_size"] * tv["price"] for tvs in tier_vars.values() for tv in tvs)
-        volume_upper_bound = sum(tv["max_batches"] * ore_batch_volume.get(oid, 0.0) for oid, tvs in tier_vars.items() for tv in tvs)
-        normalized_cost_weight = 1.0 / max(float(cost_upper_bound or 0.0), 1.0)
-        normalized_volume_weight = 1.0 / max(float(volume_upper_bound or 0.0), 1.0)
-        objective = (normalized_cost_weight * base_cost) + (normalized_volume_weight * total_ore_volume) + overflow_penalty
+    warm_started = False
+    if warm_start and not relaxed:
+        for oid, tvs in tier_vars.items():
+            ore_batches = 0
+            for tv in tvs:
+                batches = min(int(warm_start.get((oid, tv["price"]), 0) or 0), tv["max_batches"])
+                tv["var"].setInitialValue(batches)
+                ore_batches += batches
+            y[oid].setInitialValue(1 if ore_batches > 0 else 0)
+            warm_started = warm_started or ore_batches > 0
+
+    time_limit = max(1.0, float(time_limit_seconds or 30.0))
+    if relaxed:
+        solver = PULP_CBC_CMD(msg=False, timeLimit=time_limit, mip=False)
     else:
-        objective = base_cost + overflow_penalty
-    prob += objective
+        solver = PULP_CBC_CMD(msg=False, gapRel=0.001, timeLimit=time_limit, warmStart=warm_started)
+    started = time.perf_counter()
+    prob.solve(solver)
+    solve_seconds = time.perf_counter() - started
+
+    status = LpStatus[prob.status]
+    if status != "Optimal" and status != "Integer Feasible":
+        return {"status": "failed", "reason": status}
+
+    per_ore = _collect_ore_solution(
+        ores,
+        tier_vars,
+        batches_of=lambda tv: tv["var"].value(),
+        relaxed=relaxed,
+        selected_of=lambda oid: 1 if relaxed else int(round(y[oid].value() or 0)),
+    )
+
+    total_cost = sum(o["cost"] for o in per_ore.values())
+    surplus_out = {m: s[m].value() for m in materials}
+    total_volume_m3 = sum(ore_batch_volume.get(oid, 0.0) * data["batches"] for oid, data in per_ore.items())
+
+    return {
+        "status": "ok",
+        "total_cost": total_cost,
+        "total_ore_volume_m3": total_volume_m3,
+        "selected_ore_type_count": sum(1 for data in per_ore.values() if data.get("selected")),
+        "solution": list(per_ore.values()),
+        "surplus": surplus_out,
+        "pricing_mode": "tiered_orders",
+        "optimization_mode": str(mode),
+        "preview": bool(relaxed),
+        "solver": {
+            "mode": "lp_relaxation" if relaxed else "milp",
+            "status": status,
+            "solve_seconds": solve_seconds,
+            "time_limit_seconds": time_limit,
+            "warm_started": warm_started,
+        },
+    }
+
+
+def optimize_ore_tiered_shared(
+    demand_sets,
+    ores,
+    materials,
+    order_book,
+    max_ore_types=None,
+    mode="min_cost",
+    *,
+    prune=True,
+    time_limit_seconds=30.0,
+):
+    """Cover several demand sets from one order book in a single model.
+
+    ``demand_sets`` maps a set id to its demands. Each set gets its own batch variables
+    per order tier while the tiers' depth is shared, so the sets compete for the cheap
+    orders exactly as one combined purchase would. Returns the combined purchase and
+    each set's attributed share (same row shape as ``optimize_ore_tiered``).
+    """
+    aggregated: dict = {}
+    for demands in demand_sets.values():
+        for material, quantity in demands.items():
+            aggregated[material] = aggregated.get(material, 0) + quantity
+
+    prob = LpProblem("SharedTieredOreOptimization", LpMinimize)
+
+    if prune:
+        order_book = prune_and_merge_order_book(order_book, ores, aggregated)
+
+    set_ids = list(demand_sets.keys())
+    y = {o["id"]: LpVariable(f"y_{o['id']}", 0, 1, LpBinary) for o in ores}
+    ore_batch_volume = {o["id"]: float(o.get("batch_volume", 0.0) or 0.0) for o in ores}
+
+    tier_vars = {}
+    for o in ores:
+        oid = o["id"]
+        batch_size = o["batch_size"]
+        tier_vars[oid] = []
+        if all(o["batch_yields"].get(m, 0) == 0 for m in aggregated.keys()):
+            continue
+        for idx, tier in enumerate(order_book.get(oid, [])):
+            max_batches = int(tier["volume_remain"] // batch_size) if batch_size > 0 else 0
+            if max_batches <= 0:
+                continue
+            set_vars = {
+                set_id: LpVariable(f"z_{k}_{oid}_{idx}", lowBound=0, upBound=max_batches, cat=LpInteger)
+                for k, set_id in enumerate(set_ids)
+            }
+            total = lpSum(set_vars.values())
+            tier_vars[oid].append(
+                {
+                    "var": total,
+                    "set_vars": set_vars,
+                    "price": tier["price"],
+                    "batch_size": batch_size,
+                    "order_id": tier["order_id"],
+                    "max_batches": max_batches,
+                }
+            )
+            prob += total <= max_batches * y[oid]
+
+    yield_map = {o["id"]: o["batch_yields"] for o in ores}
+    s = {(k, m): LpVariable(f"s_{k}_{m}", lowBound=0) for k in range(len(set_ids)) for m in materials}
+    for k, set_id in enumerate(set_ids):
+        demands = demand_sets[set_id]
+        for m in materials:
+            prob += (
+                lpSum(
+                    tv["set_vars"][set_id] * yield_map[oid].get(m, 0) for oid, tvs in tier_vars.items() for tv in tvs
+                )
+                - s[(k, m)]
+                >= demands.get(m, 0)
+            )
+
+    base_cost = lpSum(tv["var"] * tv["batch_size"] * tv["price"] for tvs in tier_vars.values() for tv in tvs)
+    total_ore_volume = lpSum(tv["var"] * ore_batch_volume.get(oid, 0.0) for oid, tvs in tier_vars.items() for tv in tvs)
+    prob += _mode_objective(
+        mode,
+        base_cost=base_cost,
+        total_ore_volume=total_ore_volume,
+        ore_type_count=lpSum(y[oid] for oid in y),
+        overflow_penalty=_OVERFLOW_PENALTY * lpSum(s.values()),
+        tier_vars=tier_vars,
+        ore_batch_volume=ore_batch_volume,
+    )
 
     if max_ore_types is not None:
         prob += lpSum(y[oid] for oid in y) <= max_ore_types
 
-    try:
-        solver = PULP_CBC_CMD(msg=True, gapRel=0.001, timeLimit=30)
-    except TypeError:
-        solver = PULP_CBC_CMD(msg=True, timeLimit=30)
-    prob.solve(solver)
+    time_limit = max(1.0, float(time_limit_seconds or 30.0))
+    started = time.perf_counter()
+    prob.solve(PULP_CBC_CMD(msg=False, gapRel=0.001, timeLimit=time_limit))
+    solve_seconds = time.perf_counter() - started
 
     status = LpStatus[prob.status]
     if status != "Optimal" and status != "Integer Feasible":
         return {"status": "failed", "reason": status}
 
+    def set_result(k, set_id):
+        per_ore = _collect_ore_solution(
+            ores,
+            tier_vars,
+            batches_of=lambda tv: tv["set_vars"][set_id].value(),
+            relaxed=False,
+            selected_of=lambda oid: 1,
+        )
+        return {
+            "status": "ok",
+            "total_cost": sum(o["cost"] for o in per_ore.values()),
+            "total_ore_volume_m3": sum(ore_batch_volume.get(oid, 0.0) * data["batches"] for oid, data in per_ore.items()),
+            "solution": list(per_ore.values()),
+            "surplus": {m: s[(k, m)].value() for m in materials},
+        }
+
+    sets = {set_id: set_result(k, set_id) for k, set_id in enumerate(set_ids)}
+    combined = _collect_ore_solution(
+        ores,
+        tier_vars,
+        batches_of=lambda tv: sum(var.value() or 0 for var in tv["set_vars"].values()),
+        relaxed=False,
+        selected_of=lambda oid: int(round(y[oid].value() or 0)),
+    )
+
+    return {
+        "status": "ok",
+        "total_cost": sum(o["cost"] for o in combined.values()),
+        "total_ore_volume_m3": sum(ore_batch_volume.get(oid, 0.0) * data["batches"] for oid, data in combined.items()),
+        "selected_ore_type_count": sum(1 for data in combined.values() if data.get("selected")),
+        "solution": list(combined.values()),
+        "sets": sets,
+        "pricing_mode": "tiered_orders",
+        "optimization_mode": str(mode),
+        "solver": {
+            "mode": "milp_shared",
+            "status": status,
+            "solve_seconds": solve_seconds,
+            "time_limit_seconds": time_limit,
+            "variable_count": len(prob.variables()),
+        },
+    }
+
+
+def _mode_objective(mode, *, base_cost, total_ore_volume, ore_type_count, overflow_penalty, tier_vars, ore_batch_volume):
+    if mode == "min_volume":
+        return total_ore_volume + (1e-9 * base_cost) + overflow_penalty
+    if mode == "min_ore_types":
+        return ore_type_count + (1e-9 * base_cost) + overflow_penalty
+    if mode == "balanced":
+        cost_upper_bound = sum(tv["max_batches"] * tv["batch_size"] * tv["price"] for tvs in tier_vars.values() for tv in tvs)
+        volume_upper_bound = sum(tv["max_batches"] * ore_batch_volume.get(oid, 0.0) for oid, tvs in tier_vars.items() for tv in tvs)
+        normalized_cost_weight = 1.0 / max(float(cost_upper_bound or 0.0), 1.0)
+        normalized_volume_weight = 1.0 / max(float(volume_upper_bound or 0.0), 1.0)
+        return (normalized_cost_weight * base_cost) + (normalized_volume_weight * total_ore_volume) + overflow_penalty
+    return base_cost + overflow_penalty
+
+
+def _collect_ore_solution(ores, tier_vars, *, batches_of, relaxed, selected_of):
     per_ore = {}
     for o in ores:
         oid = o["id"]
@@ -112,9 +327,11 @@ def optimize_ore_tiered(
         cost_total = 0.0
         tiers_used = []
         for tv in tier_vars[oid]:
-            val = tv["var"].value()
+            val = batches_of(tv)
             if val and val > 0:
-                val_int = int(val)
+                val_int = float(val) if relaxed else int(round(val))
+                if val_int <= 0:
+                    continue
                 ore_units = val_int * batch_size
                 tier_cost = ore_units * tv["price"]
                 batches_total += val_int
@@ -140,26 +357,12 @@ def optimize_ore_tiered(
                 "cost": cost_total,
                 "avg_unit_price": cost_total / ore_units_total if ore_units_total else None,
                 "tiers": tiers_used,
-                "selected": int(y[oid].value() or 0),
+                "selected": selected_of(oid),
             }
-
-    total_cost = sum(o["cost"] for o in per_ore.values())
-    surplus_out = {m: s[m].value() for m in materials}
-    total_volume_m3 = sum(ore_batch_volume.get(oid, 0.0) * data["batches"] for oid, data in per_ore.items())
-
-    return {
-        "status": "ok",
-        "total_cost": total_cost,
-        "total_ore_volume_m3": total_volume_m3,
-        "selected_ore_type_count": sum(1 for data in per_ore.values() if data.get("selected")),
-        "solution": list(per_ore.values()),
-        "surplus": surplus_out,
-        "pricing_mode": "tiered_orders",
-        "optimization_mode": str(mode),
-    }
+    return per_ore
 
 
-def _prune_and_merge_order_book(order_book, ores, demands, safety_factor=1.05):
+def prune_and_merge_order_book(order_book, ores, demands, safety_factor=1.05):
     total_demand_units = sum(demands.values())
     reduced = {}
     for ore_id, tiers in order_book.items():
@@ -1,14 +1,171 @@
 from __future__ import annotations
 
-from typing import Any
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Hashable, Optional
+import logging
+import multiprocessing
+import os
+import threading
 import time
 
 from eve_online_industry_tracker.infrastructure.esi_service import ESIService
 
 from eve_online_industry_tracker.infrastructure.static_data.facility_repo import get_facility
-from eve_online_industry_tracker.infrastructure.sde.static_data import build_all_materials, build_all_ores
+from eve_online_industry_tracker.infrastructure.sde.build_cache import get_build_keyed, invalidate_build_keyed
+from eve_online_industry_tracker.infrastructure.sde.static_data import (
+    ORE_CATALOG_TABLES,
+    get_material_catalog,
+    get_ore_catalog,
+)
 from eve_online_industry_tracker.infrastructure.static_data.yield_calc import compute_yields
-from eve_online_industry_tracker.infrastructure.static_data.optimizer import optimize_ore_tiered
+from eve_online_industry_tracker.infrastructure.static_data.optimizer import (
+    optimize_ore_tiered,
+    optimize_ore_tiered_shared,
+    prune_and_merge_order_book,
+)
+
+
+_DEFAULT_TIME_LIMIT_SECONDS = 30.0
+_MAX_TIME_LIMIT_SECONDS = 120.0
+_PLAN_CACHE_MAX_ENTRIES = 32
+_YIELD_CACHE_MAX_ENTRIES = 16
+
+
+class _OrePlanCache:
+    """Work reused between ore optimisation requests (process-wide, LRU-bounded).
+
+    Pruned order books are keyed by the ore set, the demand vector and the fetch
+    times of the cached order snapshot, so they are only reused while that snapshot is
+    unchanged. The last integer solution per (skills, facility, implant, mode, material
+    set) seeds the next solve for those settings as a CBC warm start. Yield matrices
+    live in the SDE build cache; only their keys are tracked here, to bound how many
+    (skills, facility, implant) variants are kept.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = _PLAN_CACHE_MAX_ENTRIES,
+        max_yield_entries: int = _YIELD_CACHE_MAX_ENTRIES,
+    ):
+        self._lock = threading.Lock()
+        self._max_entries = int(max_entries)
+        self._max_yield_entries = int(max_yield_entries)
+        self._pruned_books: "OrderedDict[Hashable, dict]" = OrderedDict()
+        self._solutions: "OrderedDict[Hashable, dict]" = OrderedDict()
+        self._yield_keys: "OrderedDict[Hashable, None]" = OrderedDict()
+
+    def _get(self, store: "OrderedDict[Hashable, dict]", key: Hashable) -> Optional[dict]:
+        with self._lock:
+            value = store.get(key)
+            if value is not None:
+                store.move_to_end(key)
+            return value
+
+    def _put(self, store: "OrderedDict[Hashable, dict]", key: Hashable, value: dict) -> None:
+        with self._lock:
+            store[key] = value
+            store.move_to_end(key)
+            while len(store) > self._max_entries:
+                store.popitem(last=False)
+
+    def pruned_order_book(self, key: Optional[Hashable], build: Callable[[], dict]) -> tuple[dict, bool]:
+        """Return ``(book, reused)``; ``key=None`` (unknown snapshot) always rebuilds."""
+        if key is not None:
+            cached = self._get(self._pruned_books, key)
+            if cached is not None:
+                return cached, True
+        book = build()
+        if key is not None:
+            self._put(self._pruned_books, key, book)
+        return book, False
+
+    def warm_start(self, key: Hashable) -> Optional[dict]:
+        return self._get(self._solutions, key)
+
+    def remember_solution(self, key: Hashable, solution: list[dict[str, Any]]) -> None:
+        allocation: dict[tuple[int, float], int] = {}
+        for row in solution:
+            ore_id = int(row.get("ore_id") or 0)
+            for tier in row.get("tiers") or []:
+                tier_key = (ore_id, tier.get("unit_price"))
+                allocation[tier_key] = allocation.get(tier_key, 0) + int(tier.get("batches") or 0)
+        self._put(self._solutions, key, allocation)
+
+    def touch_yield_key(self, key: Hashable) -> list[Hashable]:
+        """Mark a yield matrix as used; return the least recently used keys over the cap."""
+        with self._lock:
+            self._yield_keys[key] = None
+            self._yield_keys.move_to_end(key)
+            evicted: list[Hashable] = []
+            while len(self._yield_keys) > self._max_yield_entries:
+                evicted.append(self._yield_keys.popitem(last=False)[0])
+            return evicted
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pruned_books.clear()
+            self._solutions.clear()
+            self._yield_keys.clear()
+
+
+_PLAN_CACHE = _OrePlanCache()
+
+
+def _ore_yields_cached(
+    sde_session: Any,
+    language: str,
+    *,
+    skills: dict[str, Any],
+    facility: dict[str, Any],
+    implant_pct: float,
+) -> list[dict]:
+    """Yield matrix for every ore, cached per (skills, facility, implant) on the current SDE build.
+
+    Only the most recently used variants are kept (see ``_OrePlanCache.touch_yield_key``).
+    """
+    implants = [{"slot": 7, "group": "reprocessing", "bonus": (implant_pct / 100)}]
+    key = (
+        "ore_yields",
+        str(language),
+        tuple(sorted((str(name), level) for name, level in skills.items())),
+        tuple(sorted(facility.items())),
+        float(implant_pct),
+    )
+    yields = get_build_keyed(
+        sde_session,
+        key,
+        lambda session, _build_number: compute_yields(get_ore_catalog(session, language), skills, facility, implants),
+        tables=ORE_CATALOG_TABLES,
+    )
+    evicted = _PLAN_CACHE.touch_yield_key(key)
+    if evicted:
+        invalidate_build_keyed(sde_session, predicate=lambda cached_key: cached_key in evicted)
+    return yields
+
+
+def _order_book_snapshot_key(esi_service: ESIService, ore_ids: list[int]) -> Optional[tuple]:
+    """Identify the cached sell-order snapshot for ``ore_ids``; None when it cannot be told apart."""
+    try:
+        metadata = esi_service.get_sell_order_book_metadata(ore_ids)
+    except Exception:
+        return None
+    if not isinstance(metadata, dict) or metadata.get("newest_fetched_at") is None:
+        return None
+    return (
+        metadata.get("region_id"),
+        metadata.get("oldest_fetched_at"),
+        metadata.get("newest_fetched_at"),
+        metadata.get("total_orders"),
+    )
+
+
+def _time_limit_seconds(value: Any) -> float:
+    try:
+        seconds = float(value) if value is not None else _DEFAULT_TIME_LIMIT_SECONDS
+    except (TypeError, ValueError):
+        seconds = _DEFAULT_TIME_LIMIT_SECONDS
+    return min(max(seconds, 1.0), _MAX_TIME_LIMIT_SECONDS)
 
 
 def _build_raw_comparator_rows(
@@ -145,6 +302,41 @@ def _build_price_provenance(
     }
 
 
+def _viable_ores(ore_yields: list[dict], req_mats: set[str], *, only_compressed: bool) -> list[dict]:
+    """Ores that yield something and nothing outside ``req_mats``."""
+    viable = [o for o in ore_yields if o["batch_yields"] and set(o["batch_yields"].keys()).issubset(req_mats)]
+    if only_compressed:
+        viable = [o for o in viable if "Compressed" in o["name"]]
+    return viable
+
+
+def _material_prices(
+    esi_service: ESIService, materials: list[dict], req_mats: set[str]
+) -> tuple[list[int], dict[str, float | None]]:
+    """Best sell price per required material, by name (None when there is no order)."""
+    req_mat_ids = [m["id"] for m in materials if m["name"] in req_mats]
+    raw_req_mat_prices = esi_service.get_material_prices(req_mat_ids)
+    req_mat_prices = {
+        m: raw_req_mat_prices.get(m, [{}])[0].get("price", None)
+        for m in req_mat_ids
+        if m in raw_req_mat_prices and raw_req_mat_prices[m]
+    }
+    mat_name_to_price: dict[str, float | None] = {}
+    for m in materials:
+        if m["name"] in req_mats:
+            mat_name_to_price[m["name"]] = req_mat_prices.get(m["id"], None)
+    return req_mat_ids, mat_name_to_price
+
+
+def _raw_material_cost(demands: dict[str, Any], mat_name_to_price: dict[str, float | None]) -> float:
+    total = 0.0
+    for mat, qty in demands.items():
+        price = mat_name_to_price.get(mat)
+        if price is not None:
+            total += qty * price
+    return total
+
+
 def run_optimize(
     payload: dict,
     *,
@@ -158,56 +350,48 @@ def run_optimize(
     facility_id = payload["facility_id"]
     opt_only_compressed = payload.get("only_compressed", False)
     optimization_mode = str(payload.get("mode") or "min_cost")
+    preview = bool(payload.get("preview", False))
+    time_limit_seconds = _time_limit_seconds(payload.get("time_limit_seconds"))
 
     skills = getattr(character, "reprocessing_skills", None) or character.extract_reprocessing_skills()
-    implants = [{"slot": 7, "group": "reprocessing", "bonus": (implant_pct / 100)}]
 
     facility = get_facility(facility_id)
 
-    ores = build_all_ores(sde_session, language)
-    ore_yields = compute_yields(ores, skills, facility, implants)
+    ore_yields = _ore_yields_cached(
+        sde_session,
+        language,
+        skills=skills,
+        facility=facility,
+        implant_pct=float(implant_pct or 0),
+    )
 
     req_mats = set(demands.keys())
-    ore_yields = [
-        o
-        for o in ore_yields
-        if set(o["batch_yields"].keys()).issubset(req_mats) and len(o["batch_yields"].keys()) > 0
-    ]
-
-    materials = build_all_materials(sde_session, language)
-    req_mat_ids = [m["id"] for m in materials if m["name"] in req_mats]
-    raw_req_mat_prices = esi_service.get_material_prices(req_mat_ids)
-    req_mat_prices = {
-        m: raw_req_mat_prices.get(m, [{}])[0].get("price", None)
-        for m in req_mat_ids
-        if m in raw_req_mat_prices and raw_req_mat_prices[m]
-    }
-
-    mat_name_to_price: dict[str, float | None] = {}
-    for m in materials:
-        if m["name"] in req_mats:
-            mat_name_to_price[m["name"]] = req_mat_prices.get(m["id"], None)
+    viable_ores = _viable_ores(ore_yields, req_mats, only_compressed=opt_only_compressed)
+    ore_ids = [o["id"] for o in viable_ores]
+    demand_key = tuple(sorted((str(material), float(quantity or 0)) for material, quantity in demands.items()))
 
-    tiered_total_cost = 0.0
-    for mat, qty in demands.items():
-        price = mat_name_to_price.get(mat)
-        if price is None:
-            price = req_mat_prices.get(mat, None)
-        if price is not None:
-            tiered_total_cost += qty * price
+    # A preview is an estimate: it reuses the book pruned from the cached order snapshot
+    # and only fetches ore prices when there is none.
+    processed_ore_prices = None if preview else esi_service.get_ore_prices(ore_ids)
+    snapshot_key = _order_book_snapshot_key(esi_service, ore_ids)
 
-    viable_ores = [
-        o
-        for o in ore_yields
-        if any(m in req_mats for m in o["batch_yields"].keys()) and len(o["batch_yields"].keys()) > 0
-    ]
-    if opt_only_compressed:
-        viable_ores = [o for o in viable_ores if "Compressed" in o["name"]]
+    def build_order_book() -> dict:
+        prices = processed_ore_prices if processed_ore_prices is not None else esi_service.get_ore_prices(ore_ids)
+        return prune_and_merge_order_book({oid: prices.get(oid, []) for oid in ore_ids}, viable_ores, demands)
 
-    ore_ids = [o["id"] for o in viable_ores]
-    processed_ore_prices = esi_service.get_ore_prices(ore_ids)
-    order_book = {oid: processed_ore_prices.get(oid, []) for oid in ore_ids}
+    order_book, order_book_reused = _PLAN_CACHE.pruned_order_book(
+        (tuple(ore_ids), demand_key, snapshot_key) if snapshot_key is not None else None,
+        build_order_book,
+    )
 
+    solution_key = (
+        tuple(sorted((str(name), level) for name, level in skills.items())),
+        facility_id,
+        float(implant_pct or 0),
+        bool(opt_only_compressed),
+        optimization_mode,
+        frozenset(req_mats),
+    )
     result = optimize_ore_tiered(
         demands=demands,
         ores=viable_ores,
@@ -215,10 +399,23 @@ def run_optimize(
         order_book=order_book,
         max_ore_types=len(req_mats),
         mode=optimization_mode,
+        relaxed=preview,
+        prune=False,
+        warm_start=None if preview else _PLAN_CACHE.warm_start(solution_key),
+        time_limit_seconds=time_limit_seconds,
     )
 
     if result.get("status") != "ok":
         return result
+    result["solver"]["order_book_reused"] = order_book_reused
+    if preview:
+        # The estimate is all the caller needs; skip material prices and provenance.
+        return result
+    _PLAN_CACHE.remember_solution(solution_key, result.get("solution", []))
+
+    materials = get_material_catalog(sde_session, language)
+    req_mat_ids, mat_name_to_price = _material_prices(esi_service, materials, req_mats)
+    tiered_total_cost = _raw_material_cost(demands, mat_name_to_price)
 
     ore_yields_map = {int(ore.get("id") or 0): ore for ore in viable_ores}
     demand_coverage = _build_demand_coverage(
@@ -258,7 +455,176 @@ def run_optimize(
         solution=result.get("solution", []),
     )
 
-    result["ore_yields"] = ore_yields
+    result["ore_yields"] = _viable_ores(ore_yields, req_mats, only_compressed=False)
     result["tiered_total_cost"] = tiered_total_cost
 
     return result
+
+
+def _solve_demand_set(kwargs: dict[str, Any]) -> dict[str, Any]:
+    # Runs in a worker process; keep it a plain top-level function so it pickles.
+    return optimize_ore_tiered(**kwargs)
+
+
+def _solve_independently(jobs: list[dict[str, Any]], *, max_workers: int | None) -> list[dict[str, Any]]:
+    workers = max(1, min(len(jobs), int(max_workers or min(4, os.cpu_count() or 1))))
+    if workers > 1:
+        try:
+            # spawn: forking a multi-threaded Flask process can deadlock the child.
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+                return list(pool.map(_solve_demand_set, jobs))
+        except Exception as e:
+            logging.warning("Ore batch process pool failed, solving in-process: %s", e)
+    return [_solve_demand_set(job) for job in jobs]
+
+
+def _combine_set_solutions(set_results: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    combined: dict[int, dict[str, Any]] = {}
+    for result in set_results:
+        for row in result.get("solution") or []:
+            ore_id = int(row.get("ore_id") or 0)
+            entry = combined.setdefault(
+                ore_id,
+                {
+                    "ore_id": ore_id,
+                    "ore_name": row.get("ore_name"),
+                    "batch_size": row.get("batch_size"),
+                    "batches": 0,
+                    "ore_units": 0,
+                    "cost": 0.0,
+                    "tiers": [],
+                    "selected": 1,
+                },
+            )
+            entry["batches"] += int(row.get("batches") or 0)
+            entry["ore_units"] += int(row.get("ore_units") or 0)
+            entry["cost"] += float(row.get("cost") or 0.0)
+            entry["tiers"].extend(row.get("tiers") or [])
+    for entry in combined.values():
+        entry["avg_unit_price"] = entry["cost"] / entry["ore_units"] if entry["ore_units"] else None
+    return list(combined.values())
+
+
+def run_optimize_batch(
+    payload: dict,
+    *,
+    character: Any,
+    esi_service: ESIService,
+    sde_session: Any,
+    language: str,
+    max_workers: int | None = None,
+) -> dict:
+    """Optimise ore buys for many demand sets against one order book snapshot.
+
+    ``payload["demand_sets"]`` is a list of ``{"id", "demands"}``. With
+    ``strategy="shared"`` all sets are solved in one model in which they compete for
+    the same order depth, and each set's share of the purchase is attributed back to
+    it. ``strategy="independent"`` solves every set on its own (as ``run_optimize``
+    would) in a process pool; the sets may then count on the same orders.
+    """
+    demand_sets: dict[str, dict[str, Any]] = {str(row["id"]): dict(row["demands"]) for row in payload["demand_sets"]}
+    strategy = str(payload.get("strategy") or "shared")
+    implant_pct = payload.get("implant_pct", 0)
+    facility_id = payload["facility_id"]
+    only_compressed = bool(payload.get("only_compressed", False))
+    optimization_mode = str(payload.get("mode") or "min_cost")
+    time_limit_seconds = _time_limit_seconds(payload.get("time_limit_seconds"))
+
+    skills = getattr(character, "reprocessing_skills", None) or character.extract_reprocessing_skills()
+    facility = get_facility(facility_id)
+    ore_yields = _ore_yields_cached(
+        sde_session,
+        language,
+        skills=skills,
+        facility=facility,
+        implant_pct=float(implant_pct or 0),
+    )
+
+    all_mats = {str(material) for demands in demand_sets.values() for material in demands.keys()}
+    materials = get_material_catalog(sde_session, language)
+    _, mat_name_to_price = _material_prices(esi_service, materials, all_mats)
+
+    viable_ores = _viable_ores(ore_yields, all_mats, only_compressed=only_compressed)
+    ore_ids = [o["id"] for o in viable_ores]
+    processed_ore_prices = esi_service.get_ore_prices(ore_ids)
+    order_book = {oid: processed_ore_prices.get(oid, []) for oid in ore_ids}
+
+    started = time.perf_counter()
+    if strategy == "shared":
+        shared = optimize_ore_tiered_shared(
+            demand_sets,
+            viable_ores,
+            all_mats,
+            order_book,
+            max_ore_types=len(all_mats),
+            mode=optimization_mode,
+            time_limit_seconds=time_limit_seconds,
+        )
+        if shared.get("status") != "ok":
+            return shared
+        set_results = shared["sets"]
+        combined_solution = shared["solution"]
+        solver = dict(shared["solver"])
+    else:
+        jobs = []
+        for demands in demand_sets.values():
+            set_mats = set(demands.keys())
+            set_ores = _viable_ores(viable_ores, set_mats, only_compressed=False)
+            jobs.append(
+                {
+                    "demands": demands,
+                    "ores": set_ores,
+                    "materials": set_mats,
+                    "order_book": {o["id"]: order_book.get(o["id"], []) for o in set_ores},
+                    "max_ore_types": len(set_mats),
+                    "mode": optimization_mode,
+                    "time_limit_seconds": time_limit_seconds,
+                }
+            )
+        set_results = dict(zip(demand_sets.keys(), _solve_independently(jobs, max_workers=max_workers)))
+        combined_solution = _combine_set_solutions([r for r in set_results.values() if r.get("status") == "ok"])
+        solver = {"mode": "milp_independent", "time_limit_seconds": time_limit_seconds}
+    solver["solve_seconds"] = time.perf_counter() - started
+
+    ore_yields_map = {int(ore.get("id") or 0): ore for ore in viable_ores}
+    sets_out = []
+    for set_id, demands in demand_sets.items():
+        result = set_results.get(set_id) or {"status": "failed", "reason": "not solved"}
+        row: dict[str, Any] = {"id": set_id, "status": result.get("status"), "demands": demands}
+        if result.get("status") == "ok":
+            raw_cost = _raw_material_cost(demands, mat_name_to_price)
+            row.update(
+                {
+                    "total_cost": float(result.get("total_cost") or 0.0),
+                    "total_ore_volume_m3": float(result.get("total_ore_volume_m3") or 0.0),
+                    "solution": result.get("solution", []),
+                    "surplus": result.get("surplus", {}),
+                    "demand_coverage": _build_demand_coverage(
+                        demands=demands,
+                        ore_yields_map=ore_yields_map,
+                        solution=result.get("solution", []),
+                    ),
+                    "tiered_total_cost": raw_cost,
+                    "savings": raw_cost - float(result.get("total_cost") or 0.0),
+                }
+            )
+        else:
+            row["reason"] = result.get("reason")
+        sets_out.append(row)
+
+    total_cost = sum(float(row.get("cost") or 0.0) for row in combined_solution)
+    solved = [row for row in sets_out if row["status"] == "ok"]
+    return {
+        "status": "ok" if len(solved) == len(sets_out) else ("partial" if solved else "failed"),
+        "strategy": strategy,
+        "depth_shared": strategy == "shared",
+        "optimization_mode": optimization_mode,
+        "set_count": len(sets_out),
+        "solved_set_count": len(solved),
+        "total_cost": total_cost,
+        "tiered_total_cost": sum(float(row.get("tiered_total_cost") or 0.0) for row in solved),
+        "reprocessing_fee": total_cost * float(facility.get("tax") or 0.0),
+        "solution": combined_solution,
+        "sets": sets_out,
+        "solver": solver,
+    }
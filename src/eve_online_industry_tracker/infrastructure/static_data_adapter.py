@@ -2,14 +2,16 @@ from __future__ import annotations
 
 from typing import Any
 
-from eve_online_industry_tracker.infrastructure.sde.static_data import build_all_materials, build_all_ores
+from eve_online_industry_tracker.infrastructure.sde.static_data import build_all_materials, build_all_ores, get_ore_catalog
 from eve_online_industry_tracker.infrastructure.static_data.facility_repo import get_all_facilities
-from eve_online_industry_tracker.infrastructure.static_data.optimizer_service import run_optimize
+from eve_online_industry_tracker.infrastructure.static_data.optimizer_service import run_optimize, run_optimize_batch
 
 
 __all__ = [
     "get_all_facilities",
     "run_optimize",
+    "run_optimize_batch",
     "build_all_materials",
     "build_all_ores",
+    "get_ore_catalog",
 ]
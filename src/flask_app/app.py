@@ -6,8 +6,11 @@ from flask import Flask
 
 from werkzeug.exceptions import HTTPException
 
+from flask_app.compression import init_compression
 from flask_app.db import close_request_sessions
 from flask_app.http import error
+from flask_app.json_provider import OrjsonProvider
+from flask_app.settings import response_compression
 from flask_app.state import state
 
 from eve_online_industry_tracker.application.errors import ServiceError
@@ -23,6 +26,7 @@ from flask_app.routes.settings import settings_bp
 
 def create_app() -> Flask:
     app = Flask(__name__)
+    app.json = OrjsonProvider(app)
 
     # Expose state via the Flask app instance so routes don't need to import the
     # module-level global directly.
@@ -62,6 +66,9 @@ def create_app() -> Flask:
     def _handle_not_found(_):
         return error(message="Not found", status_code=404)
 
+    if response_compression():
+        init_compression(app)
+
     # Blueprints
     app.register_blueprint(admin_bp)
     app.register_blueprint(static_data_bp)
@@ -7,6 +7,11 @@ from flask_app.deps import get_state
 from flask_app.state import AppState
 from flask_app.background_jobs import register_thread, stop_background_jobs
 from flask_app.settings import (
+    job_queue_workers,
+    job_result_ttl_seconds,
+    market_price_warmer_enabled,
+    public_structures_denied_backoff_hours,
+    public_structures_recheck_hours,
     public_structures_startup_scan_batch_size,
     public_structures_startup_scan_enabled,
     public_structures_esi_request_timeout_seconds,
@@ -14,6 +19,7 @@ from flask_app.settings import (
     public_structures_startup_scan_pause_seconds,
     public_structures_startup_scan_scan_cap,
     public_structures_startup_scan_time_budget_seconds,
+    sde_reload_check_seconds,
 )
 
 # App initialization imports
@@ -25,17 +31,77 @@ from utils.app_init import (
     _user_friendly_error,
 )
 
+from eve_online_industry_tracker.application.characters.realized_profit_jobs import RealizedProfitRebuildJobs
 from eve_online_industry_tracker.application.industry.job_manager import IndustryJobManager
+from eve_online_industry_tracker.application.industry.service import IndustryService
+from eve_online_industry_tracker.application.market_pricing import MarketPriceWarmer
 from eve_online_industry_tracker.infrastructure.esi_service import ESIService
 from eve_online_industry_tracker.config.admin_settings import AdminSettingsManager
 
-from eve_online_industry_tracker.infrastructure.public_structures_cache_service import trigger_global_public_structures_scan
+from eve_online_industry_tracker.infrastructure.job_queue import DurableJobQueue, JobQueueConfig
+from eve_online_industry_tracker.infrastructure.public_structures_cache_service import (
+    PUBLIC_STRUCTURES_REFRESH_JOB_KIND,
+    trigger_global_public_structures_scan,
+)
+from eve_online_industry_tracker.infrastructure.sde.dimensions import SDE_DIMENSION_TABLES
+from eve_online_industry_tracker.infrastructure.sde.reload import SdeReloader
 
 
 def _register_thread(app_state: AppState, name: str, thread: threading.Thread) -> None:
     register_thread(app_state, name, thread)
 
 
+def _init_job_queue(app_state: AppState) -> DurableJobQueue:
+    queue = DurableJobQueue(
+        state=app_state,
+        config=JobQueueConfig(
+            max_workers=job_queue_workers(),
+            group_limits={PUBLIC_STRUCTURES_REFRESH_JOB_KIND: 2},
+            result_ttl_seconds=float(job_result_ttl_seconds()),
+        ),
+    )
+    IndustryService(state=app_state).register_background_jobs(queue)
+    RealizedProfitRebuildJobs(state=app_state).register_background_jobs(queue)
+    queue.register(PUBLIC_STRUCTURES_REFRESH_JOB_KIND, durable=False)
+    return queue
+
+
+def _on_sde_tables_changed(app_state: AppState, changed: frozenset[str] | None) -> None:
+    """Drop in-process caches built from SDE tables that an update changed (None: all of them)."""
+
+    def affected(tables: frozenset[str]) -> bool:
+        return changed is None or bool(changed & tables)
+
+    manager = app_state.industry_job_manager
+    if manager is not None and affected(manager.SDE_TABLES):
+        manager.invalidate_blueprint_overview()
+    if affected(SDE_DIMENSION_TABLES):
+        app_state.materials_cache = None
+    # Rig bonuses come from types and dogma; cheap to rebuild, so drop on any change.
+    app_state._structure_rigs_cache = None
+
+
+def _start_sde_reloader(app_state: AppState) -> None:
+    interval = sde_reload_check_seconds()
+    app_state.sde_reloader = SdeReloader(
+        db_sde=app_state.db_sde,
+        on_tables_changed=lambda changed: _on_sde_tables_changed(app_state, changed),
+    )
+    if interval <= 0:
+        return
+
+    def _watch() -> None:
+        while not app_state.shutdown_event.wait(float(interval)):
+            try:
+                app_state.sde_reloader.check()
+            except Exception as e:
+                logging.warning("SDE reload check failed: %s", e, exc_info=True)
+
+    t = threading.Thread(target=_watch, name="sde-reloader", daemon=True)
+    _register_thread(app_state, "sde-reloader", t)
+    t.start()
+
+
 def initialize_application(app_state: AppState | None = None, *, refresh_metadata: bool = True) -> None:
     """Perform heavy initialization.
 
@@ -132,6 +198,17 @@ def initialize_application(app_state: AppState | None = None, *, refresh_metadat
 
         state.industry_job_manager = IndustryJobManager(state=state)
         state.industry_job_manager.start()
+        if market_price_warmer_enabled():
+            state.market_price_warmer = MarketPriceWarmer(state=state)
+            state.market_price_warmer.start()
+        _start_sde_reloader(state)
+
+        # Background refreshes run on a bounded, DB-backed queue; pick up jobs a previous run left behind.
+        state.job_queue = _init_job_queue(state)
+        resumed = state.job_queue.resume()
+        if resumed:
+            logging.info("Resumed %s background job(s) from the previous run", resumed)
+        state.job_queue.evict_expired()
         # Adapters no longer keep module-level globals; they read from state + request-scoped sessions.
 
         # Start background global scan to populate public_structures. This is best-effort and
@@ -145,6 +222,8 @@ def initialize_application(app_state: AppState | None = None, *, refresh_metadat
                 batch_size=public_structures_startup_scan_batch_size(),
                 pause_seconds=float(public_structures_startup_scan_pause_seconds()),
                 request_timeout_seconds=float(public_structures_esi_request_timeout_seconds()),
+                recheck_seconds=float(public_structures_recheck_hours()) * 3600.0,
+                denied_backoff_seconds=float(public_structures_denied_backoff_hours()) * 3600.0,
             )
 
         chars_initialized = len(state.char_manager._character_list)
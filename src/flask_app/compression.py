@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import gzip
+
+from flask import Flask, Response, request
+
+try:
+    import brotli  # pyright: ignore[reportMissingImports]
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+
+# Bodies smaller than this are not worth the CPU (and often grow when compressed).
+MIN_COMPRESS_BYTES = 1024
+GZIP_LEVEL = 5
+BROTLI_QUALITY = 4
+
+_COMPRESSIBLE_MIMETYPES = frozenset(
+    {
+        "application/json",
+        "application/javascript",
+        "text/css",
+        "text/csv",
+        "text/html",
+        "text/plain",
+        "image/svg+xml",
+    }
+)
+
+
+def _choose_encoding() -> str | None:
+    accept = request.accept_encodings
+    if brotli is not None and accept.quality("br") > 0:
+        return "br"
+    if accept.quality("gzip") > 0:
+        return "gzip"
+    return None
+
+
+def compress_response(response: Response) -> Response:
+    if response.direct_passthrough or response.is_streamed:
+        return response
+    if response.status_code < 200 or response.status_code in {204, 206, 304}:
+        return response
+    if response.mimetype not in _COMPRESSIBLE_MIMETYPES or "Content-Encoding" in response.headers:
+        return response
+
+    response.vary.add("Accept-Encoding")
+    encoding = _choose_encoding()
+    if encoding is None:
+        return response
+
+    body = response.get_data()
+    if len(body) < MIN_COMPRESS_BYTES:
+        return response
+
+    if encoding == "br":
+        compressed = brotli.compress(body, quality=BROTLI_QUALITY)
+    else:
+        compressed = gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+    response.set_data(compressed)
+    response.headers["Content-Encoding"] = encoding
+    return response
+
+
+def init_compression(app: Flask) -> None:
+    """Compress JSON/text responses with br (when ``brotli`` is installed) or gzip."""
+    app.after_request(compress_response)
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import Any, Dict, Optional, Tuple
 
-from flask import jsonify
+from flask import jsonify, request
 
 
 def ok(*, data: Any = None, message: Optional[str] = None, status_code: int = 200, **extra: Any):
@@ -15,6 +15,21 @@ def ok(*, data: Any = None, message: Optional[str] = None, status_code: int = 20
     return jsonify(payload), status_code
 
 
+def ok_cacheable(*, data: Any = None, max_age_seconds: int = 60, **extra: Any):
+    """Like ``ok`` but with a weak ETag and ``Cache-Control: max-age``; answers 304 when the ETag matches.
+
+    Intended for responses derived from static data (SDE). The ETag hashes the body, so a
+    revalidation after a hot SDE reload picks up changed data; the short ``max-age`` bounds
+    how long clients serve a response without revalidating.
+    """
+    response, status_code = ok(data=data, **extra)
+    response.status_code = status_code
+    response.cache_control.private = True
+    response.cache_control.max_age = max(0, int(max_age_seconds))
+    response.add_etag(weak=True)
+    return response.make_conditional(request)
+
+
 def error(*, message: str, status_code: int = 500, code: Optional[str] = None, **extra: Any):
     payload: Dict[str, Any] = {
         "status": "error",
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import dataclasses
+import decimal
+import uuid
+from datetime import date
+from typing import Any
+
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.http import http_date
+
+try:
+    import orjson  # pyright: ignore[reportMissingImports]
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def orjson_available() -> bool:
+    return orjson is not None
+
+
+def _default(o: Any) -> Any:
+    # Mirrors Flask's DefaultJSONProvider so responses look the same with either serializer.
+    if isinstance(o, date):
+        return http_date(o)
+    if isinstance(o, (decimal.Decimal, uuid.UUID)):
+        return str(o)
+    if dataclasses.is_dataclass(o) and not isinstance(o, type):
+        return dataclasses.asdict(o)
+    if isinstance(o, (set, frozenset, tuple)):
+        return list(o)
+    if hasattr(o, "__html__"):
+        return str(o.__html__())
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider that serializes with orjson, falling back to the stdlib when unavailable.
+
+    Keeps Flask's defaults (sorted keys, HTTP dates for datetimes, non-string dict keys)
+    and only changes NaN/Infinity, which orjson emits as ``null`` (valid JSON).
+    """
+
+    _options = (
+        (orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_SERIALIZE_NUMPY)
+        if orjson is not None
+        else 0
+    )
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=_default, option=self._options).decode("utf-8")
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        if orjson is None or (self.compact is False or (self.compact is None and self._app.debug)):
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=_default, option=self._options | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
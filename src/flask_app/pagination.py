@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Mapping
+
+from eve_online_industry_tracker.application.errors import ServiceError
+
+
+MAX_PAGE_LIMIT = 10000
+
+
+@dataclass(frozen=True)
+class ListQuery:
+    """Projection, sort and pagination requested via ``?fields=&sort=&offset=&limit=``.
+
+    ``fields`` and ``sort`` are comma separated; a ``-`` prefix on a sort key sorts descending.
+    """
+
+    fields: tuple[str, ...] = ()
+    sort: tuple[tuple[str, bool], ...] = ()
+    offset: int = 0
+    limit: int | None = None
+
+    @property
+    def is_default(self) -> bool:
+        return not self.fields and not self.sort and self.offset == 0 and self.limit is None
+
+
+def _csv_arg(args: Mapping[str, Any], name: str) -> list[str]:
+    raw = str(args.get(name) or "").strip()
+    return [part.strip() for part in raw.split(",") if part.strip()]
+
+
+def _non_negative_int_arg(args: Mapping[str, Any], name: str) -> int | None:
+    raw = str(args.get(name) or "").strip()
+    if not raw:
+        return None
+    try:
+        value = int(raw)
+    except ValueError:
+        raise ServiceError(f"Invalid {name}: must be an integer.", status_code=400) from None
+    if value < 0:
+        raise ServiceError(f"Invalid {name}: must be >= 0.", status_code=400)
+    return value
+
+
+def parse_list_query(args: Mapping[str, Any]) -> ListQuery:
+    sort_keys: list[tuple[str, bool]] = []
+    for key in _csv_arg(args, "sort"):
+        descending = key.startswith("-")
+        key = key.lstrip("+-").strip()
+        if key:
+            sort_keys.append((key, descending))
+
+    limit = _non_negative_int_arg(args, "limit")
+    return ListQuery(
+        fields=tuple(dict.fromkeys(_csv_arg(args, "fields"))),
+        sort=tuple(sort_keys),
+        offset=_non_negative_int_arg(args, "offset") or 0,
+        limit=min(limit, MAX_PAGE_LIMIT) if limit is not None else None,
+    )
+
+
+def _sort_rows(rows: list[Any], key: str, *, descending: bool) -> list[Any]:
+    # Missing/None values always sort last, in either direction.
+    present = [row for row in rows if isinstance(row, dict) and row.get(key) is not None]
+    missing = [row for row in rows if not isinstance(row, dict) or row.get(key) is None]
+    try:
+        present.sort(key=lambda row: row[key], reverse=descending)
+    except TypeError:
+        present.sort(key=lambda row: str(row[key]), reverse=descending)
+    return present + missing
+
+
+def apply_list_query(rows: list[Any], query: ListQuery) -> tuple[list[Any], dict[str, Any]]:
+    """Return ``(page_rows, page_meta)`` for a list of dict rows."""
+    total = len(rows)
+    out = list(rows)
+    # Stable sorts applied from the least to the most significant key.
+    for key, descending in reversed(query.sort):
+        out = _sort_rows(out, key, descending=descending)
+
+    start = min(query.offset, total)
+    end = total if query.limit is None else min(total, start + query.limit)
+    out = out[start:end]
+
+    if query.fields:
+        out = [{field: row[field] for field in query.fields if field in row} if isinstance(row, dict) else row for row in out]
+
+    return out, {
+        "total": total,
+        "offset": start,
+        "limit": query.limit,
+        "returned": len(out),
+        "next_offset": end if end < total else None,
+    }
+
+
+def apply_list_query_to_nested(owners: Any, query: ListQuery, *, rows_key: str = "assets") -> Any:
+    """Apply ``query`` to the ``rows_key`` list of each owner entry (e.g. per-character assets).
+
+    Owner dicts are copied so cached service payloads are never modified in place.
+    """
+    if query.is_default or not isinstance(owners, list):
+        return owners
+    out: list[Any] = []
+    for owner in owners:
+        if isinstance(owner, dict) and isinstance(owner.get(rows_key), list):
+            rows, page = apply_list_query(owner[rows_key], query)
+            owner = {**owner, rows_key: rows, f"{rows_key}_page": page}
+        out.append(owner)
+    return out
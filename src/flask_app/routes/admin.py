@@ -174,6 +174,18 @@ def stop_public_structures_scan():
     return ok(message=out["message"], meta=out["meta"])
 
 
+@admin_bp.post("/sde/reload")
+def reload_sde():
+    """Pick up an SDE updated by scripts/import_sde.py now instead of at the next periodic check."""
+    force_flag = request.args.get("force", "0")
+    if force_flag not in ("0", "1"):
+        return error(message="force must be 0 or 1", status_code=400)
+    require_ready(get_state())
+    svc = AdminService(state=get_state())
+    out = svc.reload_sde(force=force_flag == "1")
+    return ok(message=out["message"], meta=out["meta"])
+
+
 @admin_bp.get("/esi_metrics")
 def esi_metrics():
     """Return in-process ESI call metrics.
@@ -4,7 +4,9 @@ from flask import Blueprint, request
 
 from flask_app.deps import get_state
 from flask_app.bootstrap import require_ready
-from flask_app.http import ok
+from flask_app.http import error, ok
+from flask_app.pagination import apply_list_query, apply_list_query_to_nested, parse_list_query
+from flask_app.settings import realized_profit_rebuild_workers
 
 from eve_online_industry_tracker.application.characters.service import CharactersService
 
@@ -44,7 +46,7 @@ def characters_get_assets():
     svc = CharactersService(state=get_state())
     character_id_raw = (request.args.get("character_id") or "").strip()
     character_id = int(character_id_raw) if character_id_raw.isdigit() else None
-    return ok(data=svc.get_assets(character_id=character_id))
+    return ok(data=apply_list_query_to_nested(svc.get_assets(character_id=character_id), parse_list_query(request.args)))
 
 
 @characters_bp.get("/characters/market_orders")
@@ -69,8 +71,48 @@ def characters_get_realized_profit():
     svc = CharactersService(state=get_state())
     refresh_raw = (request.args.get("refresh") or "0").strip().lower()
     refresh = refresh_raw in {"1", "true", "yes", "y", "on"}
+    full_raw = (request.args.get("full") or "0").strip().lower()
+    full_rebuild = full_raw in {"1", "true", "yes", "y", "on"}
 
     character_id_raw = (request.args.get("character_id") or "").strip()
     character_id = int(character_id_raw) if character_id_raw.isdigit() else None
 
-    return ok(data=svc.get_realized_profit_ledger(refresh=refresh, character_id=character_id))
+    ledger = svc.get_realized_profit_ledger(refresh=refresh, character_id=character_id, full_rebuild=full_rebuild)
+    list_query = parse_list_query(request.args)
+    if not list_query.is_default:
+        ledger["rows"], ledger["page"] = apply_list_query(ledger.get("rows") or [], list_query)
+    return ok(data=ledger)
+
+
+@characters_bp.post("/characters/realized_profit/rebuild")
+def characters_realized_profit_rebuild_start():
+    require_ready(get_state())
+    payload = request.get_json(silent=True) or {}
+    refresh = bool(payload.get("refresh", False))
+    full_rebuild = bool(payload.get("full", False))
+    character_id_raw = payload.get("character_id")
+    try:
+        character_id = int(character_id_raw) if character_id_raw is not None else None
+        max_workers = int(payload.get("max_workers") or realized_profit_rebuild_workers())
+    except (ValueError, TypeError):
+        return error(message="character_id and max_workers must be integers.", status_code=400)
+    max_workers = max(1, min(max_workers, realized_profit_rebuild_workers()))
+    svc = CharactersService(state=get_state())
+    return ok(
+        data=svc.start_realized_profit_rebuild(
+            refresh=refresh,
+            character_id=character_id,
+            full_rebuild=full_rebuild,
+            max_workers=max_workers,
+        ),
+        status_code=202,
+    )
+
+
+@characters_bp.get("/characters/realized_profit/rebuild/<job_id>")
+def characters_realized_profit_rebuild_status(job_id: str):
+    require_ready(get_state())
+    if not job_id or not job_id.strip():
+        return error(message="job_id is required.", status_code=400)
+    svc = CharactersService(state=get_state())
+    return ok(data=svc.realized_profit_rebuild_status(job_id=job_id))
@@ -4,7 +4,9 @@ from flask import Blueprint, request
 
 from flask_app.bootstrap import require_ready
 from flask_app.deps import get_state
-from flask_app.http import ok
+from flask_app.http import error, ok
+from flask_app.pagination import apply_list_query, apply_list_query_to_nested, parse_list_query
+from flask_app.settings import realized_profit_rebuild_workers
 
 from eve_online_industry_tracker.application.corporations.service import CorporationsService
 
@@ -25,7 +27,7 @@ def corporations_assets():
     svc = CorporationsService(state=get_state())
     corporation_id_raw = (request.args.get("corporation_id") or "").strip()
     corporation_id = int(corporation_id_raw) if corporation_id_raw.isdigit() else None
-    return ok(data=svc.list_assets(corporation_id=corporation_id))
+    return ok(data=apply_list_query_to_nested(svc.list_assets(corporation_id=corporation_id), parse_list_query(request.args)))
 
 
 @corporations_bp.get("/corporations/realized_profit")
@@ -34,8 +36,48 @@ def corporations_realized_profit():
     svc = CorporationsService(state=get_state())
     refresh_raw = (request.args.get("refresh") or "0").strip().lower()
     refresh = refresh_raw in {"1", "true", "yes", "y", "on"}
+    full_raw = (request.args.get("full") or "0").strip().lower()
+    full_rebuild = full_raw in {"1", "true", "yes", "y", "on"}
 
     corporation_id_raw = (request.args.get("corporation_id") or "").strip()
     corporation_id = int(corporation_id_raw) if corporation_id_raw.isdigit() else None
 
-    return ok(data=svc.get_realized_profit_ledger(refresh=refresh, corporation_id=corporation_id))
+    ledger = svc.get_realized_profit_ledger(refresh=refresh, corporation_id=corporation_id, full_rebuild=full_rebuild)
+    list_query = parse_list_query(request.args)
+    if not list_query.is_default:
+        ledger["rows"], ledger["page"] = apply_list_query(ledger.get("rows") or [], list_query)
+    return ok(data=ledger)
+
+
+@corporations_bp.post("/corporations/realized_profit/rebuild")
+def corporations_realized_profit_rebuild_start():
+    require_ready(get_state())
+    payload = request.get_json(silent=True) or {}
+    refresh = bool(payload.get("refresh", False))
+    full_rebuild = bool(payload.get("full", False))
+    corporation_id_raw = payload.get("corporation_id")
+    try:
+        corporation_id = int(corporation_id_raw) if corporation_id_raw is not None else None
+        max_workers = int(payload.get("max_workers") or realized_profit_rebuild_workers())
+    except (ValueError, TypeError):
+        return error(message="corporation_id and max_workers must be integers.", status_code=400)
+    max_workers = max(1, min(max_workers, realized_profit_rebuild_workers()))
+    svc = CorporationsService(state=get_state())
+    return ok(
+        data=svc.start_realized_profit_rebuild(
+            refresh=refresh,
+            corporation_id=corporation_id,
+            full_rebuild=full_rebuild,
+            max_workers=max_workers,
+        ),
+        status_code=202,
+    )
+
+
+@corporations_bp.get("/corporations/realized_profit/rebuild/<job_id>")
+def corporations_realized_profit_rebuild_status(job_id: str):
+    require_ready(get_state())
+    if not job_id or not job_id.strip():
+        return error(message="job_id is required.", status_code=400)
+    svc = CorporationsService(state=get_state())
+    return ok(data=svc.realized_profit_rebuild_status(job_id=job_id))
@@ -3,15 +3,20 @@ from __future__ import annotations
 from flask import Blueprint, request
 
 from eve_online_industry_tracker.application.industry.portfolio_service import (
+    MILP_OBJECTIVES,
     IndustryPortfolioService,
     PortfolioCandidateDirective,
     PortfolioCandidateScope,
+    PortfolioMaterialLedger,
     PortfolioPlanRequest,
 )
 from eve_online_industry_tracker.application.industry.service import IndustryService
+from eve_online_industry_tracker.application.market_pricing.service import MarketPricingService
 from flask_app.bootstrap import require_ready, require_sde_ready
 from flask_app.deps import get_state
-from flask_app.http import error, ok
+from flask_app.http import error, ok, ok_cacheable
+from flask_app.pagination import apply_list_query, parse_list_query
+from flask_app.sse import job_progress_stream
 
 
 industry_bp = Blueprint("industry", __name__)
@@ -97,6 +102,10 @@ def _portfolio_plan_request_from_payload(payload: dict[str, object]) -> Portfoli
         min_owned_input_coverage_pct = float(payload.get("min_owned_input_coverage_pct") or 0.0)
     except Exception:
         min_owned_input_coverage_pct = 0.0
+    try:
+        solver_time_limit_seconds = float(payload.get("solver_time_limit_seconds") or 10.0)
+    except Exception:
+        solver_time_limit_seconds = 10.0
 
     return PortfolioPlanRequest(
         candidate_snapshot_id=str(payload.get("candidate_snapshot_id") or "").strip(),
@@ -107,6 +116,8 @@ def _portfolio_plan_request_from_payload(payload: dict[str, object]) -> Portfoli
         planning_horizon_hours=planning_horizon_hours,
         objective=str(payload.get("objective") or "balanced"),
         minimum_pricing_confidence=str(payload.get("minimum_pricing_confidence") or "low"),
+        solver=str(payload.get("solver") or "greedy").strip().lower() or "greedy",
+        solver_time_limit_seconds=solver_time_limit_seconds,
         candidate_directives=_candidate_directives_payload(payload.get("candidate_directives")),
         candidate_scope=PortfolioCandidateScope(
             categories=_string_list_payload(payload.get("candidate_categories")),
@@ -128,7 +139,7 @@ def structure_type_bonuses(type_id: int):
     require_ready(get_state())
     require_sde_ready(get_state())
     svc = IndustryService(state=get_state())
-    return ok(data=svc.structure_type_bonuses(type_id=type_id))
+    return ok_cacheable(data=svc.structure_type_bonuses(type_id=type_id))
 
 
 @industry_bp.get("/solar_systems")
@@ -136,7 +147,7 @@ def solar_systems():
     require_ready(get_state())
     require_sde_ready(get_state())
     svc = IndustryService(state=get_state())
-    return ok(data=svc.solar_systems())
+    return ok_cacheable(data=svc.solar_systems())
 
 
 @industry_bp.get("/npc_stations/<int:system_id>")
@@ -144,7 +155,7 @@ def npc_stations(system_id: int):
     require_ready(get_state())
     require_sde_ready(get_state())
     svc = IndustryService(state=get_state())
-    return ok(data=svc.npc_stations(system_id=system_id))
+    return ok_cacheable(data=svc.npc_stations(system_id=system_id))
 
 
 @industry_bp.get("/public_structures/<int:system_id>")
@@ -201,6 +212,18 @@ def industry_products(character_id: int):
     else:
         industry_profile_id = None
     owned_blueprints_scope = (request.args.get("owned_blueprints_scope") or "all_characters").strip() or "all_characters"
+    # Comma-separated hubs ("jita,amarr") or "all" to attach a per-hub price comparison to each row.
+    compare_hubs_raw = (request.args.get("compare_hubs") or "").strip().lower()
+    compare_hubs = (
+        MarketPricingService.normalize_market_hubs(None) if compare_hubs_raw == "all"
+        else [hub.strip() for hub in compare_hubs_raw.split(",") if hub.strip()]
+    )
+    unknown_hubs = [hub for hub in compare_hubs if hub not in MarketPricingService.known_market_hubs()]
+    if unknown_hubs:
+        return error(
+            message=f"Unknown compare_hubs {unknown_hubs}. Must be 'all' or any of: {MarketPricingService.known_market_hubs()}.",
+            status_code=400,
+        )
     svc = IndustryService(state=get_state())
     payload = svc.industry_manufacturing_product_overview_payload(
         force_refresh=refresh,
@@ -215,10 +238,12 @@ def industry_products(character_id: int):
         industry_profile_id=industry_profile_id,
         owned_blueprints_scope=owned_blueprints_scope,
         character_id=int(character_id),
+        compare_hubs=compare_hubs,
     )
+    rows, page = apply_list_query(payload.get("rows") or [], parse_list_query(request.args))
     return ok(
-        data=payload.get("rows") or [],
-        meta={"pricing_batch": payload.get("pricing_batch") or {}},
+        data=rows,
+        meta={"pricing_batch": payload.get("pricing_batch") or {}, "page": page},
     )
 
 
@@ -272,8 +297,36 @@ def industry_products_refresh_status(job_id: str):
     require_ready(get_state())
     if not job_id or not job_id.strip():
         return error(message="job_id is required.", status_code=400)
+    list_query = parse_list_query(request.args)
+    svc = IndustryService(state=get_state())
+    job = svc.industry_manufacturing_product_overview_refresh_status(job_id=job_id)
+    if not list_query.is_default and isinstance(job.get("result"), list):
+        job["result"], job["result_page"] = apply_list_query(job["result"], list_query)
+    return ok(data=job)
+
+
+@industry_bp.get("/industry_products/refresh/<job_id>/progress")
+def industry_products_refresh_progress(job_id: str):
+    """Job status without ``result``; cheap enough to poll while a refresh runs."""
+    require_ready(get_state())
     svc = IndustryService(state=get_state())
-    return ok(data=svc.industry_manufacturing_product_overview_refresh_status(job_id=job_id))
+    return ok(data=svc.industry_manufacturing_product_overview_refresh_progress(job_id=job_id))
+
+
+@industry_bp.get("/industry_products/refresh/<job_id>/events")
+def industry_products_refresh_events(job_id: str):
+    require_ready(get_state())
+    state = get_state()
+    svc = IndustryService(state=state)
+    return job_progress_stream(
+        lambda after_revision, wait_seconds: svc.industry_manufacturing_product_overview_refresh_progress(
+            job_id=job_id,
+            after_revision=after_revision,
+            wait_seconds=wait_seconds,
+        ),
+        last_event_id=request.headers.get("Last-Event-ID"),
+        shutdown_event=getattr(state, "shutdown_event", None),
+    )
 
 
 @industry_bp.post("/industry_products/<int:character_id>/portfolio_candidates/start")
@@ -334,6 +387,30 @@ def industry_portfolio_candidates_status(job_id: str):
     return ok(data=svc.industry_manufacturing_portfolio_candidates_refresh_status(job_id=job_id))
 
 
+@industry_bp.get("/industry_products/portfolio_candidates/<job_id>/progress")
+def industry_portfolio_candidates_progress(job_id: str):
+    """Job status without ``result``; cheap enough to poll while candidates build."""
+    require_ready(get_state())
+    svc = IndustryService(state=get_state())
+    return ok(data=svc.industry_manufacturing_portfolio_candidates_refresh_progress(job_id=job_id))
+
+
+@industry_bp.get("/industry_products/portfolio_candidates/<job_id>/events")
+def industry_portfolio_candidates_events(job_id: str):
+    require_ready(get_state())
+    state = get_state()
+    svc = IndustryService(state=state)
+    return job_progress_stream(
+        lambda after_revision, wait_seconds: svc.industry_manufacturing_portfolio_candidates_refresh_progress(
+            job_id=job_id,
+            after_revision=after_revision,
+            wait_seconds=wait_seconds,
+        ),
+        last_event_id=request.headers.get("Last-Event-ID"),
+        shutdown_event=getattr(state, "shutdown_event", None),
+    )
+
+
 @industry_bp.get("/industry_products/<int:character_id>/portfolio_candidates")
 def industry_portfolio_candidates(character_id: int):
     require_ready(get_state())
@@ -393,6 +470,7 @@ def industry_portfolio_candidates(character_id: int):
 
 _VALID_OBJECTIVES = {"balanced", "max_isk_per_hour"}
 _VALID_PRICING_CONFIDENCES = {"low", "medium", "high"}
+_VALID_PORTFOLIO_SOLVERS = {"greedy", "milp"}
 
 
 @industry_bp.post("/industry_products/<int:character_id>/portfolio_plan")
@@ -414,6 +492,18 @@ def industry_portfolio_plan(character_id: int):
             status_code=400,
         )
 
+    raw_solver = str(payload.get("solver") or "").strip().lower()
+    if raw_solver and raw_solver not in _VALID_PORTFOLIO_SOLVERS:
+        return error(
+            message=f"Invalid solver '{raw_solver}'. Must be one of: {sorted(_VALID_PORTFOLIO_SOLVERS)}.",
+            status_code=400,
+        )
+    if raw_solver == "milp" and (raw_objective or "balanced") not in MILP_OBJECTIVES:
+        return error(
+            message=f"Solver 'milp' does not support objective '{raw_objective}'. Supported: {sorted(MILP_OBJECTIVES)}.",
+            status_code=400,
+        )
+
     plan_request = _portfolio_plan_request_from_payload(payload)
 
     svc = IndustryService(state=get_state())
@@ -477,12 +567,14 @@ def industry_portfolio_plan(character_id: int):
             "candidates": list(candidate_payload.get("candidates") or []),
             "summary": candidate_payload.get("summary") or {},
             "pricing_batch": candidate_payload.get("pricing_batch") or {},
+            "material_ledger": candidate_payload.get("material_ledger"),
         }
 
     planner = IndustryPortfolioService()
     plan = planner.optimize_manufacturing_portfolio(
         candidates=list(candidate_snapshot.get("candidates") or []),
         plan_request=plan_request,
+        material_ledger=PortfolioMaterialLedger.from_payload(candidate_snapshot.get("material_ledger")),
     )
     return ok(
         data={
@@ -523,7 +615,7 @@ def industry_structure_rigs():
     require_ready(get_state())
     require_sde_ready(get_state())
     svc = IndustryService(state=get_state())
-    return ok(data=svc.structure_rigs())
+    return ok_cacheable(data=svc.structure_rigs())
 
 
 @industry_bp.post("/industry_profiles")
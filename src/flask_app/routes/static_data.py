@@ -7,6 +7,7 @@ from eve_online_industry_tracker.application.static_data.service import StaticDa
 from flask_app.bootstrap import require_ready, require_sde_ready
 from flask_app.deps import get_state
 from flask_app.http import ok
+from flask_app.settings import ore_batch_workers
 
 
 static_data_bp = Blueprint("static_data", __name__)
@@ -39,6 +40,21 @@ def optimize():
     return ok(data=result)
 
 
+@static_data_bp.post("/optimize/batch")
+def optimize_batch():
+    """Optimise ore buys for many demand sets (e.g. a week's build queue) in one request."""
+    require_ready(get_state())
+    payload = request.get_json(silent=True) or {}
+    required = ("demand_sets", "character_id", "facility_id")
+    missing = [k for k in required if k not in payload]
+    if missing:
+        raise ServiceError(f"Missing field(s): {', '.join(missing)}", status_code=400)
+
+    svc = StaticDataService(state=get_state())
+    result = svc.optimize_ore_batch(payload, max_workers=ore_batch_workers())
+    return ok(data=result)
+
+
 @static_data_bp.get("/materials")
 def materials():
     require_ready(get_state())
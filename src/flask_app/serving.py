@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import logging
+from typing import Any, Callable
+
+from flask import Flask
+
+from flask_app.settings import flask_debug, flask_host, flask_port, flask_server, flask_server_threads
+
+
+SUPPORTED_SERVERS = ("werkzeug", "waitress", "gunicorn")
+
+
+def _serve_werkzeug(app: Flask, *, host: str, port: int) -> None:
+    # Avoid Werkzeug reloader to prevent double-starting.
+    app.run(host=host, port=port, debug=flask_debug(), use_reloader=False, threaded=True)
+
+
+def _serve_waitress(app: Flask, *, host: str, port: int, threads: int) -> None:
+    try:
+        from waitress import serve  # pyright: ignore[reportMissingImports]
+    except ImportError as e:
+        raise RuntimeError("FLASK_SERVER=waitress requires the 'waitress' package (pip install waitress).") from e
+
+    serve(
+        app,
+        host=host,
+        port=port,
+        threads=threads,
+        # Long synchronous endpoints (industry overview, portfolio plan) can take minutes.
+        channel_timeout=600,
+        ident="eve-online-industry-tracker",
+    )
+
+
+def _serve_gunicorn(
+    app: Flask, *, host: str, port: int, threads: int, initialize: Callable[[], None] | None
+) -> None:
+    try:
+        from gunicorn.app.base import BaseApplication  # pyright: ignore[reportMissingImports]
+    except ImportError as e:
+        raise RuntimeError("FLASK_SERVER=gunicorn requires the 'gunicorn' package (Linux/macOS only).") from e
+
+    class _Application(BaseApplication):
+        def __init__(self, wsgi_app: Flask, options: dict[str, Any]):
+            self._wsgi_app = wsgi_app
+            self._options = options
+            super().__init__()
+
+        def load_config(self) -> None:
+            for key, value in self._options.items():
+                self.cfg.set(key, value)
+
+        def load(self) -> Flask:
+            return self._wsgi_app
+
+    def _post_worker_init(_worker: Any) -> None:
+        # Threads do not survive fork(), so initialization must start in the worker.
+        if initialize is not None:
+            initialize()
+
+    # Exactly one worker process: background jobs, job stores and caches live in the
+    # in-process AppState, so extra workers would each see a different state.
+    _Application(
+        app,
+        {
+            "bind": f"{host}:{port}",
+            "workers": 1,
+            "worker_class": "gthread",
+            "threads": threads,
+            "timeout": 600,
+            "graceful_timeout": 10,
+            "post_worker_init": _post_worker_init,
+        },
+    ).run()
+
+
+def serve_app(app: Flask, *, server: str | None = None, initialize: Callable[[], None] | None = None) -> None:
+    """Serve the Flask app with the WSGI server selected by ``FLASK_SERVER``.
+
+    ``initialize`` (typically ``start_background_initialization``) is called in the
+    process that serves requests: here for werkzeug/waitress, in the forked worker for
+    gunicorn, whose master process must not start threads or take locks first.
+    """
+    server_name = str(server or flask_server() or "werkzeug").strip().lower()
+    host = flask_host()
+    port = flask_port()
+    threads = flask_server_threads()
+
+    if server_name not in SUPPORTED_SERVERS:
+        logging.warning("Unknown FLASK_SERVER %r; falling back to werkzeug.", server_name)
+        server_name = "werkzeug"
+
+    logging.info("Serving Flask API with %s on %s:%s (threads=%s)", server_name, host, port, threads)
+    if server_name == "gunicorn":
+        _serve_gunicorn(app, host=host, port=port, threads=threads, initialize=initialize)
+        return
+    if initialize is not None:
+        initialize()
+    if server_name == "waitress":
+        _serve_waitress(app, host=host, port=port, threads=threads)
+    else:
+        _serve_werkzeug(app, host=host, port=port)
@@ -28,6 +28,16 @@ class FlaskSettings:
     flask_host: str
     flask_port: int
     flask_debug: bool
+    flask_server: str
+    flask_server_threads: int
+    response_compression: bool
+    sse_max_streams: int
+    job_queue_workers: int
+    job_result_ttl_seconds: int
+    sde_reload_check_seconds: int
+    ore_batch_workers: int
+    realized_profit_rebuild_workers: int
+    market_price_warmer_enabled: bool
     refresh_metadata_on_startup: bool
     health_poll_timeout_seconds: int
     health_request_timeout_seconds: int
@@ -40,6 +50,8 @@ class FlaskSettings:
     public_structures_startup_scan_batch_size: int
     public_structures_startup_scan_pause_seconds: int
     public_structures_esi_request_timeout_seconds: int
+    public_structures_recheck_hours: int
+    public_structures_denied_backoff_hours: int
 
 
 @lru_cache(maxsize=1)
@@ -48,6 +60,16 @@ def get_settings() -> FlaskSettings:
         flask_host=os.getenv("FLASK_HOST", "localhost"),
         flask_port=int(os.getenv("FLASK_PORT", "5000")),
         flask_debug=_bool("FLASK_DEBUG", default=False),
+        flask_server=_env("FLASK_SERVER", "werkzeug").strip().lower(),
+        flask_server_threads=_int("FLASK_SERVER_THREADS", default=16),
+        response_compression=_bool("FLASK_RESPONSE_COMPRESSION", default=True),
+        sse_max_streams=_int("FLASK_SSE_MAX_STREAMS", default=4),
+        job_queue_workers=_int("FLASK_JOB_QUEUE_WORKERS", default=2),
+        job_result_ttl_seconds=_int("FLASK_JOB_RESULT_TTL", default=21600),
+        sde_reload_check_seconds=_int("FLASK_SDE_RELOAD_CHECK_SECONDS", default=30),
+        ore_batch_workers=_int("FLASK_ORE_BATCH_WORKERS", default=min(4, os.cpu_count() or 1)),
+        realized_profit_rebuild_workers=_int("FLASK_REALIZED_PROFIT_REBUILD_WORKERS", default=4),
+        market_price_warmer_enabled=_bool("FLASK_PRICE_WARMER", default=True),
         refresh_metadata_on_startup=_bool("FLASK_REFRESH_METADATA", default=True),
         health_poll_timeout_seconds=_int("FLASK_HEALTH_POLL_TIMEOUT", default=300),
         health_request_timeout_seconds=_int("FLASK_HEALTH_REQUEST_TIMEOUT", default=2),
@@ -62,6 +84,8 @@ def get_settings() -> FlaskSettings:
         public_structures_startup_scan_batch_size=_int("FLASK_PUBLIC_STRUCTURES_STARTUP_SCAN_BATCH_SIZE", default=100),
         public_structures_startup_scan_pause_seconds=_int("FLASK_PUBLIC_STRUCTURES_STARTUP_SCAN_PAUSE", default=5),
         public_structures_esi_request_timeout_seconds=_int("FLASK_PUBLIC_STRUCTURES_ESI_TIMEOUT", default=15),
+        public_structures_recheck_hours=_int("FLASK_PUBLIC_STRUCTURES_RECHECK_HOURS", default=168),
+        public_structures_denied_backoff_hours=_int("FLASK_PUBLIC_STRUCTURES_DENIED_BACKOFF_HOURS", default=24),
     )
 
 
@@ -77,6 +101,58 @@ def flask_debug() -> bool:
     return get_settings().flask_debug
 
 
+def flask_server() -> str:
+    # "werkzeug" (development server), "waitress" or "gunicorn" (Linux/macOS only).
+    return get_settings().flask_server
+
+
+def flask_server_threads() -> int:
+    # Request-handling threads for the production servers.
+    return max(1, get_settings().flask_server_threads)
+
+
+def response_compression() -> bool:
+    # gzip/br compression of JSON responses; disable when a reverse proxy already compresses.
+    return get_settings().response_compression
+
+
+def sse_max_streams() -> int:
+    # Concurrent job-progress streams; each holds a request thread, so keep well below the pool size.
+    return max(1, get_settings().sse_max_streams)
+
+
+def job_queue_workers() -> int:
+    # Worker threads for queued background refreshes; heavy industry refreshes still run one at a time.
+    return max(1, get_settings().job_queue_workers)
+
+
+def job_result_ttl_seconds() -> int:
+    # How long finished background job results stay retrievable (kept in db_app).
+    return max(60, get_settings().job_result_ttl_seconds)
+
+
+def sde_reload_check_seconds() -> int:
+    # How often to look for an SDE swapped in by scripts/import_sde.py; 0 disables live reloads.
+    return max(0, get_settings().sde_reload_check_seconds)
+
+
+def ore_batch_workers() -> int:
+    # Worker processes for independent solves in /optimize/batch; 1 solves in-process.
+    return max(1, get_settings().ore_batch_workers)
+
+
+def realized_profit_rebuild_workers() -> int:
+    # Upper bound on per-owner worker threads in a realized-profit rebuild job; a request's
+    # max_workers is clamped to this.
+    return max(1, get_settings().realized_profit_rebuild_workers)
+
+
+def market_price_warmer_enabled() -> bool:
+    # Keep hub prices for blueprints, assets and open orders warm in the background.
+    # Pacing is configured on the admin page ("Price Warmer").
+    return get_settings().market_price_warmer_enabled
+
+
 def refresh_metadata_on_startup() -> bool:
     # Keeping existing behavior (True) unless explicitly disabled.
     return get_settings().refresh_metadata_on_startup
@@ -133,5 +209,15 @@ def public_structures_esi_request_timeout_seconds() -> int:
     return get_settings().public_structures_esi_request_timeout_seconds
 
 
+def public_structures_recheck_hours() -> int:
+    # How long the global scan waits before revisiting a structure it could read.
+    return get_settings().public_structures_recheck_hours
+
+
+def public_structures_denied_backoff_hours() -> int:
+    # First wait after a 403/404; doubles with each repeat denial (capped at 30 days).
+    return get_settings().public_structures_denied_backoff_hours
+
+
 def api_base() -> str:
     return f"http://{flask_host()}:{flask_port()}"
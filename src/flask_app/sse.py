@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from typing import Any, Callable, Iterator
+
+from flask import Response, stream_with_context
+
+from eve_online_industry_tracker.application.errors import ServiceError
+from flask_app.settings import sse_max_streams
+
+
+TERMINAL_JOB_STATUSES = frozenset({"completed", "failed"})
+
+# Comment frames keep proxies and the browser from timing out an idle stream.
+HEARTBEAT_SECONDS = 15.0
+# Each open stream holds a server request thread, so streams are short and bounded in
+# number (sse_max_streams()); EventSource clients reconnect with Last-Event-ID after
+# RECONNECT_MILLISECONDS. Clients over the limit get one snapshot per reconnect instead.
+MAX_STREAM_SECONDS = 300.0
+RECONNECT_MILLISECONDS = 3000
+
+_active_streams = 0
+_active_streams_lock = threading.Lock()
+
+
+def _acquire_stream_slot() -> bool:
+    global _active_streams
+    with _active_streams_lock:
+        if _active_streams >= sse_max_streams():
+            return False
+        _active_streams += 1
+        return True
+
+
+def _release_stream_slot() -> None:
+    global _active_streams
+    with _active_streams_lock:
+        _active_streams = max(0, _active_streams - 1)
+
+
+def sse_event(data: Any, *, event: str | None = None, event_id: Any = None) -> str:
+    lines: list[str] = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event:
+        lines.append(f"event: {event}")
+    for line in json.dumps(data, default=str, separators=(",", ":")).splitlines() or [""]:
+        lines.append(f"data: {line}")
+    return "\n".join(lines) + "\n\n"
+
+
+def _job_progress_events(
+    wait_for_progress: Callable[[int, float], dict[str, Any]],
+    *,
+    last_revision: int,
+    shutdown_event: threading.Event | None,
+) -> Iterator[str]:
+    yield f"retry: {RECONNECT_MILLISECONDS}\n\n"
+    # Claimed on first iteration and released in ``finally``, which also runs when the
+    # server closes the generator after a client disconnect.
+    streaming = _acquire_stream_slot()
+    try:
+        deadline = time.monotonic() + MAX_STREAM_SECONDS
+        revision = int(last_revision)
+        while True:
+            if shutdown_event is not None and shutdown_event.is_set():
+                return
+            try:
+                job = wait_for_progress(revision, HEARTBEAT_SECONDS if streaming else 0.0)
+            except ServiceError as e:
+                yield sse_event({"message": e.message, "status_code": e.status_code}, event="error")
+                return
+
+            job_revision = int(job.get("revision") or 0)
+            is_terminal = str(job.get("status") or "").strip().lower() in TERMINAL_JOB_STATUSES
+            if job_revision > revision or is_terminal:
+                revision = job_revision
+                yield sse_event(job, event="done" if is_terminal else "progress", event_id=revision)
+            elif streaming:
+                yield ": keep-alive\n\n"
+            if is_terminal or not streaming or time.monotonic() >= deadline:
+                return
+    finally:
+        if streaming:
+            _release_stream_slot()
+
+
+def job_progress_stream(
+    wait_for_progress: Callable[[int, float], dict[str, Any]],
+    *,
+    last_event_id: str | None = None,
+    shutdown_event: threading.Event | None = None,
+) -> Response:
+    """Server-Sent Events response that pushes job progress until the job finishes.
+
+    ``wait_for_progress(after_revision, timeout_seconds)`` must block until the job's
+    revision passes ``after_revision`` (or time out) and return the job without ``result``.
+    Emits ``progress`` events, a final ``done`` event, or ``error`` for unknown jobs. The
+    stream closes on the terminal event or after ``MAX_STREAM_SECONDS``; past
+    ``sse_max_streams()`` open streams a request gets one snapshot and reconnects later.
+    """
+    try:
+        last_revision = int(str(last_event_id or "").strip() or -1)
+    except ValueError:
+        last_revision = -1
+
+    return Response(
+        stream_with_context(
+            _job_progress_events(wait_for_progress, last_revision=last_revision, shutdown_event=shutdown_event)
+        ),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
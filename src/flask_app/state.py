@@ -19,7 +19,10 @@ class RuntimeState:
     corp_manager: Any = None
     esi_service: Any = None
     industry_job_manager: Any = None
+    market_price_warmer: Any = None
     admin_settings: Any = None
+    job_queue: Any = None
+    sde_reloader: Any = None
 
 
 @dataclass
@@ -57,6 +60,8 @@ class PublicStructuresJobState:
     global_scan_cursor: Optional[int] = None
     global_scan_attempted: int = 0
     global_scan_rows_written: int = 0
+    global_scan_skipped: int = 0
+    global_scan_workers: Optional[int] = None
 
     # Stop just the scan (without shutting down the whole app)
     global_scan_stop_event: threading.Event = field(default_factory=threading.Event)
@@ -66,12 +71,31 @@ class PublicStructuresJobState:
 class IndustryOverviewRefreshJobState:
     lock: threading.Lock = field(default_factory=threading.Lock)
     jobs: dict[str, dict[str, Any]] = field(default_factory=dict)
+    # Shares ``lock``; notified whenever a job changes so progress streams can wait instead of poll.
+    changed: threading.Condition = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.changed = threading.Condition(self.lock)
 
 
 @dataclass
 class IndustryPortfolioCandidatesJobState:
     lock: threading.Lock = field(default_factory=threading.Lock)
     jobs: dict[str, dict[str, Any]] = field(default_factory=dict)
+    changed: threading.Condition = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.changed = threading.Condition(self.lock)
+
+
+@dataclass
+class RealizedProfitRebuildJobState:
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    jobs: dict[str, dict[str, Any]] = field(default_factory=dict)
+    changed: threading.Condition = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.changed = threading.Condition(self.lock)
 
 
 @dataclass
@@ -79,6 +103,7 @@ class JobsState:
     public_structures: PublicStructuresJobState = field(default_factory=PublicStructuresJobState)
     industry_overview_refresh: IndustryOverviewRefreshJobState = field(default_factory=IndustryOverviewRefreshJobState)
     industry_portfolio_candidates: IndustryPortfolioCandidatesJobState = field(default_factory=IndustryPortfolioCandidatesJobState)
+    realized_profit_rebuild: RealizedProfitRebuildJobState = field(default_factory=RealizedProfitRebuildJobState)
 
 
 @dataclass
@@ -165,6 +190,14 @@ class AppState:
     def industry_job_manager(self, v: Any) -> None:
         self.runtime.industry_job_manager = v
 
+    @property
+    def market_price_warmer(self) -> Any:
+        return self.runtime.market_price_warmer
+
+    @market_price_warmer.setter
+    def market_price_warmer(self, v: Any) -> None:
+        self.runtime.market_price_warmer = v
+
     @property
     def admin_settings(self) -> Any:
         return self.runtime.admin_settings
@@ -173,6 +206,22 @@ class AppState:
     def admin_settings(self, v: Any) -> None:
         self.runtime.admin_settings = v
 
+    @property
+    def job_queue(self) -> Any:
+        return self.runtime.job_queue
+
+    @job_queue.setter
+    def job_queue(self, v: Any) -> None:
+        self.runtime.job_queue = v
+
+    @property
+    def sde_reloader(self) -> Any:
+        return self.runtime.sde_reloader
+
+    @sde_reloader.setter
+    def sde_reloader(self, v: Any) -> None:
+        self.runtime.sde_reloader = v
+
     @property
     def materials_cache(self) -> Any:
         return self.caches.materials_cache
@@ -334,6 +383,22 @@ class AppState:
     def public_structures_global_scan_rows_written(self, v: int) -> None:
         self.jobs.public_structures.global_scan_rows_written = v
 
+    @property
+    def public_structures_global_scan_skipped(self) -> int:
+        return self.jobs.public_structures.global_scan_skipped
+
+    @public_structures_global_scan_skipped.setter
+    def public_structures_global_scan_skipped(self, v: int) -> None:
+        self.jobs.public_structures.global_scan_skipped = v
+
+    @property
+    def public_structures_global_scan_workers(self) -> Optional[int]:
+        return self.jobs.public_structures.global_scan_workers
+
+    @public_structures_global_scan_workers.setter
+    def public_structures_global_scan_workers(self, v: Optional[int]) -> None:
+        self.jobs.public_structures.global_scan_workers = v
+
     @property
     def public_structures_global_scan_stop_event(self) -> threading.Event:
         return self.jobs.public_structures.global_scan_stop_event
@@ -1,12 +1,50 @@
+from collections import OrderedDict
+import copy
+from dataclasses import dataclass
 import logging
+import threading
+import time
 
 import requests  # pyright: ignore[reportMissingModuleSource]
 from requests import Response
+from requests.adapters import HTTPAdapter  # pyright: ignore[reportMissingModuleSource]
 from requests import exceptions as requests_exceptions
 
 from flask_app.settings import api_base, api_request_timeout_seconds
 
 
+# Default freshness for cached GETs when the API does not send Cache-Control: max-age.
+DEFAULT_CACHE_TTL_SECONDS = 300
+_CACHE_MAX_ENTRIES = 512
+
+_session_lock = threading.Lock()
+_session = None
+
+
+@dataclass
+class _CachedResponse:
+    payload: dict
+    etag: str | None
+    expires_at: float
+
+
+_cache_lock = threading.Lock()
+_cache: "OrderedDict[str, _CachedResponse]" = OrderedDict()
+
+
+def _http_session() -> requests.Session:
+    """Process-wide pooled session shared by all Streamlit sessions (keep-alive to the API)."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+        return _session
+
+
 def _handle_failure(path: str, response: Response) -> None:
     logging.error("%s failed with %s: %s", path, response.status_code, response.text)
 
@@ -15,17 +53,14 @@ def _request(method, path, *, payload=None, timeout_seconds=None):
     timeout = api_request_timeout_seconds() if timeout_seconds is None else timeout_seconds
     url = f"{api_base()}{path}"
 
+    if method not in {"GET", "POST", "PUT", "DELETE"}:
+        raise ValueError(f"Unsupported HTTP method: {method}")
+
     try:
-        if method == "GET":
-            response = requests.get(url, timeout=timeout)
-        elif method == "POST":
-            response = requests.post(url, json=payload, timeout=timeout)
-        elif method == "PUT":
-            response = requests.put(url, json=payload, timeout=timeout)
-        elif method == "DELETE":
-            response = requests.delete(url, timeout=timeout)
+        if method in {"POST", "PUT"}:
+            response = _http_session().request(method, url, json=payload, timeout=timeout)
         else:
-            raise ValueError(f"Unsupported HTTP method: {method}")
+            response = _http_session().request(method, url, timeout=timeout)
     except requests_exceptions.RequestException as exc:
         logging.error("%s request failed: %s", path, exc)
         return None
@@ -41,12 +76,98 @@ def _request(method, path, *, payload=None, timeout_seconds=None):
         return None
 
 
+def list_query_params(*, fields=None, sort=None, offset=None, limit=None):
+    """Query-string fragment for the API's projection/pagination parameters (no leading '?' or '&')."""
+    parts = []
+    if fields:
+        parts.append("fields=" + ",".join(str(field) for field in fields))
+    if sort:
+        parts.append("sort=" + ",".join(str(key) for key in sort))
+    if offset:
+        parts.append(f"offset={int(offset)}")
+    if limit is not None:
+        parts.append(f"limit={int(limit)}")
+    return "&".join(parts)
+
+
 def api_post(path, payload):
     return _request("POST", path, payload=payload)
 
 
-def cached_api_get(path, timeout_seconds=None):
-    return api_get(path, timeout_seconds=timeout_seconds)
+def _max_age_seconds(response: Response) -> int | None:
+    for directive in (response.headers.get("Cache-Control") or "").split(","):
+        name, _, value = directive.strip().partition("=")
+        if name.lower() == "max-age":
+            try:
+                return max(0, int(value))
+            except ValueError:
+                return None
+    return None
+
+
+def _store_cached(path, payload, *, etag, ttl_seconds):
+    with _cache_lock:
+        _cache[path] = _CachedResponse(payload=payload, etag=etag, expires_at=time.monotonic() + ttl_seconds)
+        _cache.move_to_end(path)
+        while len(_cache) > _CACHE_MAX_ENTRIES:
+            _cache.popitem(last=False)
+
+
+def cached_api_get(path, timeout_seconds=None, ttl_seconds=None):
+    """GET with a process-wide TTL cache that revalidates expired entries via ETag.
+
+    Fresh entries are served without a request; expired ones send ``If-None-Match`` and
+    reuse the cached body on ``304``. The API's ``Cache-Control: max-age`` takes precedence
+    over ``ttl_seconds``. Only successful JSON payloads are cached, and callers get a copy
+    so mutating the result does not affect other Streamlit sessions.
+    """
+    default_ttl = DEFAULT_CACHE_TTL_SECONDS if ttl_seconds is None else max(0, int(ttl_seconds))
+    now = time.monotonic()
+    with _cache_lock:
+        entry = _cache.get(path)
+        if entry is not None:
+            _cache.move_to_end(path)
+            if entry.expires_at > now:
+                return copy.deepcopy(entry.payload)
+
+    headers = {"If-None-Match": entry.etag} if entry is not None and entry.etag else {}
+    timeout = api_request_timeout_seconds() if timeout_seconds is None else timeout_seconds
+    try:
+        response = _http_session().get(f"{api_base()}{path}", headers=headers, timeout=timeout)
+    except requests_exceptions.RequestException as exc:
+        logging.error("%s request failed: %s", path, exc)
+        return None
+
+    max_age = _max_age_seconds(response)
+    ttl = default_ttl if max_age is None else max_age
+    if response.status_code == 304 and entry is not None:
+        _store_cached(path, entry.payload, etag=entry.etag, ttl_seconds=ttl)
+        return copy.deepcopy(entry.payload)
+
+    if not (200 <= response.status_code < 300):
+        _handle_failure(path, response)
+        return None
+
+    try:
+        payload = response.json()
+    except ValueError:
+        logging.error("%s returned invalid JSON", path)
+        return None
+
+    if not (isinstance(payload, dict) and payload.get("status") == "success"):
+        return payload
+    _store_cached(path, payload, etag=response.headers.get("ETag"), ttl_seconds=ttl)
+    return copy.deepcopy(payload)
+
+
+def clear_api_cache(path_prefix=None):
+    """Drop cached GET responses, optionally only those whose path starts with ``path_prefix``."""
+    with _cache_lock:
+        if path_prefix is None:
+            _cache.clear()
+            return
+        for path in [path for path in _cache if path.startswith(path_prefix)]:
+            _cache.pop(path, None)
 
 
 def api_get(path, timeout_seconds=None):
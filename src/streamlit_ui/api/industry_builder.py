@@ -133,24 +133,38 @@ def start_portfolio_candidates_refresh(
     return data if isinstance(data, dict) else {}
 
 
-def fetch_product_overview_refresh_status(job_id: str) -> dict[str, Any]:
-    response = api_get(f"/industry_products/refresh/{job_id}", timeout_seconds=30) or {}
+def _fetch_job_status(status_path: str, *, error_message: str) -> dict[str, Any]:
+    # Poll the lightweight progress view; only download the result once the job completed.
+    response = api_get(f"{status_path}/progress", timeout_seconds=30) or {}
     if response.get("status") != "success":
-        raise RuntimeError(response.get("message") or "Failed to load industry product overview refresh status")
+        raise RuntimeError(response.get("message") or error_message)
 
     data = response.get("data") or {}
-    return data if isinstance(data, dict) else {}
-
+    if not isinstance(data, dict) or str(data.get("status") or "") != "completed":
+        return data if isinstance(data, dict) else {}
 
-def fetch_portfolio_candidates_refresh_status(job_id: str) -> dict[str, Any]:
-    response = api_get(f"/industry_products/portfolio_candidates/{job_id}", timeout_seconds=30) or {}
+    response = api_get(status_path, timeout_seconds=60) or {}
     if response.get("status") != "success":
-        raise RuntimeError(response.get("message") or "Failed to load industry portfolio candidate status")
+        raise RuntimeError(response.get("message") or error_message)
 
     data = response.get("data") or {}
     return data if isinstance(data, dict) else {}
 
 
+def fetch_product_overview_refresh_status(job_id: str) -> dict[str, Any]:
+    return _fetch_job_status(
+        f"/industry_products/refresh/{job_id}",
+        error_message="Failed to load industry product overview refresh status",
+    )
+
+
+def fetch_portfolio_candidates_refresh_status(job_id: str) -> dict[str, Any]:
+    return _fetch_job_status(
+        f"/industry_products/portfolio_candidates/{job_id}",
+        error_message="Failed to load industry portfolio candidate status",
+    )
+
+
 @st.cache_data(ttl=60, show_spinner=False)
 def fetch_portfolio_candidates(
     *,
@@ -1,10 +1,5 @@
 from __future__ import annotations
 
-import streamlit as st
-
-from streamlit_ui.api.client import api_get
-
-
-@st.cache_data(ttl=300)
-def cached_api_get(path: str, timeout_seconds: float | None = None):
-    return api_get(path, timeout_seconds=timeout_seconds)
\ No newline at end of file
+# Kept as the import path used by pages; the cache itself lives in the plain client so it
+# is shared by every Streamlit session in the process and revalidates via ETag.
+from streamlit_ui.api.client import cached_api_get, clear_api_cache  # noqa: F401
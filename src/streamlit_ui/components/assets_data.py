@@ -28,6 +28,40 @@ ASSET_ISK_COLUMNS = [
     "total_average_price",
 ]
 
+# Raw asset fields the asset tabs and ship cards read; used to project API responses.
+ASSET_VIEW_FIELDS = [
+    "character_id",
+    "corporation_id",
+    "item_id",
+    "type_id",
+    "type_name",
+    "quantity",
+    "location_id",
+    "location_type",
+    "location_flag",
+    "top_location_id",
+    "is_container",
+    "is_ship",
+    "is_asset_safety_wrap",
+    "is_office_folder",
+    "is_blueprint_copy",
+    "is_singleton",
+    "container_name",
+    "ship_name",
+    "type_volume",
+    "type_capacity",
+    "type_average_price",
+    "type_group_id",
+    "type_group_name",
+    "type_category_name",
+    "type_faction_id",
+    "type_meta_group_id",
+    "acquisition_source",
+    "acquisition_unit_cost",
+    "acquisition_total_cost",
+    "acquisition_date",
+]
+
 ASSET_INT_COLUMNS = ["quantity"]
 ASSET_FLOAT_COLUMNS = ["type_volume", "total_volume"]
 
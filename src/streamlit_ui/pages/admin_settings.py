@@ -6,7 +6,7 @@ from __future__ import annotations
 
 import streamlit as st
 
-from streamlit_ui.api.client import api_get, api_put, api_post
+from streamlit_ui.api.client import api_get, api_put, api_post, clear_api_cache
 
 
 def _load_settings() -> tuple[dict, dict] | None:
@@ -96,6 +96,8 @@ def render() -> None:
             resp = api_put("/admin_settings", pending)
             if resp and resp.get("status") == "success":
                 st.success("Settings saved.")
+                # Cached GET responses may reflect the previous settings.
+                clear_api_cache()
                 st.rerun()
             else:
                 st.error("Failed to save settings.")
@@ -105,6 +107,7 @@ def render() -> None:
             resp = api_post("/admin_settings/reset", {})
             if resp and resp.get("status") == "success":
                 st.success("Settings reset to defaults.")
+                clear_api_cache()
                 st.rerun()
             else:
                 st.error("Failed to reset settings.")
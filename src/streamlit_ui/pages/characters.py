@@ -7,13 +7,14 @@ from streamlit_ui.components.assets_ui import (
     ASSET_FLOAT_COLUMNS,
     ASSET_INT_COLUMNS,
     ASSET_ISK_COLUMNS,
+    ASSET_VIEW_FIELDS,
     build_asset_display_frame,
     apply_location_names,
     render_ship_cards,
     summarize_asset_items,
 )
 from streamlit_ui.api.characters import build_character_options, fetch_characters
-from streamlit_ui.api.client import api_get, api_post
+from streamlit_ui.api.client import api_get, api_post, list_query_params
 from streamlit_ui.components.aggrid_formatters import js_category_text_style, js_icon_cell_renderer
 from streamlit_ui.components.formatters import format_isk, format_date, format_date_into_age, type_icon_url
 from streamlit_ui.state.session_state import ensure_state_defaults, ensure_valid_state_value
@@ -181,7 +182,10 @@ def _render_asset_summary(df: pd.DataFrame) -> None:
 
 
 def _fetch_current_character_assets(character_id: int) -> list[dict]:
-    response = api_get(f"/characters/assets?character_id={int(character_id)}", timeout_seconds=180) or {}
+    response = api_get(
+        f"/characters/assets?character_id={int(character_id)}&{list_query_params(fields=ASSET_VIEW_FIELDS)}",
+        timeout_seconds=180,
+    ) or {}
     if response.get("status") != "success":
         raise RuntimeError(response.get("message") or "Failed to refresh character assets")
 
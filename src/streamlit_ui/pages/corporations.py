@@ -7,12 +7,13 @@ from streamlit_ui.components.assets_ui import (
     ASSET_FLOAT_COLUMNS,
     ASSET_INT_COLUMNS,
     ASSET_ISK_COLUMNS,
+    ASSET_VIEW_FIELDS,
     apply_location_names,
     build_asset_display_frame,
     render_ship_cards,
     summarize_asset_items,
 )
-from streamlit_ui.api.client import api_get
+from streamlit_ui.api.client import api_get, list_query_params
 from streamlit_ui.components.formatters import format_datetime, format_date_countdown, format_isk, format_date_into_age, type_icon_url
 from streamlit_ui.state.session_state import ensure_state_defaults, ensure_valid_state_value
 from streamlit_ui.api.streamlit_client import cached_api_get
@@ -199,7 +200,10 @@ def _render_asset_dataframe(df: pd.DataFrame, *, height: int, prefer_container_n
 
 
 def _fetch_current_corporation_assets(corporation_id: int) -> list[dict]:
-    response = api_get(f"/corporations/assets?corporation_id={int(corporation_id)}", timeout_seconds=180) or {}
+    response = api_get(
+        f"/corporations/assets?corporation_id={int(corporation_id)}&{list_query_params(fields=ASSET_VIEW_FIELDS)}",
+        timeout_seconds=180,
+    ) or {}
     if response.get("status") != "success":
         raise RuntimeError(response.get("message") or "Failed to refresh corporation assets")
 
@@ -3,7 +3,7 @@ import pandas as pd
 
 from streamlit_ui.api.client import api_get, api_post, api_put, api_delete
 from streamlit_ui.state.session_state import ensure_state_defaults
-from streamlit_ui.api.streamlit_client import cached_api_get
+from streamlit_ui.api.streamlit_client import cached_api_get, clear_api_cache
 from streamlit_ui.components.selectors import select_character_id
 from streamlit_ui.components.webpage_ui import render_aggrid_table, require_aggrid
 
@@ -513,6 +513,7 @@ def _render_existing_profiles(
                     if update_response and update_response.get("status") == "success":
                         st.success("Profile updated")
                         _get_industry_profiles.clear()
+                        clear_api_cache("/industry_profiles/")
                         _rerun()
                     else:
                         st.error(f"Error: {update_response.get('message') if update_response else 'API connection failed'}")
@@ -522,6 +523,7 @@ def _render_existing_profiles(
                     if delete_response and delete_response.get("status") == "success":
                         st.success("Profile deleted")
                         _get_industry_profiles.clear()
+                        clear_api_cache("/industry_profiles/")
                         _rerun()
                     else:
                         st.error(f"Error: {delete_response.get('message') if delete_response else 'API connection failed'}")
@@ -912,6 +914,7 @@ def _render_create_profile_section(
     if create_response and create_response.get("status") == "success":
         st.success("Profile created successfully!")
         _get_industry_profiles.clear()
+        clear_api_cache("/industry_profiles/")
         st.session_state["show_create_new_profile"] = False
         _rerun()
     else:
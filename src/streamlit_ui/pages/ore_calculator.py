@@ -126,16 +126,26 @@ def render():
             st.session_state["last_clean_demands"] = clean_demands
 
             status_box = st.empty()
-            status_box.info("Running ore optimizer (MILP)...")
+            opt_payload = {
+                "demands": clean_demands,
+                "character_id": character_id,
+                "implant_pct": implant_pct,
+                "facility_id": facility_id,
+                "mode": mode,
+                "only_compressed": only_compressed,
+            }
+            # The LP relaxation returns almost immediately; show its cost while the MILP runs.
+            preview_resp = api_post("/optimize", {**opt_payload, "preview": True})
+            if preview_resp is not None and preview_resp.get("status") == "success":
+                preview_cost = (preview_resp.get("data") or {}).get("total_cost")
+                if preview_cost is not None:
+                    status_box.info(f"Preview (LP relaxation): about {float(preview_cost):,.0f} ISK. Running ore optimizer (MILP)...")
+                else:
+                    status_box.info("Running ore optimizer (MILP)...")
+            else:
+                status_box.info("Running ore optimizer (MILP)...")
             with st.spinner("Solving integer program (tiered order allocation)..."):
-                opt_resp = api_post("/optimize", {
-                    "demands": clean_demands,
-                    "character_id": character_id,
-                    "implant_pct": implant_pct,
-                    "facility_id": facility_id,
-                    "mode": mode,
-                    "only_compressed": only_compressed,
-                })
+                opt_resp = api_post("/optimize", opt_payload)
             if opt_resp is None or opt_resp.get("status") != "success":
                 status_box.error(f"Optimization failed: {opt_resp.get('message', 'Unknown error')}")
                 return
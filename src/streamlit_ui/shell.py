@@ -81,6 +81,8 @@ def _render_public_structures_scan_status() -> None:
             "Running": "yes" if global_scan.get("running") else "no",
             "Attempted": str(global_scan.get("attempted")) if global_scan.get("attempted") is not None else "-",
             "Rows written": str(global_scan.get("rows_written")) if global_scan.get("rows_written") is not None else "-",
+            "Skipped (not due)": str(global_scan.get("skipped")) if global_scan.get("skipped") is not None else "-",
+            "Workers": str(global_scan.get("workers")) if global_scan.get("workers") is not None else "-",
         },
         error_message=str(global_scan.get("error") or "") or None,
         success_message=("Scan finished." if (not global_scan.get("running")) and global_scan.get("finished_at") and not global_scan.get("error") else None),
@@ -132,7 +132,13 @@ def init_db_sde(cfgManager: ConfigManager) -> DatabaseManager:
     try:
         cfg = cfgManager.all()
         logging.debug(f"Database URI for SDE: {cfg['app']['database_sde_uri']}")
-        db_sde = DatabaseManager(cfg["app"]["database_sde_uri"], cfg["app"]["language"])
+        # The SDE only changes through scripts/import_sde.py, so it is opened immutable by default.
+        db_sde = DatabaseManager(
+            cfg["app"]["database_sde_uri"],
+            cfg["app"]["language"],
+            read_only=bool(cfg["app"].get("database_sde_read_only", True)),
+            ram_tables=list(cfg["app"].get("database_sde_ram_tables") or []),
+        )
         return db_sde
     except Exception as e:
         logging.error(f"Failed to initialize SDE database: {e}")
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import os
+import sys
+from types import SimpleNamespace
+from typing import Any
+
+from flask import Flask
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from flask_app.http import ok_cacheable  # noqa: E402
+from streamlit_ui.api import client  # noqa: E402
+
+
+class _FlaskBackedSession:
+    """Minimal ``requests.Session`` stand-in that routes GETs to a Flask test client."""
+
+    def __init__(self, app: Flask):
+        self._client = app.test_client()
+        self.requests: list[dict[str, str]] = []
+
+    def get(self, url: str, *, headers: dict[str, str] | None = None, timeout: Any = None):
+        path = url[len(client.api_base()):]
+        self.requests.append(dict(headers or {}))
+        response = self._client.get(path, headers=headers or {})
+        return SimpleNamespace(
+            status_code=response.status_code,
+            headers=response.headers,
+            text=response.get_data(as_text=True),
+            json=response.get_json,
+        )
+
+
+def test_cached_api_get_serves_fresh_entries_and_revalidates_with_etag(monkeypatch) -> None:
+    app = Flask(__name__)
+    max_age = {"seconds": 3600}
+
+    @app.get("/solar_systems")
+    def solar_systems():
+        return ok_cacheable(data=[{"id": 30000142, "name": "Jita"}], max_age_seconds=max_age["seconds"])
+
+    session = _FlaskBackedSession(app)
+    monkeypatch.setattr(client, "_http_session", lambda: session)
+    client.clear_api_cache()
+
+    first = client.cached_api_get("/solar_systems")
+    assert first["data"][0]["name"] == "Jita"
+    first["data"].clear()
+    second = client.cached_api_get("/solar_systems")
+    assert second["data"][0]["name"] == "Jita"
+    assert len(session.requests) == 1
+
+    client.clear_api_cache("/solar")
+    max_age["seconds"] = 0
+    client.cached_api_get("/solar_systems")
+    revalidated = client.cached_api_get("/solar_systems")
+    assert revalidated["data"][0]["name"] == "Jita"
+    assert len(session.requests) == 3
+    assert session.requests[2]["If-None-Match"].startswith('W/"')
+
+    client.clear_api_cache()
+
+
+def test_ok_cacheable_keeps_sde_responses_fresh_only_briefly() -> None:
+    app = Flask(__name__)
+    with app.test_request_context("/solar_systems"):
+        response = ok_cacheable(data=[])
+    # A hot SDE reload must reach clients within about a minute; the body ETag does the rest.
+    assert response.cache_control.max_age == 60
+    assert response.headers["ETag"].startswith('W/"')
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import os
+import sys
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from eve_online_industry_tracker.application.characters.asset_provenance import _get_or_fetch_market_price_on_date  # noqa: E402
+from eve_online_industry_tracker.application.characters.realized_profit import (  # noqa: E402
+    CharacterRealizedProfitLedgerService,
+    CorporationRealizedProfitLedgerService,
+)
+from eve_online_industry_tracker.application.industry.sales_history_service import SalesHistoryService  # noqa: E402
+from eve_online_industry_tracker.infrastructure.database_manager import DatabaseManager  # noqa: E402
+from eve_online_industry_tracker.infrastructure.models import BaseApp, MarketHistoryModel  # noqa: E402
+from eve_online_industry_tracker.infrastructure.persistence import blueprints_repo  # noqa: E402
+from eve_online_industry_tracker.infrastructure.persistence import market_orderbook_snapshot_repo  # noqa: E402
+from eve_online_industry_tracker.infrastructure.persistence import market_orderbook_view_cache_repo  # noqa: E402
+from eve_online_industry_tracker.infrastructure.schema_migrations import ensure_app_schema  # noqa: E402
+
+
+class _Sessions:
+    def __init__(self, db: DatabaseManager):
+        self._db = db
+
+    def app_session(self):
+        return self._db.session()
+
+
+@contextmanager
+def _captured_statements(engine):
+    statements: list[tuple[str, object]] = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", _capture)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _capture)
+
+
+def _table_scans(db: DatabaseManager, statements: list[tuple[str, object]]) -> list[str]:
+    scans = []
+    with db.engine.connect() as conn:
+        for statement, parameters in statements:
+            for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters):
+                detail = str(row[-1])
+                if detail.startswith("SCAN "):
+                    scans.append(f"{detail} <- {statement}")
+    return scans
+
+
+def test_hot_repository_queries_use_indexes(tmp_path) -> None:
+    db = DatabaseManager(f"sqlite:///{tmp_path / 'app.db'}")
+    BaseApp.metadata.create_all(bind=db.engine)
+    ensure_app_schema(db)
+    ensure_app_schema(db)  # idempotent on an already-migrated DB
+
+    session = db.session()
+    session.add(MarketHistoryModel(type_id=34, region_id=10000002, date="2026-01-01", close=5.0, volume=1, order_count=1))
+    session.commit()
+
+    with _captured_statements(db.engine) as statements:
+        blueprints_repo.get_character_blueprint_type_ids(session, 1)
+        blueprints_repo.get_character_blueprint_assets_for_ids(session, [1, 2])
+        blueprints_repo.get_corporation_blueprint_assets_for_ids(session, [10])
+        SalesHistoryService(state=None, sessions=_Sessions(db)).get_sold_history(character_id=1, type_id=34)
+        SalesHistoryService(state=None, sessions=_Sessions(db)).get_sold_history_bulk(character_id=1, type_ids=[34, 35])
+        market_orderbook_snapshot_repo.get_books_at(session, hub="jita", side="sell", type_ids=[34, 35], at=100.0)
+        market_orderbook_snapshot_repo.get_depth_deltas(session, hub="jita", side="sell", type_ids=[34], since=0.0, until=100.0)
+        market_orderbook_view_cache_repo.get_fetched_at(
+            session, hub="jita", region_id=10000002, station_id=60003760, side="sell", at_hub=True
+        )
+        price = _get_or_fetch_market_price_on_date(type_id=34, target_date="2026-01-05", app_session=session, esi_service=None)
+        for service in (
+            CharacterRealizedProfitLedgerService(app_session=session, sde_session=None),
+            CorporationRealizedProfitLedgerService(app_session=session, sde_session=None),
+        ):
+            service._load_wallet_transactions(owner_id=1, after_transaction_id=100)
+            service._load_industry_jobs(owner_id=1, completed_after="2026-01-01")
+            service._count_inputs_within_watermarks(owner_id=1, last_transaction_id=100, job_watermark_date="2026-01-01")
+            service._load_journal_map(owner_id=1, journal_ref_ids={5, 6})
+            service._load_ledger_rows(owner_id=1)
+    session.close()
+
+    assert price == 5.0
+    assert len(statements) >= 17
+    assert _table_scans(db, statements) == []
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from eve_online_industry_tracker.application.characters.asset_tree import TOP_LOCATION_FLAGS, resolve_asset_tree  # noqa: E402
+
+
+def _walk_top_location_ids(asset_list: list[dict]) -> dict[int, int]:
+    excluded = {a["item_id"] for a in asset_list if a.get("is_asset_safety_wrap") or a.get("is_office_folder")}
+    parent_location_map = {a["item_id"]: a["location_id"] for a in asset_list}
+    valid_top_location_ids = {
+        a["location_id"] for a in asset_list if a.get("location_flag") in TOP_LOCATION_FLAGS and a["location_id"] not in excluded
+    }
+    out: dict[int, int] = {}
+    for item in asset_list:
+        loc_id = item["location_id"]
+        while loc_id in parent_location_map:
+            if loc_id in valid_top_location_ids:
+                break
+            parent_id = parent_location_map[loc_id]
+            if parent_id == loc_id:
+                break
+            loc_id = parent_id
+        out[item["item_id"]] = loc_id
+    return out
+
+
+def test_resolve_asset_tree_assigns_names_and_top_locations() -> None:
+    station_id = 60003760
+    assets = [
+        {"item_id": 1, "location_id": station_id, "location_flag": "Hangar", "is_ship": True},
+        {"item_id": 2, "location_id": 1, "location_flag": "Cargo", "is_container": True},
+        {"item_id": 3, "location_id": 2, "location_flag": "Unlocked"},
+        {"item_id": 4, "location_id": 1, "location_flag": "HiSlot0"},
+        {"item_id": 5, "location_id": 1000, "location_flag": "CorpSAG1"},
+        {"item_id": 1000, "location_id": 1000, "location_flag": "OfficeFolder", "is_office_folder": True},
+    ]
+
+    resolve_asset_tree(assets, container_names={2: "Loot"}, ship_names={1: "Hauler"})
+
+    by_id = {asset["item_id"]: asset for asset in assets}
+    assert by_id[2]["container_name"] == "Loot"
+    assert by_id[3]["container_name"] == "Loot"
+    assert by_id[2]["ship_name"] == "Hauler"
+    assert by_id[4]["ship_name"] == "Hauler"
+    assert "ship_name" not in by_id[3]
+    assert [by_id[item_id]["top_location_id"] for item_id in (1, 2, 3, 4)] == [station_id] * 4
+    assert by_id[5]["top_location_id"] == 1000
+
+
+def test_resolve_asset_tree_matches_per_item_walk_on_deep_trees() -> None:
+    rng = random.Random(7)
+    assets: list[dict] = []
+    next_item_id = 1
+    for station_id in (60003760, 60008494):
+        roots = []
+        for _ in range(20):
+            assets.append({"item_id": next_item_id, "location_id": station_id, "location_flag": "Hangar", "is_container": True})
+            roots.append(next_item_id)
+            next_item_id += 1
+        parents = list(roots)
+        for _ in range(2000):
+            parent_id = rng.choice(parents)
+            flag = rng.choice(["Unlocked", "Cargo", "CorpSAG2", "Hangar"])
+            asset = {"item_id": next_item_id, "location_id": parent_id, "location_flag": flag}
+            if rng.random() < 0.3:
+                asset["is_container"] = True
+                parents.append(next_item_id)
+            assets.append(asset)
+            next_item_id += 1
+
+    expected = _walk_top_location_ids(assets)
+    resolve_asset_tree(assets)
+    assert {asset["item_id"]: asset["top_location_id"] for asset in assets} == expected
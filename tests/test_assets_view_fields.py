@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import os
+import re
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from streamlit_ui.components.assets_data import ASSET_VIEW_FIELDS  # noqa: E402
+
+_UI_DIR = os.path.join(os.path.dirname(__file__), "..", "src", "streamlit_ui")
+# Columns the asset frames derive client-side rather than receive from the API.
+_DERIVED_COLUMNS = {"location_name", "image_url", "image_variation", "total_volume", "total_average_price"}
+
+
+def test_asset_projection_covers_every_column_the_asset_pages_index() -> None:
+    indexed: set[str] = set()
+    for relative_path in ("pages/characters.py", "pages/corporations.py", "components/assets_ui.py"):
+        with open(os.path.join(_UI_DIR, relative_path), encoding="utf-8") as f:
+            indexed.update(re.findall(r'(?:assets_df|items_in_container)\["([a-z_]+)"\]', f.read()))
+
+    assert "is_office_folder" in indexed
+    assert indexed - set(ASSET_VIEW_FIELDS) - _DERIVED_COLUMNS == set()
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from eve_online_industry_tracker.application.industry.service import IndustryService  # noqa: E402
+from eve_online_industry_tracker.db_models import BackgroundJobModel  # noqa: E402
+from eve_online_industry_tracker.infrastructure.database_manager import DatabaseManager  # noqa: E402
+from eve_online_industry_tracker.infrastructure.job_queue import DurableJobQueue, JobQueueConfig  # noqa: E402
+from flask_app.state import AppState  # noqa: E402
+
+
+def _make_state(db_path) -> AppState:
+    state = AppState()
+    state.db_app = DatabaseManager(f"sqlite:///{db_path}")
+    BackgroundJobModel.__table__.create(bind=state.db_app.engine, checkfirst=True)
+    return state
+
+
+def _wait_until(predicate, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_queue_dedups_limits_concurrency_and_trims_finished_jobs(tmp_path) -> None:
+    state = _make_state(tmp_path / "app.db")
+    svc = IndustryService(state=state)
+    store = state.jobs.industry_overview_refresh
+    running: list[str] = []
+    max_running = {"value": 0}
+    release = threading.Event()
+    lock = threading.Lock()
+
+    def handler(job_id: str, params: dict) -> None:
+        with lock:
+            running.append(job_id)
+            max_running["value"] = max(max_running["value"], len(running))
+        release.wait(5.0)
+        svc._update_overview_refresh_job(job_id, status="completed", progress_fraction=1.0, result=[params])
+        with lock:
+            running.remove(job_id)
+
+    queue = DurableJobQueue(state=state, config=JobQueueConfig(max_workers=3, max_finished_in_memory=1))
+    queue.register("industry_overview_refresh", handler, concurrency_group="industry_refresh")
+    state.job_queue = queue
+
+    job_ids = []
+    for hub in ("jita", "amarr", "jita"):
+        job, created = svc._claim_job(store=store, params={"market_hub": hub}, step_count=9)
+        if created:
+            queue.submit("industry_overview_refresh", job)
+        job_ids.append(job["job_id"])
+    assert job_ids[0] == job_ids[2]
+
+    _wait_until(lambda: len(running) == 1)
+    time.sleep(0.05)
+    assert queue.stats()["pending"] == 1
+    release.set()
+    _wait_until(lambda: queue.stats()["pending"] == 0 and not queue.stats()["running_by_group"])
+    state.shutdown_event.set()
+
+    assert max_running["value"] == 1
+    with store.lock:
+        assert len(store.jobs) == 1
+    status = svc.industry_manufacturing_product_overview_refresh_status(job_id=job_ids[0])
+    assert status["status"] == "completed"
+    assert status["result"] == [{"market_hub": "jita"}]
+
+
+def test_queue_resumes_unfinished_jobs_after_restart(tmp_path) -> None:
+    db_path = tmp_path / "app.db"
+    first = _make_state(db_path)
+    first.shutdown_event.set()  # workers never pick the job up, as if the process died
+    first_queue = DurableJobQueue(state=first)
+    first_queue.register("industry_overview_refresh", lambda job_id, params: None)
+    job, _ = IndustryService(state=first)._claim_job(
+        store=first.jobs.industry_overview_refresh, params={"market_hub": "dodixie"}, step_count=9
+    )
+    first_queue.submit("industry_overview_refresh", job)
+
+    second = _make_state(db_path)
+    svc = IndustryService(state=second)
+    done = threading.Event()
+
+    def handler(job_id: str, params: dict) -> None:
+        svc._update_overview_refresh_job(job_id, status="completed", progress_fraction=1.0, result=[params])
+        done.set()
+
+    queue = DurableJobQueue(state=second)
+    queue.register("industry_overview_refresh", handler)
+    second.job_queue = queue
+    assert queue.resume() == 1
+    assert done.wait(5.0)
+    _wait_until(lambda: not queue.stats()["running_by_group"])
+    second.shutdown_event.set()
+
+    with second.jobs.industry_overview_refresh.lock:
+        second.jobs.industry_overview_refresh.jobs.clear()
+    status = svc.industry_manufacturing_product_overview_refresh_status(job_id=job["job_id"])
+    assert status["status"] == "completed"
+    assert status["result"] == [{"market_hub": "dodixie"}]
+    assert queue.resume() == 0
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import os
+import shutil
+import sqlite3
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import text
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from eve_online_industry_tracker.infrastructure.database_manager import DatabaseManager  # noqa: E402
+
+
+def _make_db(tmp_path) -> DatabaseManager:
+    db = DatabaseManager(f"sqlite:///{tmp_path / 'app.db'}")
+    db.execute("CREATE TABLE counters (id INTEGER PRIMARY KEY, writer TEXT NOT NULL)")
+    return db
+
+
+def test_sqlite_connections_use_tuned_pragmas_and_read_only_pool(tmp_path) -> None:
+    db = _make_db(tmp_path)
+    assert db.read_engine is not db.engine
+
+    with db.engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert conn.execute(text("PRAGMA temp_store")).scalar() == 2  # MEMORY
+
+    session = db.read_session()
+    try:
+        assert session.execute(text("PRAGMA query_only")).scalar() == 1
+        assert session.execute(text("SELECT COUNT(*) FROM counters")).scalar() == 0
+        with pytest.raises(Exception):
+            session.execute(text("INSERT INTO counters (writer) VALUES ('reader')"))
+    finally:
+        session.close()
+
+
+def test_run_write_serialises_concurrent_writers(tmp_path) -> None:
+    db = _make_db(tmp_path)
+    writer_threads: set[str] = set()
+
+    def write(index: int) -> int:
+        def work(session) -> int:
+            writer_threads.add(threading.current_thread().name)
+            session.execute(text("INSERT INTO counters (writer) VALUES (:w)"), {"w": f"w{index}"})
+            # Nested writes join the outer session instead of deadlocking on the writer thread.
+            return db.run_write(lambda inner: inner.execute(text("SELECT COUNT(*) FROM counters")).scalar())
+
+        return db.run_write(work)
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        counts = list(executor.map(write, range(64)))
+
+    assert sorted(counts) == list(range(1, 65))
+    assert len(writer_threads) == 1
+
+    def failing(session) -> None:
+        session.execute(text("INSERT INTO counters (writer) VALUES ('rolled-back')"))
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        db.run_write(failing)
+    assert db.query("SELECT COUNT(*) FROM counters")[0][0] == 64
+
+
+def _make_sde_file(path) -> None:
+    source = path.with_name("source.db")
+    conn = sqlite3.connect(source)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA wal_autocheckpoint=0")
+    conn.execute('CREATE TABLE types ("typeID" INTEGER PRIMARY KEY, name TEXT)')
+    conn.execute("CREATE INDEX idx_types_name ON types(name)")
+    conn.execute('CREATE TABLE "groups" ("groupID" INTEGER PRIMARY KEY, name TEXT)')
+    conn.executemany("INSERT INTO types VALUES (?, ?)", [(34, "Tritanium"), (35, "Pyerite"), (36, "Mexallon")])
+    conn.execute("INSERT INTO \"groups\" VALUES (18, 'Mineral')")
+    conn.commit()
+    # Snapshot while the rows are still only in the WAL, as after an interrupted import.
+    shutil.copy(source, path)
+    shutil.copy(f"{source}-wal", f"{path}-wal")
+    conn.close()
+
+
+@pytest.mark.parametrize("ram_tables", [None, ["types", "missing"]])
+def test_read_only_sde_is_immutable_and_can_keep_hot_tables_in_memory(tmp_path, ram_tables) -> None:
+    path = tmp_path / "sde.db"
+    _make_sde_file(path)
+    db = DatabaseManager(f"sqlite:///{path}", read_only=True, ram_tables=ram_tables)
+    assert db.read_only
+    assert not os.path.exists(f"{path}-wal") or os.path.getsize(f"{path}-wal") == 0
+
+    session = db.session()
+    try:
+        assert session.execute(text("SELECT COUNT(*) FROM types")).scalar() == 3
+        assert session.execute(text('SELECT name FROM "groups" WHERE "groupID" = 18')).scalar() == "Mineral"
+        in_memory = {row[0] for row in session.execute(text("SELECT name FROM main.sqlite_master WHERE type = 'table'"))}
+        assert in_memory == ({"types"} if ram_tables else {"types", "groups"})
+        with pytest.raises(Exception):
+            session.execute(text("INSERT INTO types VALUES (37, 'Isogen')"))
+    finally:
+        session.close()
+
+    with pytest.raises(RuntimeError):
+        db.run_write(lambda s: None)
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import sys
+from datetime import datetime, timezone
+
+import pytest
+from flask import Flask, request
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from eve_online_industry_tracker.application.errors import ServiceError  # noqa: E402
+from flask_app.compression import init_compression  # noqa: E402
+from flask_app.http import ok  # noqa: E402
+from flask_app.json_provider import OrjsonProvider  # noqa: E402
+from flask_app.pagination import apply_list_query, apply_list_query_to_nested, parse_list_query  # noqa: E402
+
+
+_ROWS = [
+    {"type_id": 3, "type_name": "Gamma", "profit": None, "volume": 1.0},
+    {"type_id": 1, "type_name": "Alpha", "profit": 10.0, "volume": 2.0},
+    {"type_id": 2, "type_name": "Beta", "profit": 30.0, "volume": 3.0},
+    {"type_id": 4, "type_name": "Delta", "profit": 30.0, "volume": 4.0},
+]
+
+
+def _make_app() -> Flask:
+    app = Flask(__name__)
+    app.json = OrjsonProvider(app)
+    init_compression(app)
+
+    @app.get("/rows")
+    def rows():
+        page_rows, page = apply_list_query(_ROWS * 50, parse_list_query(request.args))
+        return ok(data=page_rows, meta={"page": page, "at": datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)})
+
+    return app
+
+
+def test_apply_list_query_sorts_projects_and_pages() -> None:
+    rows, page = apply_list_query(_ROWS, parse_list_query({"sort": "-profit,type_name", "fields": "type_id,profit", "limit": "2"}))
+    assert rows == [{"type_id": 2, "profit": 30.0}, {"type_id": 4, "profit": 30.0}]
+    assert page == {"total": 4, "offset": 0, "limit": 2, "returned": 2, "next_offset": 2}
+
+    rows, page = apply_list_query(_ROWS, parse_list_query({"sort": "-profit,type_name", "offset": "2"}))
+    assert [row["type_id"] for row in rows] == [1, 3]
+    assert page["next_offset"] is None
+
+    owners = [{"character_id": 7, "assets": list(_ROWS)}]
+    projected = apply_list_query_to_nested(owners, parse_list_query({"fields": "type_id", "limit": "1"}))
+    assert projected[0]["assets"] == [{"type_id": 3}]
+    assert owners[0]["assets"] == _ROWS
+
+    with pytest.raises(ServiceError):
+        parse_list_query({"limit": "-1"})
+
+
+def test_json_responses_are_compressed_and_serialized_like_flask() -> None:
+    client = _make_app().test_client()
+
+    response = client.get("/rows?fields=type_id,type_name&limit=100", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    payload = json.loads(gzip.decompress(response.get_data()))
+    assert payload["meta"]["page"]["total"] == 200
+    assert payload["meta"]["at"] == "Tue, 02 Jan 2024 03:04:05 GMT"
+    assert payload["data"][0] == {"type_id": 3, "type_name": "Gamma"}
+
+    plain = client.get("/rows?limit=1", headers={"Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in plain.headers
+    assert plain.get_json()["data"] == [_ROWS[0]]
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+import os
+import sqlite3
+import sys
+
+import yaml
+
+_SCRIPT = os.path.join(os.path.dirname(__file__), "..", "scripts", "import_sde.py")
+_spec = importlib.util.spec_from_file_location("import_sde", _SCRIPT)
+import_sde = importlib.util.module_from_spec(_spec)
+sys.modules["import_sde"] = import_sde  # worker processes unpickle tasks by module name
+_spec.loader.exec_module(import_sde)
+
+_TYPES = {
+    34: {"groupID": 18, "name": {"en": "Tritanium"}, "published": True, "volume": 0.01},
+    35: {"groupID": 18, "name": {"en": "Pyerite"}, "published": True, "volume": 0.01, "marketGroupID": 1857},
+}
+_GROUPS = {18: {"categoryID": 4, "name": {"en": "Mineral"}}}
+
+
+def _write_sde(sde_dir, *, jsonl: bool) -> None:
+    os.makedirs(sde_dir, exist_ok=True)
+    for table, data in (("types", _TYPES), ("groups", _GROUPS)):
+        if jsonl:
+            with open(os.path.join(sde_dir, f"{table}.jsonl"), "w", encoding="utf-8") as f:
+                for key, value in data.items():
+                    f.write(json.dumps({"_key": key, **value}) + "\n")
+        else:
+            with open(os.path.join(sde_dir, f"{table}.yaml"), "w", encoding="utf-8") as f:
+                yaml.safe_dump(data, f)
+
+
+def _import(tmp_path, *, jsonl: bool) -> sqlite3.Connection:
+    sde_dir = tmp_path / ("jsonl" if jsonl else "yaml")
+    _write_sde(str(sde_dir), jsonl=jsonl)
+    repackaged = tmp_path / "repackaged.json"
+    repackaged.write_text(json.dumps({"repackaged_volumes": {"groups": {}, "items": {"35": {"repackaged_volume": 5.0}}}}))
+    db_path = tmp_path / f"sde_{'jsonl' if jsonl else 'yaml'}.db"
+    import_sde.import_sde_to_sqlite(
+        str(sde_dir),
+        db_uri=f"sqlite:///{db_path}",
+        tables_to_import=["types", "groups"],
+        repackaged_json_path=str(repackaged),
+        workers=2,
+    )
+    return sqlite3.connect(db_path)
+
+
+def test_yaml_and_jsonl_import_to_the_same_typed_tables_with_indexes(tmp_path) -> None:
+    results = []
+    for jsonl in (False, True):
+        conn = _import(tmp_path, jsonl=jsonl)
+        try:
+            columns = {row[1]: (row[2], row[5]) for row in conn.execute('PRAGMA table_info("types")')}
+            rows = conn.execute(
+                'SELECT id, groupID, name, published, volume, marketGroupID, repackaged_volume FROM "types" ORDER BY id'
+            ).fetchall()
+            indexes = {row[1] for row in conn.execute('PRAGMA index_list("types")')}
+            indexes |= {row[1] for row in conn.execute('PRAGMA index_list("groups")')}
+            results.append((columns, rows, indexes))
+        finally:
+            conn.close()
+
+    assert results[0] == results[1]
+    columns, rows, indexes = results[0]
+    assert columns["id"] == ("INTEGER", 1)
+    assert columns["groupID"][0] == "INTEGER"
+    assert columns["marketGroupID"][0] == "INTEGER"
+    assert columns["volume"][0] == "REAL"
+    assert columns["name"][0] == "TEXT"
+    assert rows == [
+        (34, 18, '{"en": "Tritanium"}', 1, 0.01, None, None),
+        (35, 18, '{"en": "Pyerite"}', 1, 0.01, 1857, 5.0),
+    ]
+    assert {"idx_types_groupID_published", "idx_groups_categoryID"} <= indexes
+    assert not os.path.exists(tmp_path / "yaml" / "_staging")
+
+
+def test_update_skips_unchanged_tables_and_applies_row_diffs(tmp_path) -> None:
+    sde_dir = tmp_path / "jsonl"
+    _write_sde(str(sde_dir), jsonl=True)
+    repackaged = tmp_path / "repackaged.json"
+    repackaged.write_text(json.dumps({"repackaged_volumes": {"groups": {}, "items": {}}}))
+    db_path = tmp_path / "sde.db"
+
+    def run(*, update: bool) -> dict:
+        summary = import_sde.import_sde_to_sqlite(
+            str(sde_dir),
+            db_uri=f"sqlite:///{db_path}",
+            tables_to_import=["types", "groups"],
+            repackaged_json_path=str(repackaged),
+            workers=1,
+            update=update,
+        )
+        return {report["table"]: report for report in summary}
+
+    assert set(run(update=False)) == {"types", "groups"}
+    assert run(update=True) == {}
+
+    with open(sde_dir / "types.jsonl", "w", encoding="utf-8") as f:
+        f.write(json.dumps({"_key": 34, **_TYPES[34], "volume": 0.02}) + "\n")
+        mexallon = {"groupID": 18, "name": {"en": "Mexallon"}, "published": True, "volume": 0.01, "marketGroupID": 1857}
+        f.write(json.dumps({"_key": 36, **mexallon}) + "\n")
+    reports = run(update=True)
+
+    assert set(reports) == {"types"}
+    assert reports["types"]["action"] == "-1 +2"
+    conn = sqlite3.connect(db_path)
+    try:
+        rows = conn.execute('SELECT id, volume FROM "types" ORDER BY id').fetchall()
+        state = dict(conn.execute("SELECT table_name, row_count FROM sde_table_state"))
+        journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+    finally:
+        conn.close()
+    assert rows == [(34, 0.02), (36, 0.01)]
+    assert state == {"types": 2, "groups": 1}
+    assert journal_mode == "delete"
+    assert not os.path.exists(f"{db_path}.next")
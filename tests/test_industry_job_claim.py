@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from eve_online_industry_tracker.application.industry.service import IndustryService  # noqa: E402
+from flask_app.state import AppState  # noqa: E402
+
+
+def test_claim_job_creates_one_job_for_concurrent_identical_requests() -> None:
+    state = AppState()
+    svc = IndustryService(state=state)
+    store = state.jobs.industry_overview_refresh
+    params = {"market_hub": "jita", "force_refresh": False}
+    barrier = threading.Barrier(16)
+
+    def claim(_: int) -> tuple[str, bool]:
+        barrier.wait()
+        job, created = svc._claim_job(store=store, params=params, step_count=9)
+        return str(job["job_id"]), created
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        results = list(executor.map(claim, range(16)))
+
+    assert sum(1 for _, created in results if created) == 1
+    assert len({job_id for job_id, _ in results}) == 1
+    assert len(store.jobs) == 1
+
+    job, created = svc._claim_job(store=store, params={**params, "market_hub": "amarr"}, step_count=9)
+    assert created
+    assert job["status"] == "queued"
+    assert job["progress_meta"] == {"stage": "queued", "step": 0, "step_count": 9}
@@ -3,14 +3,18 @@ from __future__ import annotations
 import os
 import sys
 
+from flask import Flask
+
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 
 from eve_online_industry_tracker.application.industry.portfolio_service import (  # noqa: E402
     IndustryPortfolioService,
     PortfolioCandidateDirective,
+    PortfolioMaterialLedger,
     PortfolioPlanRequest,
 )
 from eve_online_industry_tracker.application.industry.service import IndustryService  # noqa: E402
+from flask_app.routes import industry as industry_routes  # noqa: E402
 
 
 def test_portfolio_candidate_payload_derives_candidate_metrics() -> None:
@@ -207,3 +211,158 @@ def test_optimize_manufacturing_portfolio_honors_operator_directives() -> None:
     assert plan["operator_decisions"]["exclusions"][0]["overview_row_id"] == "candidate:excluded"
     assert plan["operator_decisions"]["unfulfilled_locked_items"][0]["overview_row_id"] == "candidate:locked"
     assert "Locked item could not fit" in str(plan["operator_decisions"]["unfulfilled_locked_items"][0]["reason"])
+
+
+def _knapsack_candidate(row_id: str, *, profit: float, cash: float, max_batches: int = 1) -> dict:
+    return {
+        "overview_row_id": row_id,
+        "type_id": hash(row_id) % 10000,
+        "type_name": row_id,
+        "is_portfolio_candidate": True,
+        "profit_amount": profit,
+        "effective_profit_per_batch": profit,
+        "effective_isk_per_hour": profit,
+        "profit_margin_fraction": 0.2,
+        "isk_per_hour": profit,
+        "pricing_confidence": "High",
+        "cash_outlay_per_batch": cash,
+        "slot_hours_per_batch": 1.0,
+        "max_batches_total": max_batches,
+        "quantity_per_batch": 1,
+        "region_daily_volume": 10,
+    }
+
+
+def test_milp_solver_beats_greedy_and_keeps_operator_directives() -> None:
+    candidates = [
+        _knapsack_candidate("big", profit=600.0, cash=600.0),
+        _knapsack_candidate("small:a", profit=500.0, cash=500.0),
+        _knapsack_candidate("small:b", profit=500.0, cash=500.0),
+        _knapsack_candidate("forced", profit=10.0, cash=100.0, max_batches=3),
+    ]
+
+    def plan(solver: str) -> dict:
+        return IndustryPortfolioService.optimize_manufacturing_portfolio(
+            candidates=candidates,
+            plan_request=PortfolioPlanRequest(
+                capital_limit_isk=1100.0,
+                manufacturing_slots_available=1,
+                planning_horizon_hours=24.0,
+                objective="balanced",
+                solver=solver,
+                candidate_directives=[
+                    PortfolioCandidateDirective(overview_row_id="forced", force_include=True, target_batches_override=1)
+                ],
+            ),
+        )
+
+    greedy = plan("greedy")
+    milp = plan("milp")
+
+    assert greedy["solver"] == {"mode": "greedy"}
+    assert {item["overview_row_id"] for item in greedy["selected_items"]} == {"forced", "big"}
+    assert greedy["total_expected_profit"] == 630.0  # big, then the forced item soaks up the rest
+
+    assert milp["solver"]["mode"] == "milp"
+    assert milp["solver"]["warm_started"] is True
+    assert milp["solver"]["greedy_objective_value"] == 620.0
+    assert milp["solver"]["gap_vs_greedy"] == 380.0
+    batches = {item["overview_row_id"]: item["batches"] for item in milp["selected_items"]}
+    assert batches == {"forced": 1, "small:a": 1, "small:b": 1}
+    assert milp["selected_items"][0]["allocation_passes"] == ["operator"]
+    assert milp["capital_committed"] == 1100.0
+    assert milp["total_expected_profit"] == 1010.0
+    assert {item["overview_row_id"]: item["reason"] for item in milp["skipped_items"]} == {
+        "big": "Not selected by the integer optimizer"
+    }
+
+
+def test_milp_solver_plans_unsupported_objectives_greedily() -> None:
+    candidates = [
+        _knapsack_candidate("big", profit=600.0, cash=600.0),
+        _knapsack_candidate("small:a", profit=500.0, cash=500.0),
+        _knapsack_candidate("small:b", profit=500.0, cash=500.0),
+    ]
+
+    def plan(solver: str) -> dict:
+        return IndustryPortfolioService.optimize_manufacturing_portfolio(
+            candidates=candidates,
+            plan_request=PortfolioPlanRequest(
+                capital_limit_isk=1100.0,
+                manufacturing_slots_available=1,
+                planning_horizon_hours=24.0,
+                objective="max_isk_per_hour",
+                solver=solver,
+            ),
+        )
+
+    greedy = plan("greedy")
+    milp = plan("milp")
+
+    assert milp["solver"]["mode"] == "greedy"
+    assert milp["solver"]["objective"] == "max_isk_per_hour"
+    assert "max_isk_per_hour" in milp["solver"]["fallback_reason"]
+    assert milp["selected_items"] == greedy["selected_items"]
+
+
+def test_portfolio_plan_route_rejects_milp_with_unsupported_objective(monkeypatch) -> None:
+    monkeypatch.setattr(industry_routes, "require_ready", lambda state: None)
+    monkeypatch.setattr(industry_routes, "require_sde_ready", lambda state: None)
+    monkeypatch.setattr(industry_routes, "get_state", lambda: None)
+    app = Flask(__name__)
+    app.register_blueprint(industry_routes.industry_bp)
+
+    response = app.test_client().post(
+        "/industry_products/1/portfolio_plan",
+        json={"solver": "milp", "objective": "max_isk_per_hour"},
+    )
+
+    assert response.status_code == 400
+    assert "max_isk_per_hour" in response.get_json()["message"]
+
+
+def test_material_ledger_nets_owned_inputs_across_the_plan() -> None:
+    candidates = []
+    for row_id in ("first", "second"):
+        candidate = _knapsack_candidate(row_id, profit=500.0, cash=1000.0)
+        candidate["material_cost"] = 900.0
+        candidate["input_materials"] = [{"type_id": 34, "quantity": 90, "unit_price": 10.0}]
+        candidates.append(candidate)
+    ledger = PortfolioMaterialLedger.from_payload(
+        PortfolioMaterialLedger(
+            owned_quantity_by_type_id={34: 100},
+            owned_unit_cost_by_type_id={34: 10.0},
+            market_unit_price_by_type_id={34: 20.0},
+        ).to_payload()
+    )
+
+    def plan(*, solver: str = "greedy", material_ledger=ledger) -> dict:
+        return IndustryPortfolioService.optimize_manufacturing_portfolio(
+            candidates=candidates,
+            plan_request=PortfolioPlanRequest(
+                capital_limit_isk=3000.0,
+                manufacturing_slots_available=2,
+                planning_horizon_hours=24.0,
+                solver=solver,
+            ),
+            material_ledger=material_ledger,
+        )
+
+    independent = plan(material_ledger=None)
+    assert independent["capital_committed"] == 2000.0
+    assert independent["material_ledger"] is None
+
+    netted = plan()
+    first, second = netted["selected_items"]
+    assert (first["owned_input_units"], first["bought_input_units"], first["capital_committed"]) == (90, 0, 1000.0)
+    # Only 10 units are left in stock; the other 80 are bought at 20 instead of 10.
+    assert (second["owned_input_units"], second["bought_input_units"], second["capital_committed"]) == (10, 80, 1800.0)
+    assert second["expected_profit"] == -300.0
+    assert netted["capital_committed"] == 2800.0
+    assert netted["material_ledger"]["depleted_type_ids"] == [34]
+    assert netted["material_ledger"]["bought_value"] == 1600.0
+
+    milp = plan(solver="milp")
+    assert [item["overview_row_id"] for item in milp["selected_items"]] == ["first"]
+    assert milp["total_expected_profit"] == 500.0
+    assert milp["solver"]["gap_vs_greedy"] == 300.0
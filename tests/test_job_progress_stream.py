@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+import threading
+import time
+
+from flask import Flask, request
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from eve_online_industry_tracker.application.industry.service import IndustryService  # noqa: E402
+from flask_app import sse  # noqa: E402
+from flask_app.sse import job_progress_stream  # noqa: E402
+from flask_app.state import AppState  # noqa: E402
+
+
+def _parse_events(body: str) -> list[tuple[str, dict]]:
+    events = []
+    for frame in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in frame.splitlines() if not line.startswith(":"))
+        if "event" in fields:
+            events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def test_progress_wait_wakes_on_update_and_omits_result() -> None:
+    state = AppState()
+    svc = IndustryService(state=state)
+    job, _ = svc._claim_job(store=state.jobs.industry_overview_refresh, params={"market_hub": "jita"}, step_count=9)
+    job_id = str(job["job_id"])
+
+    def _complete_later() -> None:
+        time.sleep(0.05)
+        svc._update_overview_refresh_job(job_id, status="completed", progress_fraction=1.0, result=[{"type_id": 34}])
+
+    threading.Thread(target=_complete_later).start()
+    started = time.monotonic()
+    progress = svc.industry_manufacturing_product_overview_refresh_progress(job_id=job_id, after_revision=0, wait_seconds=5.0)
+    assert time.monotonic() - started < 2.0
+    assert progress["status"] == "completed"
+    assert progress["revision"] == 1
+    assert progress["result_count"] == 1
+    assert "result" not in progress
+    assert svc.industry_manufacturing_product_overview_refresh_status(job_id=job_id)["result"] == [{"type_id": 34}]
+
+
+def test_job_progress_stream_pushes_updates_until_done() -> None:
+    state = AppState()
+    svc = IndustryService(state=state)
+    job, _ = svc._claim_job(store=state.jobs.industry_overview_refresh, params={"market_hub": "jita"}, step_count=9)
+    job_id = str(job["job_id"])
+
+    app = Flask(__name__)
+
+    @app.get("/events/<job_id>")
+    def events(job_id: str):
+        return job_progress_stream(
+            lambda after_revision, wait_seconds: svc.industry_manufacturing_product_overview_refresh_progress(
+                job_id=job_id,
+                after_revision=after_revision,
+                wait_seconds=wait_seconds,
+            ),
+            last_event_id=request.headers.get("Last-Event-ID"),
+        )
+
+    def _run_job() -> None:
+        for step in range(1, 4):
+            time.sleep(0.02)
+            svc._update_overview_refresh_job(job_id, status="running", progress_fraction=step / 4, progress_label=f"Step {step}")
+        svc._update_overview_refresh_job(job_id, status="completed", progress_fraction=1.0, result=[])
+
+    threading.Thread(target=_run_job).start()
+    response = app.test_client().get(f"/events/{job_id}")
+    assert response.mimetype == "text/event-stream"
+    parsed = _parse_events(response.get_data(as_text=True))
+    assert parsed[-1][0] == "done"
+    assert parsed[-1][1]["status"] == "completed"
+    revisions = [payload["revision"] for _, payload in parsed]
+    assert revisions == sorted(set(revisions))
+    assert all("result" not in payload for _, payload in parsed)
+
+    unknown = _parse_events(app.test_client().get("/events/missing").get_data(as_text=True))
+    assert unknown == [("error", {"message": "Unknown overview refresh job: missing", "status_code": 404})]
+
+
+def test_streams_past_the_limit_get_one_snapshot_and_release_their_slot(monkeypatch) -> None:
+    monkeypatch.setattr(sse, "sse_max_streams", lambda: 1)
+    waits: list[float] = []
+
+    def running_job(after_revision: int, wait_seconds: float) -> dict:
+        waits.append(wait_seconds)
+        return {"job_id": "job", "status": "running", "revision": 3}
+
+    held = sse._job_progress_events(running_job, last_revision=-1, shutdown_event=None)
+    assert next(held).startswith("retry: ")
+    assert _parse_events(next(held))[0][0] == "progress"  # holds the only slot
+
+    started = time.monotonic()
+    snapshot = list(sse._job_progress_events(running_job, last_revision=-1, shutdown_event=None))
+    assert time.monotonic() - started < 1.0
+    assert [event for event, _ in _parse_events("".join(snapshot))] == ["progress"]
+    assert waits[-1] == 0.0
+
+    held.close()
+    waits.clear()
+    again = sse._job_progress_events(running_job, last_revision=-1, shutdown_event=None)
+    next(again)
+    next(again)
+    assert waits == [sse.HEARTBEAT_SECONDS]
+    again.close()
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from eve_online_industry_tracker.application.locations import service as locations_service  # noqa: E402
+from eve_online_industry_tracker.application.locations.service import LocationsService  # noqa: E402
+from eve_online_industry_tracker.infrastructure.database_manager import DatabaseManager  # noqa: E402
+from eve_online_industry_tracker.infrastructure.esi_service import ESIService  # noqa: E402
+from eve_online_industry_tracker.infrastructure.models import (  # noqa: E402
+    BaseApp,
+    BaseSde,
+    NpcStations,
+    PublicStructuresModel,
+    StructureNameCacheModel,
+)
+
+_JITA_4_4 = 60003760
+_JITA = 30000142
+_CACHED, _PUBLIC, _DOCKABLE, _FORBIDDEN = 1030000000001, 1030000000002, 1030000000003, 1030000000004
+
+
+class _Client:
+    def __init__(self, character_id: int, structures: dict[int, dict]):
+        self.character_id = character_id
+        self.structures = structures
+        self.calls: list[int] = []
+        self._lock = threading.Lock()
+
+    def esi_get(self, endpoint: str, **kwargs):
+        structure_id = int(endpoint.strip("/").split("/")[-1])
+        with self._lock:
+            self.calls.append(structure_id)
+        return self.structures.get(structure_id)
+
+
+class _Character:
+    def __init__(self, client: _Client):
+        self.esi_client = client
+        self.character_id = client.character_id
+
+    def ensure_esi(self) -> None:
+        return None
+
+
+class _EsiService:
+    def __init__(self, main_client: _Client):
+        self._esi_client = main_client
+        self.names_calls: list[list[int]] = []
+
+    def get_universe_names(self, ids):
+        self.names_calls.append(list(ids))
+        names = {
+            _JITA_4_4: {"name": "Jita IV - Moon 4 - Caldari Navy Assembly Plant", "category": "station"},
+            _JITA: {"name": "Jita", "category": "solar_system"},
+        }
+        return {i: names[i] for i in ids if i in names}
+
+    def get_location_info(self, location_id, **kwargs):
+        raise AssertionError("batched resolution should not fall back to per-ID lookups")
+
+
+class _State:
+    pass
+
+
+def test_get_locations_batches_every_source_and_caches_denials(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(locations_service, "_DENIED_UNTIL", {})
+    db_app = DatabaseManager(f"sqlite:///{tmp_path / 'app.db'}")
+    BaseApp.metadata.create_all(bind=db_app.engine)
+    db_sde = DatabaseManager(f"sqlite:///{tmp_path / 'sde.db'}")
+    BaseSde.metadata.create_all(bind=db_sde.engine)
+
+    db_sde.session.add(
+        NpcStations(
+            id=_JITA_4_4, celestialIndex=4, operationID=26, orbitID=40009087, orbitIndex=4, ownerID=1000035,
+            position={"x": 1.0, "y": 2.0, "z": 3.0}, reprocessingEfficiency=0.5, reprocessingHangarFlag="4", reprocessingStationsTake=0.05,
+            solarSystemID=_JITA, typeID=1529, useOperationName=True,
+        )
+    )
+    db_sde.session.commit()
+    db_app.session.add(StructureNameCacheModel(structure_id=_CACHED, name="Cached Fort", solar_system_id=_JITA))
+    db_app.session.add(PublicStructuresModel(structure_id=_PUBLIC, system_id=_JITA, structure_name="Public Market"))
+    db_app.session.commit()
+
+    main_client = _Client(1, {})
+    alt_client = _Client(2, {_DOCKABLE: {"name": "Alt Citadel", "solar_system_id": _JITA, "type_id": 35832}})
+    state = _State()
+    state.esi_service = _EsiService(main_client)
+    state.char_manager = type("CharManager", (), {"_character_list": [_Character(main_client), _Character(alt_client)]})()
+    state.db_app = db_app
+    state.db_sde = db_sde
+
+    ids = [_JITA_4_4, _JITA, _CACHED, _PUBLIC, _DOCKABLE, _FORBIDDEN, _JITA_4_4]
+    result = LocationsService(state=state).get_locations(ids + ["bad"])
+
+    assert result[str(_JITA_4_4)] == {
+        "name": "Jita IV - Moon 4 - Caldari Navy Assembly Plant",
+        "station_id": _JITA_4_4,
+        "system_id": _JITA,
+        "type_id": 1529,
+        "owner": 1000035,
+        "position": {"x": 1.0, "y": 2.0, "z": 3.0},
+        "reprocessing_efficiency": 0.5,
+        "reprocessing_stations_take": 0.05,
+    }
+    assert result[str(_JITA)] == {"name": "Jita", "system_id": _JITA}
+    assert result[str(_CACHED)]["name"] == "Cached Fort"
+    assert result[str(_PUBLIC)]["name"] == "Public Market"
+    assert result[str(_DOCKABLE)]["name"] == "Alt Citadel"
+    assert result[str(_FORBIDDEN)] == {}
+    assert result["bad"] == {}
+    assert state.esi_service.names_calls == [[_JITA_4_4, _JITA]]
+    assert sorted(main_client.calls) == [_DOCKABLE, _FORBIDDEN]
+    assert sorted(alt_client.calls) == [_DOCKABLE, _FORBIDDEN]
+    assert db_app.session.get(StructureNameCacheModel, _DOCKABLE).name == "Alt Citadel"
+
+    # Second call: the resolved structure comes from the cache, the forbidden one is not retried.
+    main_client.calls.clear()
+    alt_client.calls.clear()
+    result = LocationsService(state=state).get_locations([_DOCKABLE, _FORBIDDEN])
+    assert result[str(_DOCKABLE)]["name"] == "Alt Citadel"
+    assert result[str(_FORBIDDEN)] == {}
+    assert main_client.calls == alt_client.calls == []
+
+
+class _NamesClient:
+    """/universe/names/ that, like ESI, rejects a whole request containing an unknown ID."""
+
+    def __init__(self, names: dict[int, str]):
+        self.names = names
+        self.posts: list[list[int]] = []
+
+    def esi_post(self, endpoint: str, json=None, **kwargs):
+        self.posts.append(list(json))
+        if any(i not in self.names for i in json):
+            return None
+        return [{"id": i, "name": self.names[i], "category": "station"} for i in json]
+
+
+def test_get_universe_names_splits_rejected_chunks_to_isolate_invalid_ids() -> None:
+    client = _NamesClient({i: f"Station {i}" for i in range(1, 9) if i != 6})
+    service = ESIService.__new__(ESIService)
+    service._esi_client = client
+
+    names = service.get_universe_names(range(1, 9))
+
+    assert sorted(names) == [1, 2, 3, 4, 5, 7, 8]
+    assert names[7] == {"name": "Station 7", "category": "station"}
+    # 1-8 rejected -> 1-4 ok, 5-8 rejected -> 5-6 rejected -> 5 ok, 6 rejected; 7-8 ok.
+    assert client.posts == [[1, 2, 3, 4, 5, 6, 7, 8], [1, 2, 3, 4], [5, 6, 7, 8], [5, 6], [5], [6], [7, 8]]
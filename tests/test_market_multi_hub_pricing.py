@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import os
+import sys
+from types import SimpleNamespace
+
+from flask import Flask
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from eve_online_industry_tracker.application.industry.service import IndustryService  # noqa: E402
+from eve_online_industry_tracker.application.market_pricing import MarketPricingService  # noqa: E402
+from eve_online_industry_tracker.infrastructure.database_manager import DatabaseManager  # noqa: E402
+from eve_online_industry_tracker.infrastructure.models import BaseApp  # noqa: E402
+from flask_app.routes import industry as industry_routes  # noqa: E402
+
+_JITA_4_4 = 60003760
+_PERIMETER = 60003761  # stand-in second hub in The Forge
+_AMARR = 60008494
+
+
+class _Sessions:
+    def __init__(self, db: DatabaseManager):
+        self._db = db
+
+    def app_session(self):
+        return self._db.session()
+
+
+class _Esi:
+    def __init__(self, books_by_region: dict[int, dict[int, list[dict]]]):
+        self.books_by_region = books_by_region
+        self.requests: list[tuple[int, list[int]]] = []
+
+    def get_sell_order_book(self, type_ids, region_id=None):
+        self.requests.append((region_id, sorted(type_ids)))
+        books = self.books_by_region.get(region_id) or {}
+        return {type_id: books.get(type_id, []) for type_id in type_ids}
+
+
+def _order(station_id: int, price: float, volume: int = 10) -> dict:
+    return {"location_id": station_id, "price": price, "volume_remain": volume}
+
+
+def test_multi_hub_prices_fetch_each_region_once(tmp_path, monkeypatch) -> None:
+    monkeypatch.setitem(
+        MarketPricingService._MARKET_HUBS,
+        "perimeter",
+        {"label": "Perimeter TTT", "region_id": 10000002, "station_id": _PERIMETER},
+    )
+    db = DatabaseManager(f"sqlite:///{tmp_path / 'app.db'}")
+    BaseApp.metadata.create_all(bind=db.engine)
+    esi = _Esi(
+        {
+            10000002: {34: [_order(_JITA_4_4, 5.0), _order(_PERIMETER, 4.5), _order(30000142, 1.0)], 35: [_order(_JITA_4_4, 9.0)]},
+            10000043: {34: [_order(_AMARR, 5.5)], 35: [_order(_AMARR, 8.0)]},
+        }
+    )
+    state = SimpleNamespace(esi_service=esi, cfg_manager=None, admin_settings=None)
+    pricing = MarketPricingService(state=state, sessions=_Sessions(db))
+
+    prices = pricing.get_multi_hub_price_map(type_ids=[34, 35], hubs=["jita", "perimeter", "amarr"])
+
+    assert sorted(esi.requests) == [(10000002, [34, 35]), (10000043, [34, 35])]
+    assert {hub: entry["unit_price"] for hub, entry in prices[34].items()} == {"jita": 5.0, "perimeter": 4.5, "amarr": 5.5}
+    assert prices[35]["perimeter"]["unit_price"] is None
+    assert prices[35]["amarr"]["price_source"].startswith("market_amarr_sell:")
+
+    # Per-hub views were cached: the single-hub path and a second comparison stay off ESI.
+    esi.requests.clear()
+    assert pricing.get_type_price_map(type_ids=[34], hub="perimeter")[34]["cached"] is True
+    again = pricing.get_multi_hub_price_map(type_ids=[34, 35], hubs=["jita", "perimeter", "amarr"])
+    assert all(entry["cached"] for by_hub in again.values() for entry in by_hub.values())
+    assert esi.requests == []
+
+
+def test_hub_comparison_picks_cheapest_materials_and_best_sell_hub(monkeypatch) -> None:
+    service = object.__new__(IndustryService)
+    service._state = SimpleNamespace(cfg_manager=None, esi_service=None)  # type: ignore[attr-defined]
+    service._sessions = None  # type: ignore[attr-defined]
+
+    unit_prices = {
+        100: {"jita": 1000.0, "amarr": 1100.0},
+        34: {"jita": 5.0, "amarr": 4.0},
+        35: {"jita": 9.0, "amarr": 10.0},
+    }
+
+    def fake_multi_hub_price_map(self, *, type_ids, hubs=None, side="sell"):
+        return {
+            type_id: {hub: {"unit_price": price, "hub_label": hub.title()} for hub, price in unit_prices[type_id].items()}
+            for type_id in type_ids
+        }
+
+    monkeypatch.setattr(MarketPricingService, "get_multi_hub_price_map", fake_multi_hub_price_map)
+    row = {
+        "type_id": 100,
+        "quantity": 1,
+        "manufacturing_job": {
+            "procurement_materials": {
+                "34": {"type_id": 34, "quantity": 100},
+                "35": {"type_id": 35, "quantity": 10},
+            }
+        },
+    }
+
+    (result,) = service._enrich_product_rows_with_hub_comparison([row], hubs=["jita", "amarr"])
+
+    comparison = result["hub_comparison"]
+    assert comparison["hubs"]["jita"]["material_cost"] == 590.0
+    assert comparison["hubs"]["amarr"]["material_cost"] == 500.0
+    assert comparison["best_material_hub"] == "amarr"
+    assert comparison["best_sell_hub"] == "amarr"
+    assert comparison["best_sell_unit_price"] == 1100.0
+    assert comparison["material_best_hub_by_type_id"] == {"34": "amarr", "35": "jita"}
+    assert "hub_comparison" not in row
+
+
+def test_industry_products_rejects_unknown_compare_hubs(monkeypatch) -> None:
+    monkeypatch.setattr(industry_routes, "require_ready", lambda state: None)
+    monkeypatch.setattr(industry_routes, "require_sde_ready", lambda state: None)
+    monkeypatch.setattr(industry_routes, "get_state", lambda: None)
+    app = Flask(__name__)
+    app.register_blueprint(industry_routes.industry_bp)
+
+    response = app.test_client().get("/industry_products/1?compare_hubs=jita,amar")
+
+    assert response.status_code == 400
+    assert "amar" in response.get_json()["message"]
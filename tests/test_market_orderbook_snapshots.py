@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+from sqlalchemy import text
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from eve_online_industry_tracker.application.market_analysis.pricing_suggestion_service import (  # noqa: E402
+    PricingSuggestionService,
+)
+from eve_online_industry_tracker.application.market_pricing import MarketPricingService  # noqa: E402
+from eve_online_industry_tracker.infrastructure.database_manager import DatabaseManager  # noqa: E402
+from eve_online_industry_tracker.infrastructure.models import BaseApp  # noqa: E402
+from eve_online_industry_tracker.infrastructure.persistence import market_orderbook_snapshot_repo as repo  # noqa: E402
+
+_HOUR = 3600
+_DAY = 24 * _HOUR
+
+
+class _Sessions:
+    def __init__(self, db: DatabaseManager):
+        self._db = db
+
+    def app_session(self):
+        return self._db.session()
+
+
+class _Esi:
+    def __init__(self):
+        self.books: dict[int, list[dict]] = {}
+
+    def get_sell_order_book(self, type_ids, region_id=None):
+        return {type_id: self.books[type_id] for type_id in type_ids if type_id in self.books}
+
+
+def _db(tmp_path) -> DatabaseManager:
+    db = DatabaseManager(f"sqlite:///{tmp_path / 'app.db'}")
+    BaseApp.metadata.create_all(bind=db.engine)
+    return db
+
+
+def _record(session, captured_at: float, best_price: float, total_volume: int, type_id: int = 34) -> None:
+    repo.record_snapshots(
+        session,
+        hub="jita",
+        region_id=10000002,
+        station_id=60003760,
+        side="sell",
+        snapshots_by_type_id={
+            type_id: {"levels": [[best_price, 100], [best_price + 1, 50]], "total_volume": total_volume, "order_count": 3}
+        },
+        captured_at=captured_at,
+    )
+
+
+def test_book_at_time_depth_deltas_and_retention(tmp_path) -> None:
+    db = _db(tmp_path)
+    session = db.session()
+    now = 1_000 * _DAY
+    # Sell book drained from 10,000 to 4,000 over 12h while being undercut twice.
+    for hours_ago, price, volume in ((12, 5.0, 10_000), (8, 4.9, 8_000), (4, 4.9, 9_000), (0, 4.8, 4_000)):
+        _record(session, now - hours_ago * _HOUR, price, volume)
+
+    book = repo.get_books_at(session, hub="jita", side="sell", type_ids=[34, 35], at=now - 5 * _HOUR)
+    assert set(book) == {34}
+    assert book[34]["captured_at"] == now - 8 * _HOUR
+    assert book[34]["levels"] == [(4.9, 100), (5.9, 50)]
+    assert repo.get_books_at(session, hub="jita", side="sell", type_ids=[34], at=now - 13 * _HOUR) == {}
+
+    delta = repo.get_depth_deltas(session, hub="jita", side="sell", type_ids=[34], since=now - _DAY, until=now)[34]
+    assert delta["snapshot_count"] == 4
+    assert delta["depth_delta"] == -6_000
+    assert delta["volume_removed"] == 7_000
+    assert delta["volume_added"] == 1_000
+    assert delta["volume_removed_per_day"] == 14_000
+    assert delta["best_price_changes"] == delta["undercuts"] == 2
+
+    # Older history: four snapshots in one hour three days ago, two on one day 30 days ago, one a year ago.
+    for seconds in (0, 600, 1200, 1800):
+        _record(session, now - 3 * _DAY + seconds, 5.0, 10_000)
+    _record(session, now - 30 * _DAY, 5.0, 10_000)
+    _record(session, now - 30 * _DAY + 2 * _HOUR, 5.0, 10_000)
+    _record(session, now - 365 * _DAY, 5.0, 10_000)
+
+    deleted = repo.prune_snapshots(
+        session,
+        raw_retention_seconds=2 * _DAY,
+        hourly_retention_seconds=14 * _DAY,
+        daily_retention_seconds=180 * _DAY,
+        now=now,
+    )
+    kept = session.execute(
+        text("SELECT captured_at FROM market_orderbook_snapshots ORDER BY captured_at")
+    ).scalars().all()
+    session.close()
+
+    assert deleted == {"expired": 1, "daily": 1, "hourly": 3}
+    assert kept == [
+        now - 30 * _DAY + 2 * _HOUR,
+        now - 3 * _DAY + 1800,
+        now - 12 * _HOUR,
+        now - 8 * _HOUR,
+        now - 4 * _HOUR,
+        now,
+    ]
+
+
+def test_fetches_are_snapshotted_and_feed_pricing_without_esi(tmp_path, monkeypatch) -> None:
+    db = _db(tmp_path)
+    esi = _Esi()
+    state = SimpleNamespace(esi_service=esi, cfg_manager=None, admin_settings=None)
+    pricing = MarketPricingService(state=state, sessions=_Sessions(db))
+    monkeypatch.setattr(MarketPricingService, "_snapshot_pruned_at", 0.0)
+
+    def fetch(prices: list[float], volume: int) -> None:
+        esi.books[34] = [
+            {"price": price, "volume_remain": volume, "location_id": 60003760, "order_id": index}
+            for index, price in enumerate(prices)
+        ] + [{"price": 1.0, "volume_remain": 999, "location_id": 1, "order_id": 99}]
+        pricing.get_type_price_map(type_ids=[34], hub="jita", side="sell")
+        db.execute("UPDATE market_orderbook_view_cache SET fetched_at = 0")  # force a refetch
+
+    for prices in ([5.0, 5.1, 5.2], [4.9, 5.0], [4.8, 4.9, 5.0], [4.7], [4.6, 4.7], [4.5, 4.6], [4.4]):
+        fetch(prices, 1_000)
+
+    books = pricing.get_orderbook_snapshots_at(type_ids=[34])
+    assert books[34]["levels"] == [(4.4, 1_000)]
+    assert books[34]["order_count"] == 1
+    assert books[34]["total_volume"] == 1_000
+    deltas = pricing.get_orderbook_depth_deltas(type_ids=[34])
+    assert deltas[34]["snapshot_count"] == 7
+    assert deltas[34]["undercuts"] == 6
+    assert deltas[34]["volume_removed"] == 4_000
+
+    # The view cache is stale and ESI is gone: suggestions read the stored book instead.
+    state.esi_service = None
+    suggestion = PricingSuggestionService(state=state, sessions=_Sessions(db)).suggest_price(
+        character_id=1, type_id=34, current_price=4.6, quantity=100
+    )
+    assert suggestion["orderbook_history"]["undercuts"] == 6
+    assert suggestion["seller_concentration"]["recent_undercuts"] == 6
+    assert suggestion["seller_concentration"]["num_price_levels"] == 1
+    assert suggestion["seller_concentration"]["risk_label"] == "Frequent undercutting"
+    assert time.time() - books[34]["captured_at"] < 60
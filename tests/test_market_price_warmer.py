@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from eve_online_industry_tracker.application.market_pricing import MarketPriceWarmer, MarketPricingService  # noqa: E402
+from eve_online_industry_tracker.infrastructure.database_manager import DatabaseManager  # noqa: E402
+from eve_online_industry_tracker.infrastructure.models import (  # noqa: E402
+    BaseApp,
+    CharacterAssetsModel,
+    CharacterMarketOrdersModel,
+)
+
+_JITA_4_4 = 60003760
+
+
+class _Sessions:
+    def __init__(self, db: DatabaseManager):
+        self._db = db
+
+    def app_session(self):
+        return self._db.session()
+
+
+class _Esi:
+    def __init__(self):
+        self.requests: list[tuple[str, list[int]]] = []
+        self.remain: int | None = None
+        self.unlisted: set[int] = set()
+
+    def _book(self, side: str, type_ids):
+        # Like ESIService, types without regional orders are left out of the book.
+        self.requests.append((side, sorted(type_ids)))
+        return {
+            type_id: [{"price": 10.0, "volume_remain": 5, "location_id": _JITA_4_4}]
+            for type_id in type_ids
+            if type_id not in self.unlisted
+        }
+
+    def get_sell_order_book(self, type_ids, region_id=None):
+        return self._book("sell", type_ids)
+
+    def get_buy_order_book(self, type_ids, region_id=None):
+        return self._book("buy", type_ids)
+
+    def error_budget(self):
+        return self.remain, 30
+
+
+class _Config:
+    def all(self):
+        return {
+            "defaults": {
+                "market_pricing": {
+                    "material_price_source_default": "Jita Buy",
+                    "product_price_source_default": "Jita Sell",
+                    "material_price_cache_ttl_seconds": 3600,
+                }
+            }
+        }
+
+
+class _JobManager:
+    def get_blueprint_overview(self):
+        return [
+            {
+                "blueprint_type_id": 688,
+                "manufacturing_job": {"products": [{"type_id": 587}], "materials": [{"type_id": 34}, {"type_id": 35}]},
+                "invention_job": {"products": [{"type_id": 999}], "materials": [{"type_id": 20410}]},
+            }
+        ]
+
+
+def test_warmer_refreshes_the_working_set_ahead_of_expiry(tmp_path) -> None:
+    db = DatabaseManager(f"sqlite:///{tmp_path / 'app.db'}")
+    BaseApp.metadata.create_all(bind=db.engine)
+    session = db.session()
+    session.add(
+        CharacterAssetsModel(
+            character_id=1, item_id=1, type_id=44992, location_id=_JITA_4_4, is_singleton=False,
+            is_blueprint_copy=False, quantity=10, is_container=False, is_asset_safety_wrap=False, is_ship=False,
+            is_office_folder=False,
+        )
+    )
+    session.add(CharacterMarketOrdersModel(character_id=1, order_id=7, type_id=29668))
+    session.commit()
+    session.close()
+
+    esi = _Esi()
+    state = SimpleNamespace(
+        esi_service=esi,
+        cfg_manager=_Config(),
+        admin_settings=None,
+        industry_job_manager=_JobManager(),
+        shutdown_event=threading.Event(),
+    )
+    warmer = MarketPriceWarmer(state=state, sessions=_Sessions(db))
+
+    assert warmer.warm_once() == {
+        "jita:sell": {"working_set": 3, "due": 3, "refreshed": 3},
+        "jita:buy": {"working_set": 3, "due": 3, "refreshed": 3},
+    }
+    assert sorted(esi.requests) == [("buy", [34, 35, 20410]), ("sell", [587, 29668, 44992])]
+
+    # Everything is fresh: nothing is due and a user request is served from the cache.
+    esi.requests.clear()
+    assert warmer.warm_once()["jita:sell"]["due"] == 0
+    prices = MarketPricingService(state=state, sessions=_Sessions(db)).get_type_price_map(type_ids=[587, 44992], side="sell")
+    assert all(entry["cached"] for entry in prices.values())
+    assert esi.requests == []
+
+    # Within the lead window before the TTL runs out (default 300s of 3600s): refetched.
+    db.execute(f"UPDATE market_orderbook_view_cache SET fetched_at = {time.time() - 3400} WHERE type_id = 35")
+    assert warmer.warm_once()["jita:buy"] == {"working_set": 3, "due": 1, "refreshed": 1}
+    assert esi.requests == [("buy", [35])]
+
+    # Low ESI error budget: the warmer backs off and leaves the budget to users.
+    esi.requests.clear()
+    esi.remain = 5
+    db.execute("UPDATE market_orderbook_view_cache SET fetched_at = 0")
+    assert warmer.warm_once()["jita:sell"] == {"working_set": 3, "due": 3, "refreshed": 0}
+    assert esi.requests == []
+    assert warmer.get_status()["last_cycle"]["sources"]["jita:buy"]["refreshed"] == 0
+
+
+def test_types_without_orders_are_not_refetched_every_cycle(tmp_path) -> None:
+    db = DatabaseManager(f"sqlite:///{tmp_path / 'app.db'}")
+    BaseApp.metadata.create_all(bind=db.engine)
+    esi = _Esi()
+    esi.unlisted = {35}
+    state = SimpleNamespace(
+        esi_service=esi,
+        cfg_manager=_Config(),
+        admin_settings=None,
+        industry_job_manager=_JobManager(),
+        shutdown_event=threading.Event(),
+    )
+    warmer = MarketPriceWarmer(state=state, sessions=_Sessions(db))
+
+    assert warmer.warm_once()["jita:buy"] == {"working_set": 3, "due": 3, "refreshed": 3}
+    assert MarketPricingService(state=state, sessions=_Sessions(db)).get_cached_view_ages(hub="jita", side="buy").keys() == {34, 35, 20410}
+
+    esi.requests.clear()
+    assert warmer.warm_once()["jita:buy"] == {"working_set": 3, "due": 0, "refreshed": 0}
+    prices = MarketPricingService(state=state, sessions=_Sessions(db)).get_type_price_map(type_ids=[35], side="buy")
+    assert prices[35]["cached"] is True
+    assert prices[35]["unit_price"] is None
+    assert esi.requests == []
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import os
+import sys
+
+from sqlalchemy import create_engine
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from eve_online_industry_tracker.infrastructure.sde import static_data  # noqa: E402
+from eve_online_industry_tracker.infrastructure.static_data import optimizer_service  # noqa: E402
+
+
+_ORES = [
+    {
+        "id": 1230,
+        "name": "Veldspar",
+        "volume": 0.1,
+        "portionSize": 100,
+        "materials": [{"id": 34, "name": "Tritanium", "quantity": 400}],
+    },
+    {
+        "id": 1228,
+        "name": "Scordite",
+        "volume": 0.15,
+        "portionSize": 100,
+        "materials": [{"id": 34, "name": "Tritanium", "quantity": 150}, {"id": 35, "name": "Pyerite", "quantity": 90}],
+    },
+]
+_MATERIALS = [{"id": 34, "name": "Tritanium", "volume": 0.01}, {"id": 35, "name": "Pyerite", "volume": 0.01}]
+
+
+class _Session:
+    def __init__(self):
+        self._engine = create_engine("sqlite://")
+
+    def get_bind(self):
+        return self._engine
+
+
+class _Character:
+    reprocessing_skills = {"Refining": 5, "Reprocessing Efficiency": 5, "Simple Ore Processing": 5}
+
+
+class _Esi:
+    def __init__(self):
+        self.calls: list[str] = []
+
+    def get_ore_prices(self, ore_ids):
+        self.calls.append("ore_prices")
+        book = {
+            1230: [
+                {"price": 10.0, "volume_remain": 5_000, "order_id": 1, "location_id": 60003760},
+                {"price": 12.0, "volume_remain": 200_000, "order_id": 2, "location_id": 60003760},
+            ],
+            1228: [{"price": 30.0, "volume_remain": 200_000, "order_id": 3, "location_id": 60003760}],
+        }
+        return {ore_id: book[ore_id] for ore_id in ore_ids if ore_id in book}
+
+    def get_material_prices(self, material_ids):
+        self.calls.append("material_prices")
+        return {34: [{"price": 5.0}], 35: [{"price": 12.0}]}
+
+    def get_sell_order_book_metadata(self, type_ids, region_id=None):
+        return {"region_id": 10000002, "oldest_fetched_at": 100.0, "newest_fetched_at": 100.0, "total_orders": 3}
+
+
+def test_ore_plan_reuses_catalog_and_order_book_and_warm_starts(monkeypatch) -> None:
+    catalog_loads: list[str] = []
+
+    def build_all_ores(session, language):
+        catalog_loads.append(language)
+        return _ORES
+
+    monkeypatch.setattr(static_data, "build_all_ores", build_all_ores)
+    monkeypatch.setattr(static_data, "build_all_materials", lambda session, language: _MATERIALS)
+    monkeypatch.setattr(optimizer_service, "_PLAN_CACHE", optimizer_service._OrePlanCache())
+
+    session = _Session()
+    esi = _Esi()
+
+    def solve(demands: dict, **extra) -> dict:
+        payload = {"demands": demands, "facility_id": 1, "mode": "min_cost", **extra}
+        return optimizer_service.run_optimize(
+            payload, character=_Character(), esi_service=esi, sde_session=session, language="en"
+        )
+
+    demands = {"Tritanium": 100_000, "Pyerite": 8_000}
+    preview = solve(demands, preview=True)
+    assert esi.calls == ["ore_prices"]
+    first = solve(demands)
+    second = solve(demands, time_limit_seconds=500)
+    changed = solve({"Tritanium": 110_000, "Pyerite": 8_000})
+    esi.calls.clear()
+    repeat_preview = solve(demands, preview=True)
+
+    assert catalog_loads == ["en"]
+    assert preview["preview"] is True
+    assert preview["solver"]["mode"] == "lp_relaxation"
+    assert preview["total_cost"] <= first["total_cost"]
+    assert "price_provenance" not in preview
+    # The repeated preview reuses the pruned book from the cached snapshot and fetches nothing.
+    assert esi.calls == []
+    assert repeat_preview["solver"]["order_book_reused"] is True
+    assert repeat_preview["total_cost"] == preview["total_cost"]
+
+    assert first["status"] == "ok"
+    assert first["preview"] is False
+    assert all(isinstance(row["batches"], int) for row in first["solution"])
+    assert all(coverage["shortfall"] == 0 for coverage in first["demand_coverage"].values())
+    assert first["solver"]["warm_started"] is False
+    assert first["price_provenance"]["source"] == "ESI sell orders"
+
+    assert second["solver"]["order_book_reused"] is True
+    assert second["solver"]["warm_started"] is True
+    assert second["solver"]["time_limit_seconds"] == 120.0
+    assert second["total_cost"] == first["total_cost"]
+
+    assert changed["solver"]["order_book_reused"] is False
+    assert changed["solver"]["warm_started"] is True
+    assert changed["demand_coverage"]["Tritanium"]["shortfall"] == 0
+
+
+def test_ore_yield_variants_are_lru_bounded(monkeypatch) -> None:
+    yield_builds: list[float] = []
+
+    def compute_yields(ores, skills, facility, implants):
+        yield_builds.append(implants[0]["bonus"])
+        return []
+
+    monkeypatch.setattr(static_data, "build_all_ores", lambda session, language: _ORES)
+    monkeypatch.setattr(optimizer_service, "compute_yields", compute_yields)
+    monkeypatch.setattr(optimizer_service, "_PLAN_CACHE", optimizer_service._OrePlanCache(max_yield_entries=2))
+
+    session = _Session()
+
+    def yields(implant_pct: float) -> list[dict]:
+        return optimizer_service._ore_yields_cached(
+            session, "en", skills={"Refining": 5}, facility={"id": 1}, implant_pct=implant_pct
+        )
+
+    for implant_pct in (1.0, 2.0, 1.0, 3.0, 1.0, 2.0):
+        yields(implant_pct)
+
+    # 2.0 was evicted when 3.0 arrived; 1.0 stayed because it was used more recently.
+    assert yield_builds == [0.01, 0.02, 0.03, 0.02]
+
+
+def test_batch_shares_order_depth_across_demand_sets(monkeypatch) -> None:
+    monkeypatch.setattr(static_data, "build_all_ores", lambda session, language: _ORES)
+    monkeypatch.setattr(static_data, "build_all_materials", lambda session, language: _MATERIALS)
+
+    payload = {
+        "facility_id": 1,
+        "demand_sets": [
+            {"id": "rifters", "demands": {"Tritanium": 10_000}},
+            {"id": "slashers", "demands": {"Tritanium": 10_000}},
+        ],
+    }
+
+    def solve(strategy: str) -> dict:
+        return optimizer_service.run_optimize_batch(
+            {**payload, "strategy": strategy},
+            character=_Character(),
+            esi_service=_Esi(),
+            sde_session=_Session(),
+            language="en",
+            max_workers=2,
+        )
+
+    shared = solve("shared")
+    independent = solve("independent")
+
+    def cheap_tier_batches(rows: list[dict]) -> int:
+        return sum(tier["batches"] for row in rows for tier in row["tiers"] if tier["unit_price"] == 10.0)
+
+    assert shared["status"] == independent["status"] == "ok"
+    assert [row["id"] for row in shared["sets"]] == ["rifters", "slashers"]
+    # 5,000 units at the cheap tier are 50 batches; sharing them cannot oversubscribe the order.
+    assert cheap_tier_batches(shared["solution"]) == 50
+    assert sum(cheap_tier_batches(row["solution"]) for row in shared["sets"]) == 50
+    assert cheap_tier_batches(independent["solution"]) > 50
+    assert shared["depth_shared"] is True and independent["depth_shared"] is False
+    assert shared["total_cost"] > independent["total_cost"]
+    assert shared["total_cost"] == sum(row["total_cost"] for row in shared["sets"])
+    for result in (shared, independent):
+        for row in result["sets"]:
+            assert row["demand_coverage"]["Tritanium"]["shortfall"] == 0
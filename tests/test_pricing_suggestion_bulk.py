@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from sqlalchemy import event
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from eve_online_industry_tracker.application.market_analysis.pricing_suggestion_service import (  # noqa: E402
+    PricingSuggestionService,
+)
+from eve_online_industry_tracker.infrastructure.database_manager import DatabaseManager  # noqa: E402
+from eve_online_industry_tracker.infrastructure.models import (  # noqa: E402
+    BaseApp,
+    CharacterAssetHistoryModel,
+    CharacterAssetsModel,
+    CharacterWalletTransactionsModel,
+    MarketHistoryModel,
+    MarketOrderbookViewCacheModel,
+)
+
+
+class _Sessions:
+    def __init__(self, db: DatabaseManager):
+        self._db = db
+
+    def app_session(self):
+        return self._db.session()
+
+
+def _days_ago(days: int) -> str:
+    return (datetime.utcnow() - timedelta(days=days)).isoformat()
+
+
+def _seed(db: DatabaseManager) -> None:
+    session = db.session()
+    transaction_id = 1
+    for type_id, base_price in ((34, 5.0), (35, 12.0), (36, 80.0)):
+        for day in range(0, 80, 7):
+            session.add(
+                CharacterWalletTransactionsModel(
+                    character_id=1,
+                    transaction_id=transaction_id,
+                    date=_days_ago(day),
+                    is_buy=False,
+                    quantity=1000 + day,
+                    type_id=type_id,
+                    unit_price=base_price * (1 + day / 200),
+                    total_price=base_price * (1000 + day),
+                )
+            )
+            transaction_id += 1
+        for day in range(60):
+            session.add(
+                MarketHistoryModel(
+                    type_id=type_id,
+                    region_id=10000002,
+                    date=(datetime.utcnow() - timedelta(days=day)).date().isoformat(),
+                    close=base_price * (1 + (day % 5) / 100),
+                    volume=50_000 + day * 100,
+                    order_count=10,
+                )
+            )
+        session.add(
+            MarketOrderbookViewCacheModel(
+                hub="jita",
+                region_id=10000002,
+                station_id=60003760,
+                side="sell",
+                type_id=type_id,
+                at_hub=True,
+                depth=3,
+                levels=[[base_price * 1.01, 20_000], [base_price * 0.99, 5_000], [base_price * 1.2, 90_000]],
+                fetched_at=time.time(),
+            )
+        )
+    session.add(
+        CharacterAssetsModel(
+            character_id=1,
+            item_id=900,
+            type_id=34,
+            location_id=60003760,
+            is_singleton=False,
+            is_blueprint_copy=False,
+            quantity=5000,
+            is_container=False,
+            is_asset_safety_wrap=False,
+            is_ship=False,
+            is_office_folder=False,
+            acquisition_unit_cost=4.0,
+            acquisition_source="bought",
+        )
+    )
+    for observed_at, cost in (("2026-01-01", 9.0), ("2026-02-01", 10.0)):
+        session.add(
+            CharacterAssetHistoryModel(
+                character_id=1,
+                item_id=901,
+                observed_at=observed_at,
+                type_id=35,
+                acquisition_unit_cost=cost,
+                acquisition_source="manufactured",
+            )
+        )
+    session.commit()
+    session.close()
+
+
+def test_bulk_suggestions_match_single_suggestions_with_constant_queries(tmp_path) -> None:
+    db = DatabaseManager(f"sqlite:///{tmp_path / 'app.db'}")
+    BaseApp.metadata.create_all(bind=db.engine)
+    _seed(db)
+    svc = PricingSuggestionService(state=SimpleNamespace(esi_service=None, cfg_manager=None), sessions=_Sessions(db))
+
+    orders = [
+        {"order_id": 100 + i, "character_id": 1, "type_id": type_id, "price": price, "quantity": qty,
+         "order_duration_days": 90, "days_remaining": remaining}
+        for i, (type_id, price, qty, remaining) in enumerate(
+            [(34, 5.2, 4000, 60), (35, 13.0, 800, 2), (36, 95.0, 100, None), (36, 70.0, 50, 30), (37, 1.0, 10, 5)]
+        )
+    ]
+
+    selects: list[str] = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            selects.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", _count)
+    bulk = svc.suggest_prices_bulk(orders=orders)
+    event.remove(db.engine, "before_cursor_execute", _count)
+
+    assert set(bulk) == {order["order_id"] for order in orders}
+    # history, orderbooks (+ snapshot fallback), depth history, fees, sold history, assets,
+    # asset history: independent of the order count
+    assert len(selects) <= 8
+    for order in orders:
+        single = svc.suggest_price(
+            character_id=order["character_id"],
+            type_id=order["type_id"],
+            current_price=order["price"],
+            quantity=order["quantity"],
+            order_duration_days=order["order_duration_days"],
+            days_remaining=order["days_remaining"],
+        )
+        assert bulk[order["order_id"]] == single
+
+    assert bulk[100]["fill_rate_velocity"]["transaction_count"] == 12
+    assert {"market_trend", "supply_demand"} <= set(bulk[100]["breakdown"]["components"])
+    assert bulk[100]["cost_basis_source"] == "asset"
+    assert bulk[101]["cost_basis"] == 10.0
+    assert bulk[101]["cost_basis_source"] == "asset_history"
+    assert bulk[104]["cost_basis_source"] == "market_order_fallback"
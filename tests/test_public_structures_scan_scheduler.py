@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import os
+import sys
+import threading
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from eve_online_industry_tracker.infrastructure.database_manager import DatabaseManager  # noqa: E402
+from eve_online_industry_tracker.infrastructure.models import BaseApp, IndustryProfilesModel  # noqa: E402
+from eve_online_industry_tracker.infrastructure.persistence import public_structures_scan_schedule_repo  # noqa: E402
+from eve_online_industry_tracker.infrastructure.public_structures_cache_service import _global_scan_loop  # noqa: E402
+from eve_online_industry_tracker.infrastructure.public_structures_scan_scheduler import (  # noqa: E402
+    DAY_SECONDS,
+    MAX_DENIED_BACKOFF_SECONDS,
+    next_entry,
+    plan_scan,
+    workers_for_error_budget,
+)
+
+
+def _entry(next_check_at: float, system_id: int | None = None) -> dict:
+    return {"system_id": system_id, "last_status": "ok", "consecutive_denials": 0, "last_checked_at": 0.0, "next_check_at": next_check_at}
+
+
+def test_plan_orders_priority_then_unseen_then_due_and_skips_the_rest() -> None:
+    schedule = {
+        1: _entry(50.0, system_id=7),  # due, priority system
+        2: _entry(500.0, system_id=7),  # not due yet
+        3: _entry(10.0, system_id=8),  # due, oldest
+        4: _entry(20.0, system_id=8),  # due
+    }
+    plan = plan_scan([4, 9, 3, 2, 1, 5, 9], schedule, priority_system_ids={7}, now=100.0)
+    assert plan == [1, 9, 5, 3, 4]
+
+
+def test_denials_back_off_exponentially_and_errors_retry_soon() -> None:
+    kwargs = {"system_id": None, "priority_system_ids": {7}, "recheck_seconds": 7 * DAY_SECONDS, "denied_backoff_seconds": DAY_SECONDS}
+    entry = None
+    delays = []
+    for _ in range(7):
+        entry = next_entry(entry, status="denied", now=0.0, **kwargs)
+        delays.append(entry["next_check_at"])
+    assert delays[:3] == [DAY_SECONDS, 2 * DAY_SECONDS, 4 * DAY_SECONDS]
+    assert delays[-1] == MAX_DENIED_BACKOFF_SECONDS
+
+    entry = next_entry(entry, status="error", now=0.0, **kwargs)
+    assert entry["consecutive_denials"] == 7
+    assert entry["next_check_at"] == 3600
+
+    entry = next_entry(entry, status="ok", now=0.0, **{**kwargs, "system_id": 7})
+    assert entry["consecutive_denials"] == 0
+    assert entry["next_check_at"] == 7 * DAY_SECONDS / 4
+
+
+def test_workers_follow_the_esi_error_budget() -> None:
+    assert workers_for_error_budget(None, max_workers=10) == 10
+    assert workers_for_error_budget(100, max_workers=10) == 10
+    assert workers_for_error_budget(55, max_workers=10) == 5
+    assert workers_for_error_budget(10, max_workers=10) == 1
+
+
+class _Esi:
+    def __init__(self, structures: dict[int, int]):
+        self.structures = structures
+        self.calls: list[int] = []
+        self._lock = threading.Lock()
+
+    def list_universe_structure_ids(self, filter=None):
+        return [1, 2, 3, 4]
+
+    def error_budget(self):
+        return 40, 30
+
+    def get_universe_structure(self, structure_id, **kwargs):
+        with self._lock:
+            self.calls.append(structure_id)
+        if structure_id == 4:
+            raise TimeoutError("slow")
+        system_id = self.structures.get(structure_id)
+        return None if system_id is None else {"solar_system_id": system_id, "name": f"S{structure_id}", "type_id": 35832}
+
+
+def test_second_pass_only_retries_what_is_due(tmp_path) -> None:
+    db = DatabaseManager(f"sqlite:///{tmp_path / 'app.db'}")
+    BaseApp.metadata.create_all(bind=db.engine)
+    esi = _Esi({1: 30000142, 2: 30000144})
+    state = SimpleNamespace(
+        db_app=SimpleNamespace(Session=db.session),
+        esi_service=esi,
+        public_structures_global_scan_attempted=0,
+        public_structures_global_scan_rows_written=0,
+    )
+
+    def run() -> None:
+        _global_scan_loop(
+            state=state,
+            scan_cap=10,
+            max_workers=4,
+            time_budget_seconds=10.0,
+            batch_size=2,
+            pause_seconds=0.0,
+            stop_event=None,
+            request_timeout_seconds=1.0,
+        )
+
+    run()
+    assert sorted(esi.calls) == [1, 2, 3, 4]
+    assert state.public_structures_global_scan_rows_written == 2
+    assert state.public_structures_global_scan_workers == 2
+
+    session = db.session()
+    schedule = public_structures_scan_schedule_repo.load_schedule(session)
+    assert {sid: entry["last_status"] for sid, entry in schedule.items()} == {1: "ok", 2: "ok", 3: "denied", 4: "error"}
+
+    # Only the timed-out ID is due again straight away.
+    public_structures_scan_schedule_repo.upsert_many(session, [{"structure_id": 4, **{**schedule[4], "next_check_at": 0.0}}])
+    session.add(IndustryProfilesModel(character_id=1, profile_name="Jita", system_id=30000142))
+    session.commit()
+    assert public_structures_scan_schedule_repo.list_industry_profile_system_ids(session) == {30000142}
+    session.close()
+
+    esi.calls.clear()
+    run()
+    assert esi.calls == [4]
+    assert state.public_structures_global_scan_total_ids == 1
+    assert state.public_structures_global_scan_skipped == 3
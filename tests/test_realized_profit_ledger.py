@@ -14,6 +14,7 @@ from eve_online_industry_tracker.infrastructure.models import (  # noqa: E402
     Blueprints,
     CharacterModel,
     CharacterIndustryJobsModel,
+    CharacterRealizedProfitStateModel,
     CharacterRealizedSalesLedgerModel,
     CharacterWalletJournalModel,
     CharacterWalletTransactionsModel,
@@ -26,6 +27,10 @@ from eve_online_industry_tracker.application.characters.realized_profit import (
     CharacterRealizedProfitLedgerService,
     CorporationRealizedProfitLedgerService,
 )
+from eve_online_industry_tracker.infrastructure.sde.blueprint_activities import (  # noqa: E402
+    get_blueprint_activity_cache,
+    invalidate_blueprint_activity_cache,
+)
 
 
 def _make_sessions() -> tuple[Session, Session]:
@@ -36,9 +41,8 @@ def _make_sessions() -> tuple[Session, Session]:
     return sessionmaker(bind=app_engine)(), sessionmaker(bind=sde_engine)()
 
 
-def test_realized_profit_ledger_builds_from_completed_industry_jobs() -> None:
-    app_session, sde_session = _make_sessions()
-
+def _seed_completed_job_sale(app_session: Session, sde_session: Session, *, sale_quantity: int = 10) -> None:
+    """Two delivered runs of blueprint 5000 (10 units of type 100), then one journaled sale of ``sale_quantity``."""
     app_session.add(
         CharacterModel(
             character_id=1,
@@ -96,17 +100,22 @@ def test_realized_profit_ledger_builds_from_completed_industry_jobs() -> None:
             is_buy=False,
             is_personal=True,
             journal_ref_id=300,
-            quantity=10,
+            quantity=sale_quantity,
             type_id=100,
             type_name="Test Product",
             type_group_name="Ships",
             type_category_name="Ship",
             unit_price=100.0,
-            total_price=1000.0,
+            total_price=100.0 * sale_quantity,
         )
     )
     app_session.commit()
 
+
+def test_realized_profit_ledger_builds_from_completed_industry_jobs() -> None:
+    app_session, sde_session = _make_sessions()
+    _seed_completed_job_sale(app_session, sde_session)
+
     service = CharacterRealizedProfitLedgerService(
         app_session=app_session,
         sde_session=sde_session,
@@ -598,4 +607,236 @@ def test_corporation_realized_profit_ledger_uses_gross_only_fee_capture() -> Non
     assert row["realized_profit"] == 120.0
 
     persisted = app_session.query(CorporationRealizedSalesLedgerModel).filter_by(corporation_id=10).all()
-    assert len(persisted) == 1
\ No newline at end of file
+    assert len(persisted) == 1
+
+
+def _comparable_rows(rows: list[dict]) -> list[dict]:
+    return sorted(
+        ({key: value for key, value in row.items() if key != "updated_at"} for row in rows),
+        key=lambda row: int(row["transaction_id"]),
+    )
+
+
+def _append_incremental_inputs(app_session: Session) -> None:
+    """Later activity on top of ``_seed_completed_job_sale``: another job, a sale and a small trade."""
+    app_session.add(
+        CharacterIndustryJobsModel(
+            character_id=1,
+            job_id=1001,
+            status="delivered",
+            end_date="2026-01-03T00:00:00Z",
+            completed_date="2026-01-03T00:00:00Z",
+            blueprint_type_id=5000,
+            product_type_id=100,
+            successful_runs=1,
+            runs=1,
+            cost=60.0,
+        )
+    )
+    app_session.add_all(
+        [
+            CharacterWalletTransactionsModel(
+                character_id=1,
+                transaction_id=201,
+                client_name="Seller",
+                date="2026-01-02T12:00:00Z",
+                is_buy=True,
+                is_personal=True,
+                journal_ref_id=None,
+                quantity=3,
+                type_id=110,
+                type_name="Traded Item",
+                type_group_name="Ammo",
+                type_category_name="Charge",
+                unit_price=10.0,
+                total_price=30.0,
+            ),
+            CharacterWalletTransactionsModel(
+                character_id=1,
+                transaction_id=202,
+                client_name="Buyer",
+                date="2026-01-04T00:00:00Z",
+                is_buy=False,
+                is_personal=True,
+                journal_ref_id=None,
+                quantity=8,
+                type_id=100,
+                type_name="Test Product",
+                type_group_name="Ships",
+                type_category_name="Ship",
+                unit_price=110.0,
+                total_price=880.0,
+            ),
+            CharacterWalletTransactionsModel(
+                character_id=1,
+                transaction_id=203,
+                client_name="Buyer",
+                date="2026-01-04T06:00:00Z",
+                is_buy=False,
+                is_personal=True,
+                journal_ref_id=None,
+                quantity=2,
+                type_id=110,
+                type_name="Traded Item",
+                type_group_name="Ammo",
+                type_category_name="Charge",
+                unit_price=25.0,
+                total_price=50.0,
+            ),
+        ]
+    )
+    app_session.commit()
+
+
+def test_incremental_realized_profit_rebuild_matches_full_rebuild() -> None:
+    app_session, sde_session = _make_sessions()
+    _seed_completed_job_sale(app_session, sde_session, sale_quantity=6)
+
+    service = CharacterRealizedProfitLedgerService(
+        app_session=app_session,
+        sde_session=sde_session,
+        market_prices=[{"type_id": 34, "average_price": 20.0}],
+    )
+    assert len(service.rebuild(character_id=1)) == 1
+
+    _append_incremental_inputs(app_session)
+
+    incremental_rows = service.rebuild(character_id=1, incremental=True)
+    full_rows = service.rebuild(character_id=1)
+
+    assert [row["transaction_id"] for row in _comparable_rows(incremental_rows)] == [200, 202, 203]
+    assert _comparable_rows(incremental_rows) == _comparable_rows(full_rows)
+
+    # Nothing new: the incremental pass keeps the persisted ledger unchanged.
+    assert _comparable_rows(service.rebuild(character_id=1, incremental=True)) == _comparable_rows(full_rows)
+
+
+def test_incremental_realized_profit_rebuild_falls_back_on_backdated_transactions() -> None:
+    app_session, sde_session = _make_sessions()
+    _seed_completed_job_sale(app_session, sde_session, sale_quantity=6)
+
+    service = CharacterRealizedProfitLedgerService(
+        app_session=app_session,
+        sde_session=sde_session,
+        market_prices=[{"type_id": 34, "average_price": 20.0}],
+    )
+    service.rebuild(character_id=1)
+
+    # A cheaper buy dated before the already-booked sale changes its FIFO cost basis.
+    app_session.add(
+        CharacterWalletTransactionsModel(
+            character_id=1,
+            transaction_id=150,
+            client_name="Seller",
+            date="2025-12-31T00:00:00Z",
+            is_buy=True,
+            is_personal=True,
+            journal_ref_id=None,
+            quantity=4,
+            type_id=100,
+            type_name="Test Product",
+            type_group_name="Ships",
+            type_category_name="Ship",
+            unit_price=5.0,
+            total_price=20.0,
+        )
+    )
+    app_session.commit()
+    _append_incremental_inputs(app_session)
+
+    incremental_rows = service.rebuild(character_id=1, incremental=True)
+    sale = next(row for row in incremental_rows if row["transaction_id"] == 200)
+    assert sale["source_mix"]["market_buy"]["quantity"] == 4
+
+    full_rows = service.rebuild(character_id=1)
+    assert _comparable_rows(incremental_rows) == _comparable_rows(full_rows)
+
+
+def test_blueprint_activity_cache_resolves_products_and_invention_sources() -> None:
+    _, sde_session = _make_sessions()
+    sde_session.add_all(
+        [
+            Blueprints(
+                blueprintTypeID=5000,
+                maxProductionLimit=300,
+                activities={
+                    "manufacturing": {
+                        "materials": [{"typeID": 34, "quantity": 2}, {"typeID": 35, "quantity": 1}],
+                        "products": [{"typeID": 100, "quantity": 5}],
+                    },
+                    "invention": {
+                        "materials": [{"typeID": 20410, "quantity": 2}],
+                        "products": [{"typeID": 6000, "quantity": 1, "probability": 0.34}],
+                    },
+                },
+            ),
+            Blueprints(
+                blueprintTypeID=6000,
+                maxProductionLimit=10,
+                activities={"manufacturing": {"products": [{"typeID": 200, "quantity": 1}]}},
+            ),
+        ]
+    )
+    sde_session.commit()
+
+    cache = get_blueprint_activity_cache(sde_session)
+    assert get_blueprint_activity_cache(sde_session) is cache
+    assert cache.output_quantity_per_run(5000, 100) == 5
+    assert cache.output_quantity_per_run(5000, 999) == 5
+    assert cache.material_type_ids(5000) == [34, 35]
+    assert cache.max_production_limit(6000) == 10
+    source = cache.invention_source(6000)
+    assert source is not None
+    assert source["source_blueprint_type_id"] == 5000
+    assert abs(float(source["probability"]) - 0.34) < 1e-9
+    assert cache.invention_source(5000) is None
+
+    sde_session.add(
+        Blueprints(
+            blueprintTypeID=7000,
+            maxProductionLimit=1,
+            activities={"manufacturing": {"products": [{"typeID": 300, "quantity": 2}]}},
+        )
+    )
+    sde_session.commit()
+    assert not get_blueprint_activity_cache(sde_session).has_blueprint(7000)
+    invalidate_blueprint_activity_cache(sde_session)
+    assert get_blueprint_activity_cache(sde_session).output_quantity_per_run(7000, 300) == 2
+
+
+def test_parallel_realized_profit_rebuild_commits_each_owner_in_own_session(tmp_path) -> None:
+    app_engine = create_engine(f"sqlite:///{tmp_path / 'app.db'}", connect_args={"check_same_thread": False})
+    sde_engine = create_engine(f"sqlite:///{tmp_path / 'sde.db'}", connect_args={"check_same_thread": False})
+    BaseApp.metadata.create_all(bind=app_engine)
+    BaseSde.metadata.create_all(bind=sde_engine)
+    app_session_factory = sessionmaker(bind=app_engine)
+    sde_session_factory = sessionmaker(bind=sde_engine)
+    app_session, sde_session = app_session_factory(), sde_session_factory()
+
+    _seed_completed_job_sale(app_session, sde_session, sale_quantity=6)
+    app_session.add(CharacterModel(character_id=2, character_name="Idle Character"))
+    app_session.commit()
+
+    service = CharacterRealizedProfitLedgerService(
+        app_session=app_session,
+        sde_session=sde_session,
+        market_prices=[{"type_id": 34, "average_price": 20.0}],
+    )
+    progress: list[tuple[int, int]] = []
+    results = service.rebuild_parallel(
+        app_session_factory=app_session_factory,
+        sde_session_factory=sde_session_factory,
+        incremental=False,
+        max_workers=2,
+        progress_callback=lambda done, total, _result: progress.append((done, total)),
+    )
+
+    assert [result["character_id"] for result in results] == [1, 2]
+    assert [result["row_count"] for result in results] == [1, 0]
+    assert all(result["error_message"] is None for result in results)
+    assert sorted(progress) == [(1, 2), (2, 2)]
+
+    app_session.expire_all()
+    parallel_rows = service.list_rows(character_id=1)
+    assert _comparable_rows(parallel_rows) == _comparable_rows(service.rebuild(character_id=1))
+    assert app_session.query(CharacterRealizedProfitStateModel).count() == 2
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+from flask import Flask
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from eve_online_industry_tracker.application.characters import realized_profit_jobs  # noqa: E402
+from eve_online_industry_tracker.application.characters.realized_profit_jobs import (  # noqa: E402
+    REALIZED_PROFIT_REBUILD_JOB_KIND,
+    RealizedProfitRebuildJobs,
+)
+from eve_online_industry_tracker.db_models import BackgroundJobModel  # noqa: E402
+from eve_online_industry_tracker.infrastructure.database_manager import DatabaseManager  # noqa: E402
+from eve_online_industry_tracker.infrastructure.job_queue import DurableJobQueue  # noqa: E402
+from flask_app.routes import characters as characters_routes  # noqa: E402
+from flask_app.routes import corporations as corporations_routes  # noqa: E402
+from flask_app.settings import get_settings  # noqa: E402
+from flask_app.state import AppState  # noqa: E402
+
+
+class _RecordingService:
+    calls: list[dict] = []
+
+    def __init__(self, *, state):
+        pass
+
+    def start_realized_profit_rebuild(self, **kwargs):
+        self.calls.append(kwargs)
+        return {"job_id": "job"}
+
+
+def test_rebuild_routes_clamp_max_workers(monkeypatch) -> None:
+    monkeypatch.setenv("FLASK_REALIZED_PROFIT_REBUILD_WORKERS", "3")
+    get_settings.cache_clear()
+    app = Flask(__name__)
+    for module, blueprint in (
+        (characters_routes, characters_routes.characters_bp),
+        (corporations_routes, corporations_routes.corporations_bp),
+    ):
+        monkeypatch.setattr(module, "require_ready", lambda state: None)
+        monkeypatch.setattr(module, "get_state", lambda: None)
+        app.register_blueprint(blueprint)
+    monkeypatch.setattr(characters_routes, "CharactersService", _RecordingService)
+    monkeypatch.setattr(corporations_routes, "CorporationsService", _RecordingService)
+    _RecordingService.calls = []
+
+    client = app.test_client()
+    try:
+        assert client.post("/characters/realized_profit/rebuild", json={"max_workers": 500}).status_code == 202
+        assert client.post("/corporations/realized_profit/rebuild", json={"max_workers": -2}).status_code == 202
+        assert client.post("/characters/realized_profit/rebuild", json={}).status_code == 202
+    finally:
+        get_settings.cache_clear()
+
+    assert [call["max_workers"] for call in _RecordingService.calls] == [3, 1, 3]
+
+
+class _Ledger:
+    def __init__(self, *, app_session, sde_session, market_prices):
+        pass
+
+    def rebuild_parallel(self, *, owner_ids, progress_callback, **kwargs):
+        for done, owner_id in enumerate(owner_ids, start=1):
+            progress_callback(done, len(owner_ids), {"owner_id": owner_id})
+        return [{"owner_id": owner_id, "row_count": 2} for owner_id in owner_ids]
+
+
+def test_rebuild_jobs_run_on_the_job_queue_with_phase_step_labels(tmp_path, monkeypatch) -> None:
+    state = AppState()
+    state.db_app = DatabaseManager(f"sqlite:///{tmp_path / 'app.db'}")
+    state.db_sde = DatabaseManager(f"sqlite:///{tmp_path / 'sde.db'}")
+    BackgroundJobModel.__table__.create(bind=state.db_app.engine, checkfirst=True)
+    state.esi_service = SimpleNamespace(get_market_prices=lambda: [])
+    state.char_manager = SimpleNamespace(refresh_realized_profit_inputs=lambda **kwargs: None)
+    monkeypatch.setitem(realized_profit_jobs._LEDGER_SERVICES, "character", _Ledger)
+
+    step_labels: dict[str, list[str]] = {}
+    update_job = realized_profit_jobs.update_job
+
+    def recording_update_job(store, job_id, **kwargs):
+        if (kwargs.get("progress_meta") or {}).get("step"):
+            step_labels.setdefault(job_id, []).append(kwargs["progress_label"])
+        return update_job(store, job_id, **kwargs)
+
+    monkeypatch.setattr(realized_profit_jobs, "update_job", recording_update_job)
+    jobs = RealizedProfitRebuildJobs(state=state)
+    queue = DurableJobQueue(state=state)
+    jobs.register_background_jobs(queue)
+    state.job_queue = queue
+
+    try:
+        plain = jobs.start(owner_kind="character", owner_ids=[2, 1], max_workers=2)
+        assert jobs.start(owner_kind="character", owner_ids=[1, 2], max_workers=2)["job_id"] == plain["job_id"]
+        assert plain["progress_meta"]["step_count"] == 2
+        refreshed = jobs.start(owner_kind="character", owner_ids=[1], refresh=True)
+        assert refreshed["progress_meta"]["step_count"] == 3
+
+        deadline = time.monotonic() + 5.0
+        while any(jobs.status(job_id=job["job_id"])["status"] != "completed" for job in (plain, refreshed)):
+            assert time.monotonic() < deadline, "timed out"
+            time.sleep(0.01)
+    finally:
+        state.shutdown_event.set()
+
+    assert queue.handles(REALIZED_PROFIT_REBUILD_JOB_KIND)
+    assert jobs.status(job_id=plain["job_id"])["result_meta"] == {"owner_count": 2, "failed_count": 0, "row_count": 4}
+    assert step_labels[plain["job_id"]] == [
+        "Step 1/2: Loading market prices",
+        "Step 2/2: Rebuilding owner ledgers",
+        "Step 2/2: Rebuilt 1/2 owners",
+        "Step 2/2: Rebuilt 2/2 owners",
+    ]
+    assert step_labels[refreshed["job_id"]] == [
+        "Step 1/3: Refreshing wallet and industry inputs",
+        "Step 2/3: Loading market prices",
+        "Step 3/3: Rebuilding owner ledgers",
+        "Step 3/3: Rebuilt 1/1 owners",
+    ]
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import os
+import sys
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from eve_online_industry_tracker.infrastructure.models import BaseSde, Categories, Groups, Types  # noqa: E402
+from eve_online_industry_tracker.infrastructure.sde.dimensions import (  # noqa: E402
+    get_sde_dimensions,
+    invalidate_sde_dimensions,
+)
+from eve_online_industry_tracker.infrastructure.sde.types import get_type_data  # noqa: E402
+
+
+def _make_sde_session() -> Session:
+    sde_engine = create_engine("sqlite:///:memory:")
+    BaseSde.metadata.create_all(bind=sde_engine)
+    return sessionmaker(bind=sde_engine)()
+
+
+def _seed(sde_session: Session) -> None:
+    sde_session.add(Categories(id=6, name={"en": "Ship", "de": "Schiff"}, published=True))
+    sde_session.add(Groups(id=25, categoryID=6, name={"en": "Frigate", "de": "Fregatte"}, repackaged_volume=2500.0))
+    sde_session.add(
+        Types(
+            id=587,
+            groupID=25,
+            name={"en": "Rifter", "de": "Rifter"},
+            description={"en": "<b>Fast</b> frigate", "de": "Schnelle Fregatte"},
+            volume=27289.0,
+            metaGroupID=1,
+        )
+    )
+    sde_session.commit()
+
+
+def test_sde_dimensions_keep_stored_localized_text_per_language() -> None:
+    sde_session = _make_sde_session()
+    _seed(sde_session)
+
+    english = get_sde_dimensions(sde_session, "en")
+    assert get_sde_dimensions(sde_session, "en") is english
+    assert english.get_type(587).name == "Rifter"
+    # Enrichment returns the stored text unchanged, as the per-call SDE lookups did.
+    assert english.get_type(587).description == "<b>Fast</b> frigate"
+    assert english.group_for_type(587).name == "Frigate"
+    assert english.category_for_type(587).name == "Ship"
+    assert english.get_type(999999) is None
+    assert english.meta_group_for_type(587) is None
+
+    german = get_sde_dimensions(sde_session, "de")
+    assert german is not english
+    assert german.category_for_type(587).name == "Schiff"
+    assert get_sde_dimensions(sde_session, "fr").get_type(587).description == ""
+
+
+def test_get_type_data_reads_from_dimension_cache() -> None:
+    sde_session = _make_sde_session()
+    _seed(sde_session)
+
+    type_data = get_type_data(sde_session, "en", [587, 999999])
+    assert list(type_data) == [587]
+    assert type_data[587]["type_name"] == "Rifter"
+    assert type_data[587]["group_name"] == "Frigate"
+    assert type_data[587]["category_id"] == 6
+    assert type_data[587]["category_name"] == "Ship"
+    assert type_data[587]["group_repackaged_volume"] == 2500.0
+    assert type_data[587]["meta_group_name"] == ""
+    assert type_data[587]["description"] == "Fast frigate"
+
+    sde_session.add(Types(id=588, groupID=25, name={"en": "Reaper"}))
+    sde_session.commit()
+    assert get_type_data(sde_session, "en", [588]) == {}
+    invalidate_sde_dimensions(sde_session)
+    assert get_type_data(sde_session, "en", [588])[588]["type_name"] == "Reaper"
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import sys
+
+from sqlalchemy import text
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from eve_online_industry_tracker.infrastructure.database_manager import DatabaseManager  # noqa: E402
+from eve_online_industry_tracker.infrastructure.sde.build_cache import get_build_keyed  # noqa: E402
+from eve_online_industry_tracker.infrastructure.sde.reload import PENDING_SUFFIX, SdeReloader  # noqa: E402
+
+
+def _write_sde(path, *, build: int, blueprint_hash: str, blueprint_rows: int) -> None:
+    tmp = f"{path}.tmp"
+    conn = sqlite3.connect(tmp)
+    conn.execute("CREATE TABLE sde_version (id INTEGER PRIMARY KEY, build_number INTEGER, is_current INTEGER)")
+    conn.execute("INSERT INTO sde_version (build_number, is_current) VALUES (?, 1)", (build,))
+    conn.execute("CREATE TABLE sde_table_state (table_name TEXT PRIMARY KEY, source_hash TEXT NOT NULL)")
+    conn.executemany(
+        "INSERT INTO sde_table_state VALUES (?, ?)", [("types", "types-v1"), ("blueprints", blueprint_hash)]
+    )
+    conn.execute("CREATE TABLE blueprints (id INTEGER PRIMARY KEY)")
+    conn.executemany("INSERT INTO blueprints VALUES (?)", [(i,) for i in range(blueprint_rows)])
+    conn.commit()
+    conn.close()
+    os.replace(tmp, path)
+
+
+def _cached(db: DatabaseManager, key: str, tables: set[str], calls: list[str]) -> int:
+    def load(session, build_number):
+        calls.append(key)
+        return session.execute(text("SELECT COUNT(*) FROM blueprints")).scalar()
+
+    session = db.session()
+    try:
+        return get_build_keyed(session, key, load, tables=tables)
+    finally:
+        session.close()
+
+
+def test_reload_swaps_engine_and_drops_only_caches_of_changed_tables(tmp_path) -> None:
+    path = tmp_path / "sde.db"
+    _write_sde(path, build=1, blueprint_hash="bp-v1", blueprint_rows=1)
+    db = DatabaseManager(f"sqlite:///{path}", read_only=True)
+    notified = []
+    reloader = SdeReloader(db_sde=db, on_tables_changed=notified.append)
+    calls: list[str] = []
+
+    assert _cached(db, "blueprint_count", {"blueprints"}, calls) == 1
+    assert _cached(db, "type_dims", {"types"}, calls) == 1
+    assert reloader.check() == {"reloaded": False, "reason": "unchanged"}
+
+    # On Windows the importer leaves the update next to the open file.
+    _write_sde(f"{path}{PENDING_SUFFIX}", build=2, blueprint_hash="bp-v2", blueprint_rows=3)
+    out = reloader.check()
+
+    assert out["reloaded"] is True
+    assert out["changed_tables"] == ["blueprints"]
+    assert out["invalidated_caches"] == ["blueprint_count"]
+    assert notified == [frozenset({"blueprints"})]
+    assert not os.path.exists(f"{path}{PENDING_SUFFIX}")
+    assert _cached(db, "blueprint_count", {"blueprints"}, calls) == 3
+    assert _cached(db, "type_dims", {"types"}, calls) == 1  # kept: types did not change
+    assert calls == ["blueprint_count", "type_dims", "blueprint_count"]
+    assert reloader.check()["reloaded"] is False
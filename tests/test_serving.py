@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import textwrap
+import time
+import urllib.request
+
+import pytest
+
+_SRC = os.path.join(os.path.dirname(__file__), "..", "src")
+
+_SERVER_SCRIPT = textwrap.dedent(
+    """
+    import os
+    import threading
+
+    from flask import Flask
+
+    from flask_app.serving import serve_app
+
+    app = Flask(__name__)
+    initialized = {}
+
+
+    def initialize():
+        def run():
+            initialized["pid"] = os.getpid()
+
+        thread = threading.Thread(target=run, name="app-initializer", daemon=True)
+        thread.start()
+        thread.join()
+
+
+    @app.get("/probe")
+    def probe():
+        return {"pid": os.getpid(), "initialized_pid": initialized.get("pid")}
+
+
+    serve_app(app, server="gunicorn", initialize=initialize)
+    """
+)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_gunicorn_initializes_inside_the_worker_process() -> None:
+    pytest.importorskip("gunicorn")
+    port = _free_port()
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join([_SRC, os.environ.get("PYTHONPATH", "")]),
+        "FLASK_HOST": "127.0.0.1",
+        "FLASK_PORT": str(port),
+        "FLASK_SERVER_THREADS": "2",
+    }
+    master = subprocess.Popen(
+        [sys.executable, "-c", _SERVER_SCRIPT], env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        body = None
+        deadline = time.monotonic() + 30
+        while body is None and time.monotonic() < deadline:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/probe", timeout=2) as response:
+                    body = json.loads(response.read())
+            except OSError:
+                time.sleep(0.2)
+        assert body is not None, "gunicorn did not start serving"
+
+        # Requests are served by the forked worker, and initialization ran there too.
+        assert body["pid"] != master.pid
+        assert body["initialized_pid"] == body["pid"]
+    finally:
+        master.terminate()
+        master.wait(timeout=30)